@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Account, SubscriptionPlan, AccountUser
+from .models import Account, SubscriptionPlan, AccountUser, WebhookEvent, StripeSubscription
 
 
 @admin.register(SubscriptionPlan)
@@ -34,7 +34,7 @@ class AccountAdmin(admin.ModelAdmin):
             'fields': ('subscription_plan', 'subscription_status', 'trial_ends_at', 'subscription_ends_at')
         }),
         ('Usage', {
-            'fields': ('current_article_count', 'current_user_count', 'current_storage_mb'),
+            'fields': ('current_article_count', 'current_user_count', 'current_storage_mb', 'current_storage_bytes'),
             'classes': ('collapse',)
         }),
         ('Domain', {
@@ -58,3 +58,19 @@ class AccountUserAdmin(admin.ModelAdmin):
     list_filter = ['role', 'is_active', 'joined_at']
     search_fields = ['user__email', 'account__name']
     readonly_fields = ['id', 'joined_at']
+
+
+@admin.register(WebhookEvent)
+class WebhookEventAdmin(admin.ModelAdmin):
+    list_display = ['event_id', 'event_type', 'customer_id', 'status', 'attempts', 'stripe_created_at', 'processed_at']
+    list_filter = ['status', 'event_type']
+    search_fields = ['event_id', 'customer_id']
+    readonly_fields = ['id', 'event_id', 'event_type', 'customer_id', 'payload', 'stripe_created_at',
+                       'received_at', 'processed_at']
+
+
+@admin.register(StripeSubscription)
+class StripeSubscriptionAdmin(admin.ModelAdmin):
+    list_display = ['id', 'customer_id', 'status', 'price_id', 'cancel_at_period_end', 'current_period_end', 'synced_at']
+    list_filter = ['status', 'cancel_at_period_end']
+    search_fields = ['id', 'customer_id']
@@ -21,8 +21,9 @@ from django.core.cache import cache
 from django.db import transaction
 from decimal import Decimal
 from typing import Optional, Dict, Any, List
-from datetime import timedelta
-from .models import Account, SubscriptionPlan
+from datetime import datetime, timedelta, timezone as dt_timezone
+from . import billing_state
+from .models import Account, StripeSubscription, SubscriptionPlan
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -35,6 +36,7 @@ GRACE_PERIOD_DAYS = 3  # Days to wait before suspending service after failed pay
 MAX_RETRY_ATTEMPTS = 3  # Maximum payment retry attempts
 RATE_LIMIT_REQUESTS = 10  # Max billing requests per hour per account
 RATE_LIMIT_WINDOW = 3600  # Rate limit window in seconds (1 hour)
+PRORATION_CACHE_TIMEOUT = getattr(settings, 'BILLING_PRORATION_CACHE_TIMEOUT', 15 * 60)
 
 class BillingService:
     """Service class for handling Stripe billing operations"""
@@ -45,13 +47,10 @@ class BillingService:
         Create a Stripe customer or return existing customer ID
         """
         if account.stripe_customer_id:
-            try:
-                # Verify the customer still exists in Stripe
-                customer = stripe.Customer.retrieve(account.stripe_customer_id)
+            # Verify the customer still exists, against the mirror unless it is stale
+            customer = billing_state.customer(account.stripe_customer_id)
+            if customer is not None and not customer.deleted:
                 return account.stripe_customer_id
-            except stripe.error.InvalidRequestError:
-                # Customer doesn't exist, create a new one
-                pass
 
         # Create new customer
         customer = stripe.Customer.create(
@@ -62,6 +61,7 @@ class BillingService:
                 'account_slug': account.slug,
             }
         )
+        billing_state.store_customer(customer)
 
         account.stripe_customer_id = customer.id
         account.save(update_fields=['stripe_customer_id'])
@@ -99,6 +99,7 @@ class BillingService:
             payment_behavior='default_incomplete',  # Require payment confirmation
             expand=['latest_invoice.payment_intent'],
         )
+        billing_state.store_subscription(subscription)
 
         # Update account with subscription details
         account.stripe_subscription_id = subscription.id
@@ -127,16 +128,17 @@ class BillingService:
         try:
             if cancel_at_period_end:
                 # Cancel at period end
-                stripe.Subscription.modify(
+                subscription = stripe.Subscription.modify(
                     account.stripe_subscription_id,
                     cancel_at_period_end=True
                 )
                 account.subscription_status = 'active'  # Still active until period ends
             else:
                 # Cancel immediately
-                stripe.Subscription.cancel(account.stripe_subscription_id)
+                subscription = stripe.Subscription.cancel(account.stripe_subscription_id)
                 account.subscription_status = 'canceled'
                 account.subscription_ends_at = timezone.now()
+            billing_state.store_subscription(subscription)
 
             account.save()
             return True
@@ -163,11 +165,14 @@ class BillingService:
                 raise ValueError(f"No Stripe price ID configured for {billing_type} billing on plan {new_plan.name}")
 
             # Update subscription with new price
-            subscription = stripe.Subscription.retrieve(account.stripe_subscription_id)
-            stripe.Subscription.modify(
+            subscription = billing_state.subscription(account.stripe_subscription_id)
+            if subscription is None or not subscription.item_id:
+                raise ValueError("Subscription not found in Stripe")
+
+            updated = stripe.Subscription.modify(
                 account.stripe_subscription_id,
                 items=[{
-                    'id': subscription['items']['data'][0]['id'],
+                    'id': subscription.item_id,
                     'price': price_id,
                 }],
                 proration_behavior='create_prorations',
@@ -178,6 +183,7 @@ class BillingService:
                     'plan_name': new_plan.name,
                 }
             )
+            billing_state.store_subscription(updated)
 
             # Update account
             account.subscription_plan = new_plan
@@ -214,6 +220,8 @@ class BillingService:
         data_object = event_data.get('data', {}).get('object', {})
 
         try:
+            billing_state.sync_event(event_data)
+
             if event_type == 'customer.subscription.updated':
                 BillingService._handle_subscription_updated(data_object)
             elif event_type == 'customer.subscription.deleted':
@@ -228,7 +236,8 @@ class BillingService:
                 return True  # Unhandled event, but not an error
 
             return True
-        except Exception:
+        except Exception as e:
+            logger.error(f"Error handling Stripe event {event_data.get('id')} ({event_type}): {str(e)}", exc_info=True)
             return False
 
     @staticmethod
@@ -252,7 +261,7 @@ class BillingService:
                 account.subscription_status = 'incomplete'
 
             if current_period_end:
-                account.subscription_ends_at = timezone.datetime.fromtimestamp(current_period_end)
+                account.subscription_ends_at = datetime.fromtimestamp(current_period_end, tz=dt_timezone.utc)
 
             account.save()
 
@@ -469,15 +478,16 @@ class BillingService:
                 'storage': (account.current_storage_mb / account.subscription_plan.max_storage_mb) * 100 if account.subscription_plan.max_storage_mb > 0 else 0,
             }
 
-        # Get Stripe usage data if available (requires latest Stripe API)
+        # Billing period from the mirrored subscription
         if account.stripe_customer_id:
             try:
-                subscriptions = stripe.Subscription.list(customer=account.stripe_customer_id, limit=1)
-                if subscriptions.data:
-                    sub = subscriptions.data[0]
-                    analytics['next_billing_date'] = timezone.datetime.fromtimestamp(sub.current_period_end).date().isoformat()
+                subscription = billing_state.customer_subscription(account.stripe_customer_id)
             except stripe.error.StripeError:
-                pass  # Ignore Stripe API errors for analytics
+                subscription = None  # Ignore Stripe API errors for analytics
+            if subscription and subscription.current_period_end:
+                analytics['next_billing_date'] = subscription.current_period_end.date().isoformat()
+                analytics['cancel_at_period_end'] = subscription.cancel_at_period_end
+            analytics['total_invoices'] = billing_state.paid_invoice_count(account.stripe_customer_id)
 
         return analytics
 
@@ -569,41 +579,46 @@ class BillingService:
         if not account.stripe_subscription_id:
             return {'proration_amount': 0, 'currency': 'usd'}
 
-        try:
-            subscription = stripe.Subscription.retrieve(account.stripe_subscription_id)
+        # Get new price
+        price_id = new_plan.stripe_price_id_yearly if billing_type == 'yearly' else new_plan.stripe_price_id_monthly
+        if not price_id:
+            return {'proration_amount': 0, 'currency': 'usd'}
 
-            # Get new price
-            price_id = new_plan.stripe_price_id_yearly if billing_type == 'yearly' else new_plan.stripe_price_id_monthly
-            if not price_id:
-                return {'proration_amount': 0, 'currency': 'usd'}
+        try:
+            subscription = billing_state.subscription(account.stripe_subscription_id)
+        except stripe.error.StripeError:
+            return {'proration_amount': 0, 'currency': 'usd'}
+        if subscription is None or not subscription.item_id:
+            return {'proration_amount': 0, 'currency': 'usd'}
 
-            # Calculate proration using Stripe's API
-            items = [{
-                'id': subscription['items']['data'][0]['id'],
-                'price': price_id,
-            }]
+        # Stripe's preview accounts for coupons, tax and quantities; reuse it within a billing period
+        period_start = int(subscription.current_period_start.timestamp()) if subscription.current_period_start else 0
+        cache_key = f"billing_proration:{subscription.id}:{price_id}:{period_start}"
+        proration = cache.get(cache_key)
+        if proration is not None:
+            return proration
 
+        try:
             # Create invoice preview for proration calculation
             invoice = stripe.Invoice.create(
                 customer=account.stripe_customer_id,
                 subscription=account.stripe_subscription_id,
-                subscription_items=items,
+                subscription_items=[{'id': subscription.item_id, 'price': price_id}],
                 preview=True
             )
+        except stripe.error.StripeError:
+            return {'proration_amount': 0, 'currency': 'usd'}
 
-            proration_amount = sum(
+        proration = {
+            'proration_amount': sum(
                 item.amount for item in invoice.lines.data
                 if item.type == 'proration'
-            ) / 100  # Convert from cents
-
-            return {
-                'proration_amount': proration_amount,
-                'currency': invoice.currency.upper(),
-                'description': f'Proration for plan change to {new_plan.name}'
-            }
-
-        except stripe.error.StripeError:
-            return {'proration_amount': 0, 'currency': 'usd'}
+            ) / 100,  # Convert from cents
+            'currency': invoice.currency.upper(),
+            'description': f'Proration for plan change to {new_plan.name}'
+        }
+        cache.set(cache_key, proration, PRORATION_CACHE_TIMEOUT)
+        return proration
 
     @staticmethod
     def log_billing_event(account: Account, event_type: str, data: Dict[str, Any], user=None):
@@ -648,6 +663,17 @@ class BillingService:
             usage_alerts = BillingService._check_usage_alerts(account)
             alerts.extend(usage_alerts)
 
+        # Cancellation scheduled at the end of the period
+        if account.stripe_subscription_id:
+            subscription = StripeSubscription.objects.filter(pk=account.stripe_subscription_id).first()
+            if subscription and subscription.cancel_at_period_end and subscription.current_period_end:
+                alerts.append({
+                    'type': 'subscription_ending',
+                    'severity': 'warning',
+                    'message': f'Subscription ends on {subscription.current_period_end.date().isoformat()}',
+                    'action_required': False
+                })
+
         # Payment failed
         if account.subscription_status == 'past_due':
             alerts.append({
@@ -678,7 +704,8 @@ class BillingService:
             })
 
         # Storage limit approaching
-        storage_usage_pct = (account.current_storage_mb / account.subscription_plan.max_storage_mb) * 100
+        max_storage_bytes = account.subscription_plan.max_storage_mb * 1024 * 1024
+        storage_usage_pct = (account.current_storage_bytes / max_storage_bytes) * 100 if max_storage_bytes else 0
         if storage_usage_pct >= 80:
             alerts.append({
                 'type': 'usage_warning',
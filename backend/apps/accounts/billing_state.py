@@ -0,0 +1,194 @@
+"""
+Local mirror of Stripe billing state
+Customers, subscriptions and prices are kept as rows refreshed from webhook
+events and from the objects Stripe returns to our own API calls. Reads are
+answered from the mirror and only go to Stripe when a row is missing or older
+than BILLING_STATE_TTL; a stale row is still served when Stripe is unreachable.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Optional
+
+import stripe
+from django.conf import settings
+from django.utils import timezone
+
+from .models import StripeCustomer, StripePrice, StripeSubscription, WebhookEvent
+
+logger = logging.getLogger(__name__)
+
+BILLING_STATE_TTL = getattr(settings, 'BILLING_STATE_TTL', 6 * 60 * 60)
+
+
+def _timestamp(value: Optional[int]) -> Optional[datetime]:
+    return datetime.fromtimestamp(value, tz=dt_timezone.utc) if value else None
+
+
+def _is_stale(row) -> bool:
+    return row.synced_at < timezone.now() - timedelta(seconds=BILLING_STATE_TTL)
+
+
+def _store(model, object_id: str, fields: Dict, as_of: Optional[datetime]):
+    """
+    Upsert a mirrored object unless the row already reflects a later state,
+    e.g. a fresh API read followed by the delivery of an older event. Stripe
+    timestamps have one second resolution, so ties go to the later write.
+    """
+    as_of = as_of or timezone.now().replace(microsecond=0)
+    if not model.objects.filter(pk=object_id, synced_at__lte=as_of).update(synced_at=as_of, **fields):
+        model.objects.get_or_create(pk=object_id, defaults={**fields, 'synced_at': as_of})
+    return model.objects.get(pk=object_id)
+
+
+def store_customer(customer: Dict, as_of: Optional[datetime] = None) -> StripeCustomer:
+    return _store(StripeCustomer, customer['id'], {
+        'email': customer.get('email') or '',
+        'name': customer.get('name') or '',
+        'deleted': bool(customer.get('deleted')),
+    }, as_of)
+
+
+def store_price(price: Dict, as_of: Optional[datetime] = None) -> StripePrice:
+    recurring = price.get('recurring') or {}
+    return _store(StripePrice, price['id'], {
+        'unit_amount': price.get('unit_amount'),
+        'currency': price.get('currency') or 'usd',
+        'interval': recurring.get('interval') or '',
+        'active': price.get('active', True),
+    }, as_of)
+
+
+def store_subscription(subscription: Dict, as_of: Optional[datetime] = None) -> StripeSubscription:
+    items = (subscription.get('items') or {}).get('data') or []
+    item = items[0] if items else {}
+    price = item.get('price') or ''
+    if isinstance(price, dict):
+        # Subscriptions embed their full price objects
+        store_price(price, as_of)
+        price = price['id']
+
+    customer = subscription.get('customer') or ''
+    if isinstance(customer, dict):
+        customer = customer['id']
+
+    # Newer API versions moved the billing period onto the subscription item
+    period_start = subscription.get('current_period_start') or item.get('current_period_start')
+    period_end = subscription.get('current_period_end') or item.get('current_period_end')
+    return _store(StripeSubscription, subscription['id'], {
+        'customer_id': customer,
+        'status': subscription.get('status') or '',
+        'item_id': item.get('id') or '',
+        'price_id': price,
+        'cancel_at_period_end': bool(subscription.get('cancel_at_period_end')),
+        'current_period_start': _timestamp(period_start),
+        'current_period_end': _timestamp(period_end),
+        'created_at': _timestamp(subscription.get('created')),
+    }, as_of)
+
+
+def sync_event(event: Dict):
+    """Mirror the customer, subscription or price carried by a webhook event"""
+    event_type = event.get('type') or ''
+    data_object = event.get('data', {}).get('object') or {}
+    as_of = _timestamp(event.get('created'))
+
+    if event_type.startswith('customer.subscription.'):
+        store_subscription(data_object, as_of)
+    elif event_type in ('customer.created', 'customer.updated', 'customer.deleted'):
+        store_customer({**data_object, 'deleted': event_type == 'customer.deleted'}, as_of)
+    elif event_type in ('price.created', 'price.updated', 'price.deleted'):
+        store_price({**data_object, 'active': event_type != 'price.deleted' and data_object.get('active', True)}, as_of)
+
+
+def _read(model, object_id: str, retrieve, store):
+    """
+    Mirrored row, refetched from Stripe when missing or stale. Returns None
+    when Stripe does not know the object; other Stripe errors are raised unless
+    a stale row can be served instead.
+    """
+    row = model.objects.filter(pk=object_id).first()
+    if row is not None and not _is_stale(row):
+        return row
+
+    try:
+        return store(retrieve(object_id))
+    except stripe.error.InvalidRequestError:
+        logger.info(f"Stripe has no {model.__name__} {object_id}")
+        return None
+    except stripe.error.StripeError as e:
+        if row is None:
+            raise
+        logger.warning(f"Serving stale {model.__name__} {object_id}; refresh failed: {str(e)}")
+        return row
+
+
+def customer(customer_id: str) -> Optional[StripeCustomer]:
+    return _read(StripeCustomer, customer_id, stripe.Customer.retrieve, store_customer)
+
+
+def subscription(subscription_id: str) -> Optional[StripeSubscription]:
+    return _read(StripeSubscription, subscription_id, stripe.Subscription.retrieve, store_subscription)
+
+
+def price(price_id: str) -> Optional[StripePrice]:
+    return _read(StripePrice, price_id, stripe.Price.retrieve, store_price)
+
+
+def customer_subscription(customer_id: str) -> Optional[StripeSubscription]:
+    """The customer's most recently created subscription"""
+    row = StripeSubscription.objects.filter(customer_id=customer_id).order_by('-created_at').first()
+    if row is not None and not _is_stale(row):
+        return row
+
+    try:
+        subscriptions = stripe.Subscription.list(customer=customer_id, limit=1)
+    except stripe.error.StripeError as e:
+        logger.warning(f"Could not refresh subscriptions of {customer_id}: {str(e)}")
+        return row
+    if subscriptions.data:
+        return store_subscription(subscriptions.data[0])
+    return row
+
+
+def _count_paid_invoices(customer_id: str) -> int:
+    total = 0
+    params = {'customer': customer_id, 'status': 'paid', 'limit': 100}
+    while True:
+        page = stripe.Invoice.list(**params)
+        total += len(page.data)
+        if not page.has_more or not page.data:
+            return total
+        params['starting_after'] = page.data[-1].id
+
+
+def paid_invoice_count(customer_id: str) -> int:
+    """
+    Invoices paid by a customer: counted from Stripe on first use, plus the
+    invoice.payment_succeeded webhooks processed since then
+    """
+    paid_events = WebhookEvent.objects.filter(
+        customer_id=customer_id,
+        event_type='invoice.payment_succeeded',
+        status='processed',
+    )
+    try:
+        row = StripeCustomer.objects.filter(pk=customer_id).first() or customer(customer_id)
+    except stripe.error.StripeError:
+        row = None
+    if row is None:
+        return paid_events.count()
+
+    if row.invoices_counted_at is None:
+        counted_at = timezone.now()
+        try:
+            count = _count_paid_invoices(customer_id)
+        except stripe.error.StripeError as e:
+            logger.warning(f"Could not count invoices of {customer_id}: {str(e)}")
+            return paid_events.count()
+        StripeCustomer.objects.filter(pk=customer_id, invoices_counted_at__isnull=True).update(
+            paid_invoices=count, invoices_counted_at=counted_at
+        )
+        row.refresh_from_db()
+
+    return row.paid_invoices + paid_events.filter(stripe_created_at__gt=row.invoices_counted_at).count()
@@ -0,0 +1,146 @@
+"""
+Public account directory
+Search matches an account's name, slug and description by substring or by
+trigram word similarity, so near-miss spellings still find a blog. PostgreSQL
+answers both with pg_trgm GIN indexes; other databases score trigrams in
+Python. Public cards are cached per account and assembled for a page with one
+cache read, and responses can be trimmed to the fields a client asks for.
+"""
+
+import logging
+import re
+from typing import Dict, List, Optional, Set
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Lookup, Q
+
+from .models import Account
+from .serializers import AccountPublicSerializer
+
+logger = logging.getLogger(__name__)
+
+ACCOUNT_CARD_CACHE_TIMEOUT = getattr(settings, 'ACCOUNT_CARD_CACHE_TIMEOUT', 5 * 60)
+# pg_trgm's default word_similarity_threshold, used by the Python fallback too
+WORD_SIMILARITY_THRESHOLD = 0.6
+MAX_QUERY_LENGTH = 100
+
+SEARCH_FIELDS = ['name', 'slug', 'description']
+CARD_FIELDS = list(AccountPublicSerializer.Meta.fields)
+
+WORD_RE = re.compile(r'\w+')
+
+
+class TrigramContains(Lookup):
+    """Case-insensitive substring match that a gin_trgm_ops index can serve"""
+    lookup_name = 'trigram_contains'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        rhs_params = [f"%{connection.ops.prep_for_like_query(param)}%" for param in rhs_params]
+        return f"{lhs} ILIKE {rhs}", lhs_params + rhs_params
+
+
+class TrigramWordSimilar(Lookup):
+    """Whether the value is similar to some extent of the column (pg_trgm's %>)"""
+    lookup_name = 'trigram_word_similar'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} %%> {rhs}", lhs_params + rhs_params
+
+
+for _field in SEARCH_FIELDS:
+    Account._meta.get_field(_field).register_lookup(TrigramContains)
+    Account._meta.get_field(_field).register_lookup(TrigramWordSimilar)
+
+
+def trigrams(text: str) -> Set[str]:
+    """Trigrams of each word, padded the way pg_trgm pads them"""
+    grams = set()
+    for word in WORD_RE.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def word_similarity(query: str, text: str) -> float:
+    """
+    Share of the query's trigrams found in the text. Approximates pg_trgm's
+    word_similarity without restricting matches to one contiguous extent.
+    """
+    query_grams = trigrams(query)
+    if not query_grams:
+        return 0.0
+    return len(query_grams & trigrams(text)) / len(query_grams)
+
+
+def matches(query: str, *values: str) -> bool:
+    folded = query.casefold()
+    return any(
+        folded in value.casefold() or word_similarity(query, value) >= WORD_SIMILARITY_THRESHOLD
+        for value in values if value
+    )
+
+
+def search(queryset, query: str):
+    """Narrow a queryset of accounts to those matching a search query"""
+    query = query[:MAX_QUERY_LENGTH]
+    if connections[queryset.db].vendor == 'postgresql':
+        condition = Q()
+        for field in SEARCH_FIELDS:
+            condition |= Q(**{f'{field}__trigram_contains': query}) | Q(**{f'{field}__trigram_word_similar': query})
+        return queryset.filter(condition)
+
+    # Without pg_trgm, score the candidates' search fields in Python
+    matched = [
+        pk for pk, *values in queryset.order_by().values_list('pk', *SEARCH_FIELDS)
+        if matches(query, *values)
+    ]
+    return queryset.filter(pk__in=matched)
+
+
+def card_key(account_id) -> str:
+    return f"account_card:{account_id}"
+
+
+def invalidate_card(account_id):
+    cache.delete(card_key(account_id))
+
+
+def public_cards(account_ids: List) -> List[Dict]:
+    """Public cards of accounts in the given order, building only the uncached ones"""
+    keys = {account_id: card_key(account_id) for account_id in account_ids}
+    cached = cache.get_many(list(keys.values()))
+    cards = {account_id: cached[key] for account_id, key in keys.items() if key in cached}
+
+    missing = [account_id for account_id in account_ids if account_id not in cards]
+    if missing:
+        built = {
+            account.pk: dict(AccountPublicSerializer(account).data)
+            for account in Account.objects.filter(pk__in=missing).select_related('owner')
+        }
+        cache.set_many({keys[account_id]: card for account_id, card in built.items()}, ACCOUNT_CARD_CACHE_TIMEOUT)
+        cards.update(built)
+
+    return [cards[account_id] for account_id in account_ids if account_id in cards]
+
+
+def parse_fields(value: Optional[str]) -> Optional[List[str]]:
+    """Card fields requested with ?fields=a,b, or None for all of them"""
+    if not value:
+        return None
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in CARD_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Choose from {', '.join(CARD_FIELDS)}")
+    return fields
+
+
+def trim(cards: List[Dict], fields: Optional[List[str]]) -> List[Dict]:
+    if fields is None:
+        return cards
+    return [{field: card[field] for field in fields} for card in cards]
@@ -0,0 +1,36 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.accounts.stripe_fakes import EVENT_OBJECTS, fake_event, signed_request_body
+from apps.accounts.webhook_events import ingest_event
+
+
+class Command(BaseCommand):
+    help = 'Generate fake Stripe webhook events for local development'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--type', dest='event_type', default='customer.subscription.updated',
+                            choices=sorted(EVENT_OBJECTS), help='Event type')
+        parser.add_argument('--customer', help='Stripe customer ID (random by default)')
+        parser.add_argument('--subscription', help='Stripe subscription ID')
+        parser.add_argument('--status', help='Subscription status for subscription events')
+        parser.add_argument('--count', type=int, default=1, help='Number of events')
+        parser.add_argument('--print', action='store_true', dest='print_only',
+                            help='Print signed payloads for posting to the webhook endpoint instead of ingesting')
+
+    def handle(self, *args, **options):
+        fields = {'status': options['status']} if options['status'] else {}
+        for _ in range(options['count']):
+            event = fake_event(options['event_type'], options['customer'], options['subscription'], **fields)
+            if options['print_only']:
+                secret = getattr(settings, 'STRIPE_WEBHOOK_SECRET', '')
+                if not secret:
+                    raise CommandError('STRIPE_WEBHOOK_SECRET is not configured')
+                payload, signature = signed_request_body(event, secret)
+                self.stdout.write(json.dumps({'Stripe-Signature': signature, 'payload': payload.decode('utf-8')}))
+                continue
+
+            webhook_event, _ = ingest_event(event)
+            self.stdout.write(self.style.SUCCESS(f'Ingested {webhook_event.event_id} ({webhook_event.event_type})'))
@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.accounts.models import WebhookEvent
+from apps.accounts.webhook_events import dispatch, process_customer_events
+
+
+class Command(BaseCommand):
+    help = 'Reset stored Stripe webhook events to pending and process them again'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--event-id', action='append', dest='event_ids', help='Stripe event ID (repeatable)')
+        parser.add_argument('--status', action='append', dest='statuses',
+                            choices=[value for value, _ in WebhookEvent.STATUS_CHOICES],
+                            help='Replay events in this status (repeatable, default: failed)')
+        parser.add_argument('--customer', help='Only events of this Stripe customer')
+        parser.add_argument('--type', dest='event_type', help='Only events of this type')
+        parser.add_argument('--since-hours', type=float, help='Only events received in the last N hours')
+        parser.add_argument('--sync', action='store_true', help='Process in this process instead of the billing queue')
+        parser.add_argument('--dry-run', action='store_true', help='Only list the events that would be replayed')
+
+    def handle(self, *args, **options):
+        events = WebhookEvent.objects.all()
+        if options['event_ids']:
+            events = events.filter(event_id__in=options['event_ids'])
+        else:
+            events = events.filter(status__in=options['statuses'] or ['failed'])
+        if options['customer'] is not None:
+            events = events.filter(customer_id=options['customer'])
+        if options['event_type']:
+            events = events.filter(event_type=options['event_type'])
+        if options['since_hours']:
+            events = events.filter(received_at__gte=timezone.now() - timedelta(hours=options['since_hours']))
+
+        selected = list(events.order_by('stripe_created_at').values_list('event_id', 'event_type', 'customer_id'))
+        if not selected:
+            raise CommandError('No matching webhook events')
+
+        for event_id, event_type, customer_id in selected:
+            self.stdout.write(f'{event_id} {event_type} {customer_id or "-"}')
+        if options['dry_run']:
+            self.stdout.write(f'{len(selected)} events would be replayed')
+            return
+
+        events.update(status='pending', last_error='', next_attempt_at=None)
+        customers = {customer_id for _, _, customer_id in selected}
+        if options['sync']:
+            processed = sum(process_customer_events(customer_id) or 0 for customer_id in customers)
+            self.stdout.write(self.style.SUCCESS(f'Processed {processed} events'))
+        else:
+            dispatch(customers)
+            self.stdout.write(self.style.SUCCESS(
+                f'Queued {len(selected)} events for {len(customers)} customers on the billing queue'
+            ))
@@ -22,10 +22,11 @@ class TenantMiddleware:
             request.account_user = None
             return self.get_response(request)
         
+        # The plan is loaded with the tenant so quota checks need no further queries
         # Try to find account by custom domain first
         account = None
         try:
-            account = Account.objects.filter(custom_domain=host, domain_verified=True).first()
+            account = Account.objects.select_related('subscription_plan').filter(custom_domain=host, domain_verified=True).first()
         except:
             pass
         
@@ -33,7 +34,7 @@ class TenantMiddleware:
         if not account:
             slug = host.split('.')[0] if '.' in host else host
             try:
-                account = Account.objects.filter(slug=slug, is_active=True).first()
+                account = Account.objects.select_related('subscription_plan').filter(slug=slug, is_active=True).first()
             except:
                 pass
         
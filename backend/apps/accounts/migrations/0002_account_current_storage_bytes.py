@@ -0,0 +1,18 @@
+# Generated by Django 5.0.3 on 2025-11-23 08:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="account",
+            name="current_storage_bytes",
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.0.3 on 2026-10-19 15:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0003_webhookevent"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StripeCustomer",
+            fields=[
+                (
+                    "id",
+                    models.CharField(max_length=100, primary_key=True, serialize=False),
+                ),
+                ("email", models.EmailField(blank=True, max_length=254)),
+                ("name", models.CharField(blank=True, max_length=200)),
+                ("deleted", models.BooleanField(default=False)),
+                ("synced_at", models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name="StripePrice",
+            fields=[
+                (
+                    "id",
+                    models.CharField(max_length=100, primary_key=True, serialize=False),
+                ),
+                ("unit_amount", models.IntegerField(blank=True, null=True)),
+                ("currency", models.CharField(default="usd", max_length=3)),
+                ("interval", models.CharField(blank=True, max_length=10)),
+                ("active", models.BooleanField(default=True)),
+                ("synced_at", models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name="StripeSubscription",
+            fields=[
+                (
+                    "id",
+                    models.CharField(max_length=100, primary_key=True, serialize=False),
+                ),
+                ("customer_id", models.CharField(max_length=100)),
+                ("status", models.CharField(max_length=30)),
+                ("item_id", models.CharField(blank=True, max_length=100)),
+                ("price_id", models.CharField(blank=True, max_length=100)),
+                ("cancel_at_period_end", models.BooleanField(default=False)),
+                ("current_period_start", models.DateTimeField(blank=True, null=True)),
+                ("current_period_end", models.DateTimeField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(blank=True, null=True)),
+                ("synced_at", models.DateTimeField()),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["customer_id", "created_at"],
+                        name="accounts_st_custome_2025f7_idx",
+                    )
+                ],
+            },
+        ),
+    ]
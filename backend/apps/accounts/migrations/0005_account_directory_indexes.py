@@ -0,0 +1,42 @@
+# Generated by Django 5.0.3 on 2026-10-19 17:10
+
+from django.db import migrations, models
+
+TRIGRAM_FIELDS = ["name", "slug", "description"]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # pg_trgm serves the directory search; other databases search in Python
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for field in TRIGRAM_FIELDS:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS accounts_account_{field}_trgm "
+            f"ON accounts_account USING gin ({field} gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for field in TRIGRAM_FIELDS:
+        schema_editor.execute(f"DROP INDEX IF EXISTS accounts_account_{field}_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_stripe_mirror"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="account",
+            index=models.Index(
+                fields=["is_active", "-created_at", "-id"],
+                name="accounts_ac_is_acti_0aef4e_idx",
+            ),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.0.3 on 2026-10-19 18:40
+
+from django.db import migrations
+from django.db.models import Count, F
+
+
+def backfill_quota_counters(apps, schema_editor):
+    """
+    Seed the article and member counters the quota engine now enforces, as
+    apps.accounts.quotas.reconcile_quotas() would
+    """
+    Account = apps.get_model("accounts", "Account")
+    AccountUser = apps.get_model("accounts", "AccountUser")
+    Article = apps.get_model("articles", "Article")
+
+    articles = dict(
+        Article.objects.filter(account__isnull=False).order_by()
+        .values_list("account_id").annotate(count=Count("id"))
+    )
+    # The owner is counted from the account's creation, membership row or not
+    members = dict(
+        AccountUser.objects.filter(is_active=True).exclude(user_id=F("account__owner_id")).order_by()
+        .values_list("account_id").annotate(count=Count("id"))
+    )
+    for account in Account.objects.only("id").iterator():
+        Account.objects.filter(pk=account.pk).update(
+            current_article_count=articles.get(account.pk, 0),
+            current_user_count=members.get(account.pk, 0) + 1,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0005_account_directory_indexes"),
+        ("articles", "0010_topic_updated_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_quota_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.3 on 2026-10-19 19:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0006_backfill_quota_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="stripecustomer",
+            name="paid_invoices",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="stripecustomer",
+            name="invoices_counted_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.3 on 2026-10-19 20:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0007_stripecustomer_paid_invoices"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="webhookevent",
+            name="next_attempt_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="webhookevent",
+            index=models.Index(fields=["status", "next_attempt_at"], name="accounts_we_status_34be7b_idx"),
+        ),
+    ]
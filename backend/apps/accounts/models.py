@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 import uuid
 
@@ -70,7 +70,8 @@ class Account(models.Model):
     
     # Usage tracking
     current_article_count = models.IntegerField(default=0)
-    current_storage_mb = models.IntegerField(default=0)
+    current_storage_mb = models.IntegerField(default=0)  # Rounded up from current_storage_bytes
+    current_storage_bytes = models.BigIntegerField(default=0)  # Maintained by apps.media.usage
     current_user_count = models.IntegerField(default=1)
     
     # Custom domain (for paid plans)
@@ -91,15 +92,29 @@ class Account(models.Model):
             models.Index(fields=['slug']),
             models.Index(fields=['owner']),
             models.Index(fields=['subscription_status']),
+            # Public directory: active accounts, newest first
+            models.Index(fields=['is_active', '-created_at', '-id']),
         ]
     
     def __str__(self):
         return self.name
     
+    # Usage counters moved by apps.accounts.quotas with conditional UPDATEs
+    USAGE_COUNTER_FIELDS = frozenset([
+        'current_article_count', 'current_storage_mb', 'current_storage_bytes', 'current_user_count',
+    ])
+
     def save(self, *args, **kwargs):
         if not self.slug:
             from django.utils.text import slugify
             self.slug = slugify(self.name)
+        # A full save of a loaded row would write its stale counters over
+        # concurrent reservations; they are only saved when named explicitly
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.USAGE_COUNTER_FIELDS
+            ]
         super().save(*args, **kwargs)
     
     @property
@@ -118,15 +133,13 @@ class Account(models.Model):
     
     @property
     def can_create_article(self):
-        if not self.subscription_plan:
-            return self.current_article_count < 10  # Default trial limit
-        return self.current_article_count < self.subscription_plan.max_articles
+        from .quotas import has_room
+        return has_room(self, 'articles')
     
     @property
     def can_add_user(self):
-        if not self.subscription_plan:
-            return self.current_user_count < 1  # Default trial limit
-        return self.current_user_count < self.subscription_plan.max_users
+        from .quotas import has_room
+        return has_room(self, 'users')
     
     def check_storage_limit(self, additional_mb):
         if not self.subscription_plan:
@@ -167,6 +180,11 @@ class AccountUser(models.Model):
     def __str__(self):
         return f"{self.user.email} - {self.account.name} ({self.role})"
     
+    def save(self, *args, **kwargs):
+        # The seat claimed in pre_save rolls back with a failed insert
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+    
     @property
     def can_manage_users(self):
         return self.role in ['admin']
@@ -186,3 +204,94 @@ class AccountUser(models.Model):
     @property
     def can_view_analytics(self):
         return self.role in ['admin', 'editor']
+
+
+class WebhookEvent(models.Model):
+    """
+    Raw Stripe webhook event, stored before processing so deliveries are
+    deduplicated by event ID and can be replayed
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('processed', 'Processed'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    event_id = models.CharField(max_length=255, unique=True)  # Stripe's evt_... identifier
+    event_type = models.CharField(max_length=100)
+    # Events of one customer are processed in order; blank for events without a customer
+    customer_id = models.CharField(max_length=100, blank=True)
+    payload = models.JSONField()
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    stripe_created_at = models.DateTimeField()  # When Stripe created the event
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    # When a failed event is retried; cleared once its attempts are exhausted
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['stripe_created_at']
+        indexes = [
+            models.Index(fields=['customer_id', 'status', 'stripe_created_at']),
+            models.Index(fields=['status', 'received_at']),
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} ({self.event_id})"
+
+
+class StripeCustomer(models.Model):
+    """Local mirror of a Stripe customer, refreshed from webhooks"""
+    id = models.CharField(max_length=100, primary_key=True)  # Stripe's cus_... identifier
+    email = models.EmailField(blank=True)
+    name = models.CharField(max_length=200, blank=True)
+    deleted = models.BooleanField(default=False)
+    synced_at = models.DateTimeField()  # As of when the mirrored state is known to be current
+    # Paid invoices counted from Stripe once; later payments are counted from webhooks
+    paid_invoices = models.PositiveIntegerField(default=0)
+    invoices_counted_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return self.id
+
+
+class StripePrice(models.Model):
+    """Local mirror of a Stripe price"""
+    id = models.CharField(max_length=100, primary_key=True)  # Stripe's price_... identifier
+    unit_amount = models.IntegerField(null=True, blank=True)  # In cents; null for usage-based prices
+    currency = models.CharField(max_length=3, default='usd')
+    interval = models.CharField(max_length=10, blank=True)  # day, week, month or year
+    active = models.BooleanField(default=True)
+    synced_at = models.DateTimeField()
+
+    def __str__(self):
+        return self.id
+
+
+class StripeSubscription(models.Model):
+    """Local mirror of a Stripe subscription and its (single) item"""
+    id = models.CharField(max_length=100, primary_key=True)  # Stripe's sub_... identifier
+    customer_id = models.CharField(max_length=100)
+    status = models.CharField(max_length=30)
+    item_id = models.CharField(max_length=100, blank=True)  # Needed to swap the price on plan changes
+    price_id = models.CharField(max_length=100, blank=True)
+    cancel_at_period_end = models.BooleanField(default=False)
+    current_period_start = models.DateTimeField(null=True, blank=True)
+    current_period_end = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(null=True, blank=True)  # When Stripe created the subscription
+    synced_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['customer_id', 'created_at']),
+        ]
+
+    def __str__(self):
+        return self.id
@@ -0,0 +1,142 @@
+"""
+Account quota engine
+Usage counters on Account are moved with conditional UPDATEs: an increment only
+applies while the counter stays within the plan limit, so concurrent creates
+cannot overshoot it, and releases never take a counter below zero. Limit checks
+read the tenant row the middleware already loaded. reconcile_quotas() rebuilds
+the article and member counters one account at a time to correct any drift.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .models import Account, AccountUser
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class Quota:
+    counter: str  # Account field holding current usage
+    plan_limit: str  # SubscriptionPlan field holding the limit
+    trial_limit: int  # Limit of accounts without a plan
+    unit: int = 1  # Counter units per limit unit
+    label: str = ''
+
+
+QUOTAS = {
+    'articles': Quota('current_article_count', 'max_articles', 10, label='Article'),
+    'users': Quota('current_user_count', 'max_users', 1, label='User'),
+    'storage': Quota('current_storage_bytes', 'max_storage_mb', 100, unit=MB, label='Storage'),
+}
+
+
+class QuotaExceeded(APIException):
+    status_code = status.HTTP_403_FORBIDDEN
+    default_code = 'quota_exceeded'
+
+    def __init__(self, resource: str, limit: int):
+        self.resource = resource
+        self.limit = limit
+        super().__init__(f"{QUOTAS[resource].label} limit reached for this account's plan.")
+
+
+def storage_mb(total_bytes: int) -> int:
+    """Bytes rounded up to whole megabytes, as stored in Account.current_storage_mb"""
+    return -(-total_bytes // MB)
+
+
+def storage_mb_expression(total_bytes):
+    # Integer division in the database rounds down, so add MB - 1 first
+    return (total_bytes + (MB - 1)) / MB
+
+
+def limit(account: Account, resource: str) -> int:
+    """The account's limit in counter units; uses the plan loaded with the account"""
+    quota = QUOTAS[resource]
+    plan = account.subscription_plan
+    return (getattr(plan, quota.plan_limit) if plan else quota.trial_limit) * quota.unit
+
+
+def has_room(account: Account, resource: str, amount: int = 1) -> bool:
+    """Whether the loaded account row has room for ``amount`` more, without a query"""
+    return getattr(account, QUOTAS[resource].counter) + amount <= limit(account, resource)
+
+
+def _updates(resource: str, amount: int) -> Dict:
+    counter = QUOTAS[resource].counter
+    updates = {counter: Greatest(F(counter) + amount, 0)}
+    if resource == 'storage':
+        updates['current_storage_mb'] = storage_mb_expression(Greatest(F(counter) + amount, 0))
+    return updates
+
+
+def reserve(account: Account, resource: str, amount: int = 1):
+    """
+    Count ``amount`` of a resource against the account, or raise QuotaExceeded.
+    The check and the increment are one UPDATE, so the limit holds under
+    concurrent creates even when the loaded row is out of date.
+    """
+    quota = QUOTAS[resource]
+    account_limit = limit(account, resource)
+    reserved = Account.objects.filter(
+        pk=account.pk, **{f'{quota.counter}__lte': account_limit - amount}
+    ).update(**_updates(resource, amount))
+    if not reserved:
+        raise QuotaExceeded(resource, account_limit)
+
+    # Keep the caller's copy, usually request.tenant, in step
+    setattr(account, quota.counter, getattr(account, quota.counter) + amount)
+    if resource == 'storage':
+        account.current_storage_mb = storage_mb(account.current_storage_bytes)
+
+
+def release(account_id, resource: str, amount: int = 1):
+    """Give back ``amount`` of a resource; counters never drop below zero"""
+    if account_id is not None and amount:
+        Account.objects.filter(pk=account_id).update(**_updates(resource, -amount))
+
+
+@transaction.atomic
+def reconcile_account_quotas(account_id) -> bool:
+    """Recount one account's articles and members; returns whether it drifted"""
+    from apps.articles.models import Article
+
+    # Lock first so creates committed while counting cannot be overwritten;
+    # they wait on their counter UPDATE until the rewrite commits
+    account = Account.objects.select_for_update().filter(pk=account_id).only(
+        'id', 'owner_id', 'current_article_count', 'current_user_count'
+    ).first()
+    if account is None:
+        return False
+    # The owner is counted from the account's creation, membership row or not
+    counts = (
+        Article.objects.filter(account_id=account_id).count(),
+        AccountUser.objects.filter(account_id=account_id, is_active=True).exclude(user_id=account.owner_id).count() + 1,
+    )
+    if (account.current_article_count, account.current_user_count) == counts:
+        return False
+    Account.objects.filter(pk=account_id).update(current_article_count=counts[0], current_user_count=counts[1])
+    return True
+
+
+def reconcile_quotas() -> Dict:
+    """
+    Recompute article and member counters and rewrite the accounts that
+    drifted, locking one account at a time. Storage is reconciled by
+    apps.media.usage.
+    """
+    account_ids = list(Account.objects.order_by('pk').values_list('pk', flat=True))
+    fixed = sum(1 for account_id in account_ids if reconcile_account_quotas(account_id))
+
+    logger.info(f"Reconciled account quotas: {fixed} accounts corrected")
+    return {'accounts': fixed}
@@ -0,0 +1,50 @@
+"""Keep member counters in step with memberships and public cards with accounts"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import quotas
+from .directory import invalidate_card
+from .models import Account, AccountUser
+
+
+def _takes_seat(is_active: bool, membership: AccountUser) -> bool:
+    # The owner's seat is counted from the account's creation
+    return is_active and membership.user_id != membership.account.owner_id
+
+
+@receiver(pre_save, sender=AccountUser)
+def claim_member_seat(sender, instance, update_fields=None, **kwargs):
+    """Reserve a seat for new or reactivated members before they are saved"""
+    instance._releases_seat = False
+    if update_fields is not None and 'is_active' not in update_fields:
+        return
+
+    had_seat = False
+    if not instance._state.adding:
+        stored = AccountUser.objects.filter(pk=instance.pk).values_list('is_active', flat=True).first()
+        had_seat = _takes_seat(bool(stored), instance)
+
+    has_seat = _takes_seat(instance.is_active, instance)
+    if has_seat and not had_seat:
+        quotas.reserve(instance.account, 'users')
+    instance._releases_seat = had_seat and not has_seat
+
+
+@receiver(post_save, sender=AccountUser)
+def release_deactivated_seat(sender, instance, **kwargs):
+    if getattr(instance, '_releases_seat', False):
+        quotas.release(instance.account_id, 'users')
+
+
+@receiver(post_delete, sender=AccountUser)
+def release_deleted_seat(sender, instance, **kwargs):
+    # The account may already be gone when memberships are deleted in a cascade
+    if instance.is_active and not Account.objects.filter(pk=instance.account_id, owner_id=instance.user_id).exists():
+        quotas.release(instance.account_id, 'users')
+
+
+@receiver(post_save, sender=Account)
+@receiver(post_delete, sender=Account)
+def invalidate_public_card(sender, instance, **kwargs):
+    invalidate_card(instance.pk)
@@ -0,0 +1,214 @@
+"""
+Fake Stripe webhook events and API for local development and tests
+Payloads are shaped like Stripe's events and signed the way Stripe signs
+them, so they can be posted to the webhook endpoint or ingested directly.
+StripeStub stands in for the stripe module with objects held in memory and
+records every request, so billing code runs without network calls.
+"""
+
+import hashlib
+import hmac
+import json
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from unittest import mock
+
+import stripe
+
+SUBSCRIPTION_PERIOD_SECONDS = 30 * 24 * 60 * 60
+
+EVENT_OBJECTS = {
+    'customer.subscription.updated': 'subscription',
+    'customer.subscription.deleted': 'subscription',
+    'invoice.payment_succeeded': 'invoice',
+    'invoice.payment_failed': 'invoice',
+    'checkout.session.completed': 'checkout.session',
+    'customer.updated': 'customer',
+}
+
+ID_PREFIXES = {
+    'subscription': 'sub',
+    'invoice': 'in',
+    'checkout.session': 'cs',
+    'customer': 'cus',
+    'price': 'price',
+    'payment_method': 'pm',
+}
+
+
+def fake_id(prefix: str) -> str:
+    return f"{prefix}_{uuid.uuid4().hex[:24]}"
+
+
+def fake_object(object_type: str, customer: str, subscription: Optional[str], created: int) -> Dict:
+    if object_type == 'customer':
+        return {'id': customer, 'object': 'customer'}
+
+    data_object = {'id': fake_id(ID_PREFIXES[object_type]), 'object': object_type, 'customer': customer}
+    if object_type == 'subscription':
+        data_object.update({
+            'id': subscription or data_object['id'],
+            'status': 'active',
+            'current_period_end': created + SUBSCRIPTION_PERIOD_SECONDS,
+        })
+    else:
+        data_object['subscription'] = subscription
+    return data_object
+
+
+def fake_event(event_type: str, customer: Optional[str] = None, subscription: Optional[str] = None,
+               created: Optional[int] = None, **fields) -> Dict:
+    """A Stripe event of a supported type; extra fields override the data object's"""
+    if event_type not in EVENT_OBJECTS:
+        raise ValueError(f"Unsupported fake event type {event_type!r}; choose from {', '.join(EVENT_OBJECTS)}")
+    created = created or int(time.time())
+    data_object = fake_object(EVENT_OBJECTS[event_type], customer or fake_id('cus'), subscription, created)
+    data_object.update(fields)
+    return {
+        'id': fake_id('evt'),
+        'object': 'event',
+        'type': event_type,
+        'created': created,
+        'livemode': False,
+        'data': {'object': data_object},
+    }
+
+
+def sign_payload(payload: bytes, secret: str, timestamp: Optional[int] = None) -> str:
+    """Stripe-Signature header value for a payload"""
+    timestamp = timestamp or int(time.time())
+    signature = hmac.new(
+        secret.encode('utf-8'),
+        f"{timestamp}.{payload.decode('utf-8')}".encode('utf-8'),
+        hashlib.sha256,
+    ).hexdigest()
+    return f"t={timestamp},v1={signature}"
+
+
+def signed_request_body(event: Dict, secret: str) -> tuple:
+    """(payload bytes, Stripe-Signature header) ready to post to the webhook endpoint"""
+    payload = json.dumps(event).encode('utf-8')
+    return payload, sign_payload(payload, secret)
+
+
+INTERVAL_SECONDS = {'day': 24 * 60 * 60, 'week': 7 * 24 * 60 * 60, 'month': SUBSCRIPTION_PERIOD_SECONDS,
+                    'year': 365 * 24 * 60 * 60}
+
+
+class _Resource:
+    """One API resource (stripe.Customer, stripe.Subscription, ...) of a StripeStub"""
+
+    def __init__(self, stub: 'StripeStub', object_type: str):
+        self.stub = stub
+        self.object_type = object_type
+
+    def _record(self, method: str, object_id: Optional[str] = None):
+        self.stub.requests.append((self.object_type, method, object_id))
+
+    def _get(self, object_id: str) -> Dict:
+        try:
+            return self.stub.objects[self.object_type][object_id]
+        except KeyError:
+            raise stripe.error.InvalidRequestError(f"No such {self.object_type}: '{object_id}'", 'id')
+
+    def retrieve(self, object_id: str, **params):
+        self._record('retrieve', object_id)
+        return self.stub.construct(self._get(object_id))
+
+    def create(self, **params):
+        self._record('create')
+        return self.stub.construct(self.stub.add(self.object_type, **params))
+
+    def modify(self, object_id: str, **params):
+        self._record('modify', object_id)
+        data_object = self._get(object_id)
+        data_object.update(self.stub.shape(self.object_type, params))
+        return self.stub.construct(data_object)
+
+    def list(self, limit: int = 10, **filters):
+        self._record('list')
+        matches = [
+            data_object for data_object in self.stub.objects[self.object_type].values()
+            if all(data_object.get(key) == value for key, value in filters.items() if key != 'type')
+        ]
+        matches.sort(key=lambda data_object: data_object.get('created', 0), reverse=True)
+        return self.stub.construct({'object': 'list', 'data': matches[:limit], 'has_more': len(matches) > limit})
+
+    def cancel(self, object_id: str, **params):
+        self._record('cancel', object_id)
+        data_object = self._get(object_id)
+        data_object['status'] = 'canceled'
+        return self.stub.construct(data_object)
+
+
+class StripeStub:
+    """
+    In-memory stand-in for the stripe module. Seed objects with add() and
+    check ``requests`` for the (resource, method, id) calls billing code made.
+    """
+    error = stripe.error
+
+    RESOURCES = {
+        'Customer': 'customer',
+        'Subscription': 'subscription',
+        'Price': 'price',
+        'Invoice': 'invoice',
+        'PaymentMethod': 'payment_method',
+        'Coupon': 'coupon',
+    }
+
+    def __init__(self):
+        self.api_key = 'sk_test_stub'
+        self.objects: Dict[str, Dict[str, Dict]] = {object_type: {} for object_type in self.RESOURCES.values()}
+        self.requests: List[tuple] = []
+        for name, object_type in self.RESOURCES.items():
+            setattr(self, name, _Resource(self, object_type))
+
+    def construct(self, data_object: Dict):
+        return stripe.StripeObject.construct_from(json.loads(json.dumps(data_object)), self.api_key)
+
+    def shape(self, object_type: str, params: Dict) -> Dict:
+        """Turn create/modify parameters into the fields Stripe would return"""
+        params = {key: value for key, value in params.items() if key not in ('expand', 'payment_behavior')}
+        if object_type == 'subscription' and 'items' in params:
+            params['items'] = {'object': 'list', 'data': [
+                {
+                    'id': item.get('id') or fake_id('si'),
+                    'object': 'subscription_item',
+                    'price': self.objects['price'].get(item['price'], {'id': item['price'], 'object': 'price'}),
+                }
+                for item in params['items']
+            ]}
+        return params
+
+    def add(self, object_type: str, **fields) -> Dict:
+        """Store an object as if it had been created in Stripe and return it"""
+        now = int(time.time())
+        data_object = {'id': fake_id(ID_PREFIXES.get(object_type, object_type[:3])), 'object': object_type,
+                       'created': now}
+        if object_type == 'subscription':
+            data_object.update({'status': 'active', 'cancel_at_period_end': False, 'latest_invoice': None,
+                                'current_period_start': now, 'metadata': {}})
+            if fields.get('payment_behavior') == 'default_incomplete':
+                data_object['status'] = 'incomplete'
+        elif object_type == 'price':
+            data_object.update({'currency': 'usd', 'active': True, 'recurring': {'interval': 'month'}})
+        data_object.update(self.shape(object_type, fields))
+
+        if object_type == 'subscription' and 'current_period_end' not in fields:
+            items = data_object.get('items', {}).get('data') or [{}]
+            interval = (items[0].get('price', {}).get('recurring') or {}).get('interval', 'month')
+            data_object['current_period_end'] = data_object['current_period_start'] + INTERVAL_SECONDS[interval]
+
+        self.objects[object_type][data_object['id']] = data_object
+        return data_object
+
+
+@contextmanager
+def stub_stripe(stub: Optional[StripeStub] = None):
+    """Route the billing modules' Stripe calls to a StripeStub for the duration"""
+    stub = stub or StripeStub()
+    with mock.patch('apps.accounts.billing.stripe', stub), mock.patch('apps.accounts.billing_state.stripe', stub):
+        yield stub
@@ -0,0 +1,75 @@
+"""Celery tasks for billing"""
+
+import logging
+
+from config.celery import app
+from .quotas import reconcile_quotas
+from .webhook_events import dispatch, process_customer_events, requeue_due_retries, stalled_customers
+
+logger = logging.getLogger(__name__)
+
+CUSTOMER_BUSY_RETRY_SECONDS = 5
+
+
+@app.task(bind=True, max_retries=10)
+def process_webhook_events(self, customer_id: str):
+    """
+    Process a customer's pending Stripe webhook events in creation order
+    """
+    try:
+        processed = process_customer_events(customer_id)
+    except Exception as e:
+        logger.error(f"Error processing webhook events for customer {customer_id or '-'}: {str(e)}")
+        raise self.retry(countdown=60, exc=e)
+
+    if processed is None:
+        # Another worker is draining this customer's events; check back shortly
+        raise self.retry(countdown=CUSTOMER_BUSY_RETRY_SECONDS)
+    return f"Processed {processed} webhook events for customer {customer_id or '-'}"
+
+
+@app.task(bind=True, max_retries=3)
+def retry_failed_webhook_events(self):
+    """
+    Requeue failed webhook events whose backoff has elapsed
+    Runs every minute via Celery Beat
+    """
+    try:
+        customers = requeue_due_retries()
+        dispatch(customers)
+        return f"Requeued failed webhook events of {len(customers)} customers"
+
+    except Exception as e:
+        logger.error(f"Error requeueing failed webhook events: {str(e)}")
+        raise self.retry(countdown=60, exc=e)
+
+
+@app.task(bind=True, max_retries=3)
+def reclaim_stalled_webhook_events(self):
+    """
+    Requeue customers whose events were left in processing by a crashed worker
+    Runs every 15 minutes via Celery Beat
+    """
+    try:
+        customers = stalled_customers()
+        dispatch(customers)
+        return f"Requeued stalled webhook events of {len(customers)} customers"
+
+    except Exception as e:
+        logger.error(f"Error reclaiming stalled webhook events: {str(e)}")
+        raise self.retry(countdown=60, exc=e)
+
+
+@app.task(bind=True, max_retries=3)
+def reconcile_account_quotas(self):
+    """
+    Correct drift in account article and member counters
+    Runs daily via Celery Beat
+    """
+    try:
+        result = reconcile_quotas()
+        return f"Corrected quota counters of {result['accounts']} accounts"
+
+    except Exception as e:
+        logger.error(f"Error reconciling account quotas: {str(e)}")
+        raise self.retry(countdown=60, exc=e)
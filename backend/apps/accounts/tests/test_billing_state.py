@@ -0,0 +1,152 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.accounts import billing_state
+from apps.accounts.billing import BillingService
+from apps.accounts.models import (
+    Account, AccountUser, StripeCustomer, StripeSubscription, SubscriptionPlan, WebhookEvent
+)
+from apps.accounts.stripe_fakes import fake_event, stub_stripe
+from apps.accounts.views import AccountViewSet
+
+User = get_user_model()
+
+
+@override_settings(STRIPE_SECRET_KEY='sk_test_stub')
+class BillingStateTestCase(TestCase):
+    """Test the local Stripe mirror and the billing reads it serves"""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='pass12345')
+        self.account = Account.objects.create(name='Blog', slug='blog', owner=self.owner)
+        self.membership = AccountUser.objects.create(account=self.account, user=self.owner, role='admin')
+
+    def _subscribe(self, stub, unit_amount=1000, interval='month'):
+        price = stub.add('price', unit_amount=unit_amount, recurring={'interval': interval})
+        customer = stub.add('customer', email=self.owner.email)
+        subscription = stub.add('subscription', customer=customer['id'], items=[{'price': price['id']}])
+        self.account.stripe_customer_id = customer['id']
+        self.account.stripe_subscription_id = subscription['id']
+        self.account.subscription_status = 'active'
+        self.account.save()
+        return subscription
+
+    def _get(self, action):
+        request = APIRequestFactory().get(f'/api/accounts/{self.account.pk}/{action}/')
+        force_authenticate(request, user=self.owner)
+        request.account_user = self.membership
+        return AccountViewSet.as_view({'get': action})(request, pk=self.account.pk)
+
+    def test_webhook_events_update_the_mirror(self):
+        created = int(timezone.now().timestamp())
+        event = fake_event('customer.subscription.updated', customer='cus_1', subscription='sub_1',
+                           created=created, cancel_at_period_end=True,
+                           items={'data': [{'id': 'si_1', 'price': {'id': 'price_1', 'unit_amount': 500}}]})
+
+        BillingService.handle_webhook_event(event)
+
+        subscription = StripeSubscription.objects.get(pk='sub_1')
+        self.assertEqual((subscription.customer_id, subscription.item_id, subscription.price_id), ('cus_1', 'si_1', 'price_1'))
+        self.assertTrue(subscription.cancel_at_period_end)
+        self.assertEqual(billing_state.price('price_1').unit_amount, 500)
+
+        # An older event delivered late does not overwrite newer state
+        late = fake_event('customer.subscription.updated', customer='cus_1', subscription='sub_1',
+                          created=created - 60, status='past_due')
+        BillingService.handle_webhook_event(late)
+        self.assertEqual(StripeSubscription.objects.get(pk='sub_1').status, 'active')
+
+    def test_customer_is_verified_against_the_mirror(self):
+        with stub_stripe() as stub:
+            customer_id = BillingService.create_or_get_customer(self.account)
+            self.assertEqual(BillingService.create_or_get_customer(self.account), customer_id)
+            self.assertEqual(stub.requests, [('customer', 'create', None)])
+
+            # Stale rows are refreshed once
+            StripeCustomer.objects.filter(pk=customer_id).update(synced_at=timezone.now() - timedelta(days=1))
+            BillingService.create_or_get_customer(self.account)
+            BillingService.create_or_get_customer(self.account)
+            self.assertEqual(stub.requests[1:], [('customer', 'retrieve', customer_id)])
+
+    def test_deleted_customer_is_recreated(self):
+        with stub_stripe() as stub:
+            customer_id = BillingService.create_or_get_customer(self.account)
+            BillingService.handle_webhook_event(fake_event('customer.updated', customer=customer_id))
+            BillingService.handle_webhook_event({**fake_event('customer.updated', customer=customer_id),
+                                                 'type': 'customer.deleted'})
+
+            self.assertNotEqual(BillingService.create_or_get_customer(self.account), customer_id)
+            self.assertEqual(len(stub.objects['customer']), 2)
+
+    def test_stale_row_is_served_when_stripe_is_down(self):
+        with stub_stripe() as stub:
+            subscription = self._subscribe(stub)
+            billing_state.subscription(subscription['id'])
+            StripeSubscription.objects.update(synced_at=timezone.now() - timedelta(days=1))
+
+            with mock.patch.object(stub.Subscription, 'retrieve', side_effect=stub.error.APIConnectionError('down')):
+                self.assertEqual(billing_state.subscription(subscription['id']).status, 'active')
+
+    def test_billing_dashboard_reads_locally(self):
+        with stub_stripe() as stub:
+            subscription = self._subscribe(stub)
+            BillingService.handle_webhook_event(fake_event(
+                'customer.subscription.updated', customer=subscription['customer'],
+                subscription=subscription['id'], cancel_at_period_end=True,
+                current_period_end=subscription['current_period_end'],
+            ))
+            # Paid invoices are counted from Stripe on first use only
+            self._get('billing_analytics')
+            stub.requests.clear()
+
+            analytics = self._get('billing_analytics')
+            alerts = self._get('billing_alerts')
+
+        self.assertEqual(stub.requests, [])
+        self.assertEqual(analytics.status_code, 200)
+        self.assertTrue(analytics.data['cancel_at_period_end'])
+        self.assertEqual(analytics.data['total_invoices'], 0)
+        self.assertIsNotNone(analytics.data['next_billing_date'])
+        self.assertIn('subscription_ending', [alert['type'] for alert in alerts.data['alerts']])
+
+    def test_paid_invoices_are_counted_once_then_from_webhooks(self):
+        with stub_stripe() as stub:
+            subscription = self._subscribe(stub)
+            for status in ('paid', 'paid', 'open'):
+                stub.add('invoice', customer=subscription['customer'], status=status)
+            self.assertEqual(billing_state.paid_invoice_count(subscription['customer']), 2)
+
+            WebhookEvent.objects.create(
+                event_id='evt_paid', event_type='invoice.payment_succeeded', customer_id=subscription['customer'],
+                payload={}, status='processed', stripe_created_at=timezone.now() + timedelta(seconds=1),
+            )
+            stub.requests.clear()
+            self.assertEqual(billing_state.paid_invoice_count(subscription['customer']), 3)
+
+        self.assertEqual(stub.requests, [])
+
+    def test_proration_preview_is_reused_within_the_period(self):
+        preview = {'object': 'invoice', 'currency': 'usd', 'lines': {'object': 'list', 'data': [
+            {'type': 'proration', 'amount': -500}, {'type': 'proration', 'amount': 1500},
+            {'type': 'subscription', 'amount': 3000},
+        ]}}
+        with stub_stripe() as stub:
+            subscription = self._subscribe(stub, unit_amount=1000)
+            new_price = stub.add('price', unit_amount=3000, recurring={'interval': 'month'})
+            plan = SubscriptionPlan.objects.create(name='Pro', slug='pro', stripe_price_id_monthly=new_price['id'])
+            billing_state.store_subscription(stub.construct(subscription))
+
+            with mock.patch.object(stub.Invoice, 'create', return_value=stub.construct(preview)) as create:
+                proration = BillingService.calculate_proration(self.account, plan)
+                self.assertEqual(BillingService.calculate_proration(self.account, plan), proration)
+
+        self.assertEqual(create.call_count, 1)
+        self.assertEqual(create.call_args.kwargs['subscription_items'][0]['price'], new_price['id'])
+        self.assertEqual((proration['proration_amount'], proration['currency']), (10.0, 'USD'))
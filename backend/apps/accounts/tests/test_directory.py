@@ -0,0 +1,71 @@
+from datetime import timedelta
+from urllib.parse import parse_qs, urlparse
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+
+from apps.accounts.directory import word_similarity
+from apps.accounts.models import Account
+from apps.accounts.views import AccountViewSet
+
+User = get_user_model()
+
+
+class AccountDirectoryTestCase(TestCase):
+    """Test the searchable, keyset-paginated public account directory"""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='pass12345')
+        now = timezone.now()
+        names = ['Technology Weekly', 'Garden Notes', 'Cooking Corner', 'Travel Diaries', 'Photo Journal']
+        for age, name in enumerate(names):
+            account = Account.objects.create(name=name, slug=name.lower().replace(' ', '-'), owner=self.owner,
+                                             description=f'All about {name.split()[0].lower()}')
+            Account.objects.filter(pk=account.pk).update(created_at=now - timedelta(days=age))
+        Account.objects.create(name='Closed Technology', slug='closed', owner=self.owner, is_active=False)
+
+    def _browse(self, **params):
+        request = APIRequestFactory().get('/api/accounts/public_browse/', params)
+        return AccountViewSet.as_view({'get': 'public_browse'})(request)
+
+    def test_pages_follow_the_cursor(self):
+        first = self._browse(page_size=2)
+        cursor = parse_qs(urlparse(first.data['next']).query)['cursor'][0]
+        second = self._browse(page_size=2, cursor=cursor)
+
+        self.assertEqual([card['name'] for card in first.data['results']], ['Technology Weekly', 'Garden Notes'])
+        self.assertEqual([card['name'] for card in second.data['results']], ['Cooking Corner', 'Travel Diaries'])
+
+    def test_search_matches_substrings_and_misspellings(self):
+        self.assertEqual([card['slug'] for card in self._browse(search='diaries').data['results']], ['travel-diaries'])
+        self.assertEqual([card['slug'] for card in self._browse(search='tecnology').data['results']],
+                         ['technology-weekly'])
+        self.assertEqual(self._browse(search='astronomy').data['results'], [])
+
+    def test_fields_trim_the_cards(self):
+        response = self._browse(fields='name,slug', page_size=1)
+
+        self.assertEqual(response.data['results'], [{'name': 'Technology Weekly', 'slug': 'technology-weekly'}])
+        self.assertEqual(self._browse(fields='name,owner').status_code, 400)
+
+    def test_cards_are_cached_until_the_account_changes(self):
+        self._browse()
+
+        # The page of keys only; every card comes from the cache
+        with self.assertNumQueries(1):
+            self._browse()
+
+        account = Account.objects.get(slug='garden-notes')
+        account.name = 'Garden Journal'
+        account.save()
+        names = [card['name'] for card in self._browse().data['results']]
+        self.assertIn('Garden Journal', names)
+
+    def test_word_similarity(self):
+        self.assertEqual(word_similarity('garden', 'Garden Notes'), 1.0)
+        self.assertGreater(word_similarity('tecnology', 'Technology Weekly'), 0.6)
+        self.assertLess(word_similarity('astronomy', 'Technology Weekly'), 0.6)
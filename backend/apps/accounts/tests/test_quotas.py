@@ -0,0 +1,151 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.test import TestCase
+
+from apps.accounts import quotas
+from apps.accounts.models import Account, AccountUser, SubscriptionPlan
+from apps.accounts.permissions import WithinSubscriptionLimits
+from apps.accounts.quotas import QuotaExceeded
+from apps.articles.models import Article
+from apps.media.models import Media
+
+User = get_user_model()
+
+
+class AccountQuotaTestCase(TestCase):
+    """Test atomic quota counters, their enforcement and reconciliation"""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='pass12345')
+        self.plan = SubscriptionPlan.objects.create(name='Small', slug='small', max_articles=2, max_users=2)
+        self.account = Account.objects.create(name='Blog', slug='blog', owner=self.owner, subscription_plan=self.plan)
+
+    def _article(self, n, account=None):
+        return Article.objects.create(title=f'Article {n}', slug=f'article-{n}', content='Content',
+                                      author=self.owner, account=account or self.account)
+
+    def test_articles_are_counted_and_limited(self):
+        first = self._article(1)
+        self._article(2)
+
+        with self.assertRaises(QuotaExceeded):
+            self._article(3)
+        self.assertEqual(Article.objects.count(), 2)
+
+        first.delete()
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.current_article_count, 1)
+        self._article(3)
+
+    def test_failed_insert_releases_the_reservation(self):
+        self._article(1)
+        with self.assertRaises(IntegrityError):
+            self._article(1)
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.current_article_count, 1)
+
+    def test_failed_media_save_releases_storage(self):
+        with mock.patch.object(Media, '_do_insert', side_effect=IntegrityError):
+            with self.assertRaises(IntegrityError):
+                Media.objects.create(file='uploads/test.jpg', filename='test.jpg', width=10, height=10,
+                                     file_size=quotas.MB, mime_type='image/jpeg', uploaded_by=self.owner,
+                                     account=self.account)
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.current_storage_bytes, 0)
+
+    def test_stale_rows_cannot_overshoot_the_limit(self):
+        self._article(1)
+        # Two requests that each loaded the tenant while one slot was free
+        first = Account.objects.get(pk=self.account.pk)
+        second = Account.objects.get(pk=self.account.pk)
+
+        quotas.reserve(first, 'articles')
+        with self.assertRaises(QuotaExceeded):
+            quotas.reserve(second, 'articles')
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.current_article_count, 2)
+        self.assertEqual(first.current_article_count, 2)
+
+    def test_member_seats_follow_membership(self):
+        AccountUser.objects.create(account=self.account, user=self.owner, role='admin')
+        member = User.objects.create_user(username='member', email='member@example.com', password='pass12345')
+        membership = AccountUser.objects.create(account=self.account, user=member)
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.current_user_count, 2)
+
+        extra = User.objects.create_user(username='extra', email='extra@example.com', password='pass12345')
+        with self.assertRaises(QuotaExceeded):
+            AccountUser.objects.create(account=self.account, user=extra)
+
+        membership.is_active = False
+        membership.save()
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.current_user_count, 1)
+
+        membership.is_active = True
+        membership.save()
+        membership.delete()
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.current_user_count, 1)
+
+    def test_failed_membership_insert_releases_the_seat(self):
+        SubscriptionPlan.objects.filter(pk=self.plan.pk).update(max_users=5)
+        self.account.refresh_from_db()
+        member = User.objects.create_user(username='member', email='member@example.com', password='pass12345')
+        AccountUser.objects.create(account=self.account, user=member)
+        with self.assertRaises(IntegrityError):
+            AccountUser.objects.create(account=self.account, user=member)
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.current_user_count, 2)
+
+    def test_storage_is_reserved_in_bytes(self):
+        quotas.reserve(self.account, 'storage', 3 * quotas.MB // 2)
+
+        self.account.refresh_from_db()
+        self.assertEqual((self.account.current_storage_bytes, self.account.current_storage_mb), (3 * quotas.MB // 2, 2))
+        with self.assertRaises(QuotaExceeded):
+            quotas.reserve(self.account, 'storage', self.plan.max_storage_mb * quotas.MB)
+
+        quotas.release(self.account.pk, 'storage', 2 * quotas.MB)
+        self.account.refresh_from_db()
+        self.assertEqual((self.account.current_storage_bytes, self.account.current_storage_mb), (0, 0))
+
+    def test_permission_check_reads_the_loaded_tenant(self):
+        tenant = Account.objects.select_related('subscription_plan').get(pk=self.account.pk)
+        request = SimpleNamespace(tenant=tenant)
+
+        with self.assertNumQueries(0):
+            self.assertTrue(WithinSubscriptionLimits('articles').has_permission(request, None))
+            self.assertTrue(WithinSubscriptionLimits('users').has_permission(request, None))
+
+    def test_reconcile_corrects_drift(self):
+        self._article(1)
+        member = User.objects.create_user(username='member', email='member@example.com', password='pass12345')
+        AccountUser.objects.create(account=self.account, user=self.owner, role='admin')
+        AccountUser.objects.create(account=self.account, user=member)
+        Account.objects.filter(pk=self.account.pk).update(current_article_count=7, current_user_count=0)
+
+        self.assertEqual(quotas.reconcile_quotas(), {'accounts': 1})
+
+        self.account.refresh_from_db()
+        self.assertEqual((self.account.current_article_count, self.account.current_user_count), (1, 2))
+        self.assertEqual(quotas.reconcile_quotas(), {'accounts': 0})
+
+    def test_full_save_keeps_concurrent_reservations(self):
+        # A billing save of a row loaded before an article was created
+        loaded = Account.objects.get(pk=self.account.pk)
+        self._article(1)
+        loaded.subscription_status = 'past_due'
+        loaded.save()
+
+        self.account.refresh_from_db()
+        self.assertEqual((self.account.subscription_status, self.account.current_article_count), ('past_due', 1))
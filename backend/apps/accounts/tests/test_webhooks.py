@@ -0,0 +1,171 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from apps.accounts.billing import BillingService
+from apps.accounts.models import Account, WebhookEvent
+from apps.accounts.stripe_fakes import fake_event, signed_request_body
+from apps.accounts import webhook_events
+from apps.accounts.webhook_events import (
+    ingest_event, process_customer_events, requeue_due_retries, stalled_customers,
+)
+from apps.accounts.webhooks import stripe_webhook
+
+User = get_user_model()
+
+SECRET = 'whsec_test'
+
+
+@override_settings(STRIPE_WEBHOOK_SECRET=SECRET)
+class StripeWebhookTestCase(TestCase):
+    """Test durable webhook ingestion and per-customer processing"""
+
+    def setUp(self):
+        cache.clear()
+        owner = User.objects.create_user(username='owner', email='owner@example.com', password='pass12345')
+        self.account = Account.objects.create(name='Blog', slug='blog', owner=owner, stripe_customer_id='cus_1',
+                                              stripe_subscription_id='sub_1', subscription_status='active')
+
+    def _post(self, event, secret=SECRET):
+        payload, signature = signed_request_body(event, secret)
+        request = RequestFactory().post('/api/accounts/webhooks/stripe/', payload,
+                                        content_type='application/json', HTTP_STRIPE_SIGNATURE=signature)
+        return stripe_webhook(request)
+
+    def test_event_is_stored_acknowledged_and_processed(self):
+        event = fake_event('invoice.payment_failed', customer='cus_1', subscription='sub_1')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self._post(event)
+
+        self.assertEqual(response.status_code, 200)
+        stored = WebhookEvent.objects.get(event_id=event['id'])
+        self.assertEqual((stored.customer_id, stored.status, stored.attempts), ('cus_1', 'processed', 1))
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.subscription_status, 'past_due')
+
+    def test_redelivery_is_ignored(self):
+        event = fake_event('invoice.payment_failed', customer='cus_1', subscription='sub_1')
+        with self.captureOnCommitCallbacks(execute=True):
+            self._post(event)
+
+        with mock.patch.object(BillingService, 'handle_webhook_event') as handler, \
+                self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = self._post(event)
+
+        self.assertEqual(response.content, b'Event already received')
+        self.assertEqual(callbacks, [])
+        handler.assert_not_called()
+        self.assertEqual(WebhookEvent.objects.count(), 1)
+
+    def test_invalid_signature_is_rejected(self):
+        response = self._post(fake_event('customer.updated'), secret='whsec_wrong')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(WebhookEvent.objects.exists())
+
+    def test_customer_events_are_processed_in_stripe_order(self):
+        failed = fake_event('invoice.payment_failed', customer='cus_1', subscription='sub_1', created=1000)
+        succeeded = fake_event('invoice.payment_succeeded', customer='cus_1', subscription='sub_1', created=2000)
+        # Delivered out of order; both are recorded before the worker runs
+        ingest_event(succeeded)
+        ingest_event(failed)
+
+        with mock.patch.object(BillingService, 'handle_webhook_event', return_value=True) as handler:
+            self.assertEqual(process_customer_events('cus_1'), 2)
+
+        self.assertEqual([call.args[0]['id'] for call in handler.call_args_list], [failed['id'], succeeded['id']])
+
+    def test_busy_customer_is_left_to_the_lock_holder(self):
+        ingest_event(fake_event('customer.updated', customer='cus_1'))
+        cache.add('stripe_webhook_customer_lock:cus_1', 1)
+
+        self.assertIsNone(process_customer_events('cus_1'))
+        self.assertEqual(WebhookEvent.objects.get().status, 'pending')
+
+    def test_failed_events_can_be_replayed(self):
+        event = fake_event('invoice.payment_failed', customer='cus_1', subscription='sub_1')
+        ingest_event(event)
+        with mock.patch.object(BillingService, 'handle_webhook_event', return_value=False):
+            process_customer_events('cus_1')
+        self.assertEqual(WebhookEvent.objects.get().status, 'failed')
+
+        out = StringIO()
+        call_command('replay_webhook_events', sync=True, stdout=out)
+
+        stored = WebhookEvent.objects.get()
+        self.assertEqual((stored.status, stored.attempts), ('processed', 2))
+        self.assertIn('Processed 1 events', out.getvalue())
+
+    def test_failed_event_is_retried_with_backoff(self):
+        older = fake_event('invoice.payment_failed', customer='cus_1', subscription='sub_1', created=1000)
+        newer = fake_event('customer.updated', customer='cus_1', created=2000)
+        ingest_event(older)
+        ingest_event(newer)
+
+        with mock.patch.object(BillingService, 'handle_webhook_event', side_effect=[False, True]):
+            self.assertEqual(process_customer_events('cus_1'), 2)
+        failed = WebhookEvent.objects.get(event_id=older['id'])
+        self.assertEqual(failed.status, 'failed')
+        self.assertGreater(failed.next_attempt_at, timezone.now())
+        # Not due yet
+        self.assertEqual(requeue_due_retries(), [])
+
+        WebhookEvent.objects.filter(pk=failed.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(requeue_due_retries(), ['cus_1'])
+        with mock.patch.object(BillingService, 'handle_webhook_event', return_value=True):
+            self.assertEqual(process_customer_events('cus_1'), 1)
+        failed.refresh_from_db()
+        self.assertEqual((failed.status, failed.attempts, failed.next_attempt_at), ('processed', 2, None))
+
+    def test_exhausted_event_holds_later_events(self):
+        older = fake_event('customer.subscription.updated', customer='cus_1', subscription='sub_1', created=1000)
+        newer = fake_event('customer.subscription.updated', customer='cus_1', subscription='sub_1', created=2000)
+        ingest_event(older)
+        ingest_event(newer)
+
+        with mock.patch.object(webhook_events, 'WEBHOOK_MAX_ATTEMPTS', 1), \
+                mock.patch.object(BillingService, 'handle_webhook_event', return_value=False) as handler:
+            self.assertEqual(process_customer_events('cus_1'), 1)
+        handler.assert_called_once()
+        self.assertIsNone(WebhookEvent.objects.get(event_id=older['id']).next_attempt_at)
+        self.assertEqual(WebhookEvent.objects.get(event_id=newer['id']).status, 'pending')
+
+        with mock.patch.object(BillingService, 'handle_webhook_event', return_value=True) as handler:
+            call_command('replay_webhook_events', sync=True, stdout=StringIO())
+        self.assertEqual([call.args[0]['id'] for call in handler.call_args_list], [older['id'], newer['id']])
+
+    def test_account_wide_events_do_not_hold_each_other(self):
+        for event_id, object_type, created in [('evt_price', 'price', 1000), ('evt_product', 'product', 2000)]:
+            ingest_event({'id': event_id, 'type': f'{object_type}.updated', 'created': created,
+                          'data': {'object': {'object': object_type, 'id': f'{object_type}_1'}}})
+
+        with mock.patch.object(webhook_events, 'WEBHOOK_MAX_ATTEMPTS', 1), \
+                mock.patch.object(BillingService, 'handle_webhook_event', side_effect=[False, True]):
+            self.assertEqual(process_customer_events(''), 2)
+        self.assertEqual(WebhookEvent.objects.filter(status='processed').count(), 1)
+
+    def test_stalled_processing_events_are_reclaimed(self):
+        ingest_event(fake_event('customer.updated', customer='cus_1'))
+        WebhookEvent.objects.update(status='processing', received_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(stalled_customers(), ['cus_1'])
+
+        with mock.patch.object(BillingService, 'handle_webhook_event', return_value=True):
+            self.assertEqual(process_customer_events('cus_1'), 1)
+        self.assertEqual(WebhookEvent.objects.get().status, 'processed')
+        self.assertEqual(stalled_customers(), [])
+
+    def test_fake_event_command_ingests_events(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('fake_stripe_events', event_type='customer.subscription.updated', customer='cus_1',
+                         subscription='sub_1', status='past_due', count=2, stdout=StringIO())
+
+        self.assertEqual(WebhookEvent.objects.filter(status='processed').count(), 2)
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.subscription_status, 'past_due')
@@ -1,18 +1,20 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.pagination import CursorPagination
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django.db import models
 from django.conf import settings
 from datetime import timedelta
+from . import directory
 from .billing import BillingService
+from .quotas import QuotaExceeded
 
 from .models import Account, SubscriptionPlan, AccountUser
 from .serializers import (
     AccountSerializer, AccountCreateSerializer, AccountUpdateSerializer,
-    AccountPublicSerializer, SubscriptionPlanSerializer, AccountUserSerializer
+    SubscriptionPlanSerializer, AccountUserSerializer
 )
 from .permissions import (
     IsAccountMember, IsAccountAdmin, CanManageUsers, CanManageBilling,
@@ -52,6 +54,14 @@ def csrf_failure(request, reason=""):
     }, request))
 
 
+class AccountDirectoryPagination(CursorPagination):
+    """Keyset pagination, so deep pages cost the same as the first"""
+    page_size = getattr(settings, 'ACCOUNT_DIRECTORY_PAGE_SIZE', 24)
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
+
+
 class AccountViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing accounts (blogs/sites)
@@ -241,18 +251,17 @@ class AccountViewSet(viewsets.ModelViewSet):
             if AccountUser.objects.filter(account=account, user=user).exists():
                 return Response({'error': 'User is already a member'}, status=status.HTTP_400_BAD_REQUEST)
             
-            # Create account user relationship
-            account_user = AccountUser.objects.create(
-                account=account,
-                user=user,
-                role=role,
-                invited_by=request.user,
-                invited_at=timezone.now()
-            )
-            
-            # Update user count
-            account.current_user_count = AccountUser.objects.filter(account=account, is_active=True).count()
-            account.save()
+            # Create account user relationship; the seat is reserved atomically
+            try:
+                account_user = AccountUser.objects.create(
+                    account=account,
+                    user=user,
+                    role=role,
+                    invited_by=request.user,
+                    invited_at=timezone.now()
+                )
+            except QuotaExceeded:
+                return Response({'error': 'User limit reached'}, status=status.HTTP_400_BAD_REQUEST)
             
             return Response(AccountUserSerializer(account_user).data, status=status.HTTP_201_CREATED)
     
@@ -272,13 +281,10 @@ class AccountViewSet(viewsets.ModelViewSet):
             if account_user.user == account.owner:
                 return Response({'error': 'Cannot remove account owner'}, status=status.HTTP_400_BAD_REQUEST)
             
+            # Releases the member's seat
             account_user.is_active = False
             account_user.save()
             
-            # Update user count
-            account.current_user_count = AccountUser.objects.filter(account=account, is_active=True).count()
-            account.save()
-            
             return Response({'message': 'User removed successfully'})
             
         except AccountUser.DoesNotExist:
@@ -410,15 +416,6 @@ class AccountViewSet(viewsets.ModelViewSet):
 
         try:
             analytics = BillingService.get_subscription_analytics(account)
-
-            # Add invoice revenue data if Stripe is configured
-            if getattr(settings, 'STRIPE_SECRET_KEY', None) and account.stripe_customer_id:
-                try:
-                    total_invoices = len(BillingService.get_invoices(account, 100))
-                    analytics['total_invoices'] = total_invoices
-                except:
-                    analytics['total_invoices'] = 0
-
             return Response(analytics)
 
         except Exception as e:
@@ -575,32 +572,36 @@ class AccountViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'], permission_classes=[AllowAny])
     def public_browse(self, request):
-        """Public endpoint for browsing all active accounts"""
-        search_query = request.query_params.get('search', '').strip()
+        """Public directory of active accounts, newest first, with search and field selection"""
+        try:
+            fields = directory.parse_fields(request.query_params.get('fields'))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Query all active accounts
-        accounts = Account.objects.filter(is_active=True).order_by('-created_at')
+        # Only the keys are read here; the cards come from the cache
+        accounts = Account.objects.filter(is_active=True).only('id', 'created_at')
 
-        # Apply search filter if provided
+        search_query = request.query_params.get('search', '').strip()
         if search_query:
-            accounts = accounts.filter(
-                models.Q(name__icontains=search_query) |
-                models.Q(description__icontains=search_query) |
-                models.Q(slug__icontains=search_query)
-            )
+            accounts = directory.search(accounts, search_query)
 
-        serializer = AccountPublicSerializer(accounts, many=True)
-        return Response(serializer.data)
+        paginator = AccountDirectoryPagination()
+        page = paginator.paginate_queryset(accounts, request, view=self)
+        cards = directory.public_cards([account.pk for account in page])
+        return paginator.get_paginated_response(directory.trim(cards, fields))
 
     @action(detail=True, methods=['get'], permission_classes=[AllowAny])
     def public_detail(self, request, pk=None):
         """Public endpoint for viewing account details by slug"""
         try:
-            account = Account.objects.get(slug=pk, is_active=True)
-            serializer = AccountPublicSerializer(account)
-            return Response(serializer.data)
-        except Account.DoesNotExist:
+            fields = directory.parse_fields(request.query_params.get('fields'))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        account_id = Account.objects.filter(slug=pk, is_active=True).values_list('id', flat=True).first()
+        if account_id is None:
             return Response({'error': 'Account not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(directory.trim(directory.public_cards([account_id]), fields)[0])
 
 
 class SubscriptionPlanViewSet(viewsets.ReadOnlyModelViewSet):
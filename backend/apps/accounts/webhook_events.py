@@ -0,0 +1,185 @@
+"""
+Durable Stripe webhook ingestion
+Verified events are stored as WebhookEvent rows before any billing logic runs;
+the unique event_id turns Stripe's redeliveries into no-ops and the request is
+acknowledged as soon as the row exists. Events are processed on the billing
+queue one customer at a time, in the order Stripe created them. A failed
+event is retried with exponential backoff; once its attempts are exhausted it
+holds the customer's later events until it is replayed, so an older
+subscription state is never applied over a newer one.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .billing import BillingService
+from .models import WebhookEvent
+
+logger = logging.getLogger(__name__)
+
+CUSTOMER_LOCK_TIMEOUT = 5 * 60  # Longest a worker may hold a customer's events
+PROCESS_BATCH_SIZE = 100
+WEBHOOK_MAX_ATTEMPTS = getattr(settings, 'STRIPE_WEBHOOK_MAX_ATTEMPTS', 5)
+WEBHOOK_RETRY_BACKOFF = getattr(settings, 'STRIPE_WEBHOOK_RETRY_BACKOFF', 60)  # Seconds, doubled per attempt
+
+
+def event_customer(event: Dict) -> str:
+    """Stripe customer an event belongs to, or '' for account-wide events"""
+    data_object = event.get('data', {}).get('object') or {}
+    customer = data_object.get('customer')
+    if isinstance(customer, dict):
+        customer = customer.get('id')
+    if not customer and data_object.get('object') == 'customer':
+        customer = data_object.get('id')
+    return customer or ''
+
+
+def record_event(event: Dict) -> Tuple[WebhookEvent, bool]:
+    """Store a verified event; returns the row and whether it was new"""
+    created = event.get('created')
+    return WebhookEvent.objects.get_or_create(
+        event_id=event['id'],
+        defaults={
+            'event_type': event.get('type', ''),
+            'customer_id': event_customer(event),
+            'payload': event,
+            'stripe_created_at': (
+                datetime.fromtimestamp(created, tz=dt_timezone.utc) if created else timezone.now()
+            ),
+        },
+    )
+
+
+def dispatch(customer_ids: Iterable[str]):
+    """Queue processing for customers once the current transaction commits"""
+    from .tasks import process_webhook_events
+
+    for customer_id in set(customer_ids):
+        transaction.on_commit(lambda customer_id=customer_id: process_webhook_events.delay(customer_id))
+
+
+def ingest_event(event: Dict) -> Tuple[WebhookEvent, bool]:
+    """Record an event and queue its customer for processing if it was new"""
+    webhook_event, created = record_event(event)
+    if created:
+        dispatch([webhook_event.customer_id])
+    return webhook_event, created
+
+
+def retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=WEBHOOK_RETRY_BACKOFF * 2 ** (attempts - 1))
+
+
+def process_event(webhook_event: WebhookEvent) -> bool:
+    WebhookEvent.objects.filter(pk=webhook_event.pk).update(status='processing', attempts=F('attempts') + 1)
+    attempts = webhook_event.attempts + 1
+    try:
+        success = BillingService.handle_webhook_event(webhook_event.payload)
+        error = '' if success else 'Handler reported failure'
+    except Exception as e:
+        success, error = False, str(e)
+
+    retrying = not success and attempts < WEBHOOK_MAX_ATTEMPTS
+    WebhookEvent.objects.filter(pk=webhook_event.pk).update(
+        status='processed' if success else 'failed',
+        last_error=error,
+        processed_at=timezone.now() if success else None,
+        next_attempt_at=timezone.now() + retry_delay(attempts) if retrying else None,
+    )
+    if retrying:
+        logger.warning(
+            f"Stripe event {webhook_event.event_id} ({webhook_event.event_type}) failed on attempt {attempts}, "
+            f"retrying: {error}"
+        )
+    elif not success:
+        logger.critical(
+            f"Stripe event {webhook_event.event_id} ({webhook_event.event_type}) failed after {attempts} attempts; "
+            f"later events of customer {webhook_event.customer_id or '-'} are held until it is replayed: {error}"
+        )
+    return success
+
+
+def _pending(customer_id: str):
+    """Pending events of a customer that are not held behind an exhausted failure"""
+    pending = WebhookEvent.objects.filter(customer_id=customer_id, status='pending')
+    if not customer_id:
+        # Account-wide events (prices, products) do not depend on each other
+        return pending
+    oldest_failure = (
+        WebhookEvent.objects.filter(customer_id=customer_id, status='failed', next_attempt_at__isnull=True)
+        .order_by('stripe_created_at').values_list('stripe_created_at', flat=True).first()
+    )
+    if oldest_failure is not None:
+        pending = pending.filter(stripe_created_at__lt=oldest_failure)
+    return pending
+
+
+def requeue_due_retries() -> List[str]:
+    """Return failed events whose retry is due to pending; returns their customers"""
+    due = list(
+        WebhookEvent.objects.filter(status='failed', next_attempt_at__lte=timezone.now())
+        .values_list('pk', 'customer_id')
+    )
+    WebhookEvent.objects.filter(pk__in=[pk for pk, _ in due], status='failed').update(
+        status='pending', next_attempt_at=None
+    )
+    return sorted({customer_id for _, customer_id in due})
+
+
+def reclaim_processing(customer_id: str) -> int:
+    """
+    Return events left in processing by a crashed worker to pending. Only
+    called while holding the customer's lock, when no live worker owns them.
+    """
+    reclaimed = WebhookEvent.objects.filter(customer_id=customer_id, status='processing').update(status='pending')
+    if reclaimed:
+        logger.warning(f"Reclaimed {reclaimed} stalled Stripe events of customer {customer_id or '-'}")
+    return reclaimed
+
+
+def stalled_customers() -> List[str]:
+    """Customers with events stuck in processing for longer than a lock can be held"""
+    cutoff = timezone.now() - timedelta(seconds=CUSTOMER_LOCK_TIMEOUT)
+    return list(
+        WebhookEvent.objects.filter(status='processing', received_at__lt=cutoff)
+        .order_by().values_list('customer_id', flat=True).distinct()
+    )
+
+
+def process_customer_events(customer_id: str) -> Optional[int]:
+    """
+    Process a customer's pending events oldest first. Returns the number
+    processed, or None when another worker holds the customer's lock.
+    A failed event is scheduled for a retry and the run goes on; once an
+    event's attempts are exhausted, events created after it stay pending
+    until the replay command resets it, and are then processed in order.
+    """
+    lock_key = f"stripe_webhook_customer_lock:{customer_id}"
+    processed = 0
+    while True:
+        if not cache.add(lock_key, 1, CUSTOMER_LOCK_TIMEOUT):
+            return None if processed == 0 else processed
+        try:
+            reclaim_processing(customer_id)
+            while True:
+                batch = list(_pending(customer_id).order_by('stripe_created_at', 'received_at')[:PROCESS_BATCH_SIZE])
+                if not batch:
+                    break
+                for webhook_event in batch:
+                    processed += 1
+                    if not process_event(webhook_event):
+                        # Re-read the queue so later events are held behind an exhausted failure
+                        break
+        finally:
+            cache.delete(lock_key)
+
+        # Events recorded after the last batch but before the lock was released
+        if not _pending(customer_id).exists():
+            return processed
@@ -3,7 +3,8 @@ Stripe webhook handlers for billing events
 
 Industry Standard Security Features:
 - Signature verification with timestamp validation
-- Request deduplication to prevent replay attacks
+- Durable deduplication by event ID (apps.accounts.webhook_events)
+- Immediate acknowledgement; processing runs on the billing queue
 - Comprehensive error handling
 - Structured logging for audit trails
 - Rate limiting for webhook endpoints
@@ -19,17 +20,14 @@ from django.http import HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 from django.core.exceptions import SuspiciousOperation
-from django.core.cache import cache
 from django.utils import timezone
-from .billing import BillingService
+from .webhook_events import ingest_event
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 # Security constants
 WEBHOOK_TOLERANCE_SECONDS = 300  # 5 minutes tolerance for timestamp validation
-MAX_PROCESSING_TIME_MINUTES = 10  # Max time to process duplicate events
-DUPLICATE_CACHE_PREFIX = 'stripe_webhook_processed:'
 IP_WHITELIST_ENABLED = getattr(settings, 'STRIPE_WEBHOOK_IP_WHITELIST_ENABLED', False)
 IP_WHITELIST = getattr(settings, 'STRIPE_WEBHOOK_IP_WHITELIST', [
     # Stripe's webhook IP ranges (update as needed)
@@ -83,36 +81,17 @@ def stripe_webhook(request):
             logger.warning(f"Invalid webhook signature: {str(e)}")
             return HttpResponse('Invalid signature', status=400)
 
-        # Check for duplicate events to prevent replay attacks
-        event_id = event.get('id')
-        cache_key = f"{DUPLICATE_CACHE_PREFIX}{event_id}"
+        if not event.get('id'):
+            return HttpResponse('Missing event id', status=400)
 
-        if cache.get(cache_key):
-            logger.info(f"Duplicate webhook event ignored: {event_id}")
-            return HttpResponse('Event already processed', status=200)
+        # Store the event before acknowledging; duplicates hit the unique event_id
+        webhook_event, created = ingest_event(event)
+        if not created:
+            logger.info(f"Duplicate webhook event ignored: {webhook_event.event_id}")
+            return HttpResponse('Event already received', status=200)
 
-        # Mark event as processing (temporary)
-        cache.set(cache_key, True, MAX_PROCESSING_TIME_MINUTES * 60)
-
-        # Process the event with comprehensive error handling
-        try:
-            logger.info(f"Processing Stripe webhook event: {event.get('type')} (ID: {event_id})")
-
-            success = BillingService.handle_webhook_event(event)
-
-            if success:
-                # Mark as successfully processed (longer expiry)
-                cache.set(cache_key, True, 24 * 60 * 60)  # 24 hours
-                logger.info(f"Successfully processed webhook: {event_id}")
-                return HttpResponse('Webhook processed successfully', status=200)
-            else:
-                logger.error(f"Webhook processing failed for event: {event_id}")
-                return HttpResponse('Webhook processing failed', status=500)
-
-        except Exception as e:
-            logger.error(f"Critical error processing webhook {event_id}: {str(e)}", exc_info=True)
-            # Still return success to Stripe to avoid endless retries, but log the error
-            return HttpResponse('Webhook processing error', status=500)
+        logger.info(f"Queued Stripe webhook event: {webhook_event.event_type} (ID: {webhook_event.event_id})")
+        return HttpResponse('Webhook received', status=200)
 
     except Exception as e:
         logger.error(f"Unexpected error in webhook handler: {str(e)}", exc_info=True)
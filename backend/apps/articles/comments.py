@@ -0,0 +1,52 @@
+"""
+Comment thread loading
+All approved comments of an article are fetched in one query with their
+authors and assembled into reply trees in memory, so rendering a thread no
+longer queries replies per comment or walks parents to find depth.
+"""
+
+from typing import Dict, List, Optional
+
+from django.conf import settings
+
+from .models import Comment
+
+COMMENT_THREADS_PAGE_SIZE = getattr(settings, 'COMMENT_THREADS_PAGE_SIZE', 20)
+
+
+def build_comment_tree(comments) -> List[Comment]:
+    """
+    Attach each comment's approved replies as `thread_replies` and return the
+    top-level comments. Replies whose parent is missing from `comments` (e.g.
+    an unapproved parent) are left out, as they would be when walking replies.
+    """
+    by_id: Dict = {}
+    for comment in comments:
+        comment.thread_replies = []
+        by_id[comment.id] = comment
+
+    roots = []
+    for comment in by_id.values():
+        if comment.parent_id is None:
+            roots.append(comment)
+            continue
+        parent = by_id.get(comment.parent_id)
+        if parent is not None:
+            parent.thread_replies.append(comment)
+    return roots
+
+
+def approved_comments(article):
+    return Comment.objects.filter(article=article, is_approved=True).select_related('author').order_by('created_at')
+
+
+def load_comment_threads(article) -> List[Comment]:
+    """Top-level approved comments of an article with their replies, in one query"""
+    return build_comment_tree(approved_comments(article))
+
+
+def load_comment_subtree(comment: Comment) -> Optional[Comment]:
+    """A comment with all its approved replies, fetched by path prefix in one query"""
+    comments = list(approved_comments(comment.article_id).filter(path__startswith=comment.path))
+    build_comment_tree(comments)
+    return next((item for item in comments if item.id == comment.id), None)
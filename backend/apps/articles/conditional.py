@@ -0,0 +1,112 @@
+"""
+Conditional GET for article and topic endpoints
+Validators are derived from one aggregate over the filtered queryset: the
+latest modification time of each tracked field plus the row count. Matching
+If-None-Match or If-Modified-Since requests are answered with 304 before any
+serialization happens. Anonymous responses served from the response cache
+carry the validators stored with them, so those requests skip the aggregate.
+"""
+
+import hashlib
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+HTTP_CACHE_MAX_AGE = getattr(settings, 'HTTP_CACHE_MAX_AGE', 60)
+HTTP_CACHE_STALE_WHILE_REVALIDATE = getattr(settings, 'HTTP_CACHE_STALE_WHILE_REVALIDATE', 300)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # Weak comparison: W/"x" and "x" are equivalent
+    candidates = {tag.strip() for tag in header.split(',')}
+    return '*' in candidates or etag in candidates or etag[2:] in candidates
+
+
+def request_not_modified(request, etag: str, last_modified: Optional[int]) -> bool:
+    """Whether the request's If-None-Match or If-Modified-Since matches the validators"""
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    return if_modified_since is not None and last_modified is not None and last_modified <= if_modified_since
+
+
+class ConditionalGetMixin:
+    """
+    Emit weak ETag and Last-Modified validators on GET and short-circuit
+    matching conditional requests. Views name the timestamp fields that
+    change when their payload does in validator_fields.
+    """
+    validator_fields: List[str] = ['updated_at']
+
+    def get_validator_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        # Detail views validate the single object they would look up
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return queryset
+
+    def on_not_modified(self, queryset):
+        """Side effects a full response would have had, e.g. view counters"""
+
+    def get_validators(self, queryset) -> Optional[Dict]:
+        aggregates = {f'max_{index}': Max(field) for index, field in enumerate(self.validator_fields)}
+        joins = any('__' in field for field in self.validator_fields)
+        row = queryset.order_by().aggregate(count=Count('pk', distinct=joins), **aggregates)
+        timestamps = [row[f'max_{index}'] for index in range(len(self.validator_fields))]
+        present = [value for value in timestamps if value is not None]
+        if not present:
+            return None
+
+        request = self.request
+        tenant = getattr(request, 'tenant', None)
+        seed = '|'.join([
+            request.path,
+            urlencode(sorted(request.GET.lists()), doseq=True),
+            str(request.user.pk) if request.user.is_authenticated else 'anon',
+            str(tenant.pk) if tenant else 'none',
+            getattr(request.accepted_renderer, 'format', ''),
+            str(row['count']),
+        ] + [value.isoformat() if value else '' for value in timestamps])
+        return {
+            'etag': f'W/"{hashlib.md5(seed.encode()).hexdigest()}"',
+            'last_modified': max(present),
+        }
+
+    def is_not_modified(self, validators: Dict) -> bool:
+        return request_not_modified(self.request, validators['etag'], int(validators['last_modified'].timestamp()))
+
+    def patch_validators(self, response, validators: Dict):
+        response['ETag'] = validators['etag']
+        response['Last-Modified'] = http_date(validators['last_modified'].timestamp())
+        if self.request.user.is_authenticated:
+            patch_cache_control(response, private=True, no_cache=True)
+        else:
+            patch_cache_control(
+                response, public=True, max_age=HTTP_CACHE_MAX_AGE,
+                stale_while_revalidate=HTTP_CACHE_STALE_WHILE_REVALIDATE,
+            )
+        patch_vary_headers(response, ['Authorization', 'Cookie'])
+        return response
+
+    def get(self, request, *args, **kwargs):
+        queryset = self.get_validator_queryset()
+        validators = self.get_validators(queryset)
+        if validators is None:
+            return super().get(request, *args, **kwargs)
+
+        if self.is_not_modified(validators):
+            self.on_not_modified(queryset)
+            return self.patch_validators(Response(status=status.HTTP_304_NOT_MODIFIED), validators)
+
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            self.patch_validators(response, validators)
+        return response
@@ -0,0 +1,170 @@
+"""
+Article engagement counters
+Approved comment and per-type reaction totals are adjusted in place when
+comments and reactions are created, moderated or deleted, so listings read one
+joined row per article instead of counting. reconcile_counters() rebuilds them
+from grouped aggregates, one batch of articles at a time, to correct any drift.
+"""
+
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import Article, ArticleCounters, ArticleReaction, Comment
+
+logger = logging.getLogger(__name__)
+
+
+def _counters_row(article_id) -> ArticleCounters:
+    counters = ArticleCounters.objects.filter(article_id=article_id).first()
+    if counters is None:
+        try:
+            with transaction.atomic():
+                counters = ArticleCounters.objects.create(article_id=article_id)
+        except IntegrityError:
+            counters = ArticleCounters.objects.get(article_id=article_id)
+    return counters
+
+
+def adjust_comment_count(article_id, delta: int):
+    """Shift the approved comment total of an article in place"""
+    if delta > 0:
+        _counters_row(article_id)
+    # Never go below zero on drifted rows; reconciliation will restore the true value
+    ArticleCounters.objects.filter(article_id=article_id, comment_count__gte=-min(delta, 0)).update(
+        comment_count=F('comment_count') + delta,
+        updated_at=timezone.now(),
+    )
+
+
+def adjust_reactions(article_id, changes: Dict[str, int]):
+    """Apply per-type reaction deltas, e.g. {'like': -1, 'love': 1} when a reader switches"""
+    changes = {reaction_type: delta for reaction_type, delta in changes.items() if delta}
+    if not changes:
+        return
+    with transaction.atomic():
+        if any(delta > 0 for delta in changes.values()):
+            _counters_row(article_id)
+        counters = ArticleCounters.objects.select_for_update().filter(article_id=article_id).first()
+        if counters is None:
+            return
+        counts = dict(counters.reaction_counts)
+        for reaction_type, delta in changes.items():
+            value = counts.get(reaction_type, 0) + delta
+            if value > 0:
+                counts[reaction_type] = value
+            else:
+                counts.pop(reaction_type, None)
+        counters.reaction_counts = counts
+        counters.reaction_count = sum(counts.values())
+        counters.save(update_fields=['reaction_counts', 'reaction_count', 'updated_at'])
+
+
+def get_counters(article) -> ArticleCounters:
+    """The article's counters, or zeroed ones when it has none yet"""
+    try:
+        return article.counters
+    except ArticleCounters.DoesNotExist:
+        return ArticleCounters(article_id=article.pk)
+
+
+def user_reactions(user, article_ids: Iterable) -> Dict:
+    """Map article ids to the user's reaction type in one query"""
+    if user is None or not user.is_authenticated:
+        return {}
+    return dict(
+        ArticleReaction.objects.filter(user=user, article_id__in=list(article_ids))
+        .values_list('article_id', 'reaction_type')
+    )
+
+
+def prime_user_reactions(context: Dict, articles: Iterable):
+    """Resolve the requesting user's reactions to a batch of articles into a serializer context"""
+    request = context.get('request')
+    primed = context.setdefault('user_reactions', {})
+    pending = [article.pk for article in articles if article.pk not in primed]
+    if not pending:
+        return
+    found = user_reactions(getattr(request, 'user', None), pending)
+    primed.update({article_id: found.get(article_id) for article_id in pending})
+
+
+def get_user_reaction(context: Optional[Dict], article) -> Optional[str]:
+    """The requesting user's reaction, read from the primed batch when available"""
+    context = context if context is not None else {}
+    primed = context.get('user_reactions')
+    if primed is not None and article.pk in primed:
+        return primed[article.pk]
+    request = context.get('request')
+    return user_reactions(getattr(request, 'user', None), [article.pk]).get(article.pk)
+
+
+RECONCILE_BATCH_SIZE = 500
+
+
+@transaction.atomic
+def reconcile_counter_batch(article_ids) -> Tuple[int, int]:
+    """Recount one batch of articles; returns the rows corrected and created"""
+    # Lock first so comments and reactions committed while counting cannot be
+    # overwritten; they wait on their counter UPDATE until the rewrite commits
+    locked = list(ArticleCounters.objects.select_for_update().filter(article_id__in=article_ids))
+    comments = dict(
+        Comment.objects.filter(article_id__in=article_ids, is_approved=True).order_by().values('article_id')
+        .annotate(total=Count('id')).values_list('article_id', 'total')
+    )
+    reactions = defaultdict(dict)
+    for row in ArticleReaction.objects.filter(article_id__in=article_ids).order_by().values(
+        'article_id', 'reaction_type'
+    ).annotate(total=Count('id')):
+        reactions[row['article_id']][row['reaction_type']] = row['total']
+
+    fixed = 0
+    seen = set()
+    for counters in locked:
+        seen.add(counters.article_id)
+        comment_count = comments.get(counters.article_id, 0)
+        reaction_counts = reactions.get(counters.article_id, {})
+        expected = (comment_count, reaction_counts, sum(reaction_counts.values()))
+        if (counters.comment_count, counters.reaction_counts, counters.reaction_count) != expected:
+            counters.comment_count, counters.reaction_counts, counters.reaction_count = expected
+            counters.save(update_fields=['comment_count', 'reaction_counts', 'reaction_count', 'updated_at'])
+            fixed += 1
+
+    missing = [
+        ArticleCounters(
+            article_id=article_id,
+            comment_count=comments.get(article_id, 0),
+            reaction_counts=reactions.get(article_id, {}),
+            reaction_count=sum(reactions.get(article_id, {}).values()),
+        )
+        for article_id in (set(comments) | set(reactions)) - seen
+    ]
+    # A comment or reaction may create its row meanwhile; the next run corrects it
+    ArticleCounters.objects.bulk_create(missing, ignore_conflicts=True)
+    return fixed, len(missing)
+
+
+def reconcile_counters(batch_size: int = RECONCILE_BATCH_SIZE) -> Dict:
+    """
+    Recompute all counters from grouped aggregates over Comment and
+    ArticleReaction and rewrite the rows that drifted, locking one batch of
+    articles at a time
+    """
+    fixed = created = 0
+    article_ids = Article.objects.order_by('pk').values_list('pk', flat=True).iterator(chunk_size=batch_size)
+    batch = []
+    for article_id in article_ids:
+        batch.append(article_id)
+        if len(batch) >= batch_size:
+            batch_fixed, batch_created = reconcile_counter_batch(batch)
+            fixed, created, batch = fixed + batch_fixed, created + batch_created, []
+    if batch:
+        batch_fixed, batch_created = reconcile_counter_batch(batch)
+        fixed, created = fixed + batch_fixed, created + batch_created
+
+    logger.info(f"Reconciled article counters: {fixed} corrected, {created} created")
+    return {'fixed': fixed, 'created': created}
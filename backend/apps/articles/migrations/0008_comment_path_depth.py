@@ -0,0 +1,45 @@
+# Generated by Django 5.0.3 on 2026-10-19 10:12
+
+from django.db import migrations, models
+
+
+def populate_comment_paths(apps, schema_editor):
+    Comment = apps.get_model("articles", "Comment")
+    comments = {comment.id: comment for comment in Comment.objects.only("id", "parent_id", "path", "depth")}
+
+    def resolve(comment):
+        if comment.path:
+            return comment
+        parent = comments.get(comment.parent_id)
+        if parent is not None:
+            resolve(parent)
+        comment.depth = parent.depth + 1 if parent else 0
+        comment.path = f"{parent.path if parent else ''}{comment.id.hex}/"
+        return comment
+
+    for comment in comments.values():
+        resolve(comment)
+    Comment.objects.bulk_update(comments.values(), ["path", "depth"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0007_collaborativesession_sessionparticipant_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="depth",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="path",
+            field=models.CharField(
+                blank=True, db_index=True, editable=False, max_length=1024
+            ),
+        ),
+        migrations.RunPython(populate_comment_paths, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.0.3 on 2026-10-19 11:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_article_counters(apps, schema_editor):
+    ArticleCounters = apps.get_model("articles", "ArticleCounters")
+    Comment = apps.get_model("articles", "Comment")
+    ArticleReaction = apps.get_model("articles", "ArticleReaction")
+
+    counters = {}
+    for row in (
+        Comment.objects.filter(is_approved=True)
+        .order_by()
+        .values("article_id")
+        .annotate(total=models.Count("id"))
+    ):
+        counters.setdefault(row["article_id"], ArticleCounters(article_id=row["article_id"]))
+        counters[row["article_id"]].comment_count = row["total"]
+    for row in (
+        ArticleReaction.objects.order_by()
+        .values("article_id", "reaction_type")
+        .annotate(total=models.Count("id"))
+    ):
+        item = counters.setdefault(row["article_id"], ArticleCounters(article_id=row["article_id"]))
+        item.reaction_counts = {**item.reaction_counts, row["reaction_type"]: row["total"]}
+        item.reaction_count += row["total"]
+
+    ArticleCounters.objects.bulk_create(counters.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0008_comment_path_depth"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArticleCounters",
+            fields=[
+                (
+                    "article",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="counters",
+                        serialize=False,
+                        to="articles.article",
+                    ),
+                ),
+                ("comment_count", models.PositiveIntegerField(default=0)),
+                ("reaction_count", models.PositiveIntegerField(default=0)),
+                ("reaction_counts", models.JSONField(blank=True, default=dict)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(populate_article_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.3 on 2026-10-19 12:20
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0009_articlecounters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="topic",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils.text import slugify
 import uuid
 import json
@@ -299,6 +299,7 @@ class Topic(models.Model):
     color = models.CharField(max_length=7, default='#0066FF')  # Hex color
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['name']
@@ -391,8 +392,8 @@ class Article(models.Model):
         return self.title
 
     def save(self, *args, **kwargs):
-        # Track if this is a new article
-        is_new = self.pk is None
+        # Track if this is a new article (UUID primary keys are set before the first save)
+        is_new = self._state.adding
 
         # Get the current instance before saving (for version comparison)
         if not is_new:
@@ -422,7 +423,9 @@ class Article(models.Model):
         # Calculate engagement score for recommendations
         self.engagement_score = self.calculate_engagement_score()
 
-        super().save(*args, **kwargs)
+        # The quota claimed in pre_save rolls back with a failed insert
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
         # Version control - automatically create versions (except for new articles)
         if not is_new and hasattr(self, '_create_version') and self._create_version:
@@ -1053,6 +1056,13 @@ class Comment(models.Model):
     content = models.TextField()
     parent = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='replies')
 
+    # Deepest reply allowed; path holds 33 characters per level
+    MAX_DEPTH = 30
+
+    # Thread position: ancestor ids joined by '/', so a subtree is a prefix match
+    path = models.CharField(max_length=1024, blank=True, db_index=True, editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+
     # Status
     is_approved = models.BooleanField(default=True)  # For moderation
     is_spam = models.BooleanField(default=False)
@@ -1070,6 +1080,15 @@ class Comment(models.Model):
     def __str__(self):
         return f"Comment by {self.author.username} on {self.article.title}"
 
+    def save(self, *args, **kwargs):
+        if not self.path:
+            parent = self.parent
+            self.depth = parent.depth + 1 if parent else 0
+            self.path = f"{parent.path if parent else ''}{self.id.hex}/"
+        # The comment and its counter adjustment commit together
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
 
 class ArticleReaction(models.Model):
     """
@@ -1102,6 +1121,28 @@ class ArticleReaction(models.Model):
     def __str__(self):
         return f"{self.user.username} {self.reaction_type}d {self.article.title}"
 
+    def save(self, *args, **kwargs):
+        # The reaction and its counter adjustment commit together
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class ArticleCounters(models.Model):
+    """
+    Social reading - running comment and reaction totals per article, kept
+    current by signals and periodically reconciled
+    """
+    article = models.OneToOneField(Article, on_delete=models.CASCADE, primary_key=True, related_name='counters')
+
+    comment_count = models.PositiveIntegerField(default=0)  # Approved comments only
+    reaction_count = models.PositiveIntegerField(default=0)
+    reaction_counts = models.JSONField(default=dict, blank=True)  # {'like': 3, 'wow': 1}
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.article.title}: {self.comment_count} comments, {self.reaction_count} reactions"
+
 
 class ArticleAnnotation(models.Model):
     """
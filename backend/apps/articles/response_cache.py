@@ -0,0 +1,180 @@
+"""
+Anonymous response cache for public article reads
+Rendered payloads of anonymous GET requests are cached per tenant, path and
+query string together with the versions of the tags they depend on (article,
+topic, series, account). Signals bump tag versions on writes, which turns every
+dependent entry into a miss. Entries past their fresh period are served stale
+while a single request recomputes them, and concurrent misses wait for that
+request instead of all hitting the database. Entries keep the validator
+headers of the computed response, so conditional requests are answered with
+304 straight from the cache.
+"""
+
+import hashlib
+import logging
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+from .conditional import request_not_modified
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_ENABLED = getattr(settings, 'RESPONSE_CACHE_ENABLED', True)
+# Entries are served as-is for RESPONSE_CACHE_FRESH seconds and stale until RESPONSE_CACHE_TIMEOUT
+RESPONSE_CACHE_FRESH = getattr(settings, 'RESPONSE_CACHE_FRESH', 60)
+RESPONSE_CACHE_TIMEOUT = getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 60 * 10)
+RECOMPUTE_LOCK_TIMEOUT = 30
+COALESCE_WAIT = 2.0
+COALESCE_POLL_INTERVAL = 0.05
+
+ALL_ACCOUNTS_TAG = 'account:all'
+
+# Headers of the computed response replayed on hits and 304s
+STORED_HEADERS = ('ETag', 'Last-Modified', 'Cache-Control', 'Vary')
+
+
+def article_tag(article_id) -> str:
+    return f"article:{article_id}"
+
+
+def topic_tag(slug) -> str:
+    return f"topic:{slug}"
+
+
+def series_tag(series_id) -> str:
+    return f"series:{series_id}"
+
+
+def account_tag(account_id) -> str:
+    return f"account:{account_id or 'none'}"
+
+
+def _version_key(tag: str) -> str:
+    return f"response_tag_version:{tag}"
+
+
+def tag_versions(tags: Iterable[str]) -> Dict[str, int]:
+    tags = list(tags)
+    stored = cache.get_many([_version_key(tag) for tag in tags])
+    return {tag: stored.get(_version_key(tag), 1) for tag in tags}
+
+
+def invalidate_tags(tags: Iterable[str]):
+    """Expire every cached response that depends on any of the tags"""
+    for tag in set(tags):
+        try:
+            cache.incr(_version_key(tag))
+        except ValueError:
+            cache.set(_version_key(tag), 2, None)
+
+
+def response_cache_key(request) -> str:
+    tenant = getattr(request, 'tenant', None)
+    auth = 'user' if request.user.is_authenticated else 'anon'
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    digest = hashlib.md5(f"{request.path}?{query}".encode()).hexdigest()
+    return f"response:{tenant.pk if tenant else 'none'}:{auth}:{digest}"
+
+
+def _is_current(entry: Optional[Dict]) -> bool:
+    return entry is not None and tag_versions(entry['tags']) == entry['tags']
+
+
+def _surrogate_key(tags: Iterable[str]) -> str:
+    # CDNs purge every response carrying a key, mirroring invalidate_tags()
+    return ' '.join(sorted(tags))
+
+
+def _is_not_modified(request, entry: Dict) -> bool:
+    headers = entry.get('headers', {})
+    if 'ETag' not in headers:
+        return False
+    return request_not_modified(request, headers['ETag'], parse_http_date_safe(headers.get('Last-Modified', '')))
+
+
+def _response(request, entry: Dict, state: str) -> Response:
+    if _is_not_modified(request, entry):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(entry['data'], status=entry['status'])
+    for header, value in entry.get('headers', {}).items():
+        response[header] = value
+    response['X-Cache'] = state
+    response['Surrogate-Key'] = _surrogate_key(entry['tags'])
+    return response
+
+
+class ResponseCacheMixin:
+    """
+    Serve anonymous GETs from the response cache. Views list the tags their
+    payload depends on in get_cache_tags(), which runs after the response has
+    been computed so it can use the objects that were loaded.
+    """
+
+    def get_cache_tags(self) -> List[str]:
+        # Tenant pages list that tenant's content; pages without one span every account
+        tenant = getattr(self.request, 'tenant', None)
+        return [account_tag(tenant.pk)] if tenant else [ALL_ACCOUNTS_TAG]
+
+    def on_cache_hit(self, entry: Dict):
+        """Side effects a computed response would have had, e.g. view counters"""
+
+    def get_cache_meta(self) -> Dict:
+        return {}
+
+    def get(self, request, *args, **kwargs):
+        if not RESPONSE_CACHE_ENABLED or request.user.is_authenticated:
+            return super().get(request, *args, **kwargs)
+        return self.cached_response(request, lambda: super(ResponseCacheMixin, self).get(request, *args, **kwargs))
+
+    def cached_response(self, request, compute: Callable[[], Response]) -> Response:
+        key = response_cache_key(request)
+        lock_key = f"{key}:lock"
+        entry = cache.get(key)
+
+        if _is_current(entry):
+            if time.time() < entry['fresh_until'] or not cache.add(lock_key, 1, RECOMPUTE_LOCK_TIMEOUT):
+                # Fresh, or stale while another request is already recomputing it
+                self.on_cache_hit(entry)
+                return _response(request, entry, 'HIT' if time.time() < entry['fresh_until'] else 'STALE')
+            return self._recompute(key, lock_key, compute)
+
+        if cache.add(lock_key, 1, RECOMPUTE_LOCK_TIMEOUT):
+            return self._recompute(key, lock_key, compute)
+
+        # Another request is computing this response; wait briefly for its result
+        deadline = time.monotonic() + COALESCE_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(COALESCE_POLL_INTERVAL)
+            entry = cache.get(key)
+            if _is_current(entry):
+                self.on_cache_hit(entry)
+                return _response(request, entry, 'HIT')
+        logger.warning(f"Timed out waiting for cached response {key}; computing it again")
+        return compute()
+
+    def _recompute(self, key: str, lock_key: str, compute: Callable[[], Response]) -> Response:
+        try:
+            response = compute()
+            if response.status_code == 200 and getattr(response, 'data', None) is not None:
+                tags = tag_versions(self.get_cache_tags())
+                cache.set(key, {
+                    'data': response.data,
+                    'status': response.status_code,
+                    'tags': tags,
+                    'meta': self.get_cache_meta(),
+                    'headers': {header: response[header] for header in STORED_HEADERS if response.has_header(header)},
+                    'fresh_until': time.time() + RESPONSE_CACHE_FRESH,
+                }, RESPONSE_CACHE_TIMEOUT)
+                response['X-Cache'] = 'MISS'
+                response['Surrogate-Key'] = _surrogate_key(tags)
+            return response
+        finally:
+            cache.delete(lock_key)
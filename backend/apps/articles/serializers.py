@@ -4,6 +4,9 @@ from .models import (
     Topic, Article, Page, Series, Comment, ArticleReaction,
     ArticleAnnotation, BreakingNews, SearchQuery
 )
+from .comments import COMMENT_THREADS_PAGE_SIZE, load_comment_subtree, load_comment_threads
+from .counters import get_counters, get_user_reaction, prime_user_reactions
+from apps.media.resolver import get_media_urls, prime_media_urls
 
 
 class TopicSerializer(serializers.ModelSerializer):
@@ -46,13 +49,33 @@ class SeriesSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+def article_media(article, include_gallery=False):
+    """Hero image (instance when already loaded, else id) and optionally gallery media of an article"""
+    items = [article.hero_image if Article.hero_image.is_cached(article) else article.hero_image_id]
+    if include_gallery:
+        items.extend(article.media_gallery.all())
+    return items
+
+
+class ArticleMediaListSerializer(serializers.ListSerializer):
+    """Resolves hero image URLs and the reader's reactions for a whole page of articles in one batch each"""
+
+    def to_representation(self, data):
+        articles = list(data.all() if hasattr(data, 'all') else data)
+        prime_media_urls(self.context, [item for article in articles for item in article_media(article)])
+        prime_user_reactions(self.context, articles)
+        return super().to_representation(articles)
+
+
 class ArticleListSerializer(serializers.ModelSerializer):
     author_name = serializers.CharField(source='author.username', read_only=True)
     topic_name = serializers.CharField(source='topic.name', read_only=True)
     series_name = serializers.CharField(source='series.title', read_only=True)
     hero_image_url = serializers.SerializerMethodField()
+    hero_image_srcset = serializers.SerializerMethodField()
     comment_count = serializers.SerializerMethodField()
     reaction_count = serializers.SerializerMethodField()
+    user_reaction = serializers.SerializerMethodField()
 
     class Meta:
         model = Article
@@ -60,20 +83,27 @@ class ArticleListSerializer(serializers.ModelSerializer):
             'id', 'title', 'slug', 'excerpt', 'status', 'published_at',
             'is_premium', 'premium_excerpt', 'word_count', 'reading_time',
             'view_count', 'engagement_score', 'author_name', 'topic_name',
-            'series_name', 'series_order', 'hero_image_url', 'comment_count',
-            'reaction_count', 'created_at'
+            'series_name', 'series_order', 'hero_image_url', 'hero_image_srcset',
+            'comment_count', 'reaction_count', 'user_reaction', 'created_at'
         ]
+        list_serializer_class = ArticleMediaListSerializer
 
     def get_hero_image_url(self, obj):
-        if obj.hero_image:
-            return obj.hero_image.file.url if hasattr(obj.hero_image, 'file') else None
-        return None
+        entry = get_media_urls(self.context, obj.hero_image_id)
+        return entry['url'] if entry else None
+
+    def get_hero_image_srcset(self, obj):
+        entry = get_media_urls(self.context, obj.hero_image_id)
+        return entry['srcset'] if entry else {}
 
     def get_comment_count(self, obj):
-        return obj.comments.filter(is_approved=True).count()
+        return get_counters(obj).comment_count
 
     def get_reaction_count(self, obj):
-        return obj.reactions.count()
+        return get_counters(obj).reaction_count
+
+    def get_user_reaction(self, obj):
+        return get_user_reaction(self.context, obj)
 
 
 class ArticleDetailSerializer(serializers.ModelSerializer):
@@ -83,6 +113,7 @@ class ArticleDetailSerializer(serializers.ModelSerializer):
     related_articles = ArticleListSerializer(many=True, read_only=True)
     media_gallery = serializers.SerializerMethodField()
     hero_image_url = serializers.SerializerMethodField()
+    hero_image_srcset = serializers.SerializerMethodField()
     comments = serializers.SerializerMethodField()
     reactions = serializers.SerializerMethodField()
 
@@ -91,58 +122,51 @@ class ArticleDetailSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = (
             'id', 'created_at', 'updated_at', 'word_count', 'reading_time',
-            'engagement_score', 'author', 'hero_image_url'
+            'engagement_score', 'author', 'hero_image_url', 'hero_image_srcset'
         )
 
     def get_author(self, obj):
         from users.serializers import UserSerializer
         return UserSerializer(obj.author).data
 
+    def to_representation(self, instance):
+        prime_media_urls(self.context, article_media(instance, include_gallery=True))
+        return super().to_representation(instance)
+
     def get_hero_image_url(self, obj):
-        if obj.hero_image:
-            return obj.hero_image.file.url if hasattr(obj.hero_image, 'file') else None
-        return None
+        entry = get_media_urls(self.context, obj.hero_image_id)
+        return entry['url'] if entry else None
+
+    def get_hero_image_srcset(self, obj):
+        entry = get_media_urls(self.context, obj.hero_image_id)
+        return entry['srcset'] if entry else {}
 
     def get_media_gallery(self, obj):
         # Return media URLs
         media_urls = []
         for media in obj.media_gallery.all():
-            if hasattr(media, 'file'):
-                media_urls.append({
-                    'id': media.id,
-                    'url': media.file.url,
-                    'type': media.media_type if hasattr(media, 'media_type') else 'image',
-                    'filename': media.filename if hasattr(media, 'filename') else ''
-                })
+            entry = get_media_urls(self.context, media) or {}
+            media_urls.append({
+                'id': media.id,
+                'url': entry.get('url'),
+                'srcset': entry.get('srcset', {}),
+                'type': media.media_type if hasattr(media, 'media_type') else 'image',
+                'filename': media.filename if hasattr(media, 'filename') else ''
+            })
         return media_urls
 
     def get_comments(self, obj):
-        # Return approved comments with replies
-        comments = obj.comments.filter(is_approved=True).order_by('created_at')
-        return CommentSerializer(comments, many=True).data
+        # First page of approved threads; the comments endpoint pages through the rest
+        threads = load_comment_threads(obj)[:COMMENT_THREADS_PAGE_SIZE]
+        return CommentSerializer(threads, many=True, context=self.context).data
 
     def get_reactions(self, obj):
-        # Aggregate reaction counts
-        reaction_counts = {}
-        for reaction in obj.reactions.all():
-            reaction_type = reaction.reaction_type
-            if reaction_type in reaction_counts:
-                reaction_counts[reaction_type] += 1
-            else:
-                reaction_counts[reaction_type] = 1
-
-        # Include user's reaction if authenticated
-        request = self.context.get('request')
-        user_reaction = None
-        if request and request.user.is_authenticated:
-            user_reaction_obj = obj.reactions.filter(user=request.user).first()
-            if user_reaction_obj:
-                user_reaction = user_reaction_obj.reaction_type
-
+        # Counts come from the denormalized counters row
+        counters = get_counters(obj)
         return {
-            'counts': reaction_counts,
-            'user_reaction': user_reaction,
-            'total': sum(reaction_counts.values())
+            'counts': counters.reaction_counts,
+            'user_reaction': get_user_reaction(self.context, obj),
+            'total': counters.reaction_count
         }
 
 
@@ -187,7 +211,6 @@ class CommentSerializer(serializers.ModelSerializer):
     author_name = serializers.CharField(source='author.username', read_only=True)
     author_avatar = serializers.SerializerMethodField()
     replies = serializers.SerializerMethodField()
-    depth = serializers.SerializerMethodField()
 
     class Meta:
         model = Comment
@@ -204,21 +227,11 @@ class CommentSerializer(serializers.ModelSerializer):
         return None
 
     def get_replies(self, obj):
-        # Get nested replies (limit depth to avoid infinite recursion)
-        if hasattr(obj, '_depth') and obj._depth >= 3:  # Max depth of 3
-            return []
-        replies = obj.replies.filter(is_approved=True).order_by('created_at')
-        serializer = CommentSerializer(replies, many=True, context=self.context)
-        return serializer.data
-
-    def get_depth(self, obj):
-        # Calculate reply depth
-        depth = 0
-        parent = obj.parent
-        while parent:
-            depth += 1
-            parent = parent.parent
-        return depth
+        # Replies are attached by the thread loader; load the subtree once otherwise
+        if not hasattr(obj, 'thread_replies'):
+            subtree = load_comment_subtree(obj)
+            obj.thread_replies = subtree.thread_replies if subtree else []
+        return CommentSerializer(obj.thread_replies, many=True, context=self.context).data
 
     def create(self, validated_data):
         # Set article from URL and author from request
@@ -244,6 +257,8 @@ class CommentSerializer(serializers.ModelSerializer):
                 validated_data['parent'] = Comment.objects.get(id=parent_id)
             except Comment.DoesNotExist:
                 raise serializers.ValidationError("Parent comment not found.")
+            if validated_data['parent'].depth >= Comment.MAX_DEPTH:
+                raise serializers.ValidationError("This thread is nested too deeply to reply to.")
 
         return super().create(validated_data)
 
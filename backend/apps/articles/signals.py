@@ -1,22 +1,56 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.core.cache import cache
-from .models import Article
+from apps.accounts import quotas
+from apps.seo.feeds import invalidate_feeds
+from .counters import adjust_comment_count, adjust_reactions
+from .models import Article, ArticleReaction, Comment, Series, Topic
+from .response_cache import (
+    ALL_ACCOUNTS_TAG, account_tag, article_tag, invalidate_tags, series_tag, topic_tag
+)
 import markdown
 
 
 @receiver(post_save, sender=Article)
-def clear_cache_on_article_save(sender, instance, **kwargs):
+def clear_cache_on_article_save(sender, instance, update_fields=None, **kwargs):
     """Clear relevant cache entries when an article is saved"""
+    # View counter bumps don't change any cached listing
+    if update_fields and set(update_fields) <= {'view_count'}:
+        return
+
     # Clear specific cache entries
-    cache.delete('sitemap_articles')
-    cache.delete('rss_feed')
+    invalidate_feeds(instance.account_id)
     cache.delete('featured_articles')
 
     if instance.topic:
         cache.delete(f'topic_articles_{instance.topic.slug}')
 
 
+@receiver(post_delete, sender=Article)
+def clear_cache_on_article_delete(sender, instance, **kwargs):
+    invalidate_feeds(instance.account_id)
+
+
+@receiver(post_save, sender=Topic)
+@receiver(post_delete, sender=Topic)
+def clear_cache_on_topic_save(sender, instance, **kwargs):
+    """Topic feeds list topics directly"""
+    invalidate_feeds(instance.account_id)
+
+
+@receiver(pre_save, sender=Article)
+def claim_article_quota(sender, instance, **kwargs):
+    """Count a new article against its account's plan before it is inserted"""
+    if instance._state.adding and instance.account_id:
+        quotas.reserve(instance.account, 'articles')
+
+
+@receiver(post_delete, sender=Article)
+def release_article_quota(sender, instance, **kwargs):
+    quotas.release(instance.account_id, 'articles')
+
+
 @receiver(post_save, sender=Article)
 def generate_html_content(sender, instance, **kwargs):
     """
@@ -26,3 +60,123 @@ def generate_html_content(sender, instance, **kwargs):
         html_content = markdown.markdown(instance.content)
         cache_key = f'article_html_{instance.id}'
         cache.set(cache_key, html_content, 3600)  # Cache for 1 hour
+
+
+def _tracks(update_fields, field):
+    return update_fields is None or field in update_fields
+
+
+@receiver(pre_save, sender=Comment)
+def remember_comment_approval(sender, instance, update_fields=None, **kwargs):
+    """Note the stored moderation state so approval changes can adjust the counters"""
+    if not instance._state.adding and _tracks(update_fields, 'is_approved'):
+        instance._was_approved = (
+            Comment.objects.filter(pk=instance.pk).values_list('is_approved', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Comment)
+def count_saved_comment(sender, instance, created, **kwargs):
+    if created:
+        if instance.is_approved:
+            adjust_comment_count(instance.article_id, 1)
+        return
+    was_approved = getattr(instance, '_was_approved', None)
+    if was_approved is not None and was_approved != instance.is_approved:
+        adjust_comment_count(instance.article_id, 1 if instance.is_approved else -1)
+    instance._was_approved = None
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    if instance.is_approved:
+        adjust_comment_count(instance.article_id, -1)
+
+
+@receiver(pre_save, sender=ArticleReaction)
+def remember_reaction_type(sender, instance, update_fields=None, **kwargs):
+    if not instance._state.adding and _tracks(update_fields, 'reaction_type'):
+        instance._previous_reaction_type = (
+            ArticleReaction.objects.filter(pk=instance.pk).values_list('reaction_type', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=ArticleReaction)
+def count_saved_reaction(sender, instance, created, **kwargs):
+    if created:
+        adjust_reactions(instance.article_id, {instance.reaction_type: 1})
+        return
+    previous = getattr(instance, '_previous_reaction_type', None)
+    if previous and previous != instance.reaction_type:
+        adjust_reactions(instance.article_id, {previous: -1, instance.reaction_type: 1})
+    instance._previous_reaction_type = None
+
+
+@receiver(post_delete, sender=ArticleReaction)
+def count_deleted_reaction(sender, instance, **kwargs):
+    adjust_reactions(instance.article_id, {instance.reaction_type: -1})
+
+
+def article_cache_tags(article):
+    tags = [article_tag(article.pk), account_tag(article.account_id), ALL_ACCOUNTS_TAG]
+    if article.topic_id:
+        try:
+            tags.append(topic_tag(article.topic.slug))
+        except Topic.DoesNotExist:
+            # Removed in the same cascade as the article
+            pass
+    if article.series_id:
+        tags.append(series_tag(article.series_id))
+    return tags
+
+
+def _invalidate_on_commit(tags):
+    tags = list(tags)
+    transaction.on_commit(lambda: invalidate_tags(tags))
+
+
+@receiver(pre_save, sender=Article)
+def remember_article_cache_tags(sender, instance, update_fields=None, **kwargs):
+    """Tags of the stored row, so responses under a previous topic or series expire too"""
+    if instance._state.adding or (update_fields and set(update_fields) <= {'view_count'}):
+        return
+    previous = Article.objects.filter(pk=instance.pk).select_related('topic').first()
+    instance._previous_cache_tags = article_cache_tags(previous) if previous else []
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def invalidate_article_responses(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= {'view_count'}:
+        return
+    previous = getattr(instance, '_previous_cache_tags', [])
+    instance._previous_cache_tags = []
+    _invalidate_on_commit(article_cache_tags(instance) + previous)
+
+
+@receiver(pre_save, sender=Topic)
+def remember_topic_slug(sender, instance, **kwargs):
+    if not instance._state.adding:
+        instance._previous_slug = Topic.objects.filter(pk=instance.pk).values_list('slug', flat=True).first()
+
+
+@receiver(post_save, sender=Topic)
+@receiver(post_delete, sender=Topic)
+def invalidate_topic_responses(sender, instance, **kwargs):
+    slugs = {instance.slug, getattr(instance, '_previous_slug', None)} - {None}
+    _invalidate_on_commit([topic_tag(slug) for slug in slugs] + [account_tag(instance.account_id), ALL_ACCOUNTS_TAG])
+
+
+@receiver(post_save, sender=Series)
+@receiver(post_delete, sender=Series)
+def invalidate_series_responses(sender, instance, **kwargs):
+    _invalidate_on_commit([series_tag(instance.pk), account_tag(instance.account_id), ALL_ACCOUNTS_TAG])
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=ArticleReaction)
+@receiver(post_delete, sender=ArticleReaction)
+def invalidate_engagement_responses(sender, instance, **kwargs):
+    """Article detail embeds comment threads and reaction counts"""
+    _invalidate_on_commit([article_tag(instance.article_id)])
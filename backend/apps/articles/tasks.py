@@ -0,0 +1,23 @@
+"""Celery tasks for article engagement"""
+
+import logging
+
+from config.celery import app
+from .counters import reconcile_counters
+
+logger = logging.getLogger(__name__)
+
+
+@app.task(bind=True, max_retries=3)
+def reconcile_article_counters(self):
+    """
+    Correct drift in article comment and reaction counters
+    Runs daily via Celery Beat
+    """
+    try:
+        result = reconcile_counters()
+        return f"Corrected {result['fixed']} counter rows and created {result['created']}"
+
+    except Exception as e:
+        logger.error(f"Error reconciling article counters: {str(e)}")
+        raise self.retry(countdown=60, exc=e)
@@ -0,0 +1,84 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIRequestFactory
+
+from apps.articles.comments import build_comment_tree, load_comment_subtree, load_comment_threads
+from apps.articles.models import Article, Comment
+from apps.articles.serializers import ArticleDetailSerializer, CommentSerializer
+from apps.articles.views import ArticleCommentsView
+
+User = get_user_model()
+
+
+class CommentThreadTestCase(TestCase):
+    """Test comment trees loaded in one query and assembled in memory"""
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='author', email='author@example.com', password='pass12345')
+        self.article = Article.objects.create(title='Threads', content='Body text', author=self.author,
+                                              status='published')
+        self.root = Comment.objects.create(article=self.article, author=self.author, content='Root')
+        self.reply = Comment.objects.create(article=self.article, author=self.author, content='Reply',
+                                            parent=self.root)
+        self.nested = Comment.objects.create(article=self.article, author=self.author, content='Nested',
+                                             parent=self.reply)
+        self.other = Comment.objects.create(article=self.article, author=self.author, content='Other')
+
+    def test_path_and_depth_are_stored_on_create(self):
+        self.assertEqual(self.root.depth, 0)
+        self.assertEqual(self.nested.depth, 2)
+        self.assertEqual(self.nested.path, f"{self.root.id.hex}/{self.reply.id.hex}/{self.nested.id.hex}/")
+
+    def test_threads_load_in_one_query(self):
+        with self.assertNumQueries(1):
+            threads = load_comment_threads(self.article)
+            data = CommentSerializer(threads, many=True).data
+
+        self.assertEqual([item['content'] for item in data], ['Root', 'Other'])
+        self.assertEqual(data[0]['replies'][0]['content'], 'Reply')
+        self.assertEqual(data[0]['replies'][0]['replies'][0]['depth'], 2)
+
+    def test_replies_of_unapproved_comments_are_hidden(self):
+        Comment.objects.filter(pk=self.reply.pk).update(is_approved=False)
+
+        threads = load_comment_threads(self.article)
+
+        self.assertEqual(threads[0].thread_replies, [])
+        self.assertEqual(len(threads), 2)
+
+    def test_subtree_is_fetched_by_path(self):
+        with self.assertNumQueries(1):
+            subtree = load_comment_subtree(self.reply)
+
+        self.assertEqual([item.content for item in subtree.thread_replies], ['Nested'])
+
+    def test_build_tree_ignores_orphans(self):
+        roots = build_comment_tree([self.nested, self.other])
+
+        self.assertEqual(roots, [self.other])
+
+    def test_detail_embeds_top_level_threads_only(self):
+        data = ArticleDetailSerializer(self.article, context={}).get_comments(self.article)
+
+        self.assertEqual([item['content'] for item in data], ['Root', 'Other'])
+
+    def test_comments_endpoint_paginates_threads(self):
+        request = APIRequestFactory().get(f'/api/articles/detail/{self.article.slug}/comments/', {'page': 1})
+        request.tenant = None
+
+        response = ArticleCommentsView.as_view()(request, slug=self.article.slug)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(response.data['results'][0]['replies'][0]['content'], 'Reply')
+
+    def test_replies_below_the_depth_limit_are_rejected(self):
+        Comment.objects.filter(pk=self.nested.pk).update(depth=Comment.MAX_DEPTH)
+        serializer = CommentSerializer(context={'parent_id': self.nested.pk})
+
+        with self.assertRaises(ValidationError):
+            serializer.create({'article': self.article, 'author': self.author, 'content': 'Too deep'})
+        self.assertFalse(Comment.objects.filter(content='Too deep').exists())
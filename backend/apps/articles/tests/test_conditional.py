@@ -0,0 +1,131 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils.http import http_date
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.accounts.models import Account, AccountUser
+from apps.articles.models import Article, Comment, Topic
+from apps.articles.views import ArticleDetailView, ArticleListView, TopicDetailView
+
+User = get_user_model()
+
+
+class ConditionalGetTestCase(TestCase):
+    """Test ETag/Last-Modified validators on article and topic endpoints"""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+        self.author = User.objects.create_user(username='author', email='author@example.com', password='pass12345')
+        self.topic = Topic.objects.create(name='Science', slug='science')
+        self.article = Article.objects.create(title='Validated', content='Body text', author=self.author,
+                                              status='published', topic=self.topic)
+
+    def _get(self, view, path, user=None, headers=None, account_user=None, **kwargs):
+        request = self.factory.get(path, **(headers or {}))
+        request.tenant = None
+        request.account_user = account_user
+        if user is not None:
+            force_authenticate(request, user=user)
+        return view(request, **kwargs)
+
+    def _list(self, **kwargs):
+        return self._get(ArticleListView.as_view(), '/api/articles/', **kwargs)
+
+    def _detail(self, **kwargs):
+        path = f'/api/articles/detail/{self.article.slug}/'
+        return self._get(ArticleDetailView.as_view(), path, slug=self.article.slug, **kwargs)
+
+    def test_list_emits_validators_and_cdn_headers(self):
+        response = self._list()
+
+        self.assertTrue(response['ETag'].startswith('W/"'))
+        self.assertIn('Last-Modified', response)
+        self.assertIn('public', response['Cache-Control'])
+        self.assertIn('account:all', response['Surrogate-Key'])
+
+    def test_matching_etag_is_answered_before_serialization(self):
+        etag = self._list()['ETag']
+
+        # Anonymous validators come from the response cache entry
+        with self.assertNumQueries(0):
+            response = self._list(headers={'HTTP_IF_NONE_MATCH': etag})
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_strong_form_of_weak_etag_matches(self):
+        etag = self._list()['ETag']
+
+        response = self._list(headers={'HTTP_IF_NONE_MATCH': etag[2:]})
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_edit_changes_etag(self):
+        etag = self._list()['ETag']
+        self.article.excerpt = 'Changed'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.save()
+
+        response = self._list(headers={'HTTP_IF_NONE_MATCH': etag})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_if_modified_since(self):
+        last_modified = self._list()['Last-Modified']
+
+        self.assertEqual(self._list(headers={'HTTP_IF_MODIFIED_SINCE': last_modified}).status_code, 304)
+        older = http_date(self.article.updated_at.timestamp() - 3600)
+        self.assertEqual(self._list(headers={'HTTP_IF_MODIFIED_SINCE': older}).status_code, 200)
+
+    def test_authenticated_responses_are_private(self):
+        anonymous = self._list()
+        response = self._list(user=self.author)
+
+        self.assertIn('private', response['Cache-Control'])
+        self.assertNotEqual(response['ETag'], anonymous['ETag'])
+
+    def test_new_comment_changes_detail_etag(self):
+        etag = self._detail()['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(article=self.article, author=self.author, content='First')
+
+        response = self._detail(headers={'HTTP_IF_NONE_MATCH': etag})
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_not_modified_detail_still_counts_view(self):
+        etag = self._detail()['ETag']
+
+        response = self._detail(headers={'HTTP_IF_NONE_MATCH': etag})
+
+        self.assertEqual(response.status_code, 304)
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.view_count, 2)
+
+    def test_topic_rename_changes_etag(self):
+        # Topic detail is for account members
+        account = Account.objects.create(name='Blog', slug='blog', owner=self.author)
+        member = {'user': self.author, 'account_user': AccountUser.objects.create(account=account, user=self.author)}
+        path = f'/api/articles/topics/{self.topic.slug}/'
+        etag = self._get(TopicDetailView.as_view(), path, slug=self.topic.slug, **member)['ETag']
+        later = self.topic.updated_at.replace(year=2099)
+        Topic.objects.filter(pk=self.topic.pk).update(name='Sciences', updated_at=later)
+
+        response = self._get(TopicDetailView.as_view(), path, slug=self.topic.slug,
+                             headers={'HTTP_IF_NONE_MATCH': etag}, **member)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_topic_rename_changes_article_list_etag(self):
+        etag = self._list()['ETag']
+        self.topic.name = 'Sciences'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.topic.save()
+
+        response = self._list(headers={'HTTP_IF_NONE_MATCH': etag})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['topic_name'], 'Sciences')
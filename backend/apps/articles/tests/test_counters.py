@@ -0,0 +1,128 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+from apps.articles import counters
+from apps.articles.counters import get_counters, reconcile_counters
+from apps.articles.models import Article, ArticleCounters, ArticleReaction, Comment
+from apps.articles.serializers import ArticleDetailSerializer, ArticleListSerializer
+from apps.articles.views import with_article_relations
+
+User = get_user_model()
+
+
+class ArticleCountersTestCase(TestCase):
+    """Test comment and reaction counters maintained by signals"""
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='author', email='author@example.com', password='pass12345')
+        self.reader = User.objects.create_user(username='reader', email='reader@example.com', password='pass12345')
+        self.article = Article.objects.create(title='Counted', content='Body text', author=self.author,
+                                              status='published')
+
+    def _counters(self):
+        return ArticleCounters.objects.get(article=self.article)
+
+    def test_comments_are_counted_on_create_moderation_and_delete(self):
+        comment = Comment.objects.create(article=self.article, author=self.reader, content='Hi')
+        Comment.objects.create(article=self.article, author=self.reader, content='Held', is_approved=False)
+        self.assertEqual(self._counters().comment_count, 1)
+
+        comment.is_approved = False
+        comment.save()
+        self.assertEqual(self._counters().comment_count, 0)
+
+        comment.is_approved = True
+        comment.save()
+        comment.delete()
+        self.assertEqual(self._counters().comment_count, 0)
+
+    def test_reactions_are_counted_per_type(self):
+        reaction = ArticleReaction.objects.create(article=self.article, user=self.reader, reaction_type='like')
+        ArticleReaction.objects.create(article=self.article, user=self.author, reaction_type='like')
+        self.assertEqual(self._counters().reaction_counts, {'like': 2})
+
+        reaction.reaction_type = 'wow'
+        reaction.save()
+        counters = self._counters()
+        self.assertEqual(counters.reaction_counts, {'like': 1, 'wow': 1})
+        self.assertEqual(counters.reaction_count, 2)
+
+        reaction.delete()
+        self.assertEqual(self._counters().reaction_counts, {'like': 1})
+
+    def test_reconcile_repairs_drift(self):
+        Comment.objects.create(article=self.article, author=self.reader, content='Hi')
+        ArticleReaction.objects.create(article=self.article, user=self.reader, reaction_type='love')
+        ArticleCounters.objects.filter(article=self.article).update(comment_count=9, reaction_counts={})
+        Comment.objects.filter(article=self.article).update(is_approved=False)
+
+        result = reconcile_counters()
+
+        counters = self._counters()
+        self.assertEqual(result['fixed'], 1)
+        self.assertEqual((counters.comment_count, counters.reaction_counts, counters.reaction_count),
+                         (0, {'love': 1}, 1))
+
+    def test_reconcile_creates_missing_rows(self):
+        ArticleReaction.objects.create(article=self.article, user=self.reader, reaction_type='sad')
+        ArticleCounters.objects.all().delete()
+
+        result = reconcile_counters()
+
+        self.assertEqual(result['created'], 1)
+        self.assertEqual(self._counters().reaction_counts, {'sad': 1})
+
+    def test_reconcile_runs_in_article_batches(self):
+        other = Article.objects.create(title='Other', content='Body text', author=self.author, status='published')
+        for article in [self.article, other]:
+            Comment.objects.create(article=article, author=self.reader, content='Hi')
+        ArticleCounters.objects.update(comment_count=5)
+
+        with mock.patch.object(counters, 'reconcile_counter_batch', wraps=counters.reconcile_counter_batch) as batch:
+            result = reconcile_counters(batch_size=1)
+
+        self.assertEqual(batch.call_count, 2)
+        self.assertEqual(result, {'fixed': 2, 'created': 0})
+        self.assertEqual(set(ArticleCounters.objects.values_list('comment_count', flat=True)), {1})
+
+    def test_article_without_engagement_reads_zero(self):
+        self.assertEqual(get_counters(self.article).comment_count, 0)
+
+    def test_list_reads_counters_and_user_reactions_in_batch(self):
+        others = [
+            Article.objects.create(title=f'Other {i}', content='Body text', author=self.author, status='published')
+            for i in range(3)
+        ]
+        for article in [self.article] + others:
+            Comment.objects.create(article=article, author=self.author, content='Hi')
+        ArticleReaction.objects.create(article=others[0], user=self.reader, reaction_type='like')
+
+        request = APIRequestFactory().get('/api/articles/')
+        request.user = self.reader
+        articles = with_article_relations(Article.objects.order_by('title'))
+
+        with CaptureQueriesContext(connection) as queries:
+            data = ArticleListSerializer(articles, many=True, context={'request': request}).data
+
+        tables = [query['sql'] for query in queries.captured_queries]
+        self.assertEqual(len([sql for sql in tables if 'FROM "articles_articlereaction"' in sql]), 1)
+        self.assertFalse([sql for sql in tables if 'FROM "articles_comment"' in sql])
+        self.assertEqual([item['comment_count'] for item in data], [1, 1, 1, 1])
+        self.assertEqual([item['user_reaction'] for item in data], [None, 'like', None, None])
+
+    def test_detail_reactions_come_from_counters(self):
+        ArticleReaction.objects.create(article=self.article, user=self.reader, reaction_type='laugh')
+        request = APIRequestFactory().get('/')
+        request.user = self.reader
+        article = with_article_relations(Article.objects.filter(pk=self.article.pk)).get()
+
+        data = ArticleDetailSerializer(article, context={'request': request}).get_reactions(article)
+
+        self.assertEqual(data, {'counts': {'laugh': 1}, 'user_reaction': 'laugh', 'total': 1})
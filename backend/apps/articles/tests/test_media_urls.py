@@ -0,0 +1,57 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.articles.models import Article
+from apps.articles.serializers import ArticleDetailSerializer, ArticleListSerializer
+from apps.articles.views import with_article_relations
+from apps.media.models import Media
+
+User = get_user_model()
+
+
+class ArticleMediaURLTestCase(TestCase):
+    """Test hero and gallery media URLs resolved in batches"""
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='author', email='author@example.com', password='pass12345')
+        for i in range(3):
+            hero = Media.objects.create(file=f'uploads/hero{i}.jpg', filename=f'hero{i}.jpg', width=800, height=600,
+                                        file_size=1000, mime_type='image/jpeg', uploaded_by=self.author)
+            article = Article.objects.create(title=f'Post {i}', content='Body text', author=self.author,
+                                             status='published', hero_image=hero)
+            article.media_gallery.add(hero)
+
+    def _count(self, queries, table):
+        return len([query for query in queries if f'FROM "{table}"' in query['sql']])
+
+    def test_list_resolves_hero_images_in_one_batch(self):
+        articles = with_article_relations(Article.objects.order_by('title'))
+
+        with CaptureQueriesContext(connection) as queries:
+            data = ArticleListSerializer(articles, many=True).data
+
+        self.assertEqual([item['hero_image_url'] for item in data],
+                         ['/media/uploads/hero0.jpg', '/media/uploads/hero1.jpg', '/media/uploads/hero2.jpg'])
+        # Heroes come from select_related, galleries from one prefetch; one variants lookup covers the page
+        self.assertEqual(self._count(queries.captured_queries, 'media_media'), 1)
+        self.assertEqual(self._count(queries.captured_queries, 'media_mediavariant'), 1)
+
+    def test_cached_urls_need_no_media_queries(self):
+        articles = with_article_relations(Article.objects.order_by('title'))
+        ArticleListSerializer(articles, many=True).data
+
+        with CaptureQueriesContext(connection) as queries:
+            ArticleListSerializer(with_article_relations(Article.objects.order_by('title')), many=True).data
+
+        self.assertEqual(self._count(queries.captured_queries, 'media_mediavariant'), 0)
+
+    def test_detail_gallery_uses_resolved_urls(self):
+        article = with_article_relations(Article.objects.filter(title='Post 1')).get()
+
+        data = ArticleDetailSerializer(article, context={}).get_media_gallery(article)
+
+        self.assertEqual(data[0]['url'], '/media/uploads/hero1.jpg')
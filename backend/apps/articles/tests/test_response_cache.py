@@ -0,0 +1,165 @@
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.accounts.models import Account
+from apps.articles.models import Article, Topic
+from apps.articles.response_cache import response_cache_key
+from apps.articles.views import ArticleDetailView, ArticleListView, TopicArticlesView
+
+User = get_user_model()
+
+
+class ResponseCacheTestCase(TestCase):
+    """Test whole-response caching of anonymous article reads"""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+        self.author = User.objects.create_user(username='author', email='author@example.com', password='pass12345')
+        self.topic = Topic.objects.create(name='Science', slug='science')
+        self.article = Article.objects.create(title='Cached', content='Body text', author=self.author,
+                                              status='published', topic=self.topic)
+
+    def _get(self, view, path, user=None, headers=None, **kwargs):
+        request = self.factory.get(path, **(headers or {}))
+        request.tenant = None
+        request.account_user = None
+        if user is not None:
+            force_authenticate(request, user=user)
+        return view(request, **kwargs)
+
+    def _list(self, user=None, headers=None):
+        return self._get(ArticleListView.as_view(), '/api/articles/', user=user, headers=headers)
+
+    def test_second_anonymous_request_is_served_from_cache(self):
+        self.assertEqual(self._list()['X-Cache'], 'MISS')
+
+        with self.assertNumQueries(0):
+            response = self._list()
+
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.data['results'][0]['title'], 'Cached')
+
+    def test_conditional_hit_is_answered_from_the_entry(self):
+        etag = self._list()['ETag']
+
+        with self.assertNumQueries(0):
+            response = self._list(headers={'HTTP_IF_NONE_MATCH': etag})
+
+        self.assertEqual((response.status_code, response['X-Cache'], response['ETag']), (304, 'HIT', etag))
+
+    def test_authenticated_requests_bypass_cache(self):
+        response = self._list(user=self.author)
+
+        self.assertFalse(response.has_header('X-Cache'))
+
+    def test_article_save_invalidates_tagged_responses(self):
+        self._list()
+        path = f'/api/articles/topics/{self.topic.slug}/articles/'
+        self._get(TopicArticlesView.as_view(), path, slug=self.topic.slug)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.excerpt = 'Updated'
+            self.article.save()
+
+        self.assertEqual(self._list()['X-Cache'], 'MISS')
+        response = self._get(TopicArticlesView.as_view(), path, slug=self.topic.slug)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['excerpt'], 'Updated')
+
+    def test_moving_article_invalidates_previous_topic(self):
+        path = f'/api/articles/topics/{self.topic.slug}/articles/'
+        self._get(TopicArticlesView.as_view(), path, slug=self.topic.slug)
+        other = Topic.objects.create(name='Art', slug='art')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.topic = other
+            self.article.save()
+
+        response = self._get(TopicArticlesView.as_view(), path, slug=self.topic.slug)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['count'], 0)
+
+    def test_detail_hits_still_count_views(self):
+        view = ArticleDetailView.as_view()
+        path = f'/api/articles/detail/{self.article.slug}/'
+        self._get(view, path, slug=self.article.slug)
+
+        response = self._get(view, path, slug=self.article.slug)
+
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.view_count, 2)
+
+    def test_anonymous_detail_hides_drafts(self):
+        draft = Article.objects.create(title='Draft', content='Body text', author=self.author, status='draft')
+
+        response = self._get(ArticleDetailView.as_view(), f'/api/articles/detail/{draft.slug}/', slug=draft.slug)
+
+        self.assertEqual(response.status_code, 404)
+
+    def _expire(self):
+        request = self.factory.get('/api/articles/')
+        request.user = mock.Mock(is_authenticated=False)
+        request.tenant = None
+        key = response_cache_key(request)
+        entry = cache.get(key)
+        entry['fresh_until'] = time.time() - 1
+        cache.set(key, entry)
+        return key
+
+    def test_stale_entry_is_served_while_another_request_recomputes(self):
+        self._list()
+        key = self._expire()
+        cache.add(f"{key}:lock", 1)
+
+        with self.assertNumQueries(0):
+            response = self._list()
+
+        self.assertEqual(response['X-Cache'], 'STALE')
+
+    def test_stale_entry_is_recomputed_by_one_request(self):
+        self._list()
+        self._expire()
+
+        self.assertEqual(self._list()['X-Cache'], 'MISS')
+        self.assertEqual(self._list()['X-Cache'], 'HIT')
+
+    def test_concurrent_miss_waits_for_the_computing_request(self):
+        self._list()
+        key = self._expire()
+        entry = cache.get(key)
+        cache.delete(key)
+        cache.add(f"{key}:lock", 1)
+
+        with mock.patch('apps.articles.response_cache.time.sleep', side_effect=lambda _: cache.set(key, entry)):
+            with self.assertNumQueries(0):
+                response = self._list()
+
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    def test_other_tenants_writes_keep_cached_lists(self):
+        blog = Account.objects.create(name='Blog', slug='blog', owner=self.author)
+        other = Account.objects.create(name='Other', slug='other', owner=self.author)
+        Article.objects.filter(pk=self.article.pk).update(account=blog)
+
+        def tenant_list(tenant):
+            request = self.factory.get('/api/articles/')
+            request.tenant = tenant
+            request.account_user = None
+            return ArticleListView.as_view()(request)
+
+        self.assertEqual([card['title'] for card in tenant_list(blog).data['results']], ['Cached'])
+        with self.captureOnCommitCallbacks(execute=True):
+            Article.objects.create(title='Elsewhere', content='Body text', author=self.author,
+                                   status='published', account=other)
+
+        response = tenant_list(blog)
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response['Surrogate-Key'], f'account:{blog.pk}')
+        self.assertEqual(tenant_list(other).data['results'][0]['title'], 'Elsewhere')
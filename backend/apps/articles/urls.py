@@ -8,6 +8,7 @@ urlpatterns = [
     path('', views.ArticleListView.as_view(), name='article-list'),
     path('detail/<slug:slug>/', views.ArticleDetailView.as_view(), name='article-detail'),
     path('detail/<slug:slug>/publish/', views.publish_article, name='article-publish'),
+    path('detail/<slug:slug>/comments/', views.ArticleCommentsView.as_view(), name='article-comments'),
 
     # Topics endpoints
     path('topics/', views.TopicListView.as_view(), name='topic-list'),
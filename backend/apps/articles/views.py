@@ -1,22 +1,35 @@
 from rest_framework import generics, permissions, status, filters
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.db.models import F, Prefetch, Q
 
 from .models import Article, Topic, Page, Series, CollaborativeSession, SessionParticipant
 from .serializers import (
     ArticleListSerializer, ArticleDetailSerializer,
     ArticleCreateSerializer, ArticleUpdateSerializer,
-    TopicSerializer, PageSerializer, SeriesSerializer
+    TopicSerializer, PageSerializer, SeriesSerializer, CommentSerializer
 )
+from .comments import COMMENT_THREADS_PAGE_SIZE, load_comment_threads
+from .conditional import ConditionalGetMixin
+from .response_cache import ResponseCacheMixin, article_tag, series_tag, topic_tag
 from apps.accounts.permissions import IsAccountMember, IsArticleAuthorOrEditor, CanPublishArticles
 
 
-class ArticleListView(generics.ListCreateAPIView):
+def with_article_relations(queryset):
+    """Load everything the article serializers render, including media and engagement counters"""
+    return queryset.select_related(
+        'author', 'topic', 'series', 'hero_image', 'counters'
+    ).prefetch_related('media_gallery')
+
+
+class ArticleListView(ResponseCacheMixin, ConditionalGetMixin, generics.ListCreateAPIView):
     """List articles and create new articles"""
+    # Cards embed topic and series names
+    validator_fields = ['updated_at', 'counters__updated_at', 'topic__updated_at', 'series__updated_at']
     serializer_class = ArticleListSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['status', 'author']
@@ -25,9 +38,12 @@ class ArticleListView(generics.ListCreateAPIView):
     ordering = ['-published_at']
 
     def get_queryset(self):
-        # For public requests, only show published articles
+        # For public requests, only show published articles, of the tenant if available
         if not self.request.user or not self.request.user.is_authenticated:
-            return Article.objects.filter(status='published')
+            queryset = Article.objects.filter(status='published')
+            if getattr(self.request, 'tenant', None):
+                queryset = queryset.filter(account=self.request.tenant)
+            return with_article_relations(queryset)
         
         # For authenticated users, filter by tenant if available
         if hasattr(self.request, 'tenant') and self.request.tenant:
@@ -38,9 +54,9 @@ class ArticleListView(generics.ListCreateAPIView):
         # Non-staff users can only see their own drafts
         if not self.request.user.is_staff:
             queryset = queryset.filter(
-                models.Q(status='published') | models.Q(author=self.request.user)
+                Q(status='published') | Q(author=self.request.user)
             )
-        return queryset
+        return with_article_relations(queryset)
 
     def get_permissions(self):
         if self.request.method == 'POST':
@@ -48,8 +64,10 @@ class ArticleListView(generics.ListCreateAPIView):
         return [permissions.AllowAny()]
 
 
-class ArticleDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ArticleDetailView(ResponseCacheMixin, ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update, or delete an article"""
+    validator_fields = ['updated_at', 'counters__updated_at', 'comments__updated_at', 'topic__updated_at',
+                        'series__updated_at', 'related_articles__updated_at']
     lookup_field = 'slug'
     permission_classes = [IsAccountMember]
 
@@ -60,10 +78,15 @@ class ArticleDetailView(generics.RetrieveUpdateDestroyAPIView):
         else:
             queryset = Article.objects.all()
         
-        # For non-authenticated users, only show published articles
-        if not self.request.user.is_authenticated:
+        # Drafts are only visible to account members, their authors and staff
+        user = self.request.user
+        if not user.is_authenticated:
             queryset = queryset.filter(status='published')
-        return queryset
+        elif not (user.is_staff or getattr(self.request, 'account_user', None)):
+            queryset = queryset.filter(Q(status='published') | Q(author=user))
+        return with_article_relations(queryset).prefetch_related(
+            Prefetch('related_articles', queryset=with_article_relations(Article.objects.all()))
+        )
 
     def get_serializer_class(self):
         if self.request.method in ['PUT', 'PATCH']:
@@ -71,10 +94,10 @@ class ArticleDetailView(generics.RetrieveUpdateDestroyAPIView):
         return ArticleDetailSerializer
 
     def get_permissions(self):
-        """Allow authenticated users to view drafts, others only published"""
+        """Anyone can read published articles; get_queryset limits who sees drafts"""
         if self.request.method in ['PUT', 'PATCH', 'DELETE']:
-            return [IsAccountMember, IsArticleAuthorOrEditor()]
-        return [IsAccountMember]
+            return [IsAccountMember(), IsArticleAuthorOrEditor()]
+        return [permissions.AllowAny()]
 
     def check_object_permissions(self, request, obj):
         """Authors can edit their own articles, others can't modify"""
@@ -90,9 +113,28 @@ class ArticleDetailView(generics.RetrieveUpdateDestroyAPIView):
                 raise PermissionDenied("You can only edit your own articles.")
         super().check_object_permissions(request, obj)
 
+    def get_cache_tags(self):
+        article = self.object
+        tags = [article_tag(article.pk)] + [article_tag(related.pk) for related in article.related_articles.all()]
+        if article.topic_id:
+            tags.append(topic_tag(article.topic.slug))
+        if article.series_id:
+            tags.append(series_tag(article.series_id))
+        return tags
+
+    def get_cache_meta(self):
+        return {'article_id': str(self.object.pk)}
+
+    def on_cache_hit(self, entry):
+        # Cached reads still count as views
+        Article.objects.filter(pk=entry['meta']['article_id']).update(view_count=F('view_count') + 1)
+
+    def on_not_modified(self, queryset):
+        queryset.filter(status='published').order_by().update(view_count=F('view_count') + 1)
+
     def retrieve(self, request, *args, **kwargs):
         """Override to increment view count"""
-        instance = self.get_object()
+        instance = self.object = self.get_object()
 
         # Increment view count for published articles
         if instance.status == 'published':
@@ -108,6 +150,27 @@ class ArticleDetailView(generics.RetrieveUpdateDestroyAPIView):
         return super().retrieve(request, *args, **kwargs)
 
 
+class CommentThreadPagination(PageNumberPagination):
+    page_size = COMMENT_THREADS_PAGE_SIZE
+
+
+class ArticleCommentsView(generics.ListAPIView):
+    """Approved comment threads of a published article, paginated by top-level comment"""
+    serializer_class = CommentSerializer
+    pagination_class = CommentThreadPagination
+    permission_classes = [permissions.AllowAny]
+
+    def get_article(self):
+        queryset = Article.objects.filter(status='published')
+        if hasattr(self.request, 'tenant') and self.request.tenant:
+            queryset = queryset.filter(account=self.request.tenant)
+        return get_object_or_404(queryset, slug=self.kwargs['slug'])
+
+    def get_queryset(self):
+        # Threads are assembled from a single query; replies ride along on each root
+        return load_comment_threads(self.get_article())
+
+
 @api_view(['PATCH'])
 @permission_classes([IsAccountMember, CanPublishArticles])
 def publish_article(request, slug):
@@ -142,11 +205,16 @@ def publish_article(request, slug):
     return Response(serializer.data)
 
 
-class TopicListView(generics.ListCreateAPIView):
+class TopicListView(ResponseCacheMixin, ConditionalGetMixin, generics.ListCreateAPIView):
     """List topics and create new topics"""
+    # Topic cards show published article counts
+    validator_fields = ['updated_at', 'articles__updated_at']
+
     def get_queryset(self):
-        # For public requests, show all topics
+        # For public requests, show all topics, of the tenant if available
         if not self.request.user or not self.request.user.is_authenticated:
+            if getattr(self.request, 'tenant', None):
+                return Topic.objects.filter(account=self.request.tenant)
             return Topic.objects.all()
         
         # For authenticated users, filter by tenant if available
@@ -168,8 +236,10 @@ class TopicListView(generics.ListCreateAPIView):
     ordering = ['name']
 
 
-class TopicDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TopicDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update, or delete a topic"""
+    validator_fields = ['updated_at', 'articles__updated_at']
+
     def get_queryset(self):
         # Filter by tenant if available
         if hasattr(self.request, 'tenant') and self.request.tenant:
@@ -182,14 +252,18 @@ class TopicDetailView(generics.RetrieveUpdateDestroyAPIView):
     lookup_field = 'slug'
 
 
-class TopicArticlesView(generics.ListAPIView):
+class TopicArticlesView(ResponseCacheMixin, ConditionalGetMixin, generics.ListAPIView):
     """List articles for a specific topic"""
+    validator_fields = ['updated_at', 'counters__updated_at', 'topic__updated_at', 'series__updated_at']
     serializer_class = ArticleListSerializer
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['status']
     ordering_fields = ['published_at', 'created_at', 'view_count']
     ordering = ['-published_at']
 
+    def get_cache_tags(self):
+        return [topic_tag(self.kwargs['slug'])]
+
     def get_queryset(self):
         # Filter by tenant if available
         if hasattr(self.request, 'tenant') and self.request.tenant:
@@ -201,7 +275,7 @@ class TopicArticlesView(generics.ListAPIView):
         # For non-authenticated users, only show published articles
         if not self.request.user.is_authenticated:
             queryset = queryset.filter(status='published')
-        return queryset
+        return with_article_relations(queryset)
 
 
 class PageListView(generics.ListCreateAPIView):
@@ -285,4 +359,4 @@ class SeriesArticlesView(generics.ListAPIView):
         if not self.request.user.is_authenticated:
             queryset = queryset.filter(status='published')
 
-        return queryset.order_by('series_order', '-published_at')
+        return with_article_relations(queryset).order_by('series_order', '-published_at')
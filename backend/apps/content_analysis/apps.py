@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class ContentAnalysisConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.content_analysis'
+
+    def ready(self):
+        import apps.content_analysis.signals  # noqa
@@ -0,0 +1,123 @@
+"""
+Bulk text analysis engine
+Requested analyses are deduplicated by content hash, answered from the result
+cache where possible, and only the remaining texts are analyzed. Inside a web
+process those run on a process pool, since the analyzers are CPU-bound Python;
+asynchronous jobs fan them out to Celery workers as a group of chunks.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, List, Tuple
+
+from django.conf import settings
+
+from . import textcore
+from .result_cache import analysis_cache, text_hash
+
+logger = logging.getLogger(__name__)
+
+BULK_ANALYSIS_WORKERS = getattr(settings, 'BULK_ANALYSIS_WORKERS', min(4, os.cpu_count() or 1))
+# Smaller batches are analyzed inline; handing them to the pool costs more than it saves
+BULK_ANALYSIS_POOL_MIN_TEXTS = getattr(settings, 'BULK_ANALYSIS_POOL_MIN_TEXTS', 4)
+BULK_ANALYSIS_CHUNK_SIZE = getattr(settings, 'BULK_ANALYSIS_CHUNK_SIZE', 25)
+BULK_ANALYSIS_JOB_MAX_TEXTS = getattr(settings, 'BULK_ANALYSIS_JOB_MAX_TEXTS', 1000)
+
+# (text hash, analysis type, language)
+AnalysisKey = Tuple[str, str, str]
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def analysis_key(item: Dict) -> AnalysisKey:
+    return text_hash(item['text_content']), item.get('analysis_type', 'comprehensive'), item.get('language', 'en')
+
+
+def _analyze_one(job: Tuple[str, str]) -> Dict:
+    text, analysis_type = job
+    return textcore.analyze(text, analysis_type)
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=BULK_ANALYSIS_WORKERS)
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _can_use_pool(count: int) -> bool:
+    # Daemonic processes (e.g. Celery prefork workers) may not start children
+    return (
+        BULK_ANALYSIS_WORKERS > 1
+        and count >= BULK_ANALYSIS_POOL_MIN_TEXTS
+        and not multiprocessing.current_process().daemon
+    )
+
+
+def compute(jobs: List[Tuple[str, str]]) -> List[Dict]:
+    """Analyze (text, analysis type) pairs, on the process pool when it pays off"""
+    if _can_use_pool(len(jobs)):
+        chunksize = max(1, len(jobs) // (BULK_ANALYSIS_WORKERS * 4))
+        try:
+            return list(_get_pool().map(_analyze_one, jobs, chunksize=chunksize))
+        except BrokenProcessPool:
+            logger.warning("Bulk analysis pool broke; analyzing the batch inline")
+            _reset_pool()
+    return [_analyze_one(job) for job in jobs]
+
+
+def split_cached(items: Iterable[Dict]) -> Tuple[Dict[AnalysisKey, Dict], Dict[AnalysisKey, Dict]]:
+    """
+    Deduplicate requested analyses and look each distinct one up in the cache.
+    Returns the cached results and the items still to analyze, both by key.
+    """
+    cached = {}
+    missing = {}
+    for item in items:
+        key = analysis_key(item)
+        if key in cached or key in missing:
+            continue
+        results = analysis_cache.get(*key)
+        if results is not None:
+            cached[key] = results
+        else:
+            missing[key] = item
+    return cached, missing
+
+
+def analyze_items(items: Dict[AnalysisKey, Dict]) -> Dict[AnalysisKey, Dict]:
+    """Analyze items by key and store the results in the cache"""
+    keys = list(items)
+    results = compute([(items[key]['text_content'], key[1]) for key in keys])
+    for key, result in zip(keys, results):
+        analysis_cache.set(*key, result)
+    return dict(zip(keys, results))
+
+
+def analyze_batch(items: List[Dict]) -> List[Tuple[Dict, bool]]:
+    """(results, cached) for each requested analysis, in request order"""
+    cached, missing = split_cached(items)
+    computed = analyze_items(missing) if missing else {}
+
+    answered = []
+    for item in items:
+        key = analysis_key(item)
+        if key in cached:
+            answered.append((cached[key], True))
+        else:
+            answered.append((computed[key], False))
+    return answered
@@ -0,0 +1,91 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.articles.models import Article
+from apps.content_analysis import textcore
+
+VOCABULARY = (
+    'the a of and to in is that for it as with was on be by this are from or have an they which one you had '
+    'not but what all were when we there can been has more if will would about their out up into them some '
+    'publishing editorial subscription readability newsletter audience engagement analytics distribution '
+    'independent journalism investigation community storytelling collaboration infrastructure performance'
+).split()
+
+
+def synthetic_corpus(documents: int, words: int, seed: int = 42):
+    """Deterministic long articles with varied sentence lengths and paragraphs"""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(documents):
+        paragraphs, sentence, paragraph = [], [], []
+        for _ in range(words):
+            sentence.append(rng.choice(VOCABULARY))
+            if len(sentence) >= rng.randint(8, 30):
+                paragraph.append(' '.join(sentence).capitalize() + rng.choice('..!?'))
+                sentence = []
+            if len(paragraph) >= 5:
+                paragraphs.append(' '.join(paragraph))
+                paragraph = []
+        paragraphs.append(' '.join(paragraph + [' '.join(sentence)]))
+        corpus.append('An independent look at publishing infrastructure today\n' + '\n\n'.join(paragraphs))
+    return corpus
+
+
+def _timed(callable_, corpus, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for text in corpus:
+            callable_(text)
+    return time.perf_counter() - started
+
+
+def _separate_passes(text):
+    # Every analyzer tokenizing on its own, as each used to scan the text itself
+    readability = textcore.readability(textcore.tokenize(text))
+    textcore.combine(
+        textcore.check_grammar(textcore.tokenize(text)),
+        readability,
+        textcore.analyze_seo(textcore.tokenize(text), textcore.readability(textcore.tokenize(text))),
+    )
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the text analysis core over a corpus of long articles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--documents', type=int, default=50, help='Synthetic documents to generate')
+        parser.add_argument('--words', type=int, default=3000, help='Words per synthetic document')
+        parser.add_argument('--from-articles', action='store_true', help='Use stored articles instead')
+        parser.add_argument('--repeat', type=int, default=3, help='Passes over the corpus per measurement')
+
+    def handle(self, *args, **options):
+        if options['from_articles']:
+            corpus = list(Article.objects.exclude(content='').values_list('content', flat=True)[:options['documents']])
+        else:
+            corpus = synthetic_corpus(options['documents'], options['words'])
+        if not corpus:
+            raise CommandError('No documents to benchmark')
+
+        repeat = options['repeat']
+        total_words = sum(textcore.tokenize(text).word_count for text in corpus) * repeat
+        textcore.word_syllables.cache_clear()
+
+        results = [
+            ('tokenize (cold syllable cache)', _timed(textcore.tokenize, corpus, 1) * repeat),
+            ('tokenize', _timed(textcore.tokenize, corpus, repeat)),
+            ('comprehensive, shared tokens', _timed(textcore.analyze, corpus, repeat)),
+            ('comprehensive, separate passes', _timed(_separate_passes, corpus, repeat)),
+        ]
+
+        self.stdout.write(f'{len(corpus)} documents, {total_words // repeat} words, {repeat} passes')
+        for label, seconds in results:
+            per_document = seconds / (len(corpus) * repeat) * 1000
+            rate = total_words / seconds if seconds else 0
+            self.stdout.write(f'{label:<34} {per_document:8.2f} ms/doc {rate:12,.0f} words/s')
+
+        info = textcore.word_syllables.cache_info()
+        self.stdout.write(self.style.SUCCESS(
+            f'Syllable cache: {info.hits} hits, {info.misses} misses, {info.currsize} words'
+        ))
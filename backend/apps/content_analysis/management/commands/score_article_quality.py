@@ -0,0 +1,37 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.accounts.models import Account
+from apps.content_analysis.quality import quality_report, score_account_articles
+
+
+class Command(BaseCommand):
+    help = 'Score readability, grammar and SEO quality of every article of one or more accounts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--account', action='append', dest='accounts',
+                            help='Account slug to score (repeatable)')
+        parser.add_argument('--all-accounts', action='store_true', help='Score every account')
+        parser.add_argument('--force', action='store_true', help='Rescore articles whose content is unchanged')
+        parser.add_argument('--batch-size', type=int, help='Articles analyzed per batch')
+        parser.add_argument('--report', action='store_true', help='Print each account report as JSON')
+
+    def handle(self, *args, **options):
+        if options['all_accounts']:
+            accounts = Account.objects.order_by('slug')
+        elif options['accounts']:
+            accounts = Account.objects.filter(slug__in=options['accounts']).order_by('slug')
+            missing = set(options['accounts']) - {account.slug for account in accounts}
+            if missing:
+                raise CommandError(f"Unknown accounts: {', '.join(sorted(missing))}")
+        else:
+            raise CommandError('Pass --account or --all-accounts')
+
+        for account in accounts.iterator():
+            result = score_account_articles(account, force=options['force'], batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f'{account.slug}: scored {result.scored} of {result.total} articles ({result.skipped} unchanged)'
+            ))
+            if options['report']:
+                self.stdout.write(json.dumps(quality_report(account), indent=2, default=str))
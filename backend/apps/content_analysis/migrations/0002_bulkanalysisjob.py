@@ -0,0 +1,92 @@
+# Generated by Django 5.0.3 on 2026-10-19 09:12
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0001_initial"),
+        ("content_analysis", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BulkAnalysisJob",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("items", models.JSONField(default=list)),
+                ("results", models.JSONField(default=list)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("completed", "Completed"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "total",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Number of requested analyses"
+                    ),
+                ),
+                (
+                    "unique_texts",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Distinct analyses after deduplication"
+                    ),
+                ),
+                (
+                    "cached",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Distinct analyses answered from the cache"
+                    ),
+                ),
+                (
+                    "completed",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Distinct analyses finished so far"
+                    ),
+                ),
+                ("error", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "account",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="bulk_analysis_jobs",
+                        to="accounts.account",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["account", "status"],
+                        name="content_ana_account_9b9a21_idx",
+                    )
+                ],
+            },
+        ),
+    ]
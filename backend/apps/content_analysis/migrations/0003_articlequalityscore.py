@@ -0,0 +1,66 @@
+# Generated by Django 5.0.3 on 2026-10-19 11:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0001_initial"),
+        ("articles", "0010_topic_updated_at"),
+        ("content_analysis", "0002_bulkanalysisjob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArticleQualityScore",
+            fields=[
+                (
+                    "article",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="quality_score",
+                        serialize=False,
+                        to="articles.article",
+                    ),
+                ),
+                (
+                    "content_hash",
+                    models.CharField(
+                        help_text="SHA256 of the scored title and content",
+                        max_length=64,
+                    ),
+                ),
+                ("analyzer_version", models.PositiveSmallIntegerField(default=0)),
+                ("overall_score", models.FloatField()),
+                ("grammar_score", models.FloatField()),
+                ("grammar_issues", models.PositiveIntegerField(default=0)),
+                ("flesch_reading_ease", models.FloatField()),
+                ("flesch_kincaid_grade", models.FloatField()),
+                ("readability_level", models.CharField(max_length=20)),
+                ("seo_issues", models.PositiveIntegerField(default=0)),
+                ("word_count", models.PositiveIntegerField(default=0)),
+                ("scored_at", models.DateTimeField(auto_now=True)),
+                (
+                    "account",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="article_quality_scores",
+                        to="accounts.account",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["account", "overall_score"],
+                        name="content_ana_account_f1e93a_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.3 on 2026-10-19 19:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("content_analysis", "0003_articlequalityscore"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bulkanalysisjob",
+            name="created_by",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="bulk_analysis_jobs",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+    ]
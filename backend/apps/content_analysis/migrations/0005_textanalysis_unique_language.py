@@ -0,0 +1,38 @@
+# Generated by Django 5.0.3 on 2026-10-19 21:40
+
+from django.db import migrations
+
+
+def dedupe_analyses(apps, schema_editor):
+    """Keep the newest row for each account, text, analysis type and language"""
+    TextAnalysis = apps.get_model('content_analysis', 'TextAnalysis')
+    WritingSuggestion = apps.get_model('content_analysis', 'WritingSuggestion')
+    kept = {}
+    stale = []
+    rows = TextAnalysis.objects.order_by('-updated_at', '-created_at').values_list(
+        'pk', 'account_id', 'text_hash', 'analysis_type', 'language'
+    )
+    for pk, *key in rows.iterator():
+        key = tuple(key)
+        if key in kept:
+            stale.append((pk, kept[key]))
+        else:
+            kept[key] = pk
+    for stale_pk, kept_pk in stale:
+        WritingSuggestion.objects.filter(text_analysis_id=stale_pk).update(text_analysis_id=kept_pk)
+        TextAnalysis.objects.filter(pk=stale_pk).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content_analysis", "0004_bulkanalysisjob_created_by"),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_analyses, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name="textanalysis",
+            unique_together={("account", "text_hash", "analysis_type", "language")},
+        ),
+    ]
@@ -1,9 +1,10 @@
 from django.db import models
 import uuid
 from django.utils import timezone
-from django.core.cache import cache
 import json
-import re
+
+from . import textcore
+from .result_cache import analysis_cache, text_hash
 
 
 class TextAnalysis(models.Model):
@@ -52,7 +53,7 @@ class TextAnalysis(models.Model):
             models.Index(fields=['created_at']),
             models.Index(fields=['cache_expires_at']),
         ]
-        unique_together = [['account', 'text_hash', 'analysis_type']]
+        unique_together = [['account', 'text_hash', 'analysis_type', 'language']]
 
     def __str__(self):
         return f"{self.analysis_type.title()} for {self.account.name if self.account else 'System'}"
@@ -71,260 +72,82 @@ class TextAnalysis(models.Model):
 
     @classmethod
     def get_cached_analysis(cls, text_content, analysis_type, account=None, language='en'):
-        """Get cached analysis results if available"""
-        import hashlib
-        text_hash = hashlib.sha256(text_content.encode()).hexdigest()
-
-        # Check cache first
-        cache_key = f"text_analysis_{text_hash}_{analysis_type}_{language}"
-        cached_results = cache.get(cache_key)
-
-        if cached_results:
-            # Try to get existing analysis instance
-            try:
-                analysis = cls.objects.get(
-                    text_hash=text_hash,
-                    analysis_type=analysis_type,
-                    language=language,
-                    account=account
-                )
-                return analysis
-            except cls.DoesNotExist:
-                pass
-
-        return None
+        """Cached analysis results if available, served without a database query"""
+        return analysis_cache.get(text_hash(text_content), analysis_type, language)
+
+    @classmethod
+    def persist(cls, text_content, analysis_type, results, account=None, language='en'):
+        """Store results for a text, updating the newest existing row for the same content"""
+        # unique_together does not cover NULL accounts, so system rows may already be duplicated
+        matches = cls.objects.filter(
+            account=account,
+            text_hash=text_hash(text_content),
+            analysis_type=analysis_type,
+            language=language,
+        ).order_by('-updated_at', '-created_at')
+        analysis = matches.first()
+        if analysis is None:
+            analysis = cls(
+                account=account,
+                text_hash=text_hash(text_content),
+                analysis_type=analysis_type,
+                language=language,
+            )
+        else:
+            duplicates = matches.exclude(pk=analysis.pk)
+            WritingSuggestion.objects.filter(text_analysis__in=duplicates).update(text_analysis=analysis)
+            duplicates.delete()
+
+        analysis.text_content = text_content
+        analysis.results = results
+        analysis.cache_expires_at = timezone.now() + timezone.timedelta(hours=24)
+        analysis.save()
+        return analysis
 
     def perform_analysis(self):
-        """Perform the requested text analysis"""
-        if self.analysis_type == 'grammar':
-            self.results = self._check_grammar()
-        elif self.analysis_type == 'readability':
-            self.results = self._calculate_readability()
-        elif self.analysis_type == 'seo':
-            self.results = self._analyze_seo()
-        elif self.analysis_type == 'comprehensive':
-            self.results = self._comprehensive_analysis()
+        """Perform the requested text analysis, reusing cached results for identical text"""
+        if self.analysis_type in textcore.ANALYZERS:
+            self.results, self.is_cached = analysis_cache.get_or_compute(
+                self.text_content, self.analysis_type, self.language
+            )
 
         self.save()
         return self.results
 
+    @property
+    def tokens(self):
+        """Tokenized text, computed once and shared by every analyzer"""
+        if getattr(self, '_tokens', None) is None or self._tokens.text != self.text_content:
+            self._tokens = textcore.tokenize(self.text_content)
+        return self._tokens
+
     def _check_grammar(self):
         """Basic grammar checking (expandable to use external services)"""
-        issues = []
-
-        # Basic punctuation checks
-        sentences = re.split(r'[.!?]+', self.text_content)
-        for i, sentence in enumerate(sentences):
-            if sentence.strip():
-                # Check for double spaces
-                if '  ' in sentence:
-                    issues.append({
-                        'type': 'double_space',
-                        'message': 'Double spaces found',
-                        'severity': 'minor',
-                        'position': sentence.find('  ')
-                    })
-
-                # Check for missing spaces after punctuation
-                if re.search(r'[.!?][A-Z]', sentence):
-                    issues.append({
-                        'type': 'spacing_after_punctuation',
-                        'message': 'Missing space after punctuation',
-                        'severity': 'minor'
-                    })
-
-        # Check for repeated words
-        words = re.findall(r'\b\w+\b', self.text_content.lower())
-        for i in range(len(words) - 1):
-            if words[i] == words[i + 1] and len(words[i]) > 3:  # Ignore short words
-                issues.append({
-                    'type': 'repeated_word',
-                    'message': f'Repeated word: "{words[i]}"',
-                    'severity': 'warning',
-                    'word': words[i]
-                })
-
-        return {
-            'issues': issues,
-            'issue_count': len(issues),
-            'score': max(0, 100 - (len(issues) * 5))  # Deduct points for issues
-        }
+        return textcore.check_grammar(self.tokens)
 
     def _calculate_readability(self):
         """Calculate readability scores"""
-        text = self.text_content
-
-        # Basic metrics
-        sentences = len(re.findall(r'[.!?]+', text)) or 1
-        words = len(re.findall(r'\b\w+\b', text)) or 1
-        syllables = self._count_syllables(text)
-        characters = len(text)
-
-        # Average words per sentence
-        avg_words_per_sentence = words / sentences
-
-        # Average syllables per word
-        avg_syllables_per_word = syllables / words
-
-        # Flesch Reading Ease Score
-        flesch_score = 206.835 - (1.015 * avg_words_per_sentence) - (84.6 * avg_syllables_per_word)
-        flesch_score = max(0, min(100, flesch_score))
-
-        # Flesch-Kincaid Grade Level
-        fk_grade = (0.39 * avg_words_per_sentence) + (11.8 * avg_syllables_per_word) - 15.59
-
-        # Determine readability level
-        readability_level = self._get_readability_level(flesch_score)
-
-        return {
-            'flesch_reading_ease': round(flesch_score, 1),
-            'flesch_kincaid_grade': round(fk_grade, 1),
-            'readability_level': readability_level,
-            'metrics': {
-                'total_sentences': sentences,
-                'total_words': words,
-                'total_syllables': syllables,
-                'total_characters': characters,
-                'avg_words_per_sentence': round(avg_words_per_sentence, 1),
-                'avg_syllables_per_word': round(avg_syllables_per_word, 1)
-            }
-        }
+        return textcore.readability(self.tokens)
 
     def _count_syllables(self, text):
         """Count syllables in text (basic implementation)"""
-        text = text.lower()
-        syllables = 0
-
-        # Simple syllable counting
-        words = re.findall(r'\b\w+\b', text)
-        for word in words:
-            word_syllables = 0
-            vowels = "aeiouy"
-            prev_char_was_vowel = False
-
-            for char in word:
-                if char in vowels:
-                    if not prev_char_was_vowel:
-                        word_syllables += 1
-                    prev_char_was_vowel = True
-                else:
-                    prev_char_was_vowel = False
-
-            # Handle silent 'e'
-            if word.endswith('e') and word_syllables > 1:
-                word_syllables -= 1
-
-            # Every word has at least one syllable
-            syllables += max(1, word_syllables)
-
-        return syllables
+        return textcore.count_syllables(text)
 
     def _get_readability_level(self, flesch_score):
         """Determine readability level from Flesch score"""
-        if flesch_score >= 90:
-            return 'Very Easy'
-        elif flesch_score >= 80:
-            return 'Easy'
-        elif flesch_score >= 70:
-            return 'Fairly Easy'
-        elif flesch_score >= 60:
-            return 'Standard'
-        elif flesch_score >= 50:
-            return 'Fairly Difficult'
-        elif flesch_score >= 30:
-            return 'Difficult'
-        else:
-            return 'Very Difficult'
+        return textcore.readability_level(flesch_score)
 
     def _analyze_seo(self):
         """Basic SEO analysis"""
-        issues = []
-        suggestions = []
-
-        # Title analysis (assuming first line is title)
-        lines = self.text_content.split('\n')
-        title = lines[0] if lines else ''
-
-        if len(title) < 30:
-            issues.append({
-                'type': 'title_too_short',
-                'message': 'Title is too short for SEO',
-                'severity': 'warning'
-            })
-        elif len(title) > 60:
-            issues.append({
-                'type': 'title_too_long',
-                'message': 'Title is too long for SEO',
-                'severity': 'warning'
-            })
-
-        # Keyword density (very basic)
-        words = re.findall(r'\b\w+\b', self.text_content.lower())
-        word_freq = {}
-        for word in words:
-            word_freq[word] = word_freq.get(word, 0) + 1
-
-        # Find potential keywords (words appearing more than 3 times)
-        keywords = [word for word, count in word_freq.items() if count > 3 and len(word) > 3]
-
-        # Readability check
-        readability = self._calculate_readability()
-        if readability['flesch_reading_ease'] < 60:
-            suggestions.append('Consider simplifying your language for better SEO reach')
-
-        return {
-            'issues': issues,
-            'suggestions': suggestions,
-            'keywords': keywords[:10],  # Top 10 potential keywords
-            'title_length': len(title),
-            'optimal_title_length': (30, 60),
-            'readability_score': readability['flesch_reading_ease']
-        }
+        return textcore.analyze_seo(self.tokens)
 
     def _comprehensive_analysis(self):
         """Run all analyses"""
-        grammar = self._check_grammar()
-        readability = self._calculate_readability()
-        seo = self._analyze_seo()
-
-        # Overall score (weighted average)
-        weights = {'grammar': 0.3, 'readability': 0.4, 'seo': 0.3}
-        overall_score = (
-            grammar['score'] * weights['grammar'] +
-            readability['flesch_reading_ease'] * weights['readability'] +
-            min(100, seo['readability_score'] + 20) * weights['seo']  # SEO boost
-        )
-
-        return {
-            'overall_score': round(overall_score, 1),
-            'grammar': grammar,
-            'readability': readability,
-            'seo': seo,
-            'summary': self._generate_analysis_summary(grammar, readability, seo)
-        }
+        return textcore.comprehensive(self.tokens)
 
     def _generate_analysis_summary(self, grammar, readability, seo):
         """Generate a human-readable summary"""
-        summary = []
-
-        # Grammar summary
-        if grammar['issue_count'] == 0:
-            summary.append("No grammar issues detected.")
-        else:
-            summary.append(f"Found {grammar['issue_count']} potential grammar issues.")
-
-        # Readability summary
-        level = readability['readability_level']
-        grade = readability['flesch_kincaid_grade']
-        summary.append(f"Readability level: {level} (Grade {grade:.1f})")
-
-        # SEO summary
-        if seo['issues']:
-            summary.append(f"Found {len(seo['issues'])} SEO optimization opportunities.")
-        else:
-            summary.append("Basic SEO requirements met.")
-
-        return summary
+        return textcore.analysis_summary(grammar, readability, seo)
 
 
 class WritingSuggestion(models.Model):
@@ -407,3 +230,89 @@ class WritingSuggestion(models.Model):
             self.suggested_text +
             original_text[end:]
         )
+
+
+class BulkAnalysisJob(models.Model):
+    """
+    Asynchronous bulk analysis of a large batch of texts, polled by the client
+    """
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    account = models.ForeignKey('accounts.Account', on_delete=models.CASCADE,
+                                related_name='bulk_analysis_jobs', null=True, blank=True)
+    # Only the requester may poll the job and read its results
+    created_by = models.ForeignKey('users.User', on_delete=models.CASCADE,
+                                   related_name='bulk_analysis_jobs', null=True, blank=True)
+
+    # Requested analyses as [{text_content, analysis_type, language}], in order
+    items = models.JSONField(default=list)
+    # Results in the order of items, filled in when the job completes
+    results = models.JSONField(default=list)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    total = models.PositiveIntegerField(default=0, help_text="Number of requested analyses")
+    unique_texts = models.PositiveIntegerField(default=0, help_text="Distinct analyses after deduplication")
+    cached = models.PositiveIntegerField(default=0, help_text="Distinct analyses answered from the cache")
+    completed = models.PositiveIntegerField(default=0, help_text="Distinct analyses finished so far")
+    error = models.TextField(blank=True)
+
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['account', 'status']),
+        ]
+
+    def __str__(self):
+        return f"Bulk analysis of {self.total} texts ({self.status})"
+
+    @property
+    def progress(self):
+        return round(self.completed / self.unique_texts * 100, 1) if self.unique_texts else 100.0
+
+
+class ArticleQualityScore(models.Model):
+    """
+    Compact quality scores of an article's current version, for tenant reports
+    """
+
+    article = models.OneToOneField('articles.Article', on_delete=models.CASCADE,
+                                   primary_key=True, related_name='quality_score')
+    # Denormalized so tenant reports aggregate without joining articles
+    account = models.ForeignKey('accounts.Account', on_delete=models.CASCADE,
+                                related_name='article_quality_scores', null=True, blank=True)
+
+    # Version of the scored text; reruns skip articles whose hash is unchanged
+    content_hash = models.CharField(max_length=64, help_text="SHA256 of the scored title and content")
+    analyzer_version = models.PositiveSmallIntegerField(default=0)
+
+    overall_score = models.FloatField()
+    grammar_score = models.FloatField()
+    grammar_issues = models.PositiveIntegerField(default=0)
+    flesch_reading_ease = models.FloatField()
+    flesch_kincaid_grade = models.FloatField()
+    readability_level = models.CharField(max_length=20)
+    seo_issues = models.PositiveIntegerField(default=0)
+    word_count = models.PositiveIntegerField(default=0)
+
+    scored_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['account', 'overall_score']),
+        ]
+
+    def __str__(self):
+        return f"Quality {self.overall_score} for article {self.article_id}"
@@ -0,0 +1,148 @@
+"""
+Tenant-wide article quality scoring
+Articles of an account are streamed in batches, analyzed on the bulk analysis
+pool and stored as compact ArticleQualityScore rows keyed by the hash of the
+scored text. Reruns skip articles whose text and analyzer version are
+unchanged, and tenant reports aggregate the stored rows instead of articles.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Avg, Count, Max, Min, Q
+
+from apps.articles.models import Article
+from . import bulk
+from .models import ArticleQualityScore
+from .result_cache import ANALYZER_VERSION, text_hash
+
+logger = logging.getLogger(__name__)
+
+QUALITY_SCORE_BATCH_SIZE = getattr(settings, 'QUALITY_SCORE_BATCH_SIZE', 200)
+QUALITY_REPORT_LOWEST = 10
+
+SUMMARY_FIELDS = [
+    'overall_score', 'grammar_score', 'grammar_issues', 'flesch_reading_ease',
+    'flesch_kincaid_grade', 'readability_level', 'seo_issues', 'word_count',
+]
+
+
+@dataclass
+class ScoringResult:
+    total: int = 0
+    scored: int = 0
+    skipped: int = 0
+
+
+def article_text(title: str, content: str) -> str:
+    # The title goes first so the SEO analyzer checks it as the headline
+    return f"{title}\n\n{content}"
+
+
+def summarize(results: Dict) -> Dict:
+    """Compact score summary of a comprehensive analysis"""
+    return {
+        'overall_score': results['overall_score'],
+        'grammar_score': results['grammar']['score'],
+        'grammar_issues': results['grammar']['issue_count'],
+        'flesch_reading_ease': results['readability']['flesch_reading_ease'],
+        'flesch_kincaid_grade': results['readability']['flesch_kincaid_grade'],
+        'readability_level': results['readability']['readability_level'],
+        'seo_issues': len(results['seo']['issues']),
+        'word_count': results['readability']['metrics']['total_words'],
+    }
+
+
+def _pending_batches(account, force: bool, batch_size: int,
+                     result: ScoringResult) -> Iterator[List[Tuple[str, str, str]]]:
+    """Batches of (article id, text, hash) whose stored score is missing or stale"""
+    scored = {} if force else dict(
+        ArticleQualityScore.objects
+        .filter(account=account, analyzer_version=ANALYZER_VERSION)
+        .values_list('article_id', 'content_hash')
+    )
+    articles = (
+        Article.objects.filter(account=account)
+        .order_by()
+        .values_list('id', 'title', 'content')
+        .iterator(chunk_size=batch_size)
+    )
+
+    batch = []
+    for article_id, title, content in articles:
+        result.total += 1
+        text = article_text(title, content)
+        digest = text_hash(text)
+        if scored.get(article_id) == digest:
+            result.skipped += 1
+            continue
+        batch.append((article_id, text, digest))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def score_account_articles(account, force: bool = False, batch_size: Optional[int] = None) -> ScoringResult:
+    """Score every article of an account whose text changed since it was last scored"""
+    batch_size = batch_size or QUALITY_SCORE_BATCH_SIZE
+    result = ScoringResult()
+
+    for batch in _pending_batches(account, force, batch_size, result):
+        analyses = bulk.compute([(text, 'comprehensive') for _, text, _ in batch])
+        ArticleQualityScore.objects.bulk_create(
+            [
+                ArticleQualityScore(
+                    article_id=article_id,
+                    account=account,
+                    content_hash=digest,
+                    analyzer_version=ANALYZER_VERSION,
+                    **summarize(analysis),
+                )
+                for (article_id, _, digest), analysis in zip(batch, analyses)
+            ],
+            update_conflicts=True,
+            unique_fields=['article'],
+            update_fields=['content_hash', 'analyzer_version', 'scored_at'] + SUMMARY_FIELDS,
+        )
+        result.scored += len(batch)
+
+    logger.info(
+        f"Scored {result.scored} of {result.total} articles for account "
+        f"{account.pk if account else 'none'} ({result.skipped} unchanged)"
+    )
+    return result
+
+
+def quality_report(account) -> Dict:
+    """Aggregate quality of an account's scored articles"""
+    scores = ArticleQualityScore.objects.filter(account=account)
+    report = scores.aggregate(
+        articles=Count('pk'),
+        average_overall=Avg('overall_score'),
+        lowest_overall=Min('overall_score'),
+        highest_overall=Max('overall_score'),
+        average_grammar=Avg('grammar_score'),
+        average_reading_ease=Avg('flesch_reading_ease'),
+        average_grade=Avg('flesch_kincaid_grade'),
+        with_grammar_issues=Count('pk', filter=Q(grammar_issues__gt=0)),
+        with_seo_issues=Count('pk', filter=Q(seo_issues__gt=0)),
+        last_scored_at=Max('scored_at'),
+    )
+    for key in ['average_overall', 'average_grammar', 'average_reading_ease', 'average_grade']:
+        if report[key] is not None:
+            report[key] = round(report[key], 1)
+
+    report['readability_levels'] = dict(
+        scores.order_by().values_list('readability_level').annotate(count=Count('pk'))
+    )
+    report['lowest_scoring'] = [
+        {'article_id': str(article_id), 'title': title, 'overall_score': overall_score}
+        for article_id, title, overall_score in scores.order_by('overall_score').values_list(
+            'article_id', 'article__title', 'overall_score'
+        )[:QUALITY_REPORT_LOWEST]
+    ]
+    return report
@@ -0,0 +1,155 @@
+"""
+Text analysis result cache
+Results are keyed by content hash, analysis type and language, and looked up
+in a small per-process LRU before the shared cache. Hits are served without
+touching the database; TextAnalysis rows are only written when a caller asks
+for the analysis to be persisted. Hit and miss counts per tier are tallied in
+process and added to the shared cache in batches.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import textcore
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_CACHE_TIMEOUT = getattr(settings, 'TEXT_ANALYSIS_CACHE_TIMEOUT', 60 * 60 * 24)
+LOCAL_CACHE_SIZE = getattr(settings, 'TEXT_ANALYSIS_LOCAL_CACHE_SIZE', 512)
+# Metric counts are flushed to the shared cache after this many lookups or seconds
+METRICS_FLUSH_COUNT = getattr(settings, 'TEXT_ANALYSIS_METRICS_FLUSH_COUNT', 100)
+METRICS_FLUSH_INTERVAL = getattr(settings, 'TEXT_ANALYSIS_METRICS_FLUSH_INTERVAL', 30)
+# Bump whenever analyzer output changes so stale results are not served
+ANALYZER_VERSION = 2
+
+METRICS = ('local_hits', 'shared_hits', 'misses')
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def result_key(digest: str, analysis_type: str, language: str) -> str:
+    return f"text_analysis:{ANALYZER_VERSION}:{digest}:{analysis_type}:{language}"
+
+
+def _metric_key(name: str) -> str:
+    return f"text_analysis_cache:metrics:{name}"
+
+
+class AnalysisCache:
+    """Process-local LRU in front of the shared cache"""
+
+    def __init__(self, local_size: int = LOCAL_CACHE_SIZE):
+        self.local_size = local_size
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending_metrics = Counter()
+        self._flushed_at = time.monotonic()
+
+    def _local_get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            results = self._local.get(key)
+            if results is not None:
+                self._local.move_to_end(key)
+            return results
+
+    def _local_set(self, key: str, results: Dict):
+        with self._lock:
+            self._local[key] = results
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+
+    def _count(self, name: str):
+        with self._lock:
+            self._pending_metrics[name] += 1
+            due = (
+                sum(self._pending_metrics.values()) >= METRICS_FLUSH_COUNT
+                or time.monotonic() - self._flushed_at >= METRICS_FLUSH_INTERVAL
+            )
+        if due:
+            self.flush_metrics()
+
+    def flush_metrics(self):
+        """Add this process's pending metric counts to the shared cache"""
+        with self._lock:
+            pending, self._pending_metrics = self._pending_metrics, Counter()
+            self._flushed_at = time.monotonic()
+        for name, count in pending.items():
+            try:
+                cache.incr(_metric_key(name), count)
+            except ValueError:
+                cache.add(_metric_key(name), 0, None)
+                cache.incr(_metric_key(name), count)
+
+    def get(self, digest: str, analysis_type: str, language: str = 'en') -> Optional[Dict]:
+        key = result_key(digest, analysis_type, language)
+        results = self._local_get(key)
+        if results is not None:
+            self._count('local_hits')
+            return results
+
+        results = cache.get(key)
+        if results is not None:
+            self._local_set(key, results)
+            self._count('shared_hits')
+            return results
+
+        self._count('misses')
+        return None
+
+    def set(self, digest: str, analysis_type: str, language: str, results: Dict):
+        key = result_key(digest, analysis_type, language)
+        cache.set(key, results, ANALYSIS_CACHE_TIMEOUT)
+        self._local_set(key, results)
+
+    def get_or_compute(self, text: str, analysis_type: str, language: str = 'en') -> Tuple[Dict, bool]:
+        """Results for a text and whether they came from the cache"""
+        digest = text_hash(text)
+        results = self.get(digest, analysis_type, language)
+        if results is not None:
+            return results, True
+        results = textcore.analyze(text, analysis_type)
+        self.set(digest, analysis_type, language, results)
+        return results, False
+
+    def contains(self, text: str, analysis_type: str, language: str = 'en') -> bool:
+        """Whether the shared cache holds a result, without touching the metrics"""
+        return cache.get(result_key(text_hash(text), analysis_type, language)) is not None
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+
+    def metrics(self) -> Dict:
+        self.flush_metrics()
+        counts = cache.get_many([_metric_key(name) for name in METRICS])
+        result = {name: counts.get(_metric_key(name), 0) for name in METRICS}
+        lookups = sum(result.values())
+        result['hit_ratio'] = round((result['local_hits'] + result['shared_hits']) / lookups, 3) if lookups else 0.0
+        return result
+
+    def reset_metrics(self):
+        with self._lock:
+            self._pending_metrics.clear()
+            self._flushed_at = time.monotonic()
+        cache.delete_many([_metric_key(name) for name in METRICS])
+
+
+analysis_cache = AnalysisCache()
+
+
+def warm_text(text: str, language: str = 'en', analysis_type: str = 'comprehensive') -> bool:
+    """Analyze text ahead of the first request; returns False when it was already cached"""
+    if not text or analysis_type not in textcore.ANALYZERS or analysis_cache.contains(text, analysis_type, language):
+        return False
+    analysis_cache.set(text_hash(text), analysis_type, language, textcore.analyze(text, analysis_type))
+    return True
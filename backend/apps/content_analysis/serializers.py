@@ -1,5 +1,7 @@
 from rest_framework import serializers
-from .models import TextAnalysis, WritingSuggestion
+from .bulk import BULK_ANALYSIS_JOB_MAX_TEXTS
+from .models import BulkAnalysisJob, TextAnalysis, WritingSuggestion
+from .result_cache import analysis_cache
 
 
 class TextAnalysisSerializer(serializers.ModelSerializer):
@@ -14,22 +16,20 @@ class TextAnalysisSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'results', 'created_at', 'is_cached']
 
     def create(self, validated_data):
-        # Get or create cached analysis
-        existing = TextAnalysis.get_cached_analysis(
-            text_content=validated_data['text_content'],
-            analysis_type=validated_data['analysis_type'],
-            account=self.context.get('request').account if hasattr(self.context.get('request'), 'account') else None,
-            language=validated_data.get('language', 'en')
+        # Results come from the analysis cache; creating through the API persists them
+        request = self.context.get('request')
+        language = validated_data.get('language', 'en')
+        results, cached = analysis_cache.get_or_compute(
+            validated_data['text_content'], validated_data['analysis_type'], language
         )
-
-        if existing and existing.results:
-            # Return cached results
-            existing.is_cached = True
-            return existing
-
-        # Create new analysis
-        analysis = TextAnalysis.objects.create(**validated_data)
-        analysis.perform_analysis()
+        analysis = TextAnalysis.persist(
+            validated_data['text_content'],
+            validated_data['analysis_type'],
+            results,
+            account=getattr(request, 'account', None),
+            language=language,
+        )
+        analysis.is_cached = cached
         return analysis
 
 
@@ -54,6 +54,7 @@ class TextAnalysisRequestSerializer(serializers.Serializer):
         default='comprehensive'
     )
     language = serializers.CharField(max_length=10, default='en')
+    persist = serializers.BooleanField(default=False, help_text="Store the analysis so it can be listed later")
 
     def validate_text_content(self, value):
         """Validate that text content is not empty and not too short"""
@@ -75,6 +76,38 @@ class BulkTextAnalysisSerializer(serializers.Serializer):
         return value
 
 
+class BulkAnalysisJobRequestSerializer(serializers.Serializer):
+    """Serializer for asynchronous bulk analysis job requests"""
+    analyses = TextAnalysisRequestSerializer(many=True)
+
+    def validate_analyses(self, value):
+        """Validate that the batch is not empty and within the job limit"""
+        if not value:
+            raise serializers.ValidationError("At least one analysis is required")
+        if len(value) > BULK_ANALYSIS_JOB_MAX_TEXTS:
+            raise serializers.ValidationError(
+                f"Maximum {BULK_ANALYSIS_JOB_MAX_TEXTS} analyses per bulk job"
+            )
+        return value
+
+
+class BulkAnalysisJobSerializer(serializers.ModelSerializer):
+    """Serializer for polling bulk analysis jobs; results are included once completed"""
+    progress = serializers.FloatField(read_only=True)
+    results = serializers.SerializerMethodField()
+
+    class Meta:
+        model = BulkAnalysisJob
+        fields = [
+            'id', 'status', 'total', 'unique_texts', 'cached', 'completed',
+            'progress', 'error', 'results', 'created_at', 'finished_at'
+        ]
+        read_only_fields = fields
+
+    def get_results(self, obj):
+        return obj.results if obj.status == 'completed' else None
+
+
 class AnalysisResultSerializer(serializers.Serializer):
     """Serializer for formatted analysis results"""
 
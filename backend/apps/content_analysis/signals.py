@@ -0,0 +1,16 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.articles.models import Article
+from .tasks import warm_article_analysis
+
+
+@receiver(post_save, sender=Article)
+def warm_analysis_on_article_save(sender, instance, update_fields=None, **kwargs):
+    """Analyze saved article content ahead of the editor's first request"""
+    if update_fields and set(update_fields) <= {'view_count'}:
+        return
+    if instance.content:
+        article_id = str(instance.pk)
+        transaction.on_commit(lambda: warm_article_analysis.delay(article_id))
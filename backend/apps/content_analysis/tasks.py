@@ -0,0 +1,161 @@
+"""Celery tasks for content analysis"""
+
+import logging
+
+from celery import chord
+from django.db.models import F
+from django.utils import timezone
+
+from apps.articles.models import Article
+from config.celery import app
+from . import bulk
+from .models import BulkAnalysisJob
+from .result_cache import analysis_cache, text_hash, warm_text
+
+logger = logging.getLogger(__name__)
+
+
+@app.task(bind=True, max_retries=3)
+def warm_article_analysis(self, article_id: str):
+    """
+    Cache the comprehensive analysis of an article's current content
+    """
+    try:
+        content = Article.objects.filter(id=article_id).values_list('content', flat=True).first()
+        if content is None:
+            logger.error(f"Article {article_id} not found")
+            return "Article not found"
+        warmed = warm_text(content)
+        return f"Warmed analysis for article {article_id}" if warmed else "Analysis already cached"
+
+    except Exception as e:
+        logger.error(f"Error warming analysis for article {article_id}: {str(e)}")
+        raise self.retry(countdown=60, exc=e)
+
+
+@app.task(bind=True, max_retries=3)
+def run_bulk_analysis_job(self, job_id: str):
+    """
+    Answer a bulk analysis job's cached texts and fan the rest out in chunks
+    """
+    try:
+        job = BulkAnalysisJob.objects.get(id=job_id)
+    except BulkAnalysisJob.DoesNotExist:
+        logger.error(f"Bulk analysis job {job_id} not found")
+        return "Job not found"
+
+    try:
+        cached, missing = bulk.split_cached(job.items)
+        job.status = 'running'
+        job.unique_texts = len(cached) + len(missing)
+        job.cached = job.completed = len(cached)
+        job.save(update_fields=['status', 'unique_texts', 'cached', 'completed', 'updated_at'])
+
+        if not missing:
+            return finish_bulk_analysis_job([], job_id)
+
+        items = [
+            [item['text_content'], key[1], key[2]]
+            for key, item in missing.items()
+        ]
+        size = bulk.BULK_ANALYSIS_CHUNK_SIZE
+        header = [analyze_text_chunk.s(job_id, items[i:i + size]) for i in range(0, len(items), size)]
+        callback = finish_bulk_analysis_job.s(job_id).on_error(fail_bulk_analysis_job.si(job_id))
+        chord(header)(callback)
+        return f"Dispatched {len(header)} chunks for job {job_id}"
+
+    except Exception as e:
+        logger.error(f"Error starting bulk analysis job {job_id}: {str(e)}")
+        if self.request.retries >= self.max_retries:
+            BulkAnalysisJob.objects.filter(id=job_id).update(
+                status='failed', error='The job could not be started', finished_at=timezone.now()
+            )
+        raise self.retry(countdown=60, exc=e)
+
+
+@app.task(bind=True, max_retries=3)
+def analyze_text_chunk(self, job_id: str, items: list):
+    """
+    Analyze one chunk of a bulk job; returns [text hash, type, language, results] rows
+    """
+    try:
+        rows = []
+        for text, analysis_type, language in items:
+            results, _ = analysis_cache.get_or_compute(text, analysis_type, language)
+            rows.append([text_hash(text), analysis_type, language, results])
+        BulkAnalysisJob.objects.filter(id=job_id).update(completed=F('completed') + len(rows))
+        return rows
+
+    except Exception as e:
+        logger.error(f"Error analyzing chunk of bulk job {job_id}: {str(e)}")
+        raise self.retry(countdown=60, exc=e)
+
+
+@app.task
+def finish_bulk_analysis_job(chunk_rows: list, job_id: str):
+    """
+    Aggregate chunk results and cached results into the job, in request order
+    """
+    job = BulkAnalysisJob.objects.get(id=job_id)
+    computed = {
+        (digest, analysis_type, language): results
+        for rows in chunk_rows
+        for digest, analysis_type, language, results in rows
+    }
+
+    results = []
+    for item in job.items:
+        key = bulk.analysis_key(item)
+        if key in computed:
+            item_results, cached = computed[key], False
+        else:
+            # Answered from the cache when the job started; recompute if it has been evicted since
+            item_results, cached = analysis_cache.get_or_compute(item['text_content'], key[1], key[2])
+        results.append({
+            'text_hash': key[0],
+            'analysis_type': key[1],
+            'language': key[2],
+            'results': item_results,
+            'is_cached': cached,
+        })
+
+    job.results = results
+    job.status = 'completed'
+    job.completed = job.unique_texts
+    job.finished_at = timezone.now()
+    job.save(update_fields=['results', 'status', 'completed', 'finished_at', 'updated_at'])
+    return f"Completed bulk analysis job {job_id}"
+
+
+@app.task
+def fail_bulk_analysis_job(job_id: str):
+    """Mark a bulk job failed once one of its chunks has given up"""
+    BulkAnalysisJob.objects.filter(id=job_id).update(
+        status='failed', error='One or more chunks failed', finished_at=timezone.now()
+    )
+
+
+@app.task(bind=True, max_retries=3)
+def score_account_quality(self, account_id: str, force: bool = False):
+    """
+    Score every changed article of an account and return the tenant report
+    """
+    from apps.accounts.models import Account
+    from .quality import quality_report, score_account_articles
+
+    try:
+        account = Account.objects.get(id=account_id)
+    except Account.DoesNotExist:
+        logger.error(f"Account {account_id} not found")
+        return "Account not found"
+
+    try:
+        result = score_account_articles(account, force=force)
+        report = quality_report(account)
+        report['scored'] = result.scored
+        report['skipped'] = result.skipped
+        return report
+
+    except Exception as e:
+        logger.error(f"Error scoring article quality for account {account_id}: {str(e)}")
+        raise self.retry(countdown=60, exc=e)
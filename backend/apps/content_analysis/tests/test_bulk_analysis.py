@@ -0,0 +1,116 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.content_analysis import bulk, tasks, textcore
+from apps.content_analysis.models import BulkAnalysisJob
+from apps.content_analysis.result_cache import analysis_cache, warm_text
+from apps.content_analysis.views import TextAnalysisViewSet
+
+User = get_user_model()
+
+TEXTS = [f'Article number {i} explains publishing workflows. Editors review drafts daily.' for i in range(6)]
+
+
+class BulkAnalysisTestCase(TestCase):
+    """Test deduplicated, parallel and asynchronous bulk analysis"""
+
+    def setUp(self):
+        cache.clear()
+        analysis_cache.clear_local()
+        self.user = User.objects.create_user(username='writer', email='writer@example.com', password='pass12345')
+
+    def _call(self, method, action, path, payload=None, **kwargs):
+        factory = APIRequestFactory()
+        if method == 'post':
+            request = factory.post(path, payload, format='json')
+        else:
+            request = factory.get(path)
+        force_authenticate(request, user=self.user)
+        return TextAnalysisViewSet.as_view({method: action})(request, **kwargs)
+
+    def test_batch_deduplicates_and_answers_cached_texts(self):
+        warm_text(TEXTS[0])
+        items = [{'text_content': text} for text in [TEXTS[0], TEXTS[1], TEXTS[1]]]
+
+        with mock.patch.object(bulk, 'compute', wraps=bulk.compute) as compute:
+            answered = bulk.analyze_batch(items)
+
+        compute.assert_called_once_with([(TEXTS[1], 'comprehensive')])
+        self.assertEqual([cached for _, cached in answered], [True, False, False])
+        self.assertEqual(answered[2][0], textcore.analyze(TEXTS[1]))
+
+    def test_process_pool_matches_inline_results(self):
+        jobs = [(text, 'comprehensive') for text in TEXTS]
+
+        with mock.patch.object(bulk, 'BULK_ANALYSIS_WORKERS', 2):
+            pooled = bulk.compute(jobs)
+        bulk._reset_pool()
+
+        self.assertEqual(pooled, [textcore.analyze(text) for text in TEXTS])
+
+    def test_bulk_analyze_endpoint_keeps_request_order(self):
+        payload = {'analyses': [{'text_content': text, 'analysis_type': 'readability'} for text in TEXTS[:3]]}
+
+        with mock.patch.object(bulk, 'BULK_ANALYSIS_WORKERS', 1):
+            response = self._call('post', 'bulk_analyze', '/api/content-analysis/text-analysis/bulk_analyze/',
+                                  payload)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['text_content'] for item in response.data], TEXTS[:3])
+        self.assertEqual(response.data[2]['results'], textcore.analyze(TEXTS[2], 'readability'))
+
+    def test_bulk_job_runs_chunks_and_can_be_polled(self):
+        warm_text(TEXTS[0])
+        payload = {'analyses': [{'text_content': text} for text in TEXTS + [TEXTS[3]]]}
+
+        with mock.patch.object(bulk, 'BULK_ANALYSIS_CHUNK_SIZE', 2), \
+                self.captureOnCommitCallbacks(execute=True):
+            created = self._call('post', 'bulk_jobs', '/api/content-analysis/text-analysis/bulk-jobs/', payload)
+        job_id = created.data['id']
+        response = self._call('get', 'bulk_job', f'/api/content-analysis/text-analysis/bulk-jobs/{job_id}/',
+                              job_id=job_id)
+
+        self.assertEqual(created.status_code, 202)
+        self.assertEqual(response.data['status'], 'completed')
+        self.assertEqual(
+            (response.data['total'], response.data['unique_texts'], response.data['cached'], response.data['progress']),
+            (7, 6, 1, 100.0),
+        )
+        results = response.data['results']
+        self.assertEqual(len(results), 7)
+        self.assertTrue(results[0]['is_cached'])
+        self.assertEqual(results[6]['results']['overall_score'], textcore.analyze(TEXTS[3])['overall_score'])
+        self.assertEqual(BulkAnalysisJob.objects.get(id=job_id).completed, 6)
+
+    def test_pending_job_hides_results(self):
+        job = BulkAnalysisJob.objects.create(items=[{'text_content': TEXTS[0]}], total=1, created_by=self.user)
+
+        response = self._call('get', 'bulk_job', f'/api/content-analysis/text-analysis/bulk-jobs/{job.id}/',
+                              job_id=str(job.id))
+
+        self.assertEqual(response.data['status'], 'pending')
+        self.assertIsNone(response.data['results'])
+
+    def test_jobs_are_visible_to_their_requester_only(self):
+        other = User.objects.create_user(username='other', email='other@example.com', password='pass12345')
+        job = BulkAnalysisJob.objects.create(items=[{'text_content': TEXTS[0]}], total=1, created_by=other)
+
+        response = self._call('get', 'bulk_job', f'/api/content-analysis/text-analysis/bulk-jobs/{job.id}/',
+                              job_id=str(job.id))
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_job_fails_when_it_cannot_be_started(self):
+        job = BulkAnalysisJob.objects.create(items=[{'text_content': TEXTS[0]}], total=1, created_by=self.user)
+
+        with mock.patch.object(bulk, 'split_cached', side_effect=RuntimeError('cache down')), \
+                self.assertRaises(RuntimeError):
+            tasks.run_bulk_analysis_job.apply(args=[str(job.id)], retries=3, throw=True)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertIsNotNone(job.finished_at)
@@ -0,0 +1,66 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.content_analysis import textcore
+from apps.content_analysis.incremental import analyze_document, split_paragraphs
+from apps.content_analysis.views import real_time_check
+
+User = get_user_model()
+
+DOCUMENT = (
+    'A headline that is long enough for search engines\n\n'
+    'Publishing tools help writers.  Editors review drafts.\n\n'
+    'Publishing workflows matter.Publishing schedules matter too. Publishing wins!'
+)
+
+
+class IncrementalAnalysisTestCase(TestCase):
+    """Test paragraph-level caching for real-time checks"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_split_paragraphs_keeps_offsets(self):
+        paragraphs = split_paragraphs('One.\n\nTwo.\n \nThree.')
+
+        self.assertEqual(paragraphs, [(0, 'One.'), (6, 'Two.'), (13, 'Three.')])
+
+    def test_recombined_scores_match_full_analysis(self):
+        document = analyze_document(DOCUMENT)
+        full = textcore.comprehensive(textcore.tokenize(DOCUMENT))
+
+        self.assertEqual(document.readability, full['readability'])
+        self.assertEqual(document.seo, full['seo'])
+        self.assertEqual(
+            sorted(issue['position'] for issue in document.grammar['issues']),
+            sorted(issue['position'] for issue in full['grammar']['issues']),
+        )
+        self.assertEqual(document.comprehensive()['overall_score'], full['overall_score'])
+
+    def test_only_edited_paragraph_is_reanalyzed(self):
+        self.assertEqual(analyze_document(DOCUMENT).analyzed, 3)
+
+        edited = DOCUMENT.replace('Editors review drafts.', 'Editors review every draft.')
+        document = analyze_document(edited)
+
+        self.assertEqual((document.paragraphs, document.analyzed), (3, 1))
+
+    def test_issue_positions_follow_paragraph_offsets(self):
+        document = analyze_document(DOCUMENT)
+
+        double_space = next(issue for issue in document.grammar['issues'] if issue['type'] == 'double_space')
+        self.assertEqual(DOCUMENT[double_space['position']:double_space['position'] + 2], '  ')
+
+    def test_real_time_check_endpoint(self):
+        user = User.objects.create_user(username='writer', email='writer@example.com', password='pass12345')
+        request = APIRequestFactory().post('/api/content-analysis/realtime-check/',
+                                           {'text': DOCUMENT, 'type': 'comprehensive'}, format='json')
+        force_authenticate(request, user=user)
+
+        response = real_time_check(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['paragraphs'], {'total': 3, 'analyzed': 3})
+        self.assertGreater(response.data['score'], 0)
@@ -0,0 +1,72 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.accounts.models import Account
+from apps.articles.models import Article
+from apps.content_analysis import bulk, textcore
+from apps.content_analysis.models import ArticleQualityScore
+from apps.content_analysis.quality import article_text, quality_report, score_account_articles
+from apps.content_analysis.tasks import score_account_quality
+
+User = get_user_model()
+
+
+class ArticleQualityScoringTestCase(TestCase):
+    """Test tenant-wide article quality scoring and reports"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='author', email='author@example.com', password='pass12345')
+        self.account = Account.objects.create(name='Blog', slug='blog', owner=self.user)
+        self.other = Account.objects.create(name='Other', slug='other', owner=self.user)
+        self.articles = [
+            Article.objects.create(account=self.account, author=self.user, title=f'Story {i}',
+                                   content=f'Publishing tools help writers. Editors review draft {i}.')
+            for i in range(3)
+        ]
+        Article.objects.create(account=self.other, author=self.user, title='Elsewhere', content='Not this one.')
+
+    def test_scores_every_article_of_the_account(self):
+        result = score_account_articles(self.account, batch_size=2)
+
+        self.assertEqual((result.total, result.scored, result.skipped), (3, 3, 0))
+        score = ArticleQualityScore.objects.get(article=self.articles[0])
+        expected = textcore.analyze(article_text(self.articles[0].title, self.articles[0].content))
+        self.assertEqual(score.overall_score, expected['overall_score'])
+        self.assertEqual(score.account, self.account)
+        self.assertFalse(ArticleQualityScore.objects.filter(account=self.other).exists())
+
+    def test_rerun_only_rescores_changed_articles(self):
+        score_account_articles(self.account)
+        Article.objects.filter(pk=self.articles[1].pk).update(content='A rewritten body for this story.')
+
+        with mock.patch.object(bulk, 'compute', wraps=bulk.compute) as compute:
+            result = score_account_articles(self.account)
+
+        self.assertEqual((result.scored, result.skipped), (1, 2))
+        self.assertEqual(len(compute.call_args.args[0]), 1)
+        self.assertEqual(score_account_articles(self.account, force=True).scored, 3)
+
+    def test_report_aggregates_stored_scores(self):
+        score_account_articles(self.account)
+
+        with self.assertNumQueries(3):
+            report = quality_report(self.account)
+
+        self.assertEqual(report['articles'], 3)
+        self.assertEqual(sum(report['readability_levels'].values()), 3)
+        self.assertEqual(len(report['lowest_scoring']), 3)
+        self.assertLessEqual(report['lowest_overall'], report['average_overall'])
+
+    def test_command_and_task(self):
+        out = StringIO()
+        call_command('score_article_quality', account=['blog'], stdout=out)
+        report = score_account_quality.delay(str(self.account.id)).get()
+
+        self.assertIn('blog: scored 3 of 3 articles (0 unchanged)', out.getvalue())
+        self.assertEqual((report['scored'], report['skipped'], report['articles']), (0, 3, 3))
@@ -0,0 +1,113 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.articles.models import Article
+from apps.content_analysis import result_cache, textcore
+from apps.content_analysis.models import TextAnalysis, WritingSuggestion
+from apps.content_analysis.result_cache import analysis_cache, warm_text
+from apps.content_analysis.views import TextAnalysisViewSet
+
+User = get_user_model()
+
+TEXT = 'A headline that is long enough for search engines\n\nPublishing tools help writers. Editors review drafts.'
+
+
+class ResultCacheTestCase(TestCase):
+    """Test the two-tier text analysis result cache"""
+
+    def setUp(self):
+        cache.clear()
+        analysis_cache.clear_local()
+        analysis_cache.reset_metrics()
+        self.user = User.objects.create_user(username='writer', email='writer@example.com', password='pass12345')
+
+    def _analyze(self, payload, action='analyze'):
+        request = APIRequestFactory().post(f'/api/content-analysis/analyses/{action}/', payload, format='json')
+        force_authenticate(request, user=self.user)
+        return TextAnalysisViewSet.as_view({'post': action})(request)
+
+    def test_repeat_analysis_is_served_without_queries(self):
+        first = self._analyze({'text_content': TEXT})
+        with self.assertNumQueries(0):
+            second = self._analyze({'text_content': TEXT})
+
+        self.assertEqual(first.status_code, 200)
+        self.assertFalse(first.data['is_cached'])
+        self.assertTrue(second.data['is_cached'])
+        self.assertEqual(second.data['results'], textcore.analyze(TEXT))
+        self.assertFalse(TextAnalysis.objects.exists())
+
+    def test_shared_tier_serves_other_processes(self):
+        analysis_cache.get_or_compute(TEXT, 'readability')
+        analysis_cache.clear_local()
+
+        _, cached = analysis_cache.get_or_compute(TEXT, 'readability')
+        _, cached_again = analysis_cache.get_or_compute(TEXT, 'readability')
+
+        self.assertTrue(cached and cached_again)
+        self.assertEqual(analysis_cache.metrics(), {
+            'local_hits': 1, 'shared_hits': 1, 'misses': 1, 'hit_ratio': 0.667,
+        })
+
+    def test_metrics_are_flushed_in_batches(self):
+        analysis_cache.get_or_compute(TEXT, 'readability')
+
+        with mock.patch.object(result_cache.cache, 'incr') as incr:
+            for _ in range(3):
+                analysis_cache.get_or_compute(TEXT, 'readability')
+        incr.assert_not_called()
+
+        self.assertEqual(analysis_cache.metrics()['local_hits'], 3)
+
+    def test_persist_stores_one_row_per_text(self):
+        created = self._analyze({'text_content': TEXT, 'persist': True})
+        repeated = self._analyze({'text_content': TEXT, 'persist': True})
+
+        self.assertEqual(created.status_code, 201)
+        self.assertEqual(repeated.status_code, 200)
+        self.assertEqual(created.data['id'], repeated.data['id'])
+        self.assertEqual(TextAnalysis.objects.count(), 1)
+
+    def test_persist_collapses_duplicate_system_rows(self):
+        older = TextAnalysis.objects.create(text_content=TEXT, analysis_type='readability')
+        newer = TextAnalysis.objects.create(text_content=TEXT, analysis_type='readability')
+        suggestion = WritingSuggestion.objects.create(
+            text_analysis=older, suggestion_type='clarity', title='Shorter', description='Trim it',
+            original_text='a', suggested_text='b', start_position=0, end_position=1,
+        )
+
+        analysis = TextAnalysis.persist(TEXT, 'readability', {'score': 1})
+
+        self.assertEqual(analysis.pk, newer.pk)
+        self.assertEqual(TextAnalysis.objects.count(), 1)
+        suggestion.refresh_from_db()
+        self.assertEqual(suggestion.text_analysis_id, newer.pk)
+
+    def test_persist_keeps_one_row_per_language(self):
+        english = TextAnalysis.persist(TEXT, 'readability', {'score': 1}, language='en')
+        spanish = TextAnalysis.persist(TEXT, 'readability', {'score': 2}, language='es')
+
+        self.assertNotEqual(english.pk, spanish.pk)
+        english.refresh_from_db()
+        self.assertEqual(english.results, {'score': 1})
+
+    def test_bulk_analyze_reuses_cached_results(self):
+        warm_text(TEXT)
+        response = self._analyze({'analyses': [
+            {'text_content': TEXT},
+            {'text_content': TEXT + ' More text.'},
+        ]}, action='bulk_analyze')
+
+        self.assertEqual([item['is_cached'] for item in response.data], [True, False])
+        self.assertFalse(TextAnalysis.objects.exists())
+
+    def test_saving_an_article_warms_its_analysis(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            article = Article.objects.create(title='Warm', content=TEXT, author=self.user, status='draft')
+
+        self.assertTrue(analysis_cache.contains(article.content, 'comprehensive'))
+        self.assertFalse(warm_text(article.content))
@@ -0,0 +1,81 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from apps.content_analysis import textcore
+from apps.content_analysis.models import TextAnalysis
+
+
+class TokenizerTestCase(SimpleTestCase):
+    """Test the single-pass tokenizer and the analyzers built on it"""
+
+    def test_tokenize_collects_words_spans_and_boundaries(self):
+        tokens = textcore.tokenize('Reading is fun. Make it daily!')
+
+        self.assertEqual(tokens.words, ['reading', 'is', 'fun', 'make', 'it', 'daily'])
+        self.assertEqual(tokens.spans[0], (0, 7))
+        self.assertEqual(tokens.sentence_count, 2)
+        self.assertEqual(tokens.syllables, 2 + 1 + 1 + 1 + 1 + 2)
+
+    def test_syllables_are_memoized_per_word(self):
+        textcore.word_syllables.cache_clear()
+
+        textcore.tokenize('make make make')
+
+        info = textcore.word_syllables.cache_info()
+        self.assertEqual((info.misses, info.hits), (1, 2))
+        self.assertEqual(textcore.word_syllables('make'), 1)
+
+    def test_grammar_checks(self):
+        tokens = textcore.tokenize('This  is fine.Next sentence has these these words.')
+
+        types = [issue['type'] for issue in textcore.check_grammar(tokens)['issues']]
+
+        self.assertEqual(types, ['double_space', 'repeated_word'])
+
+    def test_abbreviations_are_not_grammar_issues(self):
+        tokens = textcore.tokenize('The U.S.A. is big. We use Node.JS daily.')
+
+        self.assertEqual(textcore.check_grammar(tokens)['score'], 100)
+
+    def test_readability_uses_shared_counts(self):
+        result = textcore.readability(textcore.tokenize('The cat sat. The dog ran.'))
+
+        self.assertEqual(result['metrics']['total_sentences'], 2)
+        self.assertEqual(result['metrics']['total_words'], 6)
+        self.assertEqual(result['readability_level'], 'Very Easy')
+
+    def test_empty_text_counts_one_sentence_and_word(self):
+        result = textcore.readability(textcore.tokenize(''))
+
+        self.assertEqual(result['metrics']['total_sentences'], 1)
+        self.assertEqual(result['metrics']['total_words'], 1)
+
+    def test_seo_keywords_in_order_of_first_use(self):
+        text = 'Short title\n' + 'publishing editorial ' * 4 + 'tiny ' * 2
+
+        result = textcore.analyze_seo(textcore.tokenize(text))
+
+        self.assertEqual(result['keywords'], ['publishing', 'editorial'])
+        self.assertEqual(result['issues'][0]['type'], 'title_too_short')
+
+    def test_model_analyzers_tokenize_once(self):
+        analysis = TextAnalysis(text_content='Some words here. More words there.', analysis_type='comprehensive')
+
+        with mock.patch.object(textcore, 'tokenize', wraps=textcore.tokenize) as tokenize:
+            results = analysis._comprehensive_analysis()
+            analysis._calculate_readability()
+
+        self.assertEqual(tokenize.call_count, 1)
+        self.assertEqual(results['readability']['metrics']['total_words'], 6)
+        self.assertEqual(results['seo']['readability_score'], results['readability']['flesch_reading_ease'])
+
+    def test_benchmark_command(self):
+        out = StringIO()
+
+        call_command('benchmark_text_analysis', documents=2, words=200, repeat=1, stdout=out)
+
+        self.assertIn('comprehensive, shared tokens', out.getvalue())
+        self.assertIn('Syllable cache', out.getvalue())
@@ -0,0 +1,281 @@
+"""
+Text analysis core
+Text is tokenized once into words, word spans, sentence boundaries and
+syllable counts; the grammar, readability and SEO analyzers all read from
+that structure instead of re-scanning the text with their own regexes.
+Syllable counts are memoized per word, since articles reuse a small
+vocabulary.
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+WORD_RE = re.compile(r'\b\w+\b')
+SENTENCE_END_RE = re.compile(r'[.!?]+')
+
+VOWELS = frozenset('aeiouy')
+REPEATED_WORD_MIN_LENGTH = 4
+KEYWORD_MIN_COUNT = 4
+KEYWORD_MIN_LENGTH = 4
+OPTIMAL_TITLE_LENGTH = (30, 60)
+
+
+@lru_cache(maxsize=65536)
+def word_syllables(word: str) -> int:
+    """Vowel-group syllable estimate for a lowercase word"""
+    count = 0
+    prev_char_was_vowel = False
+    for char in word:
+        is_vowel = char in VOWELS
+        if is_vowel and not prev_char_was_vowel:
+            count += 1
+        prev_char_was_vowel = is_vowel
+
+    # Handle silent 'e'
+    if word.endswith('e') and count > 1:
+        count -= 1
+
+    # Every word has at least one syllable
+    return max(1, count)
+
+
+@dataclass
+class TokenizedText:
+    """One pass over a text: lowercase words with their spans and sentence boundaries"""
+    text: str
+    words: List[str] = field(default_factory=list)
+    spans: List[Tuple[int, int]] = field(default_factory=list)
+    # (start, end) of each run of sentence-ending punctuation
+    boundaries: List[Tuple[int, int]] = field(default_factory=list)
+    syllables: int = 0
+
+    @property
+    def word_count(self) -> int:
+        return len(self.words)
+
+    @property
+    def sentence_count(self) -> int:
+        return len(self.boundaries)
+
+    def segments(self) -> List[Tuple[int, str]]:
+        """Text between sentence boundaries as (offset, segment) pairs"""
+        result = []
+        start = 0
+        for boundary_start, boundary_end in self.boundaries:
+            result.append((start, self.text[start:boundary_start]))
+            start = boundary_end
+        result.append((start, self.text[start:]))
+        return result
+
+
+def tokenize(text: str) -> TokenizedText:
+    tokens = TokenizedText(text=text)
+    words = tokens.words
+    spans = tokens.spans
+    syllables = 0
+    for match in WORD_RE.finditer(text):
+        word = match.group().lower()
+        words.append(word)
+        spans.append(match.span())
+        syllables += word_syllables(word)
+    tokens.syllables = syllables
+    tokens.boundaries = [match.span() for match in SENTENCE_END_RE.finditer(text)]
+    return tokens
+
+
+def count_syllables(text: str) -> int:
+    return tokenize(text).syllables
+
+
+def check_grammar(tokens: TokenizedText) -> Dict:
+    """Basic spacing and repeated-word checks"""
+    issues = []
+
+    for offset, segment in tokens.segments():
+        if segment.strip() and '  ' in segment:
+            issues.append({
+                'type': 'double_space',
+                'message': 'Double spaces found',
+                'severity': 'minor',
+                'position': offset + segment.find('  ')
+            })
+
+    # The former per-sentence "missing space after punctuation" check searched
+    # text already split on punctuation and never matched; it is left out so
+    # scores stay the same until the check is redesigned
+
+    words = tokens.words
+    for index in range(len(words) - 1):
+        word = words[index]
+        if word == words[index + 1] and len(word) >= REPEATED_WORD_MIN_LENGTH:
+            issues.append({
+                'type': 'repeated_word',
+                'message': f'Repeated word: "{word}"',
+                'severity': 'warning',
+                'word': word,
+                'position': tokens.spans[index + 1][0]
+            })
+
+    return grammar_from_issues(issues)
+
+
+def grammar_from_issues(issues: List[Dict]) -> Dict:
+    return {
+        'issues': issues,
+        'issue_count': len(issues),
+        'score': max(0, 100 - (len(issues) * 5))  # Deduct points for issues
+    }
+
+
+def readability_level(flesch_score: float) -> str:
+    """Determine readability level from Flesch score"""
+    if flesch_score >= 90:
+        return 'Very Easy'
+    elif flesch_score >= 80:
+        return 'Easy'
+    elif flesch_score >= 70:
+        return 'Fairly Easy'
+    elif flesch_score >= 60:
+        return 'Standard'
+    elif flesch_score >= 50:
+        return 'Fairly Difficult'
+    elif flesch_score >= 30:
+        return 'Difficult'
+    return 'Very Difficult'
+
+
+def readability_from_counts(sentences: int, words: int, syllables: int, characters: int) -> Dict:
+    """Flesch scores from raw counts, so partial results can be recombined"""
+    sentences = sentences or 1
+    words = words or 1
+    avg_words_per_sentence = words / sentences
+    avg_syllables_per_word = syllables / words
+
+    flesch_score = 206.835 - (1.015 * avg_words_per_sentence) - (84.6 * avg_syllables_per_word)
+    flesch_score = max(0, min(100, flesch_score))
+    fk_grade = (0.39 * avg_words_per_sentence) + (11.8 * avg_syllables_per_word) - 15.59
+
+    return {
+        'flesch_reading_ease': round(flesch_score, 1),
+        'flesch_kincaid_grade': round(fk_grade, 1),
+        'readability_level': readability_level(flesch_score),
+        'metrics': {
+            'total_sentences': sentences,
+            'total_words': words,
+            'total_syllables': syllables,
+            'total_characters': characters,
+            'avg_words_per_sentence': round(avg_words_per_sentence, 1),
+            'avg_syllables_per_word': round(avg_syllables_per_word, 1)
+        }
+    }
+
+
+def readability(tokens: TokenizedText) -> Dict:
+    return readability_from_counts(tokens.sentence_count, tokens.word_count, tokens.syllables, len(tokens.text))
+
+
+def keyword_counts(tokens: TokenizedText) -> Counter:
+    """Frequencies of words long enough to be keywords, in order of first use"""
+    return Counter(word for word in tokens.words if len(word) >= KEYWORD_MIN_LENGTH)
+
+
+def seo_from_parts(title: str, keyword_frequencies: Dict[str, int], readability_result: Dict) -> Dict:
+    """SEO result from the title line, keyword frequencies and readability, so parts can be recombined"""
+    issues = []
+    suggestions = []
+
+    if len(title) < OPTIMAL_TITLE_LENGTH[0]:
+        issues.append({
+            'type': 'title_too_short',
+            'message': 'Title is too short for SEO',
+            'severity': 'warning'
+        })
+    elif len(title) > OPTIMAL_TITLE_LENGTH[1]:
+        issues.append({
+            'type': 'title_too_long',
+            'message': 'Title is too long for SEO',
+            'severity': 'warning'
+        })
+
+    # Potential keywords: longer words appearing more than three times, in order of first use
+    keywords = [word for word, count in keyword_frequencies.items() if count >= KEYWORD_MIN_COUNT]
+
+    if readability_result['flesch_reading_ease'] < 60:
+        suggestions.append('Consider simplifying your language for better SEO reach')
+
+    return {
+        'issues': issues,
+        'suggestions': suggestions,
+        'keywords': keywords[:10],  # Top 10 potential keywords
+        'title_length': len(title),
+        'optimal_title_length': OPTIMAL_TITLE_LENGTH,
+        'readability_score': readability_result['flesch_reading_ease']
+    }
+
+
+def analyze_seo(tokens: TokenizedText, readability_result: Optional[Dict] = None) -> Dict:
+    """Title length, candidate keywords and readability reach (title is the first line)"""
+    return seo_from_parts(
+        tokens.text.split('\n', 1)[0],
+        keyword_counts(tokens),
+        readability_result or readability(tokens),
+    )
+
+
+def analysis_summary(grammar: Dict, readability_result: Dict, seo: Dict) -> List[str]:
+    """Generate a human-readable summary"""
+    summary = []
+
+    if grammar['issue_count'] == 0:
+        summary.append("No grammar issues detected.")
+    else:
+        summary.append(f"Found {grammar['issue_count']} potential grammar issues.")
+
+    level = readability_result['readability_level']
+    grade = readability_result['flesch_kincaid_grade']
+    summary.append(f"Readability level: {level} (Grade {grade:.1f})")
+
+    if seo['issues']:
+        summary.append(f"Found {len(seo['issues'])} SEO optimization opportunities.")
+    else:
+        summary.append("Basic SEO requirements met.")
+
+    return summary
+
+
+def combine(grammar: Dict, readability_result: Dict, seo: Dict) -> Dict:
+    """Comprehensive result from the individual analyses"""
+    weights = {'grammar': 0.3, 'readability': 0.4, 'seo': 0.3}
+    overall_score = (
+        grammar['score'] * weights['grammar'] +
+        readability_result['flesch_reading_ease'] * weights['readability'] +
+        min(100, seo['readability_score'] + 20) * weights['seo']  # SEO boost
+    )
+    return {
+        'overall_score': round(overall_score, 1),
+        'grammar': grammar,
+        'readability': readability_result,
+        'seo': seo,
+        'summary': analysis_summary(grammar, readability_result, seo)
+    }
+
+
+def comprehensive(tokens: TokenizedText) -> Dict:
+    readability_result = readability(tokens)
+    return combine(check_grammar(tokens), readability_result, analyze_seo(tokens, readability_result))
+
+
+ANALYZERS = {
+    'grammar': check_grammar,
+    'readability': readability,
+    'seo': analyze_seo,
+    'comprehensive': comprehensive,
+}
+
+
+def analyze(text: str, analysis_type: str = 'comprehensive') -> Dict:
+    """Results of one analysis type, tokenizing the text once"""
+    return ANALYZERS[analysis_type](tokenize(text))
@@ -1,21 +1,35 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action, api_view
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from django.db import transaction
 from django.shortcuts import get_object_or_404
-from django.core.cache import cache
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
 from django.http import JsonResponse
 
-from .models import TextAnalysis, WritingSuggestion
+from apps.core.ratelimit import RateThrottle, ratelimit
+from .bulk import analyze_batch
+from .incremental import analyze_document
+from .models import BulkAnalysisJob, TextAnalysis, WritingSuggestion
+from .quality import quality_report
+from .result_cache import analysis_cache, text_hash
 from .serializers import (
     TextAnalysisSerializer,
     WritingSuggestionSerializer,
     TextAnalysisRequestSerializer,
     BulkTextAnalysisSerializer,
+    BulkAnalysisJobRequestSerializer,
+    BulkAnalysisJobSerializer,
     SuggestionActionSerializer
 )
+from .tasks import run_bulk_analysis_job
+
+
+class TextAnalysisRateThrottle(RateThrottle):
+    """Analysis requests per user"""
+    scope = 'text_analysis'
+    rate = '60/m'
 
 
 class TextAnalysisViewSet(viewsets.ModelViewSet):
@@ -25,6 +39,7 @@ class TextAnalysisViewSet(viewsets.ModelViewSet):
     queryset = TextAnalysis.objects.all()
     serializer_class = TextAnalysisSerializer
     permission_classes = [IsAuthenticated]
+    throttle_classes = [TextAnalysisRateThrottle]
 
     def get_queryset(self):
         """Filter by account if user has account context"""
@@ -33,79 +48,115 @@ class TextAnalysisViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(account=self.request.account)
         return queryset
 
+    def _request_account(self, request):
+        return request.account if hasattr(request, 'account') and request.account else None
+
+    def _build_analysis(self, request, data, results, cached):
+        """Analysis instance for computed results, persisted only when asked to"""
+        account = self._request_account(request)
+        language = data.get('language', 'en')
+
+        if data.get('persist'):
+            analysis = TextAnalysis.persist(
+                data['text_content'], data['analysis_type'], results, account=account, language=language
+            )
+        else:
+            analysis = TextAnalysis(
+                id=None,
+                account=account,
+                text_content=data['text_content'],
+                text_hash=text_hash(data['text_content']),
+                analysis_type=data['analysis_type'],
+                language=language,
+                results=results,
+            )
+        analysis.is_cached = cached
+        return analysis
+
+    def _run_analysis(self, request, data):
+        """Analyze one validated request from the result cache"""
+        results, cached = analysis_cache.get_or_compute(
+            data['text_content'], data['analysis_type'], data.get('language', 'en')
+        )
+        return self._build_analysis(request, data, results, cached)
+
     @action(detail=False, methods=['post'])
     def analyze(self, request):
         """
         Analyze text content and return results
-        Supports caching for repeated analyses
+        Identical text is served from the result cache; pass persist=true to store the analysis
         """
         serializer = TextAnalysisRequestSerializer(data=request.data)
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        # Create or get cached analysis
-        analysis = TextAnalysis(
-            text_content=serializer.validated_data['text_content'],
-            analysis_type=serializer.validated_data['analysis_type'],
-            language=serializer.validated_data.get('language', 'en')
+        analysis = self._run_analysis(request, serializer.validated_data)
+        created = serializer.validated_data['persist'] and not analysis.is_cached
+        return Response(
+            self.get_serializer(analysis).data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
         )
 
-        # Set account if available
-        if hasattr(request, 'account') and request.account:
-            analysis.account = request.account
-
-        # Check for cached results
-        cached = TextAnalysis.get_cached_analysis(
-            analysis.text_content,
-            analysis.analysis_type,
-            analysis.account,
-            analysis.language
-        )
-
-        if cached:
-            cached.is_cached = True
-            serializer = self.get_serializer(cached)
-            return Response(serializer.data)
-
-        # Perform new analysis
-        analysis.save()
-        results = analysis.perform_analysis()
-
-        # Cache the results
-        cache_key = f"text_analysis_{analysis.text_hash}_{analysis.analysis_type}_{analysis.language}"
-        cache.set(cache_key, results, 86400)  # 24 hours
-
-        serializer = self.get_serializer(analysis)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
-
     @action(detail=False, methods=['post'])
     def bulk_analyze(self, request):
         """
         Perform bulk text analysis (max 10 analyses per request)
+        Repeated and cached texts are answered once; the rest are analyzed in parallel
         """
         serializer = BulkTextAnalysisSerializer(data=request.data)
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        results = []
-        for analysis_data in serializer.validated_data['analyses']:
-            # Create temporary analysis object for processing
-            analysis = TextAnalysis(
-                text_content=analysis_data['text_content'],
-                analysis_type=analysis_data['analysis_type'],
-                language=analysis_data.get('language', 'en')
-            )
+        analyses = serializer.validated_data['analyses']
+        results = [
+            self.get_serializer(self._build_analysis(request, analysis_data, item_results, cached)).data
+            for analysis_data, (item_results, cached) in zip(analyses, analyze_batch(analyses))
+        ]
+        return Response(results, status=status.HTTP_200_OK)
 
-            if hasattr(request, 'account') and request.account:
-                analysis.account = request.account
+    @action(detail=False, methods=['post'], url_path='bulk-jobs')
+    def bulk_jobs(self, request):
+        """
+        Start an asynchronous bulk analysis of up to BULK_ANALYSIS_JOB_MAX_TEXTS texts
+        Poll the returned job until its status is completed
+        """
+        serializer = BulkAnalysisJobRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-            # Perform analysis
-            analysis.save()
-            analysis.perform_analysis()
+        items = [
+            {
+                'text_content': analysis['text_content'],
+                'analysis_type': analysis['analysis_type'],
+                'language': analysis['language'],
+            }
+            for analysis in serializer.validated_data['analyses']
+        ]
+        job = BulkAnalysisJob.objects.create(
+            account=self._request_account(request), created_by=request.user, items=items, total=len(items)
+        )
+        job_id = str(job.id)
+        transaction.on_commit(lambda: run_bulk_analysis_job.delay(job_id))
+        return Response(BulkAnalysisJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=['get'], url_path=r'bulk-jobs/(?P<job_id>[0-9a-f-]+)')
+    def bulk_job(self, request, job_id=None):
+        """Status, progress and (once completed) results of a bulk analysis job"""
+        job = get_object_or_404(
+            BulkAnalysisJob.objects.defer('items'),
+            id=job_id, account=self._request_account(request), created_by=request.user,
+        )
+        return Response(BulkAnalysisJobSerializer(job).data)
 
-            results.append(self.get_serializer(analysis).data)
+    @action(detail=False, methods=['get'], url_path='quality-report')
+    def quality_report(self, request):
+        """Aggregate article quality scores of the current account"""
+        return Response(quality_report(self._request_account(request)))
 
-        return Response(results, status=status.HTTP_200_OK)
+    @action(detail=False, methods=['get'], url_path='cache-stats', permission_classes=[IsAdminUser])
+    def cache_stats(self, request):
+        """Hit and miss counts of the analysis result cache"""
+        return Response(analysis_cache.metrics())
 
     @action(detail=True, methods=['get'])
     def suggestions(self, request, pk=None):
@@ -244,10 +295,12 @@ def health_check(request):
 
 
 @api_view(['POST'])
+@ratelimit('120/m', scope='realtime_check', key='user_or_ip')
 def real_time_check(request):
     """
-    Lightweight endpoint for real-time text checking (no caching)
-    Used by the editor for live validation feedback
+    Lightweight endpoint for real-time text checking
+    Used by the editor for live validation feedback; only paragraphs that
+    changed since the previous check are re-analyzed
     """
     text = request.data.get('text', '')
     check_type = request.data.get('type', 'grammar')
@@ -255,24 +308,18 @@ def real_time_check(request):
     if not text or len(text.strip()) < 5:
         return Response({'issues': [], 'score': 100})
 
-    # Create temporary analysis object
-    analysis = TextAnalysis(
-        text_content=text,
-        analysis_type=check_type,
-        language=request.data.get('language', 'en')
-    )
-
-    # Perform analysis without saving to database
+    document = analyze_document(text)
     if check_type == 'grammar':
-        results = analysis._check_grammar()
+        results = document.grammar
     elif check_type == 'readability':
-        results = analysis._calculate_readability()
+        results = document.readability
     else:
-        results = analysis._comprehensive_analysis()
+        results = document.comprehensive()
 
     return Response({
         'issues': results.get('issues', []),
         'score': results.get('score') if 'score' in results else results.get('overall_score', 0),
         'metrics': results.get('metrics', {}),
-        'level': results.get('readability_level', 'Unknown')
+        'level': results.get('readability_level', 'Unknown'),
+        'paragraphs': {'total': document.paragraphs, 'analyzed': document.analyzed}
     })
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.retention import POLICIES, get_policy, purge
+
+
+class Command(BaseCommand):
+    help = 'Delete expired rows in chunked batches according to the data retention policies'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--policy', action='append', dest='policies',
+                            help=f"Policy to run (repeatable). Available: {', '.join(sorted(POLICIES))}")
+        parser.add_argument('--days', type=int, help='Override the retention window in days')
+        parser.add_argument('--batch-size', type=int, help='Rows deleted per batch')
+        parser.add_argument('--sleep', type=float, help='Seconds to sleep between batches')
+        parser.add_argument('--max-runtime', type=float, help='Stop after this many seconds and keep the checkpoint')
+        parser.add_argument('--dry-run', action='store_true', help='Only estimate how many rows would be deleted')
+
+    def handle(self, *args, **options):
+        try:
+            policies = [get_policy(name) for name in options['policies']] if options['policies'] else list(POLICIES.values())
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        for policy in policies:
+            result = purge(
+                policy,
+                days=options['days'],
+                batch_size=options['batch_size'],
+                sleep=options['sleep'],
+                dry_run=options['dry_run'],
+                max_runtime=options['max_runtime'],
+            )
+            if result.dry_run:
+                self.stdout.write(f'{policy.name}: ~{result.estimated_rows} rows eligible')
+            elif result.completed:
+                self.stdout.write(self.style.SUCCESS(
+                    f'{policy.name}: deleted {result.deleted} rows in {result.batches} batches'
+                ))
+            else:
+                self.stdout.write(self.style.WARNING(
+                    f'{policy.name}: paused after {result.deleted} rows; rerun to resume from checkpoint'
+                ))
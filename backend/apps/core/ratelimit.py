@@ -0,0 +1,188 @@
+"""
+Sliding-window rate limiting
+Each client gets one integer counter per fixed window, created with cache
+add() and bumped with incr(), both atomic in Redis, memcached and locmem. The
+sliding-window estimate weights the previous window's count by how much of it
+still overlaps, so a check costs one increment and one read regardless of the
+limit. The same limiter backs the decorator, the DRF throttle and the
+middleware.
+"""
+
+import logging
+import re
+import time
+from dataclasses import dataclass
+from functools import lru_cache, wraps
+from typing import Callable, Optional, Tuple, Union
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import JsonResponse
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+RATELIMIT_ENABLED = getattr(settings, 'RATELIMIT_ENABLED', True)
+RATELIMIT_CACHE_ALIAS = getattr(settings, 'RATELIMIT_CACHE_ALIAS', 'default')
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 60 * 60 * 24}
+RATE_RE = re.compile(r'^(\d+)/(\d*)([smhd])$')
+
+
+@lru_cache(maxsize=None)
+def parse_rate(rate: str) -> Tuple[int, int]:
+    """'5/m', '3/h' or '5/300s' as (limit, window seconds)"""
+    match = RATE_RE.match(rate.replace(' ', ''))
+    if not match:
+        raise ValueError(f"Invalid rate {rate!r}; expected e.g. '5/m' or '5/300s'")
+    limit, multiplier, period = match.groups()
+    return int(limit), int(multiplier or 1) * PERIODS[period]
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: int
+
+
+def _counter(backend, key: str, window: int) -> int:
+    # Counters outlive their window by one more so the next window can weight them
+    if backend.add(key, 1, window * 2):
+        return 1
+    try:
+        return backend.incr(key)
+    except ValueError:
+        # Expired between add() and incr()
+        backend.add(key, 1, window * 2)
+        return 1
+
+
+def hit(scope: str, ident: str, limit: int, window: int, now: Optional[float] = None) -> RateLimitResult:
+    """Count one request of a client against a limit and report whether it is allowed"""
+    if not RATELIMIT_ENABLED:
+        return RateLimitResult(True, limit, limit, 0)
+
+    backend = caches[RATELIMIT_CACHE_ALIAS]
+    now = time.time() if now is None else now
+    current_window = int(now // window)
+    elapsed = (now % window) / window
+
+    count = _counter(backend, f"ratelimit:{scope}:{ident}:{window}:{current_window}", window)
+    previous = backend.get(f"ratelimit:{scope}:{ident}:{window}:{current_window - 1}", 0)
+    estimated = previous * (1 - elapsed) + count
+
+    if estimated <= limit:
+        return RateLimitResult(True, limit, int(limit - estimated), 0)
+
+    # Rejected requests count too, so the retry must leave room for one more. Wait for
+    # the previous window's weight to decay, or for the next window once the current
+    # window alone is at the limit
+    retry_after = window - (now % window)
+    if previous and count < limit:
+        retry_after = (1 - (limit - count - 1) / previous) * window - (now % window)
+    return RateLimitResult(False, limit, 0, max(1, int(retry_after + 0.999)))
+
+
+def client_ip(request) -> str:
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '')
+    ip = forwarded.split(',')[0].strip() if forwarded else request.META.get('REMOTE_ADDR', '')
+    return ip or 'unknown'
+
+
+def client_key(request, key: Union[str, Callable] = 'ip') -> str:
+    """Identify the client by 'ip', 'user', 'user_or_ip' or a callable taking the request"""
+    if callable(key):
+        return str(key(request))
+    user = getattr(request, 'user', None)
+    if key in ('user', 'user_or_ip') and user is not None and user.is_authenticated:
+        return f"user:{user.pk}"
+    if key == 'user':
+        return 'user:anonymous'
+    return f"ip:{client_ip(request)}"
+
+
+def rate_limited_response(result: RateLimitResult) -> JsonResponse:
+    response = JsonResponse(
+        {'error': 'Too many requests. Please try again later.', 'retry_after': result.retry_after},
+        status=429,
+    )
+    response['Retry-After'] = str(result.retry_after)
+    response['X-RateLimit-Limit'] = str(result.limit)
+    response['X-RateLimit-Remaining'] = '0'
+    return response
+
+
+def scope_rate(scope: str, default: Optional[str] = None) -> Optional[str]:
+    return getattr(settings, 'RATELIMIT_RATES', {}).get(scope, default)
+
+
+def ratelimit(rate: Optional[str] = None, scope: Optional[str] = None,
+              key: Union[str, Callable] = 'ip', methods=None):
+    """
+    Rate limit a view function at ``rate``, or at the scope's entry in
+    RATELIMIT_RATES. Place it below @api_view so 'user' keys see the
+    authenticated user.
+    """
+    def decorator(func):
+        view_scope = scope or func.__name__
+
+        @wraps(func)
+        def wrapper(request, *args, **kwargs):
+            view_rate = scope_rate(view_scope, rate)
+            if view_rate and (methods is None or request.method in methods):
+                result = hit(view_scope, client_key(request, key), *parse_rate(view_rate))
+                if not result.allowed:
+                    return rate_limited_response(result)
+            return func(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class RateThrottle(BaseThrottle):
+    """
+    DRF throttle backed by the sliding-window limiter. Subclasses set ``scope``
+    and either ``rate`` or an entry for the scope in RATELIMIT_RATES.
+    """
+    scope: Optional[str] = None
+    rate: Optional[str] = None
+    key = 'user_or_ip'
+
+    def get_rate(self) -> Optional[str]:
+        return scope_rate(self.scope, self.rate)
+
+    def allow_request(self, request, view):
+        rate = self.get_rate()
+        if rate is None:
+            return True
+        limit, window = parse_rate(rate)
+        self.result = hit(self.scope, client_key(request, self.key), limit, window)
+        return self.result.allowed
+
+    def wait(self):
+        return self.result.retry_after
+
+
+class RateLimitMiddleware:
+    """
+    Rate limit requests by path prefix before any view runs. RATELIMIT_PATHS
+    maps path prefixes to rates; clients are keyed by IP.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.rules = [
+            (prefix, prefix.strip('/').replace('/', ':'), *parse_rate(rate))
+            for prefix, rate in getattr(settings, 'RATELIMIT_PATHS', {}).items()
+        ]
+
+    def __call__(self, request):
+        for prefix, scope, limit, window in self.rules:
+            if request.path.startswith(prefix):
+                result = hit(scope, client_key(request), limit, window)
+                if not result.allowed:
+                    logger.warning(f"Rate limited {client_ip(request)} on {request.path}")
+                    return rate_limited_response(result)
+                break
+        return self.get_response(request)
@@ -0,0 +1,220 @@
+"""
+Chunked data retention framework
+Deletes expired rows in small primary-key ordered batches so cleanup jobs never
+materialize a whole table in worker memory or hold long-running locks.
+"""
+
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_BATCH_SLEEP = 0.1
+CHECKPOINT_TIMEOUT = 60 * 60 * 24  # Checkpoints survive a day of interrupted runs
+
+
+class RetentionPolicy:
+    """
+    Describes which rows of a model have expired.
+    Rows whose ``date_field`` is older than ``now - days`` are eligible for deletion.
+    """
+
+    def __init__(self, name: str, model_label: str, date_field: str,
+                 days: int = 0, filters: Optional[Dict] = None):
+        self.name = name
+        self.model_label = model_label
+        self.date_field = date_field
+        self.days = days
+        self.filters = filters or {}
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def get_days(self, days: Optional[int] = None) -> int:
+        """Explicit override, then the DATA_RETENTION_DAYS setting, then the policy default"""
+        if days is not None:
+            return days
+        overrides = getattr(settings, 'DATA_RETENTION_DAYS', {})
+        return overrides.get(self.name, self.days)
+
+    def get_cutoff(self, days: Optional[int] = None, now=None):
+        now = now or timezone.now()
+        return now - timedelta(days=self.get_days(days))
+
+    def get_queryset(self, days: Optional[int] = None, now=None):
+        lookup = {f'{self.date_field}__lt': self.get_cutoff(days, now)}
+        return self.model._default_manager.filter(**lookup, **self.filters)
+
+    def __repr__(self):
+        return f"<RetentionPolicy {self.name}: {self.model_label}.{self.date_field}>"
+
+
+# Registered retention policies, keyed by name
+POLICIES: Dict[str, RetentionPolicy] = {}
+
+
+def register_policy(policy: RetentionPolicy) -> RetentionPolicy:
+    POLICIES[policy.name] = policy
+    return policy
+
+
+def get_policy(name: str) -> RetentionPolicy:
+    try:
+        return POLICIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown retention policy '{name}'. Available: {', '.join(sorted(POLICIES))}")
+
+
+register_policy(RetentionPolicy('newsletter_sends', 'newsletter.NewsletterSend', 'created_at', days=90))
+register_policy(RetentionPolicy('page_views', 'analytics.PageView', 'timestamp', days=365))
+register_policy(RetentionPolicy('operation_transforms', 'articles.OperationTransform', 'timestamp', days=30))
+register_policy(RetentionPolicy('text_analyses', 'content_analysis.TextAnalysis', 'cache_expires_at', days=0))
+register_policy(RetentionPolicy('collaborative_sessions', 'articles.CollaborativeSession', 'expires_at', days=7))
+
+
+@dataclass
+class RetentionResult:
+    """Outcome of a single policy run"""
+    policy: str
+    dry_run: bool = False
+    estimated_rows: Optional[int] = None
+    deleted: int = 0
+    batches: int = 0
+    completed: bool = True
+    resumed_from: Optional[str] = None
+    deleted_by_model: Dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict:
+        return {
+            'policy': self.policy,
+            'dry_run': self.dry_run,
+            'estimated_rows': self.estimated_rows,
+            'deleted': self.deleted,
+            'batches': self.batches,
+            'completed': self.completed,
+            'resumed_from': self.resumed_from,
+            'deleted_by_model': self.deleted_by_model,
+        }
+
+
+def checkpoint_key(policy_name: str) -> str:
+    return f'retention_checkpoint:{policy_name}'
+
+
+def get_checkpoint(policy_name: str) -> Optional[Dict]:
+    return cache.get(checkpoint_key(policy_name))
+
+
+def estimate_rows(queryset) -> int:
+    """
+    Estimate how many rows a queryset would delete.
+    Uses the PostgreSQL planner estimate so dry runs stay cheap on huge tables,
+    falling back to an exact COUNT on other backends.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        try:
+            plan = json.loads(queryset.explain(format='json'))
+            return int(plan[0]['Plan']['Plan Rows'])
+        except Exception as e:
+            logger.warning(f"Falling back to COUNT for retention estimate: {str(e)}")
+    return queryset.count()
+
+
+def purge(policy: RetentionPolicy, days: Optional[int] = None, batch_size: Optional[int] = None,
+          sleep: Optional[float] = None, dry_run: bool = False,
+          max_runtime: Optional[float] = None, now=None) -> RetentionResult:
+    """
+    Delete a policy's expired rows in primary-key ordered batches.
+
+    Each batch selects at most ``batch_size`` primary keys above the last
+    checkpoint and deletes them in its own short transaction, sleeping between
+    batches to give replicas and concurrent writers room. Progress is stored in
+    the cache so an interrupted run (or one stopped by ``max_runtime``) resumes
+    where it left off.
+    """
+    batch_size = batch_size or getattr(settings, 'DATA_RETENTION_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+    if sleep is None:
+        sleep = getattr(settings, 'DATA_RETENTION_BATCH_SLEEP', DEFAULT_BATCH_SLEEP)
+
+    queryset = policy.get_queryset(days=days, now=now)
+    result = RetentionResult(policy=policy.name, dry_run=dry_run)
+
+    if dry_run:
+        result.estimated_rows = estimate_rows(queryset)
+        logger.info(f"Retention dry run for {policy.name}: ~{result.estimated_rows} rows eligible")
+        return result
+
+    key = checkpoint_key(policy.name)
+    checkpoint = cache.get(key) or {}
+    last_pk = checkpoint.get('last_pk')
+    result.resumed_from = last_pk
+    result.deleted = checkpoint.get('deleted', 0)
+    result.batches = checkpoint.get('batches', 0)
+
+    pk_queryset = queryset.order_by('pk').values_list('pk', flat=True)
+    manager = policy.model._default_manager
+    started = time.monotonic()
+
+    while True:
+        page = pk_queryset.filter(pk__gt=last_pk) if last_pk is not None else pk_queryset
+        batch = list(page[:batch_size])
+        if not batch:
+            break
+
+        with transaction.atomic():
+            deleted, per_model = manager.filter(pk__in=batch).delete()
+
+        last_pk = batch[-1]
+        result.deleted += deleted
+        result.batches += 1
+        for label, count in per_model.items():
+            result.deleted_by_model[label] = result.deleted_by_model.get(label, 0) + count
+
+        cache.set(key, {
+            'last_pk': str(last_pk),
+            'deleted': result.deleted,
+            'batches': result.batches,
+            'updated_at': timezone.now().isoformat(),
+        }, CHECKPOINT_TIMEOUT)
+
+        if len(batch) < batch_size:
+            break
+
+        if max_runtime is not None and time.monotonic() - started >= max_runtime:
+            result.completed = False
+            logger.info(f"Retention for {policy.name} paused after {result.batches} batches; will resume from checkpoint")
+            return result
+
+        if sleep:
+            time.sleep(sleep)
+
+    cache.delete(key)
+    logger.info(f"Retention for {policy.name} deleted {result.deleted} rows in {result.batches} batches")
+    return result
+
+
+def run_policies(names: Optional[Iterable[str]] = None, **options) -> List[RetentionResult]:
+    """Run the named policies (all registered policies by default)"""
+    policies = [get_policy(name) for name in names] if names else list(POLICIES.values())
+    results = []
+    for policy in policies:
+        try:
+            results.append(purge(policy, **options))
+        except Exception as e:
+            logger.error(f"Retention policy {policy.name} failed: {str(e)}")
+            results.append(RetentionResult(policy=policy.name, completed=False,
+                                           dry_run=options.get('dry_run', False)))
+    return results
@@ -0,0 +1,47 @@
+"""Celery tasks for platform maintenance"""
+
+import logging
+from typing import List, Optional
+
+from config.celery import app
+from .retention import get_policy, purge, run_policies
+
+logger = logging.getLogger(__name__)
+
+
+@app.task(bind=True)
+def cleanup_expired_data(self, policies: Optional[List[str]] = None, dry_run: bool = False):
+    """
+    Apply data retention policies in chunked batches
+    Runs daily via Celery Beat
+    """
+    try:
+        results = [result.as_dict() for result in run_policies(policies, dry_run=dry_run)]
+        logger.info(f"Data retention run finished: {results}")
+        return results
+
+    except Exception as e:
+        logger.error(f"Error in cleanup_expired_data: {str(e)}")
+        raise
+
+
+@app.task(bind=True, max_retries=3)
+def purge_expired_rows(self, policy_name: str, days: Optional[int] = None, max_runtime: Optional[float] = None):
+    """
+    Run a single retention policy, re-queueing itself until the backlog is drained
+    """
+    try:
+        result = purge(get_policy(policy_name), days=days, max_runtime=max_runtime)
+        if not result.completed:
+            purge_expired_rows.apply_async(
+                args=[policy_name],
+                kwargs={'days': days, 'max_runtime': max_runtime},
+                countdown=5,
+            )
+        return result.as_dict()
+
+    except ValueError:
+        raise
+    except Exception as e:
+        logger.error(f"Error purging {policy_name}: {str(e)}")
+        raise self.retry(countdown=60, exc=e)
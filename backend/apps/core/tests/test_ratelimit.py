@@ -0,0 +1,121 @@
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.content_analysis.views import real_time_check
+from apps.core.ratelimit import RateLimitMiddleware, RateThrottle, hit, parse_rate, ratelimit
+
+User = get_user_model()
+
+
+class TwoPerMinuteThrottle(RateThrottle):
+    scope = 'test_throttle'
+    rate = '2/m'
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@throttle_classes([TwoPerMinuteThrottle])
+def throttled_view(request):
+    return Response({'ok': True})
+
+
+@ratelimit('2/m', key='ip')
+def decorated_view(request):
+    return HttpResponse('ok')
+
+
+class RateLimitTestCase(TestCase):
+    """Test the sliding-window rate limiter and its entry points"""
+
+    def setUp(self):
+        caches['ratelimit'].clear()
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('5/m'), (5, 60))
+        self.assertEqual(parse_rate('5/300s'), (5, 300))
+        self.assertEqual(parse_rate('3/h'), (3, 3600))
+        with self.assertRaises(ValueError):
+            parse_rate('five per minute')
+
+    def test_fixed_window_counts_are_atomic_integers(self):
+        results = [hit('scope', 'client', 3, 60, now=600.0) for _ in range(4)]
+
+        self.assertEqual([result.allowed for result in results], [True, True, True, False])
+        self.assertEqual(results[0].remaining, 2)
+        self.assertEqual(results[3].retry_after, 60)
+        self.assertEqual(caches['ratelimit'].get('ratelimit:scope:client:60:10'), 4)
+
+    def test_previous_window_is_weighted_by_overlap(self):
+        for _ in range(4):
+            hit('scope', 'client', 4, 60, now=630.0)
+
+        # A quarter into the next window, 3 of the previous 4 requests still count
+        self.assertTrue(hit('scope', 'client', 4, 60, now=675.0).allowed)
+        blocked = hit('scope', 'client', 4, 60, now=675.0)
+        self.assertFalse(blocked.allowed)
+        self.assertEqual(blocked.retry_after, 30)
+        self.assertTrue(hit('scope', 'client', 4, 60, now=705.0).allowed)
+
+    def test_clients_are_counted_separately(self):
+        hit('scope', 'first', 1, 60, now=600.0)
+
+        self.assertFalse(hit('scope', 'first', 1, 60, now=600.0).allowed)
+        self.assertTrue(hit('scope', 'second', 1, 60, now=600.0).allowed)
+
+    def test_decorator(self):
+        request = RequestFactory().get('/', REMOTE_ADDR='10.0.0.1')
+        statuses = [decorated_view(request).status_code for _ in range(3)]
+
+        self.assertEqual(statuses, [200, 200, 429])
+        self.assertEqual(decorated_view(RequestFactory().get('/', REMOTE_ADDR='10.0.0.2')).status_code, 200)
+
+    def test_drf_throttle(self):
+        responses = [throttled_view(APIRequestFactory().get('/')) for _ in range(3)]
+
+        self.assertEqual([response.status_code for response in responses], [200, 200, 429])
+        self.assertIn('Retry-After', responses[2])
+
+    @override_settings(RATELIMIT_PATHS={'/api/analytics/track/': '1/m'})
+    def test_middleware_limits_configured_paths(self):
+        middleware = RateLimitMiddleware(lambda request: HttpResponse('ok'))
+        factory = RequestFactory()
+
+        first = middleware(factory.post('/api/analytics/track/'))
+        second = middleware(factory.post('/api/analytics/track/'))
+        other = middleware(factory.post('/api/articles/'))
+
+        self.assertEqual((first.status_code, second.status_code, other.status_code), (200, 429, 200))
+        self.assertEqual(second['X-RateLimit-Limit'], '1')
+
+    def test_configured_paths_match_the_tracking_routes(self):
+        urls = [
+            reverse('analytics:track_page_view'),
+            reverse('newsletter:tracking', args=['open', uuid.uuid4()]),
+            reverse('seo:track_redirect'),
+        ]
+
+        for url in urls:
+            self.assertTrue(any(url.startswith(prefix) for prefix in settings.RATELIMIT_PATHS), url)
+
+    @override_settings(RATELIMIT_RATES={'realtime_check': '1/m'})
+    def test_realtime_check_is_limited_per_user(self):
+        user = User.objects.create_user(username='writer', email='writer@example.com', password='pass12345')
+
+        statuses = []
+        for _ in range(2):
+            request = APIRequestFactory().post('/api/content-analysis/realtime-check/',
+                                               {'text': 'Short text to check.'}, format='json')
+            force_authenticate(request, user=user)
+            statuses.append(real_time_check(request).status_code)
+
+        self.assertEqual(statuses[1], 429)
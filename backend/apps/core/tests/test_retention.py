@@ -0,0 +1,63 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.analytics.models import PageView
+from apps.content_analysis.models import TextAnalysis
+from apps.core.retention import get_checkpoint, get_policy, purge
+
+
+class RetentionPurgeTestCase(TestCase):
+    """Test chunked retention deletes"""
+
+    def setUp(self):
+        cache.clear()
+        old = timezone.now() - timedelta(days=400)
+        for i in range(7):
+            PageView.objects.create(content_type='home', url=f'/old/{i}', timestamp=old)
+        for i in range(3):
+            PageView.objects.create(content_type='home', url=f'/new/{i}')
+
+    def test_purge_deletes_only_expired_rows_in_batches(self):
+        """Expired rows are removed in batch_size chunks and recent rows survive"""
+        result = purge(get_policy('page_views'), batch_size=3, sleep=0)
+
+        self.assertEqual(result.deleted, 7)
+        self.assertEqual(result.batches, 3)
+        self.assertTrue(result.completed)
+        self.assertEqual(PageView.objects.count(), 3)
+        self.assertIsNone(get_checkpoint('page_views'))
+
+    def test_dry_run_estimates_without_deleting(self):
+        """Dry runs report eligible rows and leave the table untouched"""
+        result = purge(get_policy('page_views'), dry_run=True)
+
+        self.assertEqual(result.estimated_rows, 7)
+        self.assertEqual(result.deleted, 0)
+        self.assertEqual(PageView.objects.count(), 10)
+
+    def test_paused_run_resumes_from_checkpoint(self):
+        """A run stopped by max_runtime leaves a checkpoint the next run resumes from"""
+        first = purge(get_policy('page_views'), batch_size=2, sleep=0, max_runtime=0)
+        self.assertFalse(first.completed)
+        self.assertEqual(first.deleted, 2)
+        self.assertIsNotNone(get_checkpoint('page_views'))
+
+        second = purge(get_policy('page_views'), batch_size=2, sleep=0)
+        self.assertTrue(second.completed)
+        self.assertEqual(second.deleted, 7)
+        self.assertEqual(PageView.objects.count(), 3)
+
+    def test_text_analysis_policy_uses_cache_expiry(self):
+        """Stale TextAnalysis rows are selected by cache_expires_at"""
+        TextAnalysis.objects.create(text_content='old', text_hash='a' * 64,
+                                    cache_expires_at=timezone.now() - timedelta(hours=1))
+        TextAnalysis.objects.create(text_content='fresh', text_hash='b' * 64,
+                                    cache_expires_at=timezone.now() + timedelta(hours=1))
+
+        result = purge(get_policy('text_analyses'), sleep=0)
+
+        self.assertEqual(result.deleted, 1)
+        self.assertEqual(list(TextAnalysis.objects.values_list('text_content', flat=True)), ['fresh'])
@@ -0,0 +1,80 @@
+# Generated by Django 5.0.3 on 2025-11-22 09:15
+
+import apps.media.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("media", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="media",
+            name="processing_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("ready", "Ready"),
+                    ("skipped", "Skipped"),
+                    ("failed", "Failed"),
+                ],
+                default="pending",
+                max_length=20,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="media",
+            index=models.Index(
+                fields=["processing_status", "created_at"],
+                name="media_media_process_8884eb_idx",
+            ),
+        ),
+        migrations.CreateModel(
+            name="MediaVariant",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "format",
+                    models.CharField(
+                        choices=[("webp", "WebP"), ("avif", "AVIF"), ("jpeg", "JPEG")],
+                        max_length=10,
+                    ),
+                ),
+                ("width", models.PositiveIntegerField()),
+                ("height", models.PositiveIntegerField()),
+                (
+                    "file",
+                    models.FileField(
+                        max_length=255,
+                        upload_to=apps.media.models.variant_upload_to,
+                    ),
+                ),
+                ("file_size", models.PositiveIntegerField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "media",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="variants",
+                        to="media.media",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["format", "width"],
+                "unique_together": {("media", "format", "width")},
+            },
+        ),
+    ]
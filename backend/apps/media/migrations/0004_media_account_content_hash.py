@@ -0,0 +1,38 @@
+# Generated by Django 5.0.3 on 2025-11-22 13:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0001_initial"),
+        ("media", "0003_media_processing_status_mediavariant"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="media",
+            name="account",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="media_files",
+                to="accounts.account",
+            ),
+        ),
+        migrations.AddField(
+            model_name="media",
+            name="content_hash",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name="media",
+            index=models.Index(
+                fields=["account", "content_hash"],
+                name="media_media_account_7682bc_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.0.3 on 2026-10-19 19:20
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def drop_duplicate_rows(apps, schema_editor):
+    """
+    Keep the oldest tenant-less counter row per uploader. Counter updates hit
+    every duplicate, so the oldest one has seen all of them.
+    """
+    MediaUsage = apps.get_model("media", "MediaUsage")
+    duplicated = (
+        MediaUsage.objects.filter(account__isnull=True).values("user_id")
+        .annotate(rows=Count("id")).filter(rows__gt=1).values_list("user_id", flat=True)
+    )
+    for user_id in list(duplicated):
+        rows = MediaUsage.objects.filter(account__isnull=True, user_id=user_id).order_by("id")
+        MediaUsage.objects.filter(pk__in=list(rows.values_list("id", flat=True)[1:])).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("media", "0005_mediausage"),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_rows, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="mediausage",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("account__isnull", True)),
+                fields=("user",),
+                name="media_usage_unique_user_without_account",
+            ),
+        ),
+    ]
@@ -0,0 +1,125 @@
+from django.db import models, transaction
+import uuid
+
+
+class Media(models.Model):
+    """
+    Uploaded images and files
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    # File
+    file = models.ImageField(upload_to='uploads/%Y/%m/')
+    filename = models.CharField(max_length=255)
+    alt_text = models.CharField(max_length=255, blank=True)
+
+    # Metadata (auto-filled)
+    width = models.IntegerField(null=True, blank=True)
+    height = models.IntegerField(null=True, blank=True)
+    file_size = models.IntegerField()  # bytes
+    mime_type = models.CharField(max_length=100)
+    content_hash = models.CharField(max_length=64, blank=True)  # SHA-256, for per-tenant deduplication
+
+    # Responsive variant processing
+    PROCESSING_PENDING = 'pending'
+    PROCESSING_READY = 'ready'
+    PROCESSING_SKIPPED = 'skipped'
+    PROCESSING_FAILED = 'failed'
+    PROCESSING_CHOICES = [
+        (PROCESSING_PENDING, 'Pending'),
+        (PROCESSING_READY, 'Ready'),
+        (PROCESSING_SKIPPED, 'Skipped'),
+        (PROCESSING_FAILED, 'Failed'),
+    ]
+    processing_status = models.CharField(max_length=20, choices=PROCESSING_CHOICES, default=PROCESSING_PENDING)
+
+    # Owner
+    account = models.ForeignKey('accounts.Account', on_delete=models.CASCADE, related_name='media_files', null=True, blank=True)
+    uploaded_by = models.ForeignKey('users.User', on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name_plural = 'Media'
+        indexes = [
+            models.Index(fields=['processing_status', 'created_at']),
+            models.Index(fields=['account', 'content_hash']),
+        ]
+
+    def __str__(self):
+        return self.filename
+
+    def save(self, *args, **kwargs):
+        # Extract image dimensions from the file header
+        if self.file and not self.width:
+            from .uploads import probe_image
+            info = probe_image(self.file)
+            if info:
+                self.width, self.height = info.width, info.height
+
+        # Set file size
+        if self.file and not self.file_size:
+            self.file_size = self.file.size
+
+        # Set filename if not provided
+        if not self.filename:
+            self.filename = self.file.name
+
+        # The storage claimed in pre_save rolls back if the file write or insert fails
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+def variant_upload_to(instance, filename):
+    return f"variants/{instance.media_id}/{filename}"
+
+
+class MediaVariant(models.Model):
+    """
+    Resized, metadata-free rendition of an image at one width and format
+    """
+    FORMAT_CHOICES = [
+        ('webp', 'WebP'),
+        ('avif', 'AVIF'),
+        ('jpeg', 'JPEG'),
+    ]
+
+    media = models.ForeignKey(Media, on_delete=models.CASCADE, related_name='variants')
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    file = models.FileField(upload_to=variant_upload_to, max_length=255)
+    file_size = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['format', 'width']
+        unique_together = [['media', 'format', 'width']]
+
+    def __str__(self):
+        return f"{self.media.filename} ({self.format}, {self.width}w)"
+
+
+class MediaUsage(models.Model):
+    """
+    Running upload totals per tenant and uploader, kept current by signals
+    and periodically reconciled against the Media table
+    """
+    account = models.ForeignKey('accounts.Account', on_delete=models.CASCADE, related_name='media_usage', null=True, blank=True)
+    user = models.ForeignKey('users.User', on_delete=models.CASCADE, related_name='media_usage')
+    file_count = models.PositiveIntegerField(default=0)
+    image_count = models.PositiveIntegerField(default=0)
+    total_bytes = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [['account', 'user']]
+        constraints = [
+            # NULLs never collide in unique_together, so uploads without a tenant need their own
+            models.UniqueConstraint(
+                fields=['user'], condition=models.Q(account__isnull=True), name='media_usage_unique_user_without_account'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user} in {self.account}: {self.file_count} files, {self.total_bytes} bytes"
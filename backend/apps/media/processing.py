@@ -0,0 +1,140 @@
+"""
+Responsive image variants
+Each uploaded image is decoded once, orientation-corrected and re-encoded at
+the configured widths in every available format. Variants are written without
+EXIF, XMP or ICC metadata and recorded in MediaVariant.
+"""
+
+import io
+import logging
+from typing import Dict, List
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image, ImageOps
+
+from .models import Media, MediaVariant
+
+try:
+    import pillow_avif  # noqa: F401  (registers the AVIF codec on older Pillow releases)
+except ImportError:
+    pass
+
+logger = logging.getLogger(__name__)
+
+VARIANT_WIDTHS = getattr(settings, 'MEDIA_VARIANT_WIDTHS', [320, 640, 1024, 1600])
+VARIANT_FORMATS = getattr(settings, 'MEDIA_VARIANT_FORMATS', ['avif', 'webp', 'jpeg'])
+VARIANT_QUALITY = getattr(settings, 'MEDIA_VARIANT_QUALITY', {'avif': 55, 'webp': 80, 'jpeg': 82})
+
+PIL_FORMATS = {'webp': 'WEBP', 'avif': 'AVIF', 'jpeg': 'JPEG'}
+EXTENSIONS = {'webp': 'webp', 'avif': 'avif', 'jpeg': 'jpg'}
+MIME_TYPES = {'webp': 'image/webp', 'avif': 'image/avif', 'jpeg': 'image/jpeg'}
+
+# Animated images and vector formats are served as uploaded
+SKIPPED_MIME_TYPES = {'image/gif', 'image/svg+xml'}
+
+
+def available_formats() -> List[str]:
+    """Configured formats this Pillow build can encode"""
+    Image.init()
+    return [name for name in VARIANT_FORMATS if PIL_FORMATS.get(name) in Image.SAVE]
+
+
+def target_widths(original_width: int) -> List[int]:
+    """Configured widths narrower than the original, or the original width alone"""
+    widths = sorted({width for width in VARIANT_WIDTHS if width < original_width})
+    return widths or [original_width]
+
+
+def should_process(media: Media) -> bool:
+    return bool(media.file) and media.mime_type.startswith('image/') and media.mime_type not in SKIPPED_MIME_TYPES
+
+
+def _prepare(image: Image.Image) -> Image.Image:
+    """Apply EXIF orientation and normalize the colour mode"""
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        return image.convert('RGBA')
+    return image.convert('RGB')
+
+
+def encode(image: Image.Image, variant_format: str) -> bytes:
+    """Encode without passing exif/icc_profile, which drops all metadata"""
+    if variant_format == 'jpeg' and image.mode != 'RGB':
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        image = background
+
+    options = {'quality': VARIANT_QUALITY.get(variant_format, 80)}
+    if variant_format == 'jpeg':
+        options.update(optimize=True, progressive=True)
+    elif variant_format == 'webp':
+        options['method'] = 4
+
+    buffer = io.BytesIO()
+    image.save(buffer, format=PIL_FORMATS[variant_format], **options)
+    return buffer.getvalue()
+
+
+def generate_variants(media: Media) -> List[MediaVariant]:
+    """
+    Replace the variants of an image. Returns the new variants; media that
+    cannot be processed is marked skipped or failed instead.
+    """
+    from .resolver import invalidate_media_urls
+
+    if not should_process(media):
+        Media.objects.filter(pk=media.pk).update(processing_status=Media.PROCESSING_SKIPPED)
+        return []
+
+    formats = available_formats()
+    media.file.open('rb')
+    try:
+        with Image.open(media.file) as source:
+            if getattr(source, 'is_animated', False):
+                Media.objects.filter(pk=media.pk).update(processing_status=Media.PROCESSING_SKIPPED)
+                return []
+            image = _prepare(source)
+    finally:
+        media.file.close()
+
+    variants = []
+    for width in target_widths(image.width):
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        for variant_format in formats:
+            data = encode(resized, variant_format)
+            variant = MediaVariant(media=media, format=variant_format, width=width, height=height, file_size=len(data))
+            variant.file.save(f"{width}w.{EXTENSIONS[variant_format]}", ContentFile(data), save=False)
+            variants.append(variant)
+
+    # Files of replaced variants are removed by the post_delete signal once this commits
+    with transaction.atomic():
+        media.variants.all().delete()
+        MediaVariant.objects.bulk_create(variants)
+        Media.objects.filter(pk=media.pk).update(processing_status=Media.PROCESSING_READY)
+        transaction.on_commit(lambda: invalidate_media_urls([media.pk]))
+
+    media.processing_status = Media.PROCESSING_READY
+    logger.info(f"Generated {len(variants)} variants for media {media.id}")
+    return variants
+
+
+def build_srcset(media: Media, url_for=None, variants=None) -> Dict[str, Dict]:
+    """
+    Srcset strings per format, e.g. {'webp': {'type': 'image/webp', 'srcset': 'a.webp 320w, ...'}}.
+    Uses the given or prefetched variants when available.
+    """
+    url_for = url_for or (lambda url: url)
+    variants = media.variants.all() if variants is None else variants
+    by_format = {}
+    for variant in sorted(variants, key=lambda item: item.width):
+        by_format.setdefault(variant.format, []).append(f"{url_for(variant.file.url)} {variant.width}w")
+
+    # Most efficient format first, matching <picture> source order
+    order = {variant_format: index for index, variant_format in enumerate(VARIANT_FORMATS)}
+    return {
+        variant_format: {'type': MIME_TYPES[variant_format], 'srcset': ', '.join(by_format[variant_format])}
+        for variant_format in sorted(by_format, key=lambda name: order.get(name, len(order)))
+    }
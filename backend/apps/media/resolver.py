@@ -0,0 +1,108 @@
+"""
+Batched media URL resolution
+Serializers hand over every Media id they are about to render and get back the
+file URL and srcset of each in one call. Results are cached per media item so
+storage URL construction (and URL signing on S3) happens once per cache period
+instead of once per item per request.
+"""
+
+import logging
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Media, MediaVariant
+from .processing import build_srcset
+
+logger = logging.getLogger(__name__)
+
+# Signed URLs must outlive their cache entry
+MEDIA_URL_CACHE_TIMEOUT = getattr(
+    settings, 'MEDIA_URL_CACHE_TIMEOUT', min(60 * 30, getattr(settings, 'AWS_QUERYSTRING_EXPIRE', 3600) // 2)
+)
+
+
+def media_url_key(media_id) -> str:
+    return f"media_urls:{media_id}"
+
+
+def invalidate_media_urls(media_ids: Iterable):
+    cache.delete_many([media_url_key(media_id) for media_id in media_ids])
+
+
+def _entry(media: Media, variants) -> Dict:
+    return {
+        'url': media.file.url if media.file else None,
+        'srcset': build_srcset(media, variants=variants),
+    }
+
+
+def resolve_media_urls(items: Iterable) -> Dict[str, Dict]:
+    """
+    Map media ids to {'url', 'srcset'}.
+
+    Accepts Media instances or ids. Cache misses cost one query for variants,
+    plus one for any Media given only by id.
+    """
+    instances = {}
+    ids = []
+    for item in items:
+        if item is None:
+            continue
+        media_id = str(item.pk if isinstance(item, Media) else item)
+        if isinstance(item, Media):
+            instances[media_id] = item
+        ids.append(media_id)
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        return {}
+
+    cached = cache.get_many([media_url_key(media_id) for media_id in ids])
+    resolved = {media_id: cached[media_url_key(media_id)] for media_id in ids if media_url_key(media_id) in cached}
+
+    missing = [media_id for media_id in ids if media_id not in resolved]
+    if missing:
+        unknown = [media_id for media_id in missing if media_id not in instances]
+        if unknown:
+            for media in Media.objects.filter(id__in=unknown).only('id', 'file'):
+                instances[str(media.pk)] = media
+
+        variants = {}
+        for variant in MediaVariant.objects.filter(media_id__in=missing).only('media_id', 'format', 'width', 'file'):
+            variants.setdefault(str(variant.media_id), []).append(variant)
+
+        fresh = {}
+        for media_id in missing:
+            media = instances.get(media_id)
+            if media is not None:
+                fresh[media_id] = _entry(media, variants.get(media_id, []))
+
+        cache.set_many({media_url_key(media_id): entry for media_id, entry in fresh.items()}, MEDIA_URL_CACHE_TIMEOUT)
+        resolved.update(fresh)
+
+    return resolved
+
+
+def get_media_urls(context: Optional[Dict], item) -> Optional[Dict]:
+    """
+    Entry for one media item (instance or id), read from the batch primed into
+    a serializer context and resolved on its own when it was not primed
+    """
+    if item is None:
+        return None
+    media_id = str(item.pk if isinstance(item, Media) else item)
+    primed = context.get('media_urls') if context is not None else None
+    if primed is not None and media_id in primed:
+        return primed[media_id]
+    return resolve_media_urls([item]).get(media_id)
+
+
+def prime_media_urls(context: Dict, items: Iterable):
+    """Resolve a batch of media (instances or ids) into a serializer context"""
+    primed = context.setdefault('media_urls', {})
+    pending = [
+        item for item in items
+        if item is not None and str(item.pk if isinstance(item, Media) else item) not in primed
+    ]
+    primed.update(resolve_media_urls(pending))
@@ -0,0 +1,85 @@
+from rest_framework import serializers
+from .models import Media
+from .processing import build_srcset
+from .uploads import file_digest, find_duplicate, probe_image
+
+
+class MediaSerializer(serializers.ModelSerializer):
+    """Serializer for media files"""
+    file_url = serializers.SerializerMethodField()
+    srcset = serializers.SerializerMethodField()
+    uploaded_by_name = serializers.CharField(source='uploaded_by.get_full_name', read_only=True)
+
+    class Meta:
+        model = Media
+        fields = [
+            'id', 'file', 'file_url', 'filename', 'alt_text',
+            'width', 'height', 'file_size', 'mime_type', 'processing_status', 'srcset',
+            'uploaded_by', 'uploaded_by_name', 'created_at'
+        ]
+        read_only_fields = [
+            'id', 'file_url', 'width', 'height', 'file_size', 'mime_type',
+            'processing_status', 'srcset', 'uploaded_by', 'uploaded_by_name', 'created_at'
+        ]
+
+    def get_file_url(self, obj):
+        """Return the full URL to the media file"""
+        request = self.context.get('request')
+        if obj.file and hasattr(obj.file, 'url'):
+            url = obj.file.url
+            if request:
+                return request.build_absolute_uri(url)
+            return url
+        return None
+
+    def get_srcset(self, obj):
+        """Responsive variants per format, most efficient first"""
+        request = self.context.get('request')
+        return build_srcset(obj, request.build_absolute_uri if request else None)
+
+
+class MediaUploadSerializer(serializers.ModelSerializer):
+    """Serializer for uploading media files"""
+    # Validated from the file header rather than by a full decode
+    file = serializers.FileField()
+
+    class Meta:
+        model = Media
+        fields = ['file', 'alt_text']
+
+    def validate_file(self, value):
+        info = probe_image(value)
+        if info is None:
+            raise serializers.ValidationError('Upload a valid PNG, JPEG, GIF or WebP image.')
+        value.image_info = info
+        return value
+
+    def create(self, validated_data):
+        request = self.context['request']
+        account = getattr(request, 'tenant', None)
+        file_obj = validated_data['file']
+
+        # Identical bytes the user already stored in this tenant are reused
+        content_hash = file_digest(file_obj)
+        duplicate = find_duplicate(account, request.user, content_hash)
+        self.deduplicated = duplicate is not None
+        if duplicate is not None:
+            return duplicate
+
+        info = file_obj.image_info
+        validated_data.update(
+            uploaded_by=request.user,
+            account=account,
+            content_hash=content_hash,
+            mime_type=info.mime_type,
+            width=info.width,
+            height=info.height,
+            file_size=file_obj.size,
+        )
+        return super().create(validated_data)
+
+
+class MediaUploadCheckSerializer(serializers.Serializer):
+    """Pre-upload check so clients can skip sending bytes the server already has"""
+    sha256 = serializers.RegexField(r'^[0-9a-fA-F]{64}$')
+    size = serializers.IntegerField(min_value=0)
@@ -0,0 +1,39 @@
+"""Queue responsive variant generation and keep storage counters current"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Media, MediaVariant
+from .resolver import invalidate_media_urls
+from .usage import record_created, record_deleted, reserve_storage
+
+
+@receiver(pre_save, sender=Media)
+def claim_storage(sender, instance, **kwargs):
+    # Before the insert, so an upload over the limit is never stored
+    if instance._state.adding:
+        reserve_storage(instance)
+
+
+@receiver(post_save, sender=Media)
+def queue_variant_generation(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_media_urls([instance.pk])
+        return
+    record_created(instance)
+    from .tasks import generate_media_variants
+    media_id = str(instance.pk)
+    transaction.on_commit(lambda: generate_media_variants.delay(media_id))
+
+
+@receiver(post_delete, sender=Media)
+def release_storage(sender, instance, **kwargs):
+    record_deleted(instance)
+    invalidate_media_urls([instance.pk])
+
+
+@receiver(post_delete, sender=MediaVariant)
+def delete_variant_file(sender, instance, **kwargs):
+    if instance.file:
+        transaction.on_commit(lambda: instance.file.delete(save=False))
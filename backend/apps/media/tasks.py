@@ -0,0 +1,73 @@
+"""Celery tasks for media processing"""
+
+import logging
+
+from config.celery import app
+from .models import Media
+from .processing import generate_variants
+from .usage import reconcile_usage
+
+logger = logging.getLogger(__name__)
+
+
+@app.task(bind=True, max_retries=3)
+def generate_media_variants(self, media_id: str):
+    """
+    Generate responsive variants for a newly uploaded image
+    """
+    try:
+        media = Media.objects.get(id=media_id)
+        variants = generate_variants(media)
+        return f"Generated {len(variants)} variants for media {media_id}"
+
+    except Media.DoesNotExist:
+        logger.error(f"Media {media_id} not found")
+        return "Media not found"
+    except OSError as e:
+        # Unreadable or truncated image data will not improve on retry
+        logger.error(f"Cannot process media {media_id}: {str(e)}")
+        Media.objects.filter(id=media_id).update(processing_status=Media.PROCESSING_FAILED)
+        return "Media could not be processed"
+    except Exception as e:
+        logger.error(f"Error generating variants for media {media_id}: {str(e)}")
+        if self.request.retries >= self.max_retries:
+            Media.objects.filter(id=media_id).update(processing_status=Media.PROCESSING_FAILED)
+        raise self.retry(countdown=60, exc=e)
+
+
+@app.task(bind=True)
+def optimize_media_files(self, batch_size: int = 200):
+    """
+    Queue variant generation for media still pending processing
+    (uploads whose task was lost and media created before variants existed)
+    Runs every 4 hours via Celery Beat
+    """
+    try:
+        pending = list(
+            Media.objects.filter(processing_status=Media.PROCESSING_PENDING)
+            .order_by('created_at')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        for media_id in pending:
+            generate_media_variants.delay(str(media_id))
+
+        return f"Queued {len(pending)} media files for optimization"
+
+    except Exception as e:
+        logger.error(f"Error in optimize_media_files: {str(e)}")
+        raise
+
+
+@app.task(bind=True, max_retries=3)
+def reconcile_media_usage(self):
+    """
+    Correct drift in media usage counters and tenant storage totals
+    Runs daily via Celery Beat
+    """
+    try:
+        result = reconcile_usage()
+        return f"Corrected {result['usage_rows']} usage rows and {result['accounts']} accounts"
+
+    except Exception as e:
+        logger.error(f"Error reconciling media usage: {str(e)}")
+        raise self.retry(countdown=60, exc=e)
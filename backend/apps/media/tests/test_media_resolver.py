@@ -0,0 +1,56 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from apps.media.models import Media, MediaVariant
+from apps.media.resolver import prime_media_urls, resolve_media_urls
+
+User = get_user_model()
+
+
+class MediaURLResolverTestCase(TestCase):
+    """Test batched, cached media URL resolution"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='uploader', email='uploader@example.com', password='pass12345')
+        self.media = [
+            Media.objects.create(file=f'uploads/photo{i}.jpg', filename=f'photo{i}.jpg', width=800, height=600,
+                                 file_size=1000, mime_type='image/jpeg', uploaded_by=self.user)
+            for i in range(3)
+        ]
+        MediaVariant.objects.create(media=self.media[0], format='webp', width=320, height=240,
+                                    file='variants/a/320w.webp', file_size=100)
+
+    def test_batch_resolves_with_two_queries_then_from_cache(self):
+        ids = [media.id for media in self.media]
+
+        with self.assertNumQueries(2):
+            resolved = resolve_media_urls(ids)
+
+        self.assertEqual(resolved[str(self.media[1].id)]['url'], '/media/uploads/photo1.jpg')
+        self.assertIn('320w', resolved[str(self.media[0].id)]['srcset']['webp']['srcset'])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(resolve_media_urls(ids), resolved)
+
+    def test_instances_skip_the_media_query(self):
+        with self.assertNumQueries(1):
+            resolve_media_urls(self.media)
+
+    def test_update_invalidates_entry(self):
+        resolve_media_urls([self.media[0].id])
+
+        MediaVariant.objects.all().delete()
+        self.media[0].alt_text = 'Changed'
+        self.media[0].save()
+
+        self.assertEqual(resolve_media_urls([self.media[0].id])[str(self.media[0].id)]['srcset'], {})
+
+    def test_prime_skips_already_primed(self):
+        context = {}
+        prime_media_urls(context, self.media[:2])
+
+        with self.assertNumQueries(1):
+            prime_media_urls(context, self.media)
+        self.assertEqual(len(context['media_urls']), 3)
@@ -0,0 +1,103 @@
+import io
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from apps.media.models import Media, MediaVariant
+from apps.media.processing import available_formats, build_srcset, generate_variants, target_widths
+from apps.media.serializers import MediaSerializer
+from apps.media.tasks import optimize_media_files
+
+User = get_user_model()
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def make_image(width=1200, height=800, image_format='JPEG'):
+    image = Image.new('RGB', (width, height), (200, 60, 20))
+    exif = Image.Exif()
+    exif[0x010F] = 'CameraMaker'  # Make
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format, exif=exif)
+    return buffer.getvalue()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class MediaVariantTestCase(TestCase):
+    """Test responsive variant generation"""
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='uploader', email='uploader@example.com', password='pass12345')
+
+    def _create_media(self, data=None, mime_type='image/jpeg', name='photo.jpg'):
+        return Media.objects.create(
+            file=SimpleUploadedFile(name, data or make_image(), content_type=mime_type),
+            mime_type=mime_type,
+            uploaded_by=self.user,
+        )
+
+    def test_target_widths(self):
+        self.assertEqual(target_widths(1200), [320, 640, 1024])
+        self.assertEqual(target_widths(200), [200])
+
+    def test_upload_generates_variants_without_metadata(self):
+        """Uploading queues variant generation once the transaction commits"""
+        with self.captureOnCommitCallbacks(execute=True):
+            media = self._create_media()
+
+        media.refresh_from_db()
+        self.assertEqual(media.processing_status, Media.PROCESSING_READY)
+        variants = list(media.variants.all())
+        self.assertEqual(len(variants), 3 * len(available_formats()))
+
+        variant = media.variants.get(format='jpeg', width=640)
+        self.assertEqual(variant.height, 427)
+        with Image.open(variant.file) as image:
+            self.assertEqual(image.size, (640, 427))
+            self.assertEqual(len(image.getexif()), 0)
+
+    def test_regenerating_replaces_variants(self):
+        media = self._create_media()
+        generate_variants(media)
+        first_ids = set(media.variants.values_list('id', flat=True))
+
+        generate_variants(media)
+
+        self.assertFalse(MediaVariant.objects.filter(id__in=first_ids).exists())
+        self.assertEqual(media.variants.count(), len(first_ids))
+
+    def test_non_images_are_skipped(self):
+        media = self._create_media(mime_type='image/gif', name='anim.gif', data=make_image(image_format='GIF'))
+
+        self.assertEqual(generate_variants(media), [])
+        media.refresh_from_db()
+        self.assertEqual(media.processing_status, Media.PROCESSING_SKIPPED)
+
+    def test_srcset_lists_widths_per_format(self):
+        media = self._create_media()
+        generate_variants(media)
+
+        srcset = build_srcset(Media.objects.prefetch_related('variants').get(pk=media.pk))
+
+        self.assertEqual(srcset['jpeg']['type'], 'image/jpeg')
+        self.assertEqual([part.split()[-1] for part in srcset['jpeg']['srcset'].split(', ')], ['320w', '640w', '1024w'])
+        self.assertIn('srcset', MediaSerializer(media).data)
+
+    def test_periodic_task_processes_pending_media(self):
+        """optimize_media_files picks up media whose upload task never ran"""
+        media = self._create_media()
+        self.assertEqual(media.processing_status, Media.PROCESSING_PENDING)
+
+        optimize_media_files()
+
+        media.refresh_from_db()
+        self.assertEqual(media.processing_status, Media.PROCESSING_READY)
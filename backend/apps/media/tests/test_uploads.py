@@ -0,0 +1,155 @@
+import hashlib
+import io
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadhandler import StopUpload
+from django.test import TestCase, override_settings
+from PIL import Image
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.accounts.models import Account
+from apps.media.models import Media
+from apps.media.uploads import HashingUploadHandler, probe_image
+from apps.media.views import MediaUploadView, media_upload_check
+
+User = get_user_model()
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def image_bytes(image_format='PNG', size=(300, 200)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, (10, 120, 200)).save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+class ProbeImageTestCase(TestCase):
+    """Test header-only image identification"""
+
+    def test_supported_formats(self):
+        for image_format, mime_type in [('PNG', 'image/png'), ('JPEG', 'image/jpeg'),
+                                        ('GIF', 'image/gif'), ('WEBP', 'image/webp')]:
+            info = probe_image(io.BytesIO(image_bytes(image_format, (321, 123))))
+            self.assertEqual((info.mime_type, info.width, info.height), (mime_type, 321, 123), image_format)
+
+    def test_lossless_webp(self):
+        buffer = io.BytesIO()
+        Image.new('RGBA', (77, 55)).save(buffer, format='WEBP', lossless=True)
+
+        info = probe_image(buffer)
+
+        self.assertEqual((info.width, info.height), (77, 55))
+
+    def test_jpeg_with_large_metadata(self):
+        """Frame headers behind big EXIF and ICC segments are still found"""
+        buffer = io.BytesIO()
+        exif = b'Exif\x00\x00' + b'\x00' * 60 * 1024
+        Image.new('RGB', (400, 300)).save(buffer, format='JPEG', exif=exif, icc_profile=b'\x00' * 20 * 1024)
+
+        info = probe_image(buffer)
+
+        self.assertEqual((info.mime_type, info.width, info.height), ('image/jpeg', 400, 300))
+
+    def test_non_image_is_rejected(self):
+        self.assertIsNone(probe_image(io.BytesIO(b'<html>not an image</html>')))
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class StreamingUploadTestCase(TestCase):
+    """Test hashed, deduplicated and storage-limited uploads"""
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(username='uploader', email='uploader@example.com', password='pass12345')
+        self.account = Account.objects.create(name='Blog', slug='blog', owner=self.user)
+        self.data = image_bytes()
+
+    def _upload(self, account, data=None, content_type='image/png', user=None):
+        upload = SimpleUploadedFile('photo.png', data or self.data, content_type=content_type)
+        request = self.factory.post('/api/media/upload/', {'file': upload, 'alt_text': 'A photo'}, format='multipart')
+        request.tenant = account
+        force_authenticate(request, user=user or self.user)
+        response = MediaUploadView.as_view()(request)
+        request.close()
+        return response
+
+    def test_upload_records_hash_and_sniffed_type(self):
+        """The MIME type comes from the file header, not the client"""
+        response = self._upload(self.account, content_type='text/plain')
+
+        self.assertEqual(response.status_code, 201)
+        media = Media.objects.get(id=response.data['id'])
+        self.assertEqual(media.content_hash, hashlib.sha256(self.data).hexdigest())
+        self.assertEqual((media.mime_type, media.width, media.height), ('image/png', 300, 200))
+        self.assertEqual(media.account, self.account)
+
+    def test_identical_upload_is_deduplicated_per_tenant(self):
+        first = self._upload(self.account)
+        second = self._upload(self.account)
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.data['id'], first.data['id'])
+
+        other = Account.objects.create(name='Other', slug='other', owner=self.user)
+        self.assertEqual(self._upload(other).status_code, 201)
+        self.assertEqual(Media.objects.count(), 2)
+
+    def test_uploads_of_other_users_are_not_reused(self):
+        other_user = User.objects.create_user(username='other', email='other@example.com', password='pass12345')
+        first = self._upload(None)
+        second = self._upload(None, user=other_user)
+
+        self.assertEqual(second.status_code, 201)
+        self.assertNotEqual(second.data['id'], first.data['id'])
+        self.assertEqual(Media.objects.get(id=second.data['id']).uploaded_by, other_user)
+
+    def test_invalid_image_is_rejected(self):
+        response = self._upload(self.account, data=b'plain text pretending to be an image')
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_storage_limit_checked_before_body(self):
+        self.account.current_storage_mb = 100
+        self.account.save(update_fields=['current_storage_mb'])
+
+        response = self._upload(self.account)
+
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(Media.objects.exists())
+
+    def test_handler_aborts_over_allowance(self):
+        handler = HashingUploadHandler(max_bytes=10)
+        handler.new_file('file', 'photo.png', 'image/png', 20)
+
+        with self.assertRaises(StopUpload):
+            handler.receive_data_chunk(b'x' * 20, 0)
+        self.assertTrue(handler.exceeded)
+
+    def _check(self, account, user):
+        payload = {'sha256': hashlib.sha256(self.data).hexdigest(), 'size': len(self.data)}
+        request = self.factory.post('/api/media/upload/check/', payload, format='json')
+        request.tenant = account
+        force_authenticate(request, user=user)
+        return media_upload_check(request)
+
+    def test_upload_check(self):
+        self._upload(self.account)
+
+        self.assertTrue(self._check(self.account, self.user).data['exists'])
+
+    def test_upload_check_hides_media_of_other_users(self):
+        self._upload(None)
+        other_user = User.objects.create_user(username='other', email='other@example.com', password='pass12345')
+
+        response = self._check(None, other_user)
+
+        self.assertFalse(response.data['exists'])
+        self.assertNotIn('media', response.data)
@@ -0,0 +1,95 @@
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.accounts.models import Account
+from apps.media.models import Media, MediaUsage
+from apps.media.usage import reconcile_account_usage, reconcile_usage
+from apps.media.views import media_stats
+
+User = get_user_model()
+
+MB = 1024 * 1024
+
+
+class MediaUsageTestCase(TestCase):
+    """Test incremental storage accounting and reconciliation"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='uploader', email='uploader@example.com', password='pass12345')
+        self.account = Account.objects.create(name='Blog', slug='blog', owner=self.user)
+
+    def _media(self, size, mime_type='image/jpeg', account=None):
+        # Dimensions are preset so no file needs to be read
+        return Media.objects.create(
+            file='uploads/test.jpg', filename='test.jpg', width=10, height=10,
+            file_size=size, mime_type=mime_type, uploaded_by=self.user,
+            account=account or self.account,
+        )
+
+    def test_counters_follow_create_and_delete(self):
+        self._media(3 * MB)
+        pdf = self._media(MB // 2, mime_type='application/pdf')
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.current_storage_bytes, 3 * MB + MB // 2)
+        self.assertEqual(self.account.current_storage_mb, 4)
+
+        pdf.delete()
+
+        self.account.refresh_from_db()
+        self.assertEqual((self.account.current_storage_bytes, self.account.current_storage_mb), (3 * MB, 3))
+        usage = MediaUsage.objects.get(account=self.account, user=self.user)
+        self.assertEqual((usage.file_count, usage.image_count), (1, 1))
+
+    def test_uploads_without_tenant_share_one_counter_row(self):
+        Media.objects.create(file='uploads/a.jpg', filename='a.jpg', width=10, height=10, file_size=MB,
+                             mime_type='image/jpeg', uploaded_by=self.user)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            MediaUsage.objects.create(account=None, user=self.user)
+
+        self.assertEqual(MediaUsage.objects.get(account=None, user=self.user).total_bytes, MB)
+
+    def test_stats_read_counters_in_one_query(self):
+        self._media(100)
+        self._media(50, mime_type='application/pdf')
+        request = APIRequestFactory().get('/api/media/stats/')
+        force_authenticate(request, user=self.user)
+
+        with self.assertNumQueries(1):
+            response = media_stats(request)
+
+        self.assertEqual(response.data, {'total_files': 2, 'total_size': 150, 'images': 1, 'other_files': 1})
+
+    def test_reconcile_corrects_drift(self):
+        self._media(2 * MB)
+        MediaUsage.objects.update(file_count=9, total_bytes=1)
+        Account.objects.filter(pk=self.account.pk).update(current_storage_bytes=0, current_storage_mb=0)
+
+        result = reconcile_usage()
+
+        self.assertEqual(result, {'usage_rows': 1, 'accounts': 1})
+        usage = MediaUsage.objects.get()
+        self.assertEqual((usage.file_count, usage.total_bytes), (1, 2 * MB))
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.current_storage_mb, 2)
+        self.assertEqual(reconcile_usage(), {'usage_rows': 0, 'accounts': 0})
+
+    def test_reconcile_rewrites_one_account_at_a_time(self):
+        other = Account.objects.create(name='Other', slug='other', owner=self.user)
+        self._media(MB)
+        self._media(MB, account=other)
+        MediaUsage.objects.update(file_count=9)
+
+        self.assertEqual(reconcile_account_usage(self.account.pk), (1, 0))
+
+        self.assertEqual(MediaUsage.objects.get(account=self.account).file_count, 1)
+        self.assertEqual(MediaUsage.objects.get(account=other).file_count, 9)
+
+    def test_deleting_account_cascades_cleanly(self):
+        self._media(100)
+
+        self.account.delete()
+
+        self.assertFalse(MediaUsage.objects.exists())
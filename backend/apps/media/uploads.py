@@ -0,0 +1,207 @@
+"""
+Streaming media uploads
+Upload bodies are streamed to a temporary file while a SHA-256 digest is
+computed and the tenant's storage allowance is enforced. Image format and
+dimensions are read from the file headers instead of decoding the image, and
+identical files are deduplicated per tenant and uploader by their digest.
+"""
+
+import hashlib
+import logging
+import struct
+from typing import NamedTuple, Optional
+
+from django.core.files.uploadhandler import StopUpload, TemporaryFileUploadHandler
+
+from apps.accounts import quotas
+from .models import Media
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+# Enough for the PNG, GIF and WebP headers; JPEG segments are walked instead
+PROBE_BYTES = 32
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+class ImageInfo(NamedTuple):
+    format: str
+    mime_type: str
+    width: int
+    height: int
+
+
+MIME_TYPES = {
+    'png': 'image/png',
+    'gif': 'image/gif',
+    'jpeg': 'image/jpeg',
+    'webp': 'image/webp',
+}
+
+
+def _probe_png(head: bytes) -> Optional[ImageInfo]:
+    if head[:8] == b'\x89PNG\r\n\x1a\n' and head[12:16] == b'IHDR':
+        width, height = struct.unpack('>II', head[16:24])
+        return ImageInfo('png', MIME_TYPES['png'], width, height)
+    return None
+
+
+def _probe_gif(head: bytes) -> Optional[ImageInfo]:
+    if head[:6] in (b'GIF87a', b'GIF89a'):
+        width, height = struct.unpack('<HH', head[6:10])
+        return ImageInfo('gif', MIME_TYPES['gif'], width, height)
+    return None
+
+
+def _probe_webp(head: bytes) -> Optional[ImageInfo]:
+    if head[:4] != b'RIFF' or head[8:12] != b'WEBP':
+        return None
+    chunk = head[12:16]
+    if chunk == b'VP8 ' and head[23:26] == b'\x9d\x01\x2a':
+        width, height = struct.unpack('<HH', head[26:30])
+        return ImageInfo('webp', MIME_TYPES['webp'], width & 0x3fff, height & 0x3fff)
+    if chunk == b'VP8L' and head[20:21] == b'\x2f':
+        bits = int.from_bytes(head[21:25], 'little')
+        return ImageInfo('webp', MIME_TYPES['webp'], (bits & 0x3fff) + 1, ((bits >> 14) & 0x3fff) + 1)
+    if chunk == b'VP8X':
+        width = int.from_bytes(head[24:27], 'little') + 1
+        height = int.from_bytes(head[27:30], 'little') + 1
+        return ImageInfo('webp', MIME_TYPES['webp'], width, height)
+    return None
+
+
+# Start-of-frame markers; DHT (C4), JPG (C8) and DAC (CC) share the range but carry no size
+JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def _probe_jpeg(file_obj) -> Optional[ImageInfo]:
+    """
+    Walk the JPEG marker segments up to the start of frame, seeking past each
+    segment by its length field so large EXIF or ICC blocks are never read.
+    """
+    file_obj.seek(0)
+    if file_obj.read(2) != b'\xff\xd8':
+        return None
+    while True:
+        if file_obj.read(1) != b'\xff':
+            return None
+        marker = file_obj.read(1)
+        while marker == b'\xff':  # Fill bytes may pad any marker
+            marker = file_obj.read(1)
+        if not marker:
+            return None
+        code = marker[0]
+        if code in (0xD8, 0x01) or 0xD0 <= code <= 0xD7:
+            continue
+        if code in (0xD9, 0xDA):
+            # End of image or start of scan before any frame header
+            return None
+        header = file_obj.read(2)
+        if len(header) < 2:
+            return None
+        length = struct.unpack('>H', header)[0]
+        if length < 2:
+            return None
+        if code in JPEG_SOF_MARKERS:
+            frame = file_obj.read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack('>HH', frame[1:5])
+            return ImageInfo('jpeg', MIME_TYPES['jpeg'], width, height)
+        file_obj.seek(length - 2, 1)
+
+
+HEADER_PROBES = (_probe_png, _probe_gif, _probe_webp)
+
+
+def probe_image(file_obj) -> Optional[ImageInfo]:
+    """
+    Identify an image from its leading bytes without decoding pixel data.
+    Returns None when the bytes are not a supported image.
+    """
+    position = file_obj.tell() if hasattr(file_obj, 'tell') else None
+    try:
+        file_obj.seek(0)
+        head = file_obj.read(PROBE_BYTES)
+        if head[:2] == b'\xff\xd8':
+            info = _probe_jpeg(file_obj)
+        else:
+            info = next(filter(None, (probe(head) for probe in HEADER_PROBES)), None)
+    finally:
+        if position is not None:
+            file_obj.seek(position)
+
+    if info is not None and info.width and info.height:
+        return info
+    return None
+
+
+def file_digest(file_obj) -> str:
+    """SHA-256 of a file, reusing the digest computed while it streamed in"""
+    digest = getattr(file_obj, 'content_hash', None)
+    if digest:
+        return digest
+    sha256 = hashlib.sha256()
+    file_obj.seek(0)
+    for chunk in iter(lambda: file_obj.read(HASH_CHUNK_SIZE), b''):
+        sha256.update(chunk)
+    file_obj.seek(0)
+    return sha256.hexdigest()
+
+
+def storage_allowance_bytes(account) -> Optional[int]:
+    """Bytes the tenant may still upload, or None when uploads are not tenant-scoped"""
+    if account is None:
+        return None
+    return max(0, quotas.limit(account, 'storage') - account.current_storage_bytes)
+
+
+def within_storage_limit(account, size_bytes: int) -> bool:
+    if account is None:
+        return True
+    return account.check_storage_limit(-(-size_bytes // MB))
+
+
+def find_duplicate(account, user, content_hash: str) -> Optional[Media]:
+    """
+    An existing upload of the same bytes in the tenant, if any. Only media the
+    user can open is matched: their own uploads, or any upload for staff.
+    """
+    if not content_hash:
+        return None
+    queryset = Media.objects.filter(account=account, content_hash=content_hash)
+    if not user.is_staff:
+        queryset = queryset.filter(uploaded_by=user)
+    return queryset.order_by('created_at').first()
+
+
+class HashingUploadHandler(TemporaryFileUploadHandler):
+    """
+    Stream uploads to a temporary file, hashing each chunk as it arrives and
+    aborting the request once it exceeds the tenant's remaining storage.
+    """
+
+    def __init__(self, request=None, max_bytes: Optional[int] = None):
+        super().__init__(request)
+        self.max_bytes = max_bytes
+        self.received = 0
+        self.exceeded = False
+        self.sha256 = None
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.sha256 = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.max_bytes is not None and self.received > self.max_bytes:
+            self.exceeded = True
+            logger.warning(f"Upload aborted after {self.received} bytes: storage limit exceeded")
+            raise StopUpload(connection_reset=True)
+        self.sha256.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded_file = super().file_complete(file_size)
+        uploaded_file.content_hash = self.sha256.hexdigest()
+        return uploaded_file
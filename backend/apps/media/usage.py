@@ -0,0 +1,150 @@
+"""
+Media storage accounting
+Upload counts and byte totals are adjusted in place with F() expressions when
+media is created or deleted, so statistics and plan limits are read from a
+handful of counter rows instead of scanning Media. The tenant's storage total
+is reserved through the account quota engine before the row is inserted.
+reconcile_usage() rebuilds the counters one account at a time, each in its
+own short transaction, to correct any drift.
+"""
+
+import logging
+from typing import Dict, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce
+
+from apps.accounts import quotas
+from apps.accounts.models import Account
+from apps.accounts.quotas import storage_mb
+from .models import Media, MediaUsage
+
+logger = logging.getLogger(__name__)
+
+
+def _usage_row(account_id, user_id) -> MediaUsage:
+    usage = MediaUsage.objects.filter(account_id=account_id, user_id=user_id).first()
+    if usage is None:
+        try:
+            with transaction.atomic():
+                usage = MediaUsage.objects.create(account_id=account_id, user_id=user_id)
+        except IntegrityError:
+            usage = MediaUsage.objects.get(account_id=account_id, user_id=user_id)
+    return usage
+
+
+def apply_delta(account_id, user_id, files: int, images: int, size: int):
+    """Adjust the uploader's counters in place"""
+    if files > 0:
+        _usage_row(account_id, user_id)
+    # Decrements never create rows: during a cascade delete the owner may already be gone
+    MediaUsage.objects.filter(account_id=account_id, user_id=user_id).update(
+        file_count=F('file_count') + files,
+        image_count=F('image_count') + images,
+        total_bytes=F('total_bytes') + size,
+    )
+
+
+def reserve_storage(media: Media):
+    """Count a new upload against the tenant's storage limit, or raise QuotaExceeded"""
+    if media.account_id is not None and media.file_size:
+        quotas.reserve(media.account, 'storage', media.file_size)
+
+
+def record_created(media: Media):
+    is_image = 1 if media.mime_type.startswith('image/') else 0
+    apply_delta(media.account_id, media.uploaded_by_id, 1, is_image, media.file_size or 0)
+
+
+def record_deleted(media: Media):
+    is_image = 1 if media.mime_type.startswith('image/') else 0
+    apply_delta(media.account_id, media.uploaded_by_id, -1, -is_image, -(media.file_size or 0))
+    quotas.release(media.account_id, 'storage', media.file_size or 0)
+
+
+def get_stats(user=None) -> Dict:
+    """Totals for one uploader across tenants, or for everyone when user is None"""
+    rows = MediaUsage.objects.all() if user is None else MediaUsage.objects.filter(user=user)
+    totals = rows.aggregate(
+        total_files=Coalesce(Sum('file_count'), 0),
+        total_size=Coalesce(Sum('total_bytes'), 0),
+        images=Coalesce(Sum('image_count'), 0),
+    )
+    totals['other_files'] = totals['total_files'] - totals['images']
+    return totals
+
+
+@transaction.atomic
+def reconcile_account_usage(account_id) -> Tuple[int, int]:
+    """
+    Recompute one account's counters, or those of uploads without an account
+    when account_id is None. Returns the counter rows and accounts corrected.
+    """
+    # Lock first so uploads committed while counting cannot be overwritten;
+    # they wait on their counter UPDATEs until the rewrite commits. The account
+    # goes first, in the order uploads take it, so the two cannot deadlock
+    account = None
+    if account_id is not None:
+        account = Account.objects.select_for_update().filter(pk=account_id).only(
+            'id', 'current_storage_bytes', 'current_storage_mb'
+        ).first()
+        if account is None:
+            return 0, 0
+    usages = list(MediaUsage.objects.select_for_update().filter(account_id=account_id).order_by('pk'))
+    actual = {
+        row['uploaded_by_id']: row
+        for row in Media.objects.filter(account_id=account_id).order_by().values('uploaded_by_id').annotate(
+            files=Count('id'),
+            images=Count('id', filter=Q(mime_type__startswith='image/')),
+            size=Coalesce(Sum('file_size'), 0),
+        )
+    }
+
+    fixed_rows = 0
+    seen = set()
+    for usage in usages:
+        row = actual.get(usage.user_id)
+        if row is None or usage.user_id in seen:
+            usage.delete()
+            fixed_rows += 1
+            continue
+        seen.add(usage.user_id)
+        if (usage.file_count, usage.image_count, usage.total_bytes) != (row['files'], row['images'], row['size']):
+            usage.file_count, usage.image_count, usage.total_bytes = row['files'], row['images'], row['size']
+            usage.save(update_fields=['file_count', 'image_count', 'total_bytes', 'updated_at'])
+            fixed_rows += 1
+
+    missing = [
+        MediaUsage(account_id=account_id, user_id=user_id, file_count=row['files'],
+                   image_count=row['images'], total_bytes=row['size'])
+        for user_id, row in actual.items() if user_id not in seen
+    ]
+    # An upload without an account may create its row meanwhile; it counts itself
+    MediaUsage.objects.bulk_create(missing, ignore_conflicts=True)
+    fixed_rows += len(missing)
+
+    if account is None:
+        return fixed_rows, 0
+    total_bytes = sum(row['size'] for row in actual.values())
+    total_mb = storage_mb(total_bytes)
+    if (account.current_storage_bytes, account.current_storage_mb) == (total_bytes, total_mb):
+        return fixed_rows, 0
+    Account.objects.filter(pk=account.pk).update(current_storage_bytes=total_bytes, current_storage_mb=total_mb)
+    return fixed_rows, 1
+
+
+def reconcile_usage() -> Dict:
+    """
+    Recompute every account's counters and rewrite the rows that drifted,
+    locking one account at a time
+    """
+    fixed_rows = fixed_accounts = 0
+    account_ids = list(Account.objects.order_by('pk').values_list('pk', flat=True))
+    for account_id in account_ids + [None]:
+        rows, accounts = reconcile_account_usage(account_id)
+        fixed_rows += rows
+        fixed_accounts += accounts
+
+    logger.info(f"Reconciled media usage: {fixed_rows} counter rows and {fixed_accounts} accounts corrected")
+    return {'usage_rows': fixed_rows, 'accounts': fixed_accounts}
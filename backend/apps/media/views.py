@@ -0,0 +1,106 @@
+from rest_framework import generics, permissions, status, parsers
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from rest_framework.filters import SearchFilter, OrderingFilter
+from django_filters.rest_framework import DjangoFilterBackend
+from django.shortcuts import get_object_or_404
+from apps.accounts.quotas import QuotaExceeded
+from .models import Media
+from .serializers import MediaSerializer, MediaUploadCheckSerializer, MediaUploadSerializer
+from .usage import get_stats
+from .uploads import HashingUploadHandler, find_duplicate, storage_allowance_bytes, within_storage_limit
+
+STORAGE_LIMIT_MESSAGE = 'Storage limit exceeded for this account.'
+
+
+class MediaListView(generics.ListAPIView):
+    """List media files for authenticated users"""
+    serializer_class = MediaSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filterset_fields = ['mime_type', 'uploaded_by']
+    search_fields = ['filename', 'alt_text']
+    ordering = ['-created_at']
+
+    def get_queryset(self):
+        # Users can only see their own uploads, unless staff
+        queryset = Media.objects.select_related('uploaded_by').prefetch_related('variants')
+        if self.request.user.is_staff:
+            return queryset
+        return queryset.filter(uploaded_by=self.request.user)
+
+
+class MediaDetailView(generics.RetrieveDestroyAPIView):
+    """Get or delete a media file"""
+    serializer_class = MediaSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    lookup_field = 'id'
+
+    def get_queryset(self):
+        # Users can only access their own uploads, unless staff
+        queryset = Media.objects.select_related('uploaded_by').prefetch_related('variants')
+        if self.request.user.is_staff:
+            return queryset
+        return queryset.filter(uploaded_by=self.request.user)
+
+
+class MediaUploadView(generics.CreateAPIView):
+    """Upload a new media file"""
+    serializer_class = MediaUploadSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [parsers.MultiPartParser, parsers.FormParser]
+
+    def create(self, request, *args, **kwargs):
+        account = getattr(request, 'tenant', None)
+
+        # Refuse oversized uploads from the declared length, before reading the body
+        content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+        if not within_storage_limit(account, content_length):
+            return Response({'detail': STORAGE_LIMIT_MESSAGE}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+        handler = HashingUploadHandler(request._request, max_bytes=storage_allowance_bytes(account))
+        request._request.upload_handlers = [handler]
+
+        serializer = self.get_serializer(data=request.data)
+        if handler.exceeded:
+            return Response({'detail': STORAGE_LIMIT_MESSAGE}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        serializer.is_valid(raise_exception=True)
+        try:
+            media = serializer.save()
+        except QuotaExceeded:
+            # A concurrent upload took the remaining storage
+            return Response({'detail': STORAGE_LIMIT_MESSAGE}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+        data = MediaSerializer(media, context=self.get_serializer_context()).data
+        if serializer.deduplicated:
+            return Response(data, status=status.HTTP_200_OK)
+        return Response(data, status=status.HTTP_201_CREATED, headers=self.get_success_headers(data))
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def media_upload_check(request):
+    """Report whether the user already stored an upload in the tenant and whether it fits the storage limit"""
+    serializer = MediaUploadCheckSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+
+    account = getattr(request, 'tenant', None)
+    duplicate = find_duplicate(account, request.user, serializer.validated_data['sha256'].lower())
+    if duplicate is not None:
+        return Response({
+            'exists': True,
+            'media': MediaSerializer(duplicate, context={'request': request}).data,
+        })
+
+    return Response({
+        'exists': False,
+        'within_storage_limit': within_storage_limit(account, serializer.validated_data['size']),
+    })
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def media_stats(request):
+    """Get media upload statistics for current user"""
+    stats = get_stats(None if request.user.is_staff else request.user)
+    return Response(stats)
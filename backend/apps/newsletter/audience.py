@@ -0,0 +1,248 @@
+"""
+Materialized newsletter audiences
+Group-targeted recipients are resolved once into compressed chunks of subscriber
+ids so the send fan-out and reporting never repeat the group join. Membership
+changes are applied incrementally while a newsletter is scheduled, and
+subscribers who confirm or are reactivated are appended as they become
+eligible, so sending fans out straight from the stored chunks.
+"""
+
+import bisect
+import logging
+import uuid
+import zlib
+from datetime import datetime
+from typing import Iterable, Iterator, List
+
+from django.db import transaction
+
+from .models import AudienceChunk, AudienceSnapshot, Newsletter, Subscriber
+
+logger = logging.getLogger(__name__)
+
+AUDIENCE_CHUNK_SIZE = 5000
+
+SubscriberGroupMembership = Subscriber.groups.through
+
+
+def pack_ids(ids: Iterable[uuid.UUID]) -> bytes:
+    """Pack UUIDs into a compressed run of 16-byte values"""
+    return zlib.compress(b''.join(member_id.bytes for member_id in ids))
+
+
+def unpack_ids(data) -> List[uuid.UUID]:
+    raw = zlib.decompress(bytes(data))
+    return [uuid.UUID(bytes=raw[i:i + 16]) for i in range(0, len(raw), 16)]
+
+
+def get_target_signature(newsletter: Newsletter) -> str:
+    """Fingerprint of a newsletter's targeting; a change invalidates its snapshot"""
+    if newsletter.target_all_subscribers:
+        return 'all'
+    group_ids = sorted(str(group_id) for group_id in newsletter.target_groups.values_list('id', flat=True))
+    return uuid.uuid5(uuid.NAMESPACE_OID, ','.join(group_ids)).hex
+
+
+def eligible_subscribers(newsletter: Newsletter):
+    """Live recipient query used to build snapshots"""
+    subscribers = Subscriber.objects.filter(is_active=True, is_confirmed=True)
+    if newsletter.target_all_subscribers:
+        return subscribers
+    return subscribers.filter(groups__in=newsletter.target_groups.all()).distinct()
+
+
+def _iter_chunks(ids: Iterator[uuid.UUID], size: int) -> Iterator[List[uuid.UUID]]:
+    chunk = []
+    for member_id in ids:
+        chunk.append(member_id)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+@transaction.atomic
+def build_snapshot(newsletter: Newsletter, chunk_size: int = AUDIENCE_CHUNK_SIZE) -> AudienceSnapshot:
+    """Resolve a newsletter's audience into a fresh snapshot, replacing any existing one"""
+    AudienceSnapshot.objects.filter(newsletter=newsletter).delete()
+    snapshot = AudienceSnapshot.objects.create(
+        newsletter=newsletter,
+        target_signature=get_target_signature(newsletter),
+    )
+
+    ids = eligible_subscribers(newsletter).order_by('id').values_list('id', flat=True).iterator(chunk_size=chunk_size)
+    pending = []
+    for index, member_ids in enumerate(_iter_chunks(ids, chunk_size)):
+        pending.append(AudienceChunk(
+            snapshot=snapshot,
+            index=index,
+            member_count=len(member_ids),
+            member_ids=pack_ids(member_ids),
+        ))
+        snapshot.total_count += len(member_ids)
+        snapshot.chunk_count += 1
+        if len(pending) >= 50:
+            AudienceChunk.objects.bulk_create(pending)
+            pending = []
+    if pending:
+        AudienceChunk.objects.bulk_create(pending)
+
+    snapshot.save(update_fields=['total_count', 'chunk_count', 'refreshed_at'])
+
+    logger.info(f"Materialized audience for newsletter {newsletter.id}: {snapshot.total_count} recipients")
+    return snapshot
+
+
+def get_or_build_snapshot(newsletter: Newsletter) -> AudienceSnapshot:
+    """Return a snapshot matching the newsletter's current targeting"""
+    snapshot = AudienceSnapshot.objects.filter(newsletter=newsletter).first()
+    if snapshot is None or snapshot.target_signature != get_target_signature(newsletter):
+        snapshot = build_snapshot(newsletter)
+    return snapshot
+
+
+def iter_audience_batches(snapshot: AudienceSnapshot) -> Iterator[List[uuid.UUID]]:
+    """Yield the subscriber ids of each chunk in order"""
+    for chunk in snapshot.chunks.order_by('index').iterator():
+        member_ids = unpack_ids(chunk.member_ids)
+        if member_ids:
+            yield member_ids
+
+
+def add_members(snapshot: AudienceSnapshot, subscriber_ids: Iterable[uuid.UUID],
+                chunk_size: int = AUDIENCE_CHUNK_SIZE) -> int:
+    """
+    Append subscribers to the tail chunk(s) of a snapshot. Callers pass ids
+    that are not in the snapshot yet; only the tail chunk is decoded.
+    """
+    new_ids = sorted(set(subscriber_ids))
+    if not new_ids:
+        return 0
+
+    with transaction.atomic():
+        tail = snapshot.chunks.select_for_update().order_by('-index').first()
+        if tail is not None and tail.member_count < chunk_size:
+            room = chunk_size - tail.member_count
+            members = unpack_ids(tail.member_ids)
+            for member_id in new_ids[:room]:
+                bisect.insort(members, member_id)
+            tail.member_ids = pack_ids(members)
+            tail.member_count = len(members)
+            tail.save(update_fields=['member_ids', 'member_count'])
+            remaining = new_ids[room:]
+            next_index = tail.index + 1
+        else:
+            remaining = new_ids
+            next_index = tail.index + 1 if tail is not None else 0
+
+        for offset, member_ids in enumerate(_iter_chunks(iter(remaining), chunk_size)):
+            AudienceChunk.objects.create(
+                snapshot=snapshot,
+                index=next_index + offset,
+                member_count=len(member_ids),
+                member_ids=pack_ids(member_ids),
+            )
+
+        snapshot.total_count += len(new_ids)
+        snapshot.chunk_count = snapshot.chunks.count()
+        snapshot.save(update_fields=['total_count', 'chunk_count', 'refreshed_at'])
+
+    return len(new_ids)
+
+
+def remove_members(snapshot: AudienceSnapshot, subscriber_ids: Iterable[uuid.UUID]) -> int:
+    """Drop subscribers from whichever chunks hold them, rewriting only those chunks"""
+    to_remove = set(subscriber_ids)
+    if not to_remove:
+        return 0
+
+    removed = 0
+    with transaction.atomic():
+        for chunk in snapshot.chunks.select_for_update().order_by('index'):
+            members = unpack_ids(chunk.member_ids)
+            kept = [member_id for member_id in members if member_id not in to_remove]
+            if len(kept) == len(members):
+                continue
+            removed += len(members) - len(kept)
+            chunk.member_ids = pack_ids(kept)
+            chunk.member_count = len(kept)
+            chunk.save(update_fields=['member_ids', 'member_count'])
+
+        if removed:
+            snapshot.total_count -= removed
+            snapshot.save(update_fields=['total_count', 'refreshed_at'])
+
+    return removed
+
+
+def refresh_for_membership_change(group_ids: Iterable, subscriber_ids: Iterable, added: bool) -> int:
+    """
+    Incrementally update snapshots of scheduled newsletters targeting the changed groups.
+    Additions only include eligible subscribers who are not already targeted
+    through another group; removals keep subscribers who are still in one.
+    """
+    group_ids = {uuid.UUID(str(group_id)) for group_id in group_ids}
+    subscriber_ids = {uuid.UUID(str(subscriber_id)) for subscriber_id in subscriber_ids}
+    snapshots = AudienceSnapshot.objects.filter(
+        newsletter__status=Newsletter.SCHEDULED,
+        newsletter__target_all_subscribers=False,
+        newsletter__target_groups__in=group_ids,
+    ).select_related('newsletter').distinct()
+
+    changed = 0
+    for snapshot in snapshots:
+        target_group_ids = list(snapshot.newsletter.target_groups.values_list('id', flat=True))
+        if added:
+            # Members of another targeted group are in the snapshot already
+            already_targeted = SubscriberGroupMembership.objects.filter(
+                subscriber_id__in=subscriber_ids,
+                subscribergroup_id__in=set(target_group_ids) - group_ids,
+            ).values_list('subscriber_id', flat=True)
+            eligible = Subscriber.objects.filter(
+                id__in=subscriber_ids, is_active=True, is_confirmed=True
+            ).exclude(id__in=already_targeted).values_list('id', flat=True)
+            changed += add_members(snapshot, eligible)
+        else:
+            still_targeted = set(SubscriberGroupMembership.objects.filter(
+                subscriber_id__in=subscriber_ids,
+                subscribergroup_id__in=target_group_ids,
+            ).values_list('subscriber_id', flat=True))
+            changed += remove_members(snapshot, subscriber_ids - still_targeted)
+
+    return changed
+
+
+def refresh_for_eligibility(subscriber_ids: Iterable, eligible_since: datetime) -> int:
+    """
+    Append subscribers who just confirmed or were reactivated to the snapshots
+    of scheduled newsletters targeting them. Snapshots built after they became
+    eligible resolved them already.
+    """
+    eligible = set(Subscriber.objects.filter(
+        id__in=[uuid.UUID(str(subscriber_id)) for subscriber_id in subscriber_ids], is_active=True, is_confirmed=True
+    ).values_list('id', flat=True))
+    if not eligible:
+        return 0
+
+    group_members = {}
+    for subscriber_id, group_id in SubscriberGroupMembership.objects.filter(
+        subscriber_id__in=eligible
+    ).values_list('subscriber_id', 'subscribergroup_id'):
+        group_members.setdefault(group_id, set()).add(subscriber_id)
+
+    snapshots = AudienceSnapshot.objects.filter(
+        newsletter__status=Newsletter.SCHEDULED, built_at__lt=eligible_since
+    ).select_related('newsletter')
+
+    changed = 0
+    for snapshot in snapshots:
+        if snapshot.newsletter.target_all_subscribers:
+            targeted = eligible
+        else:
+            targeted = set()
+            for group_id in snapshot.newsletter.target_groups.values_list('id', flat=True):
+                targeted |= group_members.get(group_id, set())
+        changed += add_members(snapshot, targeted)
+
+    return changed
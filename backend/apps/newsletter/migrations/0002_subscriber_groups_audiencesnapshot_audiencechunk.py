@@ -0,0 +1,78 @@
+# Generated by Django 5.0.3 on 2025-11-20 09:14
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("newsletter", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="subscriber",
+            name="groups",
+            field=models.ManyToManyField(
+                blank=True, related_name="subscribers", to="newsletter.subscribergroup"
+            ),
+        ),
+        migrations.CreateModel(
+            name="AudienceSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("target_signature", models.CharField(max_length=64)),
+                ("total_count", models.PositiveIntegerField(default=0)),
+                ("chunk_count", models.PositiveIntegerField(default=0)),
+                ("built_at", models.DateTimeField(auto_now_add=True)),
+                ("refreshed_at", models.DateTimeField(auto_now=True)),
+                (
+                    "newsletter",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="audience",
+                        to="newsletter.newsletter",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="AudienceChunk",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("index", models.PositiveIntegerField()),
+                ("member_count", models.PositiveIntegerField(default=0)),
+                ("member_ids", models.BinaryField()),
+                (
+                    "snapshot",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="chunks",
+                        to="newsletter.audiencesnapshot",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["snapshot", "index"],
+                "unique_together": {("snapshot", "index")},
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.3 on 2026-10-19 20:40
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("newsletter", "0002_subscriber_groups_audiencesnapshot_audiencechunk"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="subscriber",
+            index=models.Index(
+                django.db.models.functions.text.Lower("email"), name="newsletter_subscriber_email_lower"
+            ),
+        ),
+    ]
@@ -1,6 +1,7 @@
 import uuid
 import logging
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils import timezone
 from django.conf import settings
 from .email_service import email_service
@@ -35,6 +36,13 @@ class Subscriber(models.Model):
         related_name='newsletter_subscription'
     )
     
+    # Segmentation
+    groups = models.ManyToManyField(
+        'SubscriberGroup',
+        blank=True,
+        related_name='subscribers'
+    )
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
@@ -42,6 +50,8 @@ class Subscriber(models.Model):
             models.Index(fields=['confirmation_token']),
             models.Index(fields=['unsubscribe_token']),
             models.Index(fields=['is_active', 'is_confirmed']),
+            # Case-insensitive lookups of imports and signups
+            models.Index(Lower('email'), name='newsletter_subscriber_email_lower'),
         ]
     
     def __str__(self):
@@ -176,6 +186,42 @@ class SubscriberGroup(models.Model):
         return self.name
 
 
+class AudienceSnapshot(models.Model):
+    """
+    Materialized recipient list for a scheduled newsletter
+    Resolved once when the newsletter is scheduled and reused by fan-out and reporting
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    newsletter = models.OneToOneField(Newsletter, on_delete=models.CASCADE, related_name='audience')
+    
+    # Targeting the snapshot was built for, e.g. "all" or sorted group ids
+    target_signature = models.CharField(max_length=64)
+    total_count = models.PositiveIntegerField(default=0)
+    chunk_count = models.PositiveIntegerField(default=0)
+    
+    built_at = models.DateTimeField(auto_now_add=True)
+    refreshed_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Audience for {self.newsletter.title} ({self.total_count} recipients)"
+
+
+class AudienceChunk(models.Model):
+    """Compressed block of subscriber ids belonging to an audience snapshot"""
+    snapshot = models.ForeignKey(AudienceSnapshot, on_delete=models.CASCADE, related_name='chunks')
+    index = models.PositiveIntegerField()
+    member_count = models.PositiveIntegerField(default=0)
+    # zlib-compressed, sorted 16-byte UUIDs
+    member_ids = models.BinaryField()
+    
+    class Meta:
+        ordering = ['snapshot', 'index']
+        unique_together = ['snapshot', 'index']
+    
+    def __str__(self):
+        return f"Chunk {self.index} ({self.member_count} members)"
+
+
 class NewsletterSend(models.Model):
     """Track individual newsletter sends"""
     PENDING = 'pending'
@@ -22,6 +22,13 @@ class NewsletterSubscriptionSerializer(serializers.Serializer):
     last_name = serializers.CharField(max_length=100, required=False, allow_blank=True)
 
 
+class SubscriberImportSerializer(serializers.Serializer):
+    """Serializer for bulk subscriber import uploads"""
+    file = serializers.FileField(required=True)
+    file_format = serializers.ChoiceField(choices=['csv', 'ndjson'], required=False)
+    send_confirmation = serializers.BooleanField(default=True)
+
+
 class SubscriberGroupSerializer(serializers.ModelSerializer):
     subscriber_count = serializers.SerializerMethodField()
     
@@ -31,9 +38,7 @@ class SubscriberGroupSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
     
     def get_subscriber_count(self, obj):
-        # This would require a related_name on the Subscriber model
-        # For now, return 0 as placeholder
-        return 0
+        return obj.subscribers.count()
 
 
 class NewsletterSerializer(serializers.ModelSerializer):
@@ -54,15 +59,11 @@ class NewsletterSerializer(serializers.ModelSerializer):
         ]
     
     def get_recipient_count(self, obj):
-        """Get count of recipients for this newsletter"""
-        if obj.target_all_subscribers:
-            return Subscriber.objects.filter(is_active=True, is_confirmed=True).count()
-        else:
-            return Subscriber.objects.filter(
-                is_active=True, 
-                is_confirmed=True,
-                groups__in=obj.target_groups.all()
-            ).distinct().count()
+        """Get count of recipients, preferring the materialized audience"""
+        snapshot = getattr(obj, 'audience', None)
+        if snapshot is not None:
+            return snapshot.total_count
+        return obj.get_recipients().count()
 
 
 class NewsletterSendSerializer(serializers.ModelSerializer):
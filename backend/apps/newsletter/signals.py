@@ -0,0 +1,93 @@
+"""Keep materialized newsletter audiences in sync with targeting, group membership and eligibility"""
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import AudienceSnapshot, Newsletter, Subscriber
+
+
+def _queue_materialize(newsletter_id):
+    from .tasks import materialize_newsletter_audience
+    transaction.on_commit(lambda: materialize_newsletter_audience.delay(str(newsletter_id)))
+
+
+@receiver(post_save, sender=Newsletter)
+def materialize_audience_on_schedule(sender, instance, **kwargs):
+    """Resolve the audience once a newsletter is scheduled"""
+    if instance.status == Newsletter.SCHEDULED:
+        _queue_materialize(instance.pk)
+
+
+@receiver(m2m_changed, sender=Newsletter.target_groups.through)
+def rebuild_audience_on_targeting_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Targeting changes invalidate the snapshot of a scheduled newsletter"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        newsletter_ids = [instance.pk] if instance.status == Newsletter.SCHEDULED else []
+    else:
+        newsletter_ids = list(instance.newsletters.filter(status=Newsletter.SCHEDULED).values_list('id', flat=True))
+
+    for newsletter_id in newsletter_ids:
+        _queue_materialize(newsletter_id)
+
+
+@receiver(m2m_changed, sender=Subscriber.groups.through)
+def refresh_audience_on_membership_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Apply group membership changes to scheduled audiences incrementally"""
+    if action == 'pre_clear':
+        # pk_set is not provided for clears, so capture the members before they go
+        if reverse:
+            instance._cleared_pks = set(instance.subscribers.values_list('id', flat=True))
+        else:
+            instance._cleared_pks = set(instance.groups.values_list('id', flat=True))
+        return
+
+    if action == 'post_clear':
+        pk_set = getattr(instance, '_cleared_pks', set())
+    elif action not in ('post_add', 'post_remove'):
+        return
+
+    if not pk_set or not AudienceSnapshot.objects.filter(newsletter__status=Newsletter.SCHEDULED).exists():
+        return
+
+    if reverse:
+        group_ids, subscriber_ids = [instance.pk], list(pk_set)
+    else:
+        group_ids, subscriber_ids = list(pk_set), [instance.pk]
+
+    from .tasks import refresh_audience_membership
+    added = action == 'post_add'
+    group_ids = [str(pk) for pk in group_ids]
+    subscriber_ids = [str(pk) for pk in subscriber_ids]
+    transaction.on_commit(lambda: refresh_audience_membership.delay(group_ids, subscriber_ids, added))
+
+
+def _is_eligible(subscriber) -> bool:
+    return subscriber.is_active and subscriber.is_confirmed
+
+
+@receiver(pre_save, sender=Subscriber)
+def remember_subscriber_eligibility(sender, instance, **kwargs):
+    if instance._state.adding:
+        instance._was_eligible = False
+        return
+    previous = Subscriber.objects.filter(pk=instance.pk).values('is_active', 'is_confirmed').first()
+    instance._was_eligible = bool(previous) and previous['is_active'] and previous['is_confirmed']
+
+
+@receiver(post_save, sender=Subscriber)
+def refresh_audience_on_eligibility(sender, instance, **kwargs):
+    """Append subscribers who confirm or are reactivated to scheduled audiences"""
+    if getattr(instance, '_was_eligible', True) or not _is_eligible(instance):
+        return
+    if not AudienceSnapshot.objects.filter(newsletter__status=Newsletter.SCHEDULED).exists():
+        return
+
+    from .tasks import refresh_audience_eligibility
+    subscriber_ids = [str(instance.pk)]
+    eligible_since = timezone.now().isoformat()
+    transaction.on_commit(lambda: refresh_audience_eligibility.delay(subscriber_ids, eligible_since))
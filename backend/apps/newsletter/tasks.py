@@ -1,6 +1,7 @@
 """Celery tasks for newsletter functionality"""
 
 import logging
+from datetime import datetime
 from typing import List, Dict, Any
 from django.conf import settings
 from django.utils import timezone
@@ -8,6 +9,10 @@ from django.db.models import Q, Count
 from django.core.mail import send_mail
 
 from config.celery import app
+from apps.core.retention import get_policy, purge
+from .audience import (
+    get_or_build_snapshot, iter_audience_batches, refresh_for_eligibility, refresh_for_membership_change,
+)
 from .models import Newsletter, Subscriber, NewsletterSend
 from .email_service import EmailService
 
@@ -34,27 +39,16 @@ def process_pending_newsletters(self):
                 newsletter.status = 'sending'
                 newsletter.save()
 
-                # Queue individual sends
-                active_subscribers = Subscriber.objects.filter(
-                    is_active=True,
-                    is_confirmed=True
-                )
-
-                # Batch subscribers for efficiency
-                batch_size = 100
-                subscriber_batches = [
-                    active_subscribers[i:i + batch_size]
-                    for i in range(0, active_subscribers.count(), batch_size)
-                ]
-
-                for batch in subscriber_batches:
+                # Fan out over the materialized audience
+                snapshot = get_or_build_snapshot(newsletter)
+                for subscriber_ids in iter_audience_batches(snapshot):
                     send_newsletter_to_batch.delay(
-                        newsletter.id,
-                        [sub.id for sub in batch]
+                        str(newsletter.id),
+                        [str(subscriber_id) for subscriber_id in subscriber_ids]
                     )
 
                 processed_count += 1
-                logger.info(f"Queued newsletter '{newsletter.subject}' for {active_subscribers.count()} subscribers")
+                logger.info(f"Queued newsletter '{newsletter.subject}' for {snapshot.total_count} subscribers")
 
             except Exception as e:
                 logger.error(f"Failed to process newsletter {newsletter.id}: {str(e)}")
@@ -125,6 +119,52 @@ def send_newsletter_to_batch(self, newsletter_id: int, subscriber_ids: List[int]
         raise self.retry(countdown=60, max_retries=3, exc=e)
 
 
+@app.task(bind=True, max_retries=3)
+def materialize_newsletter_audience(self, newsletter_id: str):
+    """
+    Resolve a scheduled newsletter's recipients into an audience snapshot
+    """
+    try:
+        newsletter = Newsletter.objects.get(id=newsletter_id)
+        snapshot = get_or_build_snapshot(newsletter)
+        return f"Audience has {snapshot.total_count} recipients"
+
+    except Newsletter.DoesNotExist:
+        logger.error(f"Newsletter {newsletter_id} not found")
+        return "Newsletter not found"
+    except Exception as e:
+        logger.error(f"Error materializing audience for newsletter {newsletter_id}: {str(e)}")
+        raise self.retry(countdown=60, exc=e)
+
+
+@app.task(bind=True, max_retries=3)
+def refresh_audience_membership(self, group_ids: List[str], subscriber_ids: List[str], added: bool):
+    """
+    Apply subscriber group membership changes to scheduled audience snapshots
+    """
+    try:
+        changed = refresh_for_membership_change(group_ids, subscriber_ids, added)
+        return f"Updated {changed} audience memberships"
+
+    except Exception as e:
+        logger.error(f"Error refreshing audience membership: {str(e)}")
+        raise self.retry(countdown=60, exc=e)
+
+
+@app.task(bind=True, max_retries=3)
+def refresh_audience_eligibility(self, subscriber_ids: List[str], eligible_since: str):
+    """
+    Append newly confirmed or reactivated subscribers to scheduled audience snapshots
+    """
+    try:
+        changed = refresh_for_eligibility(subscriber_ids, datetime.fromisoformat(eligible_since))
+        return f"Added {changed} audience memberships"
+
+    except Exception as e:
+        logger.error(f"Error refreshing audience eligibility: {str(e)}")
+        raise self.retry(countdown=60, exc=e)
+
+
 @app.task(bind=True, max_retries=3)
 def update_email_analytics(self):
     """
@@ -222,23 +262,40 @@ def resend_failed_emails(self, newsletter_id: int = None, days_back: int = 7):
         raise
 
 
-@app.task(bind=True)
-def clean_old_newsletter_data(self, days_to_keep: int = 90):
+@app.task(bind=True, max_retries=3)
+def send_confirmation_emails(self, subscriber_ids: List[str]):
     """
-    Clean up old newsletter send data and analytics
+    Send double opt-in confirmation emails for imported subscribers
     """
     try:
-        cutoff_date = timezone.now() - timezone.timedelta(days=days_to_keep)
+        subscribers = Subscriber.objects.filter(id__in=subscriber_ids, is_confirmed=False)
 
-        # Delete old send records
-        old_sends = NewsletterSend.objects.filter(
-            created_at__lt=cutoff_date
-        )
+        sent_count = 0
+        for subscriber in subscribers.iterator():
+            try:
+                subscriber.send_confirmation_email()
+                sent_count += 1
+            except Exception as e:
+                logger.error(f"Failed to send confirmation email to {subscriber.email}: {str(e)}")
+
+        logger.info(f"Sent {sent_count} confirmation emails")
+        return f"Sent {sent_count} confirmation emails"
+
+    except Exception as e:
+        logger.error(f"Error in send_confirmation_emails: {str(e)}")
+        raise self.retry(countdown=60, exc=e)
 
-        deleted_count = old_sends.delete()[0]
-        logger.info(f"Cleaned up {deleted_count} old newsletter send records")
 
-        return f"Cleaned up {deleted_count} records"
+@app.task(bind=True)
+def clean_old_newsletter_data(self, days_to_keep: int = 90):
+    """
+    Clean up old newsletter send data in chunked batches
+    """
+    try:
+        result = purge(get_policy('newsletter_sends'), days=days_to_keep)
+        logger.info(f"Cleaned up {result.deleted} old newsletter send records")
+
+        return f"Cleaned up {result.deleted} records"
 
     except Exception as e:
         logger.error(f"Error in clean_old_newsletter_data: {str(e)}")
@@ -0,0 +1,129 @@
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.newsletter.audience import (
+    add_members, build_snapshot, iter_audience_batches, remove_members
+)
+from apps.newsletter.models import AudienceSnapshot, Newsletter, Subscriber, SubscriberGroup
+from apps.newsletter.serializers import NewsletterSerializer
+
+
+class AudienceSnapshotTestCase(TestCase):
+    """Test materialized newsletter audiences"""
+
+    def setUp(self):
+        self.group = SubscriberGroup.objects.create(name='Weekly')
+        self.other_group = SubscriberGroup.objects.create(name='Monthly')
+        self.members = []
+        for i in range(5):
+            subscriber = Subscriber.objects.create(email=f'member{i}@example.com', is_active=True, is_confirmed=True)
+            subscriber.groups.add(self.group)
+            self.members.append(subscriber)
+        Subscriber.objects.create(email='outsider@example.com', is_active=True, is_confirmed=True)
+        unconfirmed = Subscriber.objects.create(email='pending@example.com')
+        unconfirmed.groups.add(self.group)
+
+        self.newsletter = Newsletter.objects.create(
+            title='Weekly', subject='Weekly', preview_text='', content_html='<p>Hi</p>',
+            content_text='Hi', target_all_subscribers=False,
+        )
+        self.newsletter.target_groups.add(self.group)
+
+    def _members(self, snapshot):
+        return {member_id for batch in iter_audience_batches(snapshot) for member_id in batch}
+
+    def test_build_snapshot_resolves_group_audience_in_chunks(self):
+        """Only active, confirmed group members are materialized, split into chunks"""
+        snapshot = build_snapshot(self.newsletter, chunk_size=2)
+
+        self.assertEqual(snapshot.total_count, 5)
+        self.assertEqual(snapshot.chunk_count, 3)
+        self.assertEqual(self._members(snapshot), {member.id for member in self.members})
+
+    def test_scheduling_materializes_audience_and_reporting_reuses_it(self):
+        """Scheduling builds the snapshot and the serializer reads its count"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.newsletter.status = Newsletter.SCHEDULED
+            self.newsletter.save()
+
+        snapshot = AudienceSnapshot.objects.get(newsletter=self.newsletter)
+        self.assertEqual(snapshot.total_count, 5)
+
+        newsletter = Newsletter.objects.select_related('audience').get(pk=self.newsletter.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(NewsletterSerializer().get_recipient_count(newsletter), 5)
+
+    def test_membership_changes_refresh_snapshot_incrementally(self):
+        """Joining or leaving a targeted group updates a scheduled snapshot"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.newsletter.status = Newsletter.SCHEDULED
+            self.newsletter.save()
+
+        newcomer = Subscriber.objects.create(email='new@example.com', is_active=True, is_confirmed=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            newcomer.groups.add(self.group)
+        snapshot = AudienceSnapshot.objects.get(newsletter=self.newsletter)
+        self.assertEqual(snapshot.total_count, 6)
+        self.assertIn(newcomer.id, self._members(snapshot))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.group.subscribers.remove(self.members[0])
+        snapshot.refresh_from_db()
+        self.assertEqual(snapshot.total_count, 5)
+        self.assertNotIn(self.members[0].id, self._members(snapshot))
+
+    def test_joining_a_second_targeted_group_adds_no_duplicate(self):
+        self.newsletter.target_groups.add(self.other_group)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.newsletter.status = Newsletter.SCHEDULED
+            self.newsletter.save()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.members[0].groups.add(self.other_group)
+
+        snapshot = AudienceSnapshot.objects.get(newsletter=self.newsletter)
+        self.assertEqual(snapshot.total_count, 5)
+
+    def test_add_and_remove_members_rewrite_only_needed_chunks(self):
+        """Additions fill the tail chunk before opening new ones"""
+        snapshot = build_snapshot(self.newsletter, chunk_size=3)
+        extra = [Subscriber.objects.create(email=f'extra{i}@example.com').id for i in range(2)]
+
+        self.assertEqual(add_members(snapshot, extra, chunk_size=3), 2)
+        self.assertEqual(snapshot.total_count, 7)
+        self.assertEqual(list(snapshot.chunks.values_list('member_count', flat=True)), [3, 3, 1])
+
+        self.assertEqual(remove_members(snapshot, [extra[0]]), 1)
+        self.assertEqual(snapshot.total_count, 6)
+
+    @mock.patch('apps.newsletter.tasks.send_newsletter_to_batch.delay')
+    def test_fan_out_uses_snapshot_batches(self, mock_delay):
+        """process_pending_newsletters queues one batch per snapshot chunk"""
+        from apps.newsletter.tasks import process_pending_newsletters
+
+        Newsletter.objects.filter(pk=self.newsletter.pk).update(status=Newsletter.SCHEDULED, scheduled_at=timezone.now())
+        process_pending_newsletters.apply()
+
+        queued = [subscriber_id for call in mock_delay.call_args_list for subscriber_id in call.args[1]]
+        self.assertEqual(set(queued), {str(member.id) for member in self.members})
+
+    @mock.patch('apps.newsletter.tasks.send_newsletter_to_batch.delay')
+    def test_send_includes_subscribers_confirmed_after_scheduling(self, mock_delay):
+        """Subscribers confirming after scheduling are appended to the snapshot, without duplicating anyone"""
+        from apps.newsletter.tasks import process_pending_newsletters
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.newsletter.status = Newsletter.SCHEDULED
+            self.newsletter.scheduled_at = timezone.now()
+            self.newsletter.save()
+        pending = Subscriber.objects.get(email='pending@example.com')
+        with self.captureOnCommitCallbacks(execute=True):
+            pending.confirm_subscription()
+        self.assertEqual(AudienceSnapshot.objects.get(newsletter=self.newsletter).total_count, len(self.members) + 1)
+
+        process_pending_newsletters.apply()
+
+        queued = [subscriber_id for call in mock_delay.call_args_list for subscriber_id in call.args[1]]
+        self.assertEqual(sorted(queued), sorted(str(member.id) for member in self.members + [pending]))
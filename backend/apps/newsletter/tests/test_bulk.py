@@ -0,0 +1,134 @@
+import json
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.newsletter.bulk import import_subscribers, iter_export
+from apps.newsletter.models import Subscriber
+from apps.newsletter.views import SubscriberViewSet
+
+User = get_user_model()
+
+
+class SubscriberImportTestCase(TestCase):
+    """Test streaming subscriber import"""
+
+    def setUp(self):
+        Subscriber.objects.create(email='existing@example.com')
+
+    @mock.patch('apps.newsletter.tasks.send_confirmation_emails.delay')
+    def test_csv_import_validates_and_dedups(self, mock_delay):
+        """Invalid rows are reported and duplicates in the file or database are skipped"""
+        upload = SimpleUploadedFile('list.csv', (
+            'Email,First_Name,last_name\n'
+            'new@example.com,New,One\n'
+            'NEW@example.com,Dup,Row\n'
+            'existing@example.com,Old,Row\n'
+            'not-an-email,Bad,Row\n'
+            'second@example.com,,\n'
+        ).encode())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            summary = import_subscribers(upload, 'csv', chunk_size=2)
+
+        self.assertEqual(summary['processed'], 5)
+        self.assertEqual(summary['created'], 2)
+        self.assertEqual(summary['duplicates'], 2)
+        self.assertEqual(summary['invalid'], 1)
+        self.assertEqual(summary['errors'][0]['line'], 5)
+        self.assertTrue(Subscriber.objects.filter(email='new@example.com', first_name='New').exists())
+        self.assertEqual(sum(len(call.args[0]) for call in mock_delay.call_args_list), 2)
+
+    @mock.patch('apps.newsletter.tasks.send_confirmation_emails.delay')
+    def test_rows_taken_concurrently_are_not_counted_or_confirmed(self, mock_delay):
+        """Emails stored with other casing or inserted mid-import are duplicates"""
+        Subscriber.objects.create(email='Mixed@Example.com')
+        upload = SimpleUploadedFile('list.csv', b'email\nmixed@example.com\nrace@example.com\nfresh@example.com\n')
+        bulk_create = Subscriber.objects.bulk_create
+
+        def racing_bulk_create(objs, **kwargs):
+            # A signup commits race@example.com between the lookup and the insert
+            Subscriber.objects.create(email='race@example.com')
+            return bulk_create(objs, **kwargs)
+
+        with mock.patch.object(Subscriber.objects, 'bulk_create', side_effect=racing_bulk_create), \
+                self.captureOnCommitCallbacks(execute=True):
+            summary = import_subscribers(upload, 'csv')
+
+        fresh = Subscriber.objects.get(email='fresh@example.com')
+        self.assertEqual((summary['created'], summary['duplicates'], summary['confirmations_queued']), (1, 2, 1))
+        mock_delay.assert_called_once_with([str(fresh.pk)])
+
+    @mock.patch('apps.newsletter.tasks.send_confirmation_emails.delay')
+    def test_ndjson_import_without_confirmation(self, mock_delay):
+        """NDJSON lines are imported and confirmation can be skipped"""
+        upload = SimpleUploadedFile('list.ndjson', (
+            '{"email": "a@example.com", "first_name": "A"}\n'
+            '\n'
+            '["not", "an", "object"]\n'
+            '{"email": "b@example.com"}\n'
+        ).encode())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            summary = import_subscribers(upload, 'ndjson', send_confirmation=False)
+
+        self.assertEqual(summary['created'], 2)
+        self.assertEqual(summary['invalid'], 1)
+        mock_delay.assert_not_called()
+
+    @mock.patch('apps.newsletter.tasks.send_confirmation_emails.delay')
+    def test_import_endpoint_requires_staff(self, mock_delay):
+        """Only staff users may bulk import"""
+        factory = APIRequestFactory()
+        view = SubscriberViewSet.as_view({'post': 'import_subscribers'}, **SubscriberViewSet.import_subscribers.kwargs)
+        user = User.objects.create_user(username='member', email='member@example.com', password='pass12345')
+        staff = User.objects.create_user(username='staff', email='staff@example.com', password='pass12345',
+                                         is_staff=True)
+
+        request = factory.post('/', {'file': SimpleUploadedFile('list.csv', b'email\nx@example.com\n')},
+                               format='multipart')
+        force_authenticate(request, user=user)
+        self.assertEqual(view(request).status_code, status.HTTP_403_FORBIDDEN)
+
+        request = factory.post('/', {'file': SimpleUploadedFile('list.csv', b'email\nx@example.com\n')},
+                               format='multipart')
+        force_authenticate(request, user=staff)
+        response = view(request)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 1)
+
+
+class SubscriberExportTestCase(TestCase):
+    """Test streaming subscriber export"""
+
+    def setUp(self):
+        Subscriber.objects.create(email='one@example.com', first_name='One', is_active=True)
+        Subscriber.objects.create(email='two@example.com')
+
+    def test_csv_export_streams_header_and_rows(self):
+        """CSV export yields a header followed by one line per subscriber"""
+        lines = list(iter_export(Subscriber.objects.order_by('email'), 'csv', chunk_size=1))
+
+        self.assertTrue(lines[0].startswith('id,email,first_name'))
+        self.assertEqual(len(lines), 3)
+        self.assertIn('one@example.com,One', lines[1])
+
+    def test_ndjson_export_and_endpoint(self):
+        """NDJSON export is served as a streaming response"""
+        factory = APIRequestFactory()
+        view = SubscriberViewSet.as_view({'get': 'export'}, **SubscriberViewSet.export.kwargs)
+        staff = User.objects.create_user(username='staff', email='staff@example.com', password='pass12345',
+                                         is_staff=True)
+        request = factory.get('/', {'export_format': 'ndjson'})
+        force_authenticate(request, user=staff)
+
+        response = view(request)
+
+        self.assertTrue(response.streaming)
+        records = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual({record['email'] for record in records}, {'one@example.com', 'two@example.com'})
+        self.assertIsNone(records[0]['confirmed_at'])
@@ -1,20 +1,31 @@
 import uuid
+from django.http import StreamingHttpResponse
 from django.shortcuts import render, get_object_or_404
 from django.utils import timezone
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
+from apps.core.ratelimit import RateThrottle
+from .bulk import FORMAT_NDJSON, FORMATS, guess_format, import_subscribers, iter_export
 from .models import Subscriber, Newsletter, SubscriberGroup, NewsletterSend
 from .serializers import (
     SubscriberSerializer, NewsletterSerializer, SubscriberGroupSerializer,
-    NewsletterSendSerializer, NewsletterSubscriptionSerializer
+    NewsletterSendSerializer, NewsletterSubscriptionSerializer, SubscriberImportSerializer
 )
 
 
+class SubscribeRateThrottle(RateThrottle):
+    """Public subscription requests per IP"""
+    scope = 'subscribe'
+    rate = '5/h'
+    key = 'ip'
+
+
 class SubscriberViewSet(viewsets.ModelViewSet):
     """API endpoint for managing newsletter subscribers"""
     queryset = Subscriber.objects.all()
@@ -30,6 +41,12 @@ class SubscriberViewSet(viewsets.ModelViewSet):
         if self.action == 'create':
             return [permissions.AllowAny()]
         return [permission() for permission in self.permission_classes]
+
+    def get_throttles(self):
+        # Only the public subscription endpoints are limited
+        if self.action in ('create', 'subscribe'):
+            return [SubscribeRateThrottle()]
+        return super().get_throttles()
     
     @action(detail=False, methods=['post'], permission_classes=[permissions.AllowAny])
     def subscribe(self, request):
@@ -121,10 +138,57 @@ class SubscriberViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    
+    @action(detail=False, methods=['post'], url_path='import',
+            permission_classes=[permissions.IsAdminUser], parser_classes=[MultiPartParser, FormParser])
+    def import_subscribers(self, request):
+        """Bulk import subscribers from a CSV or NDJSON file"""
+        serializer = SubscriberImportSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        upload = serializer.validated_data['file']
+        file_format = serializer.validated_data.get('file_format') or guess_format(upload.name)
+        
+        try:
+            summary = import_subscribers(
+                upload,
+                file_format=file_format,
+                send_confirmation=serializer.validated_data['send_confirmation'],
+            )
+        except UnicodeDecodeError:
+            return Response(
+                {'detail': 'File must be UTF-8 encoded.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            return Response(
+                {'detail': f'Error importing subscribers: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        
+        return Response(summary, status=status.HTTP_201_CREATED if summary['created'] else status.HTTP_200_OK)
+    
+    @action(detail=False, methods=['get'], permission_classes=[permissions.IsAdminUser])
+    def export(self, request):
+        """Stream subscribers as CSV or NDJSON (?export_format=csv|ndjson)"""
+        file_format = request.query_params.get('export_format', 'csv')
+        if file_format not in FORMATS:
+            return Response(
+                {'detail': f"Unsupported export format. Choose one of: {', '.join(FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        queryset = self.filter_queryset(self.get_queryset())
+        content_type = 'application/x-ndjson' if file_format == FORMAT_NDJSON else 'text/csv'
+        response = StreamingHttpResponse(iter_export(queryset, file_format), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="subscribers.{file_format}"'
+        return response
+
 
 class NewsletterViewSet(viewsets.ModelViewSet):
     """API endpoint for managing newsletters"""
-    queryset = Newsletter.objects.all()
+    queryset = Newsletter.objects.select_related('audience')
     serializer_class = NewsletterSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
@@ -47,8 +47,8 @@ class SitemapEntryAdmin(admin.ModelAdmin):
 
 @admin.register(Redirect)
 class RedirectAdmin(admin.ModelAdmin):
-    list_display = ['old_path', 'new_path', 'status_code', 'is_active', 'updated_at']
-    list_filter = ['status_code', 'is_active']
+    list_display = ['old_path', 'new_path', 'match_type', 'status_code', 'is_active', 'updated_at']
+    list_filter = ['match_type', 'status_code', 'is_active']
     search_fields = ['old_path', 'new_path']
     list_editable = ['status_code', 'is_active']
     ordering = ['old_path']
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SeoConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.seo'
+
+    def ready(self):
+        import apps.seo.signals  # noqa
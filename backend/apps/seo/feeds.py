@@ -0,0 +1,181 @@
+"""
+Cached syndication feeds
+The item list for each tenant and feed type is built once, cached, and rendered
+as RSS 2.0, Atom or JSON Feed on demand. Article and topic saves and deletes
+invalidate it through the receivers in apps.articles.signals.
+"""
+
+import hashlib
+import logging
+from email.utils import format_datetime
+from typing import Dict
+
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.articles.models import Article, Topic
+from .models import SEOSettings
+from .sitemaps import get_base_url
+
+logger = logging.getLogger(__name__)
+
+FEED_TYPES = ('articles', 'topics')
+FEED_FORMATS = ('rss', 'atom', 'json')
+FEED_ITEM_LIMIT = 20
+FEED_CACHE_TIMEOUT = getattr(settings, 'FEED_CACHE_TIMEOUT', 60 * 60)
+
+CONTENT_TYPES = {
+    'rss': 'application/rss+xml; charset=utf-8',
+    'atom': 'application/atom+xml; charset=utf-8',
+    'json': 'application/feed+json; charset=utf-8',
+}
+
+
+def feed_cache_key(account_id, feed_type: str) -> str:
+    return f"seo_feed:{account_id or 'global'}:{feed_type}"
+
+
+def invalidate_feeds(account_id=None):
+    """Drop every cached feed of a tenant, plus the main site feeds that list all tenants"""
+    account_ids = {account_id, None}
+    cache.delete_many([
+        feed_cache_key(key_account, feed_type) for key_account in account_ids for feed_type in FEED_TYPES
+    ])
+
+
+def build_feed(account, feed_type: str) -> Dict:
+    """Query and assemble the feed item list for a tenant"""
+    site = Site.objects.get_current()
+    base_url = get_base_url(account)
+    seo_settings = SEOSettings.objects.filter(site=site).first()
+    title = (seo_settings.meta_title if seo_settings else '') or f"{site.name} Blog"
+    description = (seo_settings.meta_description if seo_settings else '') or f"Latest articles from {site.name}"
+
+    account_filter = {'account': account} if account is not None else {}
+    items = []
+    if feed_type == 'articles':
+        articles = (
+            Article.objects.filter(status='published', **account_filter)
+            .select_related('author')
+            .only('id', 'title', 'slug', 'excerpt', 'content', 'published_at', 'updated_at',
+                  'author__first_name', 'author__last_name', 'author__email')
+            .order_by('-published_at')[:FEED_ITEM_LIMIT]
+        )
+        for article in articles:
+            items.append({
+                'id': str(article.id),
+                'title': article.title,
+                'link': f"{base_url}/articles/{article.slug}/",
+                'description': article.excerpt or article.content[:200] + '...',
+                'published': article.published_at,
+                'updated': article.updated_at or article.published_at,
+                'author': article.author.get_full_name() or article.author.email,
+            })
+    else:
+        for topic in Topic.objects.filter(**account_filter).order_by('-created_at')[:FEED_ITEM_LIMIT]:
+            items.append({
+                'id': str(topic.id),
+                'title': topic.name,
+                'link': f"{base_url}/topics/{topic.slug}/",
+                'description': topic.description or '',
+                'published': topic.created_at,
+                'updated': topic.updated_at or topic.created_at,
+                'author': site.name,
+            })
+
+    updated = max((item['updated'] for item in items if item['updated']), default=timezone.now())
+    # Item content too, so edits that leave a timestamp unchanged (an author rename) still change the ETag
+    fingerprint = '|'.join(
+        f"{item['id']}:{item['updated'].isoformat()}:{item['title']}:{item['link']}:{item['description']}:{item['author']}"
+        for item in items
+    )
+    return {
+        'title': title,
+        'description': description,
+        'link': base_url,
+        'feed_url': f"{base_url}/feed/{feed_type}/",
+        'items': items,
+        'updated': updated,
+        'etag': hashlib.sha1(f"{title}|{description}|{fingerprint}".encode()).hexdigest(),
+    }
+
+
+def get_feed(account, feed_type: str) -> Dict:
+    """Cached item list for a tenant and feed type"""
+    account_id = getattr(account, 'pk', None)
+    key = feed_cache_key(account_id, feed_type)
+    feed = cache.get(key)
+    if feed is None:
+        feed = build_feed(account, feed_type)
+        cache.set(key, feed, FEED_CACHE_TIMEOUT)
+    return feed
+
+
+def rss_context(feed: Dict) -> Dict:
+    return {
+        'title': feed['title'],
+        'description': feed['description'],
+        'link': feed['link'],
+        'feed_url': feed['feed_url'],
+        'items': [
+            {
+                'title': item['title'],
+                'link': item['link'],
+                'description': item['description'],
+                'pubDate': format_datetime(item['published']) if item['published'] else '',
+                'guid': item['link'],
+                'author': item['author'],
+            }
+            for item in feed['items']
+        ],
+        'build_date': format_datetime(feed['updated']),
+        'language': 'en-us',
+    }
+
+
+def atom_context(feed: Dict) -> Dict:
+    return {
+        'title': feed['title'],
+        'subtitle': feed['description'],
+        'link': feed['link'],
+        'feed_url': f"{feed['feed_url']}atom/",
+        'updated': feed['updated'].isoformat(),
+        'items': [
+            {
+                'id': item['link'],
+                'title': item['title'],
+                'link': item['link'],
+                'summary': item['description'],
+                'published': item['published'].isoformat() if item['published'] else '',
+                'updated': item['updated'].isoformat() if item['updated'] else '',
+                'author': item['author'],
+            }
+            for item in feed['items']
+        ],
+    }
+
+
+def json_feed(feed: Dict) -> Dict:
+    """JSON Feed 1.1 document (https://jsonfeed.org/version/1.1)"""
+    return {
+        'version': 'https://jsonfeed.org/version/1.1',
+        'title': feed['title'],
+        'description': feed['description'],
+        'home_page_url': feed['link'],
+        'feed_url': f"{feed['feed_url']}json/",
+        'language': 'en-US',
+        'items': [
+            {
+                'id': item['link'],
+                'url': item['link'],
+                'title': item['title'],
+                'summary': item['description'],
+                'date_published': item['published'].isoformat() if item['published'] else None,
+                'date_modified': item['updated'].isoformat() if item['updated'] else None,
+                'authors': [{'name': item['author']}],
+            }
+            for item in feed['items']
+        ],
+    }
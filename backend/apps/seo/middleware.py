@@ -0,0 +1,35 @@
+from django.http import HttpResponseGone, HttpResponsePermanentRedirect, HttpResponseRedirect
+
+from .redirects import match
+
+
+class RedirectMiddleware:
+    """
+    Serve configured 301/302/410 redirects before URL resolution,
+    using the in-process redirect engine
+    """
+
+    skip_paths = ('/admin/', '/api/', '/static/', '/media/')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.method not in ('GET', 'HEAD') or request.path.startswith(self.skip_paths):
+            return self.get_response(request)
+
+        redirect = match(request.path)
+        if redirect is None:
+            return self.get_response(request)
+
+        if redirect.status_code == 410 or not redirect.new_path:
+            return HttpResponseGone()
+
+        location = redirect.new_path
+        query_string = request.META.get('QUERY_STRING', '')
+        if query_string and '?' not in location:
+            location = f"{location}?{query_string}"
+
+        if redirect.status_code == 302:
+            return HttpResponseRedirect(location)
+        return HttpResponsePermanentRedirect(location)
@@ -0,0 +1,84 @@
+# Generated by Django 5.0.3 on 2025-11-21 10:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0001_initial"),
+        ("seo", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="sitemapentry",
+            name="account",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="sitemap_entries",
+                to="accounts.account",
+            ),
+        ),
+        migrations.AddField(
+            model_name="sitemapentry",
+            name="shard",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="sitemapentry",
+            name="lastmod",
+            field=models.DateTimeField(
+                blank=True, help_text="When the listed content last changed", null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sitemapentry",
+            index=models.Index(
+                fields=["account", "shard"], name="seo_sitemap_account_f62bf2_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sitemapentry",
+            index=models.Index(
+                fields=["content_type", "object_id"], name="seo_sitemap_content_a09caf_idx"
+            ),
+        ),
+        migrations.CreateModel(
+            name="SitemapShard",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("index", models.PositiveIntegerField(default=0)),
+                ("content", models.BinaryField(blank=True)),
+                ("url_count", models.PositiveIntegerField(default=0)),
+                ("etag", models.CharField(blank=True, max_length=64)),
+                ("is_stale", models.BooleanField(default=True)),
+                ("generated_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "account",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sitemap_shards",
+                        to="accounts.account",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["account", "index"],
+                "unique_together": {("account", "index")},
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.3 on 2025-11-21 14:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("seo", "0002_sitemapentry_account_shard_sitemapshard"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="redirect",
+            name="match_type",
+            field=models.CharField(
+                choices=[
+                    ("exact", "Exact path"),
+                    ("prefix", "Path prefix"),
+                    ("regex", "Regular expression"),
+                ],
+                default="exact",
+                help_text="Prefix redirects append the rest of the path to the new path; regex redirects may use \\1 group references",
+                max_length=10,
+            ),
+        ),
+    ]
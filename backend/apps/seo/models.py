@@ -61,6 +61,10 @@ class SitemapEntry(models.Model):
     
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     
+    # Tenant and shard the URL is listed in
+    account = models.ForeignKey('accounts.Account', on_delete=models.CASCADE, related_name='sitemap_entries', null=True, blank=True)
+    shard = models.PositiveIntegerField(default=0)
+    
     # Content identification
     content_type = models.CharField(max_length=20, choices=CONTENT_TYPES)
     object_id = models.UUIDField(null=True, blank=True)  # For article/page/topic IDs
@@ -83,6 +87,7 @@ class SitemapEntry(models.Model):
     )
     
     # Timestamps
+    lastmod = models.DateTimeField(null=True, blank=True, help_text="When the listed content last changed")
     last_modified = models.DateTimeField(auto_now=True)
     
     class Meta:
@@ -91,12 +96,35 @@ class SitemapEntry(models.Model):
         indexes = [
             models.Index(fields=['content_type', 'last_modified']),
             models.Index(fields=['last_modified']),
+            models.Index(fields=['account', 'shard']),
+            models.Index(fields=['content_type', 'object_id']),
         ]
     
     def __str__(self):
         return f"{self.content_type}: {self.url}"
 
 
+class SitemapShard(models.Model):
+    """
+    Pre-rendered, gzip-compressed sitemap file of at most 50,000 URLs for one tenant
+    """
+    account = models.ForeignKey('accounts.Account', on_delete=models.CASCADE, related_name='sitemap_shards', null=True, blank=True)
+    index = models.PositiveIntegerField(default=0)
+    
+    content = models.BinaryField(blank=True)  # gzip-compressed XML
+    url_count = models.PositiveIntegerField(default=0)
+    etag = models.CharField(max_length=64, blank=True)
+    is_stale = models.BooleanField(default=True)
+    generated_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['account', 'index']
+        unique_together = ['account', 'index']
+    
+    def __str__(self):
+        return f"Sitemap shard {self.index} ({self.url_count} URLs)"
+
+
 class Redirect(models.Model):
     """
     URL redirects for SEO and maintenance
@@ -106,8 +134,18 @@ class Redirect(models.Model):
         ('302', 'Temporary (302)'),
         ('410', 'Gone (410)'),
     ]
+
+    MATCH_CHOICES = [
+        ('exact', 'Exact path'),
+        ('prefix', 'Path prefix'),
+        ('regex', 'Regular expression'),
+    ]
     
     old_path = models.CharField(max_length=500, unique=True, help_text="The old URL path (without domain)")
+    match_type = models.CharField(
+        max_length=10, choices=MATCH_CHOICES, default='exact',
+        help_text="Prefix redirects append the rest of the path to the new path; regex redirects may use \\1 group references"
+    )
     new_path = models.CharField(max_length=500, blank=True, help_text="The new URL path (leave empty for 410)")
     status_code = models.CharField(max_length=3, choices=STATUS_CHOICES, default='301')
     
@@ -0,0 +1,144 @@
+"""
+In-process redirect engine
+Active Redirect rows are loaded once per worker into an exact-path dict, a
+path-segment trie for prefix redirects and an ordered list of compiled
+patterns. A version stamp in the shared cache tells every worker to reload
+after a redirect changes, so matching a request costs no database queries.
+"""
+
+import logging
+import re
+import threading
+from typing import Dict, List, NamedTuple, Optional
+
+from django.core.cache import cache
+
+from .models import Redirect
+
+logger = logging.getLogger(__name__)
+
+REDIRECT_VERSION_KEY = 'seo_redirects_version'
+
+
+class RedirectMatch(NamedTuple):
+    old_path: str
+    new_path: str
+    status_code: int
+
+
+def normalize(path: str) -> str:
+    """Compare paths without their trailing slash"""
+    return path.rstrip('/') or '/'
+
+
+def _segments(path: str) -> List[str]:
+    return [segment for segment in path.split('/') if segment]
+
+
+class RedirectEngine:
+    """Immutable lookup tables built from a list of redirects"""
+
+    def __init__(self, redirects, version=None):
+        self.version = version
+        self.exact: Dict[str, Redirect] = {}
+        self.trie: Dict = {}
+        self.patterns = []
+
+        for redirect in redirects:
+            if redirect.match_type == 'prefix':
+                node = self.trie
+                for segment in _segments(redirect.old_path):
+                    node = node.setdefault(segment, {})
+                node[None] = redirect
+            elif redirect.match_type == 'regex':
+                try:
+                    self.patterns.append((re.compile(redirect.old_path), redirect))
+                except re.error as e:
+                    logger.error(f"Skipping invalid redirect pattern {redirect.old_path!r}: {str(e)}")
+            else:
+                self.exact[normalize(redirect.old_path)] = redirect
+
+    def __len__(self):
+        return len(self.exact) + len(self.patterns) + self._count(self.trie)
+
+    def _count(self, node) -> int:
+        return sum(1 if key is None else self._count(child) for key, child in node.items())
+
+    def _match_prefix(self, path: str) -> Optional[RedirectMatch]:
+        """Longest registered prefix of the path, with the remainder carried over"""
+        segments = _segments(path)
+        node, best, depth = self.trie, self.trie.get(None), 0
+        for index, segment in enumerate(segments):
+            node = node.get(segment)
+            if node is None:
+                break
+            if None in node:
+                best, depth = node[None], index + 1
+        if best is None:
+            return None
+
+        new_path = best.new_path
+        rest = '/'.join(segments[depth:])
+        if rest and new_path:
+            new_path = f"{new_path.rstrip('/')}/{rest}"
+            if path.endswith('/'):
+                new_path += '/'
+        return RedirectMatch(best.old_path, new_path, int(best.status_code))
+
+    def match(self, path: str) -> Optional[RedirectMatch]:
+        """Exact paths win over prefixes, which win over patterns"""
+        redirect = self.exact.get(normalize(path))
+        if redirect is not None:
+            return RedirectMatch(redirect.old_path, redirect.new_path, int(redirect.status_code))
+
+        if self.trie:
+            match = self._match_prefix(path)
+            if match is not None:
+                return match
+
+        for pattern, redirect in self.patterns:
+            found = pattern.fullmatch(path)
+            if found:
+                new_path = found.expand(redirect.new_path) if redirect.new_path else ''
+                return RedirectMatch(redirect.old_path, new_path, int(redirect.status_code))
+
+        return None
+
+
+_engine: Optional[RedirectEngine] = None
+_lock = threading.Lock()
+
+
+def invalidate():
+    """Ask every worker to reload its redirect tables"""
+    try:
+        cache.incr(REDIRECT_VERSION_KEY)
+    except ValueError:
+        cache.set(REDIRECT_VERSION_KEY, 2, None)
+
+
+def load_engine(version=None) -> RedirectEngine:
+    redirects = Redirect.objects.filter(is_active=True).only(
+        'old_path', 'new_path', 'status_code', 'match_type'
+    ).order_by('old_path')
+    engine = RedirectEngine(redirects, version=version)
+    logger.info(f"Loaded {len(engine)} redirects (version {version})")
+    return engine
+
+
+def get_engine() -> RedirectEngine:
+    """Current engine, reloaded when the shared version stamp has moved"""
+    global _engine
+    version = cache.get(REDIRECT_VERSION_KEY, 1)
+    engine = _engine
+    if engine is not None and engine.version == version:
+        return engine
+
+    with _lock:
+        if _engine is None or _engine.version != version:
+            _engine = load_engine(version)
+        return _engine
+
+
+def match(path: str) -> Optional[RedirectMatch]:
+    return get_engine().match(path)
@@ -0,0 +1,280 @@
+"""
+Path to SEO metadata resolver
+Maps a public URL path to its content object, merged meta tags and Schema.org
+data. Resolved paths are cached under version stamps that are bumped whenever
+content, MetaTag or SEOSettings rows change, and misses are resolved in bulk
+with one query per model.
+"""
+
+import hashlib
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+from django.db.models import Q
+
+from apps.articles.models import Article, Page, Topic
+from .models import MetaTag, SEOSettings
+from .sitemaps import get_base_url
+
+logger = logging.getLogger(__name__)
+
+RESOLVER_CACHE_TIMEOUT = getattr(settings, 'SEO_RESOLVER_CACHE_TIMEOUT', 60 * 60 * 6)
+MAX_BATCH_SIZE = 100
+
+GLOBAL_VERSION_KEY = 'seo_meta_version:global'
+
+
+def tenant_version_key(account_id) -> str:
+    return f"seo_meta_version:{account_id or 'global'}:content"
+
+
+def _bump(key: str):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, None)
+
+
+def invalidate_tenant(account_id=None):
+    """Content of one tenant changed"""
+    _bump(tenant_version_key(account_id))
+
+
+def invalidate_all():
+    """Meta tags or site-wide SEO settings changed"""
+    _bump(GLOBAL_VERSION_KEY)
+
+
+def normalize_path(url: str) -> str:
+    """Reduce a full URL or path to a canonical '/path/' form"""
+    path = urlparse(url).path if '://' in url else url.split('?')[0].split('#')[0]
+    path = '/' + path.strip('/')
+    return path if path == '/' else path + '/'
+
+
+def parse_path(path: str) -> Tuple[str, Optional[str]]:
+    """Classify a normalized path as (content_type, slug)"""
+    parts = [part for part in path.split('/') if part]
+    if not parts:
+        return 'home', None
+    if len(parts) == 2 and parts[0] == 'articles':
+        return 'article', parts[1]
+    if len(parts) == 2 and parts[0] == 'topics':
+        return 'topic', parts[1]
+    if len(parts) == 1:
+        return 'page', parts[0]
+    return 'custom', None
+
+
+def _media_url(media) -> str:
+    return media.file.url if media and media.file else ''
+
+
+def build_meta(meta_tag: Optional[MetaTag], seo_settings: Optional[SEOSettings]) -> Dict:
+    """Merge object-specific meta tags over the site defaults"""
+    tags = {
+        'title': '',
+        'description': '',
+        'keywords': '',
+        'canonical': '',
+        'og_title': '',
+        'og_description': '',
+        'og_image': '',
+        'twitter_card': 'summary_large_image',
+        'twitter_site': '',
+        'twitter_creator': '',
+        'robots_index': True,
+        'robots_follow': True,
+        'custom_meta': {}
+    }
+
+    if meta_tag:
+        tags['title'] = meta_tag.meta_title or tags['title']
+        tags['description'] = meta_tag.meta_description or tags['description']
+        tags['keywords'] = meta_tag.meta_keywords or tags['keywords']
+        tags['canonical'] = meta_tag.canonical_url or tags['canonical']
+        tags['robots_index'] = meta_tag.robots_index
+        tags['robots_follow'] = meta_tag.robots_follow
+        tags['custom_meta'] = meta_tag.custom_meta or {}
+
+    if seo_settings:
+        tags['title'] = tags['title'] or seo_settings.meta_title
+        tags['description'] = tags['description'] or seo_settings.meta_description
+        tags['keywords'] = tags['keywords'] or seo_settings.meta_keywords
+        tags['og_title'] = tags['og_title'] or seo_settings.og_title or tags['title']
+        tags['og_description'] = tags['og_description'] or seo_settings.og_description or tags['description']
+        tags['og_image'] = tags['og_image'] or _media_url(seo_settings.og_image)
+        tags['twitter_card'] = seo_settings.twitter_card
+        tags['twitter_site'] = seo_settings.twitter_site
+        tags['twitter_creator'] = seo_settings.twitter_creator
+
+    return tags
+
+
+def build_article_schema(article: Article, base_url: str) -> Dict:
+    url = f"{base_url}/articles/{article.slug}/"
+    published = article.published_at or article.created_at
+    schema = {
+        "@context": "https://schema.org",
+        "@type": "Article",
+        "headline": article.title,
+        "description": article.excerpt or article.content[:200] + '...',
+        "author": {
+            "@type": "Person",
+            "name": article.author.get_full_name() or article.author.email
+        },
+        "datePublished": published.isoformat(),
+        "dateModified": (article.updated_at or published).isoformat(),
+        "url": url,
+        "mainEntityOfPage": {
+            "@type": "WebPage",
+            "@id": url
+        }
+    }
+    if article.hero_image:
+        schema["image"] = _media_url(article.hero_image)
+    return schema
+
+
+def build_home_schema(seo_settings: Optional[SEOSettings]) -> Dict:
+    if not seo_settings:
+        return {}
+    return {
+        "@context": "https://schema.org",
+        "@type": "Organization",
+        "name": seo_settings.organization_name,
+        "url": seo_settings.organization_url,
+        "logo": _media_url(seo_settings.organization_logo)
+    }
+
+
+class SEOResolver:
+    """Resolves paths for one tenant, memoizing results in the cache"""
+
+    def __init__(self, account=None):
+        self.account = account
+        self.account_id = getattr(account, 'pk', None)
+
+    def _account_filter(self) -> Dict:
+        return {'account': self.account} if self.account is not None else {'account__isnull': True}
+
+    def _key_prefix(self) -> str:
+        versions = cache.get_many([GLOBAL_VERSION_KEY, tenant_version_key(self.account_id)])
+        global_version = versions.get(GLOBAL_VERSION_KEY, 1)
+        tenant_version = versions.get(tenant_version_key(self.account_id), 1)
+        return f"seo_meta:{global_version}:{tenant_version}:{self.account_id or 'global'}"
+
+    @staticmethod
+    def _path_key(prefix: str, path: str) -> str:
+        return f"{prefix}:{hashlib.md5(path.encode()).hexdigest()}"
+
+    def resolve(self, url: str) -> Dict:
+        path = normalize_path(url)
+        return self.resolve_many([path])[path]
+
+    def resolve_many(self, urls: Iterable[str]) -> Dict[str, Dict]:
+        """Resolve several paths, hitting the database only for cache misses"""
+        paths = list(dict.fromkeys(normalize_path(url) for url in urls))
+        prefix = self._key_prefix()
+        keys = {self._path_key(prefix, path): path for path in paths}
+
+        cached = cache.get_many(list(keys))
+        results = {keys[key]: record for key, record in cached.items()}
+
+        missing = [path for path in paths if path not in results]
+        if missing:
+            resolved = self._resolve_from_db(missing)
+            cache.set_many(
+                {self._path_key(prefix, path): record for path, record in resolved.items()},
+                RESOLVER_CACHE_TIMEOUT
+            )
+            results.update(resolved)
+
+        return results
+
+    def _resolve_from_db(self, paths: List[str]) -> Dict[str, Dict]:
+        parsed = {path: parse_path(path) for path in paths}
+        slugs = {'article': set(), 'topic': set(), 'page': set()}
+        custom_paths = []
+        for path, (content_type, slug) in parsed.items():
+            if content_type in slugs:
+                slugs[content_type].add(slug)
+            elif content_type == 'custom':
+                custom_paths.append(path)
+
+        objects = {'article': {}, 'topic': {}, 'page': {}}
+        if slugs['article']:
+            articles = Article.objects.filter(
+                slug__in=slugs['article'], status='published', **self._account_filter()
+            ).select_related('author', 'hero_image').order_by()
+            objects['article'] = {article.slug: article for article in articles}
+        if slugs['topic']:
+            topics = Topic.objects.filter(slug__in=slugs['topic'], **self._account_filter())
+            objects['topic'] = {topic.slug: topic for topic in topics}
+        if slugs['page']:
+            pages = Page.objects.filter(slug__in=slugs['page'], **self._account_filter())
+            objects['page'] = {page.slug: page for page in pages}
+
+        object_filter = Q(content_type='home')
+        for content_type, by_slug in objects.items():
+            if by_slug:
+                object_filter |= Q(content_type=content_type, object_id__in=[obj.pk for obj in by_slug.values()])
+        if custom_paths:
+            object_filter |= Q(content_type='custom', url_pattern__in=custom_paths)
+
+        meta_by_object = {}
+        home_meta = None
+        for meta_tag in MetaTag.objects.filter(object_filter, is_active=True):
+            if meta_tag.content_type == 'home':
+                home_meta = home_meta or meta_tag
+            elif meta_tag.content_type == 'custom':
+                meta_by_object.setdefault(('custom', meta_tag.url_pattern), meta_tag)
+            else:
+                meta_by_object.setdefault((meta_tag.content_type, meta_tag.object_id), meta_tag)
+
+        seo_settings = SEOSettings.objects.filter(site=Site.objects.get_current()).select_related(
+            'og_image', 'organization_logo'
+        ).first()
+        base_url = get_base_url(self.account)
+
+        results = {}
+        for path, (content_type, slug) in parsed.items():
+            obj = objects.get(content_type, {}).get(slug) if slug else None
+            if content_type == 'home':
+                meta_tag, schema = home_meta, build_home_schema(seo_settings)
+            elif obj is not None:
+                meta_tag = meta_by_object.get((content_type, obj.pk))
+                schema = build_article_schema(obj, base_url) if content_type == 'article' else {}
+            elif content_type == 'custom':
+                meta_tag, schema = meta_by_object.get(('custom', path)), {}
+            else:
+                meta_tag, schema = None, {}
+
+            results[path] = {
+                'path': path,
+                'content_type': content_type if (obj is not None or content_type in ('home', 'custom')) else None,
+                'object_id': str(obj.pk) if obj is not None else None,
+                'meta': build_meta(meta_tag, seo_settings),
+                'schema': schema,
+            }
+        return results
+
+    def warm(self, chunk_size: int = 500) -> int:
+        """Precompute the index for every published path of the tenant"""
+        paths = ['/']
+        account_filter = self._account_filter()
+        paths += [f"/articles/{slug}/" for slug in Article.objects.filter(
+            status='published', **account_filter).values_list('slug', flat=True).iterator()]
+        paths += [f"/topics/{slug}/" for slug in Topic.objects.filter(
+            **account_filter).values_list('slug', flat=True).iterator()]
+        paths += [f"/{slug}/" for slug in Page.objects.filter(
+            **account_filter).values_list('slug', flat=True).iterator()]
+
+        for start in range(0, len(paths), chunk_size):
+            self.resolve_many(paths[start:start + chunk_size])
+        logger.info(f"Warmed SEO resolver with {len(paths)} paths for account {self.account_id}")
+        return len(paths)
@@ -0,0 +1,70 @@
+"""Keep sitemap shards, the meta tag resolver and redirect tables in sync with their sources"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.articles.models import Article, Page, Topic
+from .models import MetaTag, Redirect, SEOSettings
+from .redirects import invalidate as invalidate_redirects
+from .resolver import invalidate_all, invalidate_tenant
+from .sitemaps import is_indexed, mark_stale, remove_entry, sync_entry
+
+
+def _queue_shard_render(account, shard):
+    from .tasks import regenerate_sitemap_shard
+    account_id = str(account.pk) if account is not None else None
+    transaction.on_commit(lambda: regenerate_sitemap_shard.delay(account_id, shard))
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_save, sender=Topic)
+@receiver(post_save, sender=Page)
+def update_sitemap_on_save(sender, instance, update_fields=None, **kwargs):
+    """Re-index the saved object and re-render only the shard it lives in"""
+    if update_fields and set(update_fields) <= {'view_count'}:
+        return
+    if not is_indexed(instance.account):
+        return
+
+    shard = sync_entry(instance)
+    if shard is not None:
+        mark_stale(instance.account, shard)
+        _queue_shard_render(instance.account, shard)
+
+
+@receiver(post_delete, sender=Article)
+@receiver(post_delete, sender=Topic)
+@receiver(post_delete, sender=Page)
+def update_sitemap_on_delete(sender, instance, **kwargs):
+    shard = remove_entry(instance)
+    if shard is not None:
+        mark_stale(instance.account, shard)
+        _queue_shard_render(instance.account, shard)
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_save, sender=Topic)
+@receiver(post_save, sender=Page)
+@receiver(post_delete, sender=Article)
+@receiver(post_delete, sender=Topic)
+@receiver(post_delete, sender=Page)
+def invalidate_resolver_on_content_change(sender, instance, update_fields=None, **kwargs):
+    """Retire the tenant's resolved meta tags; stale entries expire on their own"""
+    if update_fields and set(update_fields) <= {'view_count'}:
+        return
+    invalidate_tenant(instance.account_id)
+
+
+@receiver(post_save, sender=MetaTag)
+@receiver(post_save, sender=SEOSettings)
+@receiver(post_delete, sender=MetaTag)
+@receiver(post_delete, sender=SEOSettings)
+def invalidate_resolver_on_meta_change(sender, instance, **kwargs):
+    invalidate_all()
+
+
+@receiver(post_save, sender=Redirect)
+@receiver(post_delete, sender=Redirect)
+def reload_redirects(sender, instance, **kwargs):
+    transaction.on_commit(invalidate_redirects)
@@ -0,0 +1,256 @@
+"""
+Per-tenant sharded sitemaps
+URLs are indexed in SitemapEntry rows assigned to shards of at most
+SITEMAP_SHARD_SIZE URLs. Each shard is rendered once, stored gzip-compressed
+in SitemapShard and only re-rendered when content in that shard changes.
+"""
+
+import gzip
+import hashlib
+import logging
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.db import transaction
+from django.db.models import Count, Max
+from django.template import loader
+from django.utils import timezone
+
+from apps.articles.models import Article, Page, Topic
+from .models import SitemapEntry, SitemapShard
+
+logger = logging.getLogger(__name__)
+
+# Search engines reject sitemaps with more than 50,000 URLs
+SITEMAP_SHARD_SIZE = getattr(settings, 'SITEMAP_SHARD_SIZE', 50000)
+SITEMAP_XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+# content_type -> (changefreq, priority)
+ENTRY_DEFAULTS = {
+    'article': ('weekly', 0.8),
+    'topic': ('monthly', 0.6),
+    'page': ('monthly', 0.7),
+}
+
+
+def get_base_url(account=None) -> str:
+    """Public base URL of a tenant (verified custom domain, else subdomain)"""
+    domain = Site.objects.get_current().domain
+    if account is None:
+        return f"https://{domain}"
+    if account.custom_domain and account.domain_verified:
+        return f"https://{account.custom_domain}"
+    return f"https://{account.slug}.{domain}"
+
+
+def entry_for(instance) -> Optional[Dict]:
+    """Sitemap attributes for a content object, or None if it should not be listed"""
+    if isinstance(instance, Article):
+        if instance.status != 'published':
+            return None
+        return {
+            'content_type': 'article',
+            'url': f"/articles/{instance.slug}/",
+            'lastmod': instance.updated_at or instance.published_at,
+        }
+    if isinstance(instance, Topic):
+        return {'content_type': 'topic', 'url': f"/topics/{instance.slug}/", 'lastmod': instance.created_at}
+    if isinstance(instance, Page):
+        return {'content_type': 'page', 'url': f"/{instance.slug}/", 'lastmod': instance.updated_at or instance.created_at}
+    return None
+
+
+def _account_filter(account) -> Dict:
+    return {'account': account} if account is not None else {'account__isnull': True}
+
+
+def _next_shard(account) -> int:
+    """Open shard for new entries: the highest shard while it still has room"""
+    entries = SitemapEntry.objects.filter(**_account_filter(account))
+    last = entries.aggregate(last=Max('shard'))['last']
+    if last is None:
+        return 0
+    if entries.filter(shard=last).count() >= SITEMAP_SHARD_SIZE:
+        return last + 1
+    return last
+
+
+def is_indexed(account) -> bool:
+    """Whether a tenant's sitemap has been built; until then saves are left to the first full build"""
+    return SitemapShard.objects.filter(**_account_filter(account)).exists()
+
+
+def mark_stale(account, shard: int):
+    """Flag a shard for re-rendering, creating its row if needed"""
+    updated = SitemapShard.objects.filter(**_account_filter(account), index=shard).update(is_stale=True)
+    if not updated:
+        SitemapShard.objects.get_or_create(account=account, index=shard, defaults={'is_stale': True})
+
+
+def sync_entry(instance) -> Optional[int]:
+    """
+    Upsert or remove the sitemap entry for a content object.
+    Returns the shard that changed, or None if nothing changed.
+    """
+    content_type = {Article: 'article', Topic: 'topic', Page: 'page'}.get(type(instance))
+    if content_type is None:
+        return None
+
+    account = instance.account
+    existing = SitemapEntry.objects.filter(content_type=content_type, object_id=instance.pk).first()
+    attributes = entry_for(instance)
+
+    if attributes is None:
+        if existing is None:
+            return None
+        existing.delete()
+        return existing.shard
+
+    changefreq, priority = ENTRY_DEFAULTS[content_type]
+    if existing is not None:
+        existing.url = attributes['url']
+        existing.lastmod = attributes['lastmod']
+        existing.account = account
+        existing.save(update_fields=['url', 'lastmod', 'account', 'last_modified'])
+        return existing.shard
+
+    shard = _next_shard(account)
+    SitemapEntry.objects.create(
+        account=account,
+        shard=shard,
+        content_type=content_type,
+        object_id=instance.pk,
+        url=attributes['url'],
+        lastmod=attributes['lastmod'],
+        changefreq=changefreq,
+        priority=priority,
+    )
+    return shard
+
+
+def remove_entry(instance) -> Optional[int]:
+    content_type = {Article: 'article', Topic: 'topic', Page: 'page'}.get(type(instance))
+    entry = SitemapEntry.objects.filter(content_type=content_type, object_id=instance.pk).first()
+    if entry is None:
+        return None
+    entry.delete()
+    return entry.shard
+
+
+def render_shard(account, index: int) -> SitemapShard:
+    """Render one shard's XML and store it gzip-compressed"""
+    base_url = get_base_url(account)
+    entries = []
+
+    if index == 0:
+        entries.append({
+            'url': base_url,
+            'lastmod': timezone.now().isoformat(),
+            'changefreq': 'daily',
+            'priority': '1.0',
+        })
+
+    rows = SitemapEntry.objects.filter(**_account_filter(account), shard=index).order_by('url').values_list(
+        'url', 'lastmod', 'last_modified', 'changefreq', 'priority'
+    )
+    for url, lastmod, last_modified, changefreq, priority in rows.iterator(chunk_size=5000):
+        entries.append({
+            'url': f"{base_url}{url}",
+            'lastmod': (lastmod or last_modified).isoformat(),
+            'changefreq': changefreq,
+            'priority': str(priority),
+        })
+
+    xml = loader.get_template('seo/sitemap.xml').render({'entries': entries, 'xmlns': SITEMAP_XMLNS})
+    body = xml.encode('utf-8')
+
+    shard, _ = SitemapShard.objects.update_or_create(
+        account=account,
+        index=index,
+        defaults={
+            'content': gzip.compress(body),
+            'url_count': len(entries),
+            'etag': hashlib.sha1(body).hexdigest(),
+            'is_stale': False,
+            'generated_at': timezone.now(),
+        },
+    )
+    return shard
+
+
+@transaction.atomic
+def rebuild_account(account) -> List[SitemapShard]:
+    """
+    Re-index every sitemap URL of a tenant into fresh shards and render them.
+    Custom entries are kept; generated entries are rewritten in shard order.
+    """
+    SitemapEntry.objects.filter(**_account_filter(account)).exclude(content_type='custom').delete()
+
+    custom_count = SitemapEntry.objects.filter(**_account_filter(account), content_type='custom').count()
+    position = custom_count
+    batch = []
+
+    sources = [
+        Article.objects.filter(**_account_filter(account), status='published').order_by('published_at', 'id'),
+        Topic.objects.filter(**_account_filter(account)).order_by('created_at', 'id'),
+        Page.objects.filter(**_account_filter(account)).order_by('created_at', 'id'),
+    ]
+    for queryset in sources:
+        for instance in queryset.iterator(chunk_size=2000):
+            attributes = entry_for(instance)
+            if attributes is None:
+                continue
+            changefreq, priority = ENTRY_DEFAULTS[attributes['content_type']]
+            batch.append(SitemapEntry(
+                account=account,
+                shard=position // SITEMAP_SHARD_SIZE,
+                content_type=attributes['content_type'],
+                object_id=instance.pk,
+                url=attributes['url'],
+                lastmod=attributes['lastmod'],
+                changefreq=changefreq,
+                priority=priority,
+            ))
+            position += 1
+            if len(batch) >= 2000:
+                SitemapEntry.objects.bulk_create(batch)
+                batch = []
+    if batch:
+        SitemapEntry.objects.bulk_create(batch)
+
+    shard_count = max(1, -(-position // SITEMAP_SHARD_SIZE))
+    SitemapShard.objects.filter(**_account_filter(account), index__gte=shard_count).delete()
+    shards = [render_shard(account, index) for index in range(shard_count)]
+    logger.info(f"Rebuilt {shard_count} sitemap shards ({position} URLs) for account {getattr(account, 'slug', None)}")
+    return shards
+
+
+def get_shard(account, index: int) -> Optional[SitemapShard]:
+    """Fetch a shard, rendering it first when missing or stale"""
+    shard = SitemapShard.objects.filter(**_account_filter(account), index=index).first()
+    if shard is None:
+        if index == 0 and not SitemapShard.objects.filter(**_account_filter(account)).exists():
+            return rebuild_account(account)[0]
+        if not SitemapEntry.objects.filter(**_account_filter(account), shard=index).exists():
+            return None
+        return render_shard(account, index)
+    if shard.is_stale or not shard.content:
+        shard = render_shard(account, index)
+    return shard
+
+
+def list_shards(account) -> List[SitemapShard]:
+    """Shards for the sitemap index, building them on first use"""
+    shards = list(SitemapShard.objects.filter(**_account_filter(account)).order_by('index').defer('content'))
+    if not shards:
+        shards = rebuild_account(account)
+    return shards
+
+
+def shard_stats(account) -> List[Dict]:
+    """URL counts per shard for monitoring"""
+    return list(
+        SitemapEntry.objects.filter(**_account_filter(account))
+        .values('shard').annotate(urls=Count('id')).order_by('shard')
+    )
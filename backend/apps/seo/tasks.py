@@ -0,0 +1,57 @@
+"""Celery tasks for SEO maintenance"""
+
+import logging
+from typing import Optional
+
+from config.celery import app
+from apps.accounts.models import Account
+from .models import SitemapShard
+from .resolver import SEOResolver
+from .sitemaps import rebuild_account, render_shard
+
+logger = logging.getLogger(__name__)
+
+
+@app.task(bind=True, max_retries=3)
+def regenerate_sitemap_shard(self, account_id: Optional[str], shard: int):
+    """
+    Re-render a single sitemap shard after its content changed
+    """
+    try:
+        account = Account.objects.get(id=account_id) if account_id else None
+        sitemap = render_shard(account, shard)
+        return f"Rendered sitemap shard {shard} with {sitemap.url_count} URLs"
+
+    except Account.DoesNotExist:
+        logger.error(f"Account {account_id} not found")
+        return "Account not found"
+    except Exception as e:
+        logger.error(f"Error rendering sitemap shard {shard} for account {account_id}: {str(e)}")
+        raise self.retry(countdown=60, exc=e)
+
+
+@app.task(bind=True)
+def update_sitemap_and_seo(self):
+    """
+    Rebuild sitemap shards for every tenant, re-render any left stale and
+    pre-warm the meta tag resolver
+    Runs daily via Celery Beat
+    """
+    try:
+        rebuilt = 0
+        for account in [None, *Account.objects.filter(is_active=True).iterator()]:
+            try:
+                rebuild_account(account)
+                SEOResolver(account).warm()
+                rebuilt += 1
+            except Exception as e:
+                logger.error(f"Failed to rebuild sitemaps for account {getattr(account, 'id', None)}: {str(e)}")
+
+        for shard in SitemapShard.objects.filter(is_stale=True).select_related('account').defer('content'):
+            render_shard(shard.account, shard.index)
+
+        return f"Rebuilt sitemaps for {rebuilt} tenants"
+
+    except Exception as e:
+        logger.error(f"Error in update_sitemap_and_seo: {str(e)}")
+        raise
@@ -0,0 +1,94 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+
+from apps.articles.models import Article, Topic
+from apps.seo.views import rss_feed
+
+User = get_user_model()
+
+
+class CachedFeedTestCase(TestCase):
+    """Test cached, conditional syndication feeds"""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+        self.author = User.objects.create_user(username='author', email='author@example.com', password='pass12345',
+                                               first_name='Ada', last_name='Writer')
+        for i in range(3):
+            Article.objects.create(title=f'Post {i}', content='Body text', author=self.author, status='published')
+
+    def _get(self, feed_format='rss', feed_type='articles', **extra):
+        request = self.factory.get(f'/feed/{feed_type}/', **extra)
+        request.tenant = None
+        return rss_feed(request, feed_type=feed_type, feed_format=feed_format)
+
+    def test_feed_is_cached_after_first_fetch(self):
+        """Repeat fetches render from the cached item list without queries"""
+        first = self._get()
+        self.assertEqual(first.status_code, 200)
+        self.assertIn('Ada Writer', first.content.decode())
+
+        with self.assertNumQueries(0):
+            second = self._get()
+        self.assertEqual(first.content, second.content)
+
+    def test_conditional_request_returns_304(self):
+        """A matching If-None-Match yields 304 Not Modified"""
+        etag = self._get()['ETag']
+
+        response = self._get(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_if_modified_since_returns_304(self):
+        last_modified = self._get()['Last-Modified']
+
+        response = self._get(HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_article_save_invalidates_feed(self):
+        """Publishing an article changes the cached feed and its ETag"""
+        etag = self._get()['ETag']
+        Article.objects.create(title='Breaking', content='Body text', author=self.author, status='published')
+
+        response = self._get(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Breaking', response.content.decode())
+
+    def test_article_delete_invalidates_feed(self):
+        etag = self._get()['ETag']
+        Article.objects.get(title='Post 0').delete()
+
+        response = self._get(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Post 0', response.content.decode())
+
+    def test_topic_edit_changes_topic_feed_etag(self):
+        topic = Topic.objects.create(name='Science', slug='science', description='Old description')
+        etag = self._get(feed_type='topics')['ETag']
+
+        topic.description = 'New description'
+        topic.save()
+        response = self._get(feed_type='topics', HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('New description', response.content.decode())
+
+    def test_atom_and_json_variants_share_items(self):
+        """Atom and JSON Feed are rendered from the same item list"""
+        atom = self._get('atom')
+        self.assertEqual(atom['Content-Type'], 'application/atom+xml; charset=utf-8')
+        self.assertEqual(atom.content.decode().count('<entry>'), 3)
+
+        document = json.loads(self._get('json').content)
+        self.assertEqual(document['version'], 'https://jsonfeed.org/version/1.1')
+        self.assertEqual(len(document['items']), 3)
+        self.assertEqual(document['items'][0]['authors'][0]['name'], 'Ada Writer')
@@ -0,0 +1,78 @@
+import json
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+
+from apps.seo import redirects
+from apps.seo.middleware import RedirectMiddleware
+from apps.seo.models import Redirect
+from apps.seo.redirects import RedirectEngine
+from apps.seo.views import track_redirect
+
+
+class RedirectEngineTestCase(TestCase):
+    """Test exact, prefix and pattern redirect matching"""
+
+    def setUp(self):
+        Redirect.objects.create(old_path='/old-post/', new_path='/articles/new-post/')
+        Redirect.objects.create(old_path='/blog/', new_path='/articles/', match_type='prefix')
+        Redirect.objects.create(old_path='/blog/archive/', new_path='/archive/', match_type='prefix', status_code='302')
+        Redirect.objects.create(old_path=r'/(\d{4})/(\d{2})/([\w-]+)/', new_path=r'/articles/\3/', match_type='regex')
+        Redirect.objects.create(old_path='/removed/', status_code='410')
+        self.engine = RedirectEngine(Redirect.objects.all())
+
+    def test_exact_match_ignores_trailing_slash(self):
+        self.assertEqual(self.engine.match('/old-post').new_path, '/articles/new-post/')
+
+    def test_longest_prefix_wins(self):
+        self.assertEqual(self.engine.match('/blog/hello/').new_path, '/articles/hello/')
+        match = self.engine.match('/blog/archive/2020/')
+        self.assertEqual((match.new_path, match.status_code), ('/archive/2020/', 302))
+
+    def test_pattern_with_group_references(self):
+        self.assertEqual(self.engine.match('/2021/05/my-post/').new_path, '/articles/my-post/')
+
+    def test_no_match(self):
+        self.assertIsNone(self.engine.match('/articles/current/'))
+
+
+class RedirectMiddlewareTestCase(TestCase):
+    """Test redirects served by middleware without database queries"""
+
+    def setUp(self):
+        cache.clear()
+        redirects._engine = None
+        self.factory = RequestFactory()
+        self.middleware = RedirectMiddleware(lambda request: HttpResponse('view'))
+        Redirect.objects.create(old_path='/old-post/', new_path='/articles/new-post/')
+        Redirect.objects.create(old_path='/removed/', status_code='410')
+
+    def test_redirects_served_without_queries(self):
+        self.middleware(self.factory.get('/warm-up/'))
+
+        with self.assertNumQueries(0):
+            response = self.middleware(self.factory.get('/old-post/?utm_source=x'))
+
+        self.assertEqual(response.status_code, 301)
+        self.assertEqual(response['Location'], '/articles/new-post/?utm_source=x')
+        self.assertEqual(self.middleware(self.factory.get('/removed/')).status_code, 410)
+        self.assertEqual(self.middleware(self.factory.get('/other/')).content, b'view')
+
+    def test_change_reloads_engine(self):
+        """Saving a redirect bumps the shared version so workers reload"""
+        self.middleware(self.factory.get('/warm-up/'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Redirect.objects.create(old_path='/new-old/', new_path='/fresh/', status_code='302')
+
+        response = self.middleware(self.factory.get('/new-old/'))
+        self.assertEqual((response.status_code, response['Location']), (302, '/fresh/'))
+
+    def test_track_redirect_uses_engine(self):
+        request = self.factory.post('/api/seo/redirect/', json.dumps({'path': '/old-post/'}),
+                                    content_type='application/json')
+
+        response = track_redirect(request)
+
+        self.assertEqual(json.loads(response.content)['new_path'], '/articles/new-post/')
@@ -0,0 +1,119 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+
+from apps.accounts.models import Account
+from apps.articles.models import Article, Topic
+from apps.seo.models import MetaTag
+from apps.seo.resolver import SEOResolver, normalize_path, parse_path
+from apps.seo.views import seo_meta_tags, seo_meta_tags_batch, seo_schema_ld
+
+User = get_user_model()
+
+
+class SEOResolverTestCase(TestCase):
+    """Test the cached path to meta tag resolver"""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+        self.author = User.objects.create_user(username='author', email='author@example.com', password='pass12345')
+        self.article = Article.objects.create(title='Hello World', content='Body text', author=self.author,
+                                              status='published')
+        self.topic = Topic.objects.create(name='Science')
+        MetaTag.objects.create(content_type='article', object_id=self.article.id, meta_title='Custom title')
+
+    def test_parse_path(self):
+        """Full URLs and paths are classified by their first segment"""
+        self.assertEqual(normalize_path('https://example.com/articles/hello-world?ref=x'), '/articles/hello-world/')
+        self.assertEqual(parse_path('/articles/hello-world/'), ('article', 'hello-world'))
+        self.assertEqual(parse_path('/topics/science/'), ('topic', 'science'))
+        self.assertEqual(parse_path('/about/'), ('page', 'about'))
+        self.assertEqual(parse_path('/'), ('home', None))
+
+    def test_resolves_object_and_merged_meta(self):
+        resolved = SEOResolver().resolve(f'/articles/{self.article.slug}/')
+
+        self.assertEqual(resolved['content_type'], 'article')
+        self.assertEqual(resolved['object_id'], str(self.article.id))
+        self.assertEqual(resolved['meta']['title'], 'Custom title')
+        self.assertEqual(resolved['schema']['headline'], 'Hello World')
+
+    def test_second_resolution_hits_cache(self):
+        """A cached path is served without any queries"""
+        url = f'/articles/{self.article.slug}/'
+        SEOResolver().resolve(url)
+
+        with self.assertNumQueries(0):
+            resolved = SEOResolver().resolve(url)
+        self.assertEqual(resolved['meta']['title'], 'Custom title')
+
+    def test_batch_resolution_query_count(self):
+        """Misses are resolved with one query per model, not per URL"""
+        for i in range(5):
+            Article.objects.create(title=f'Post {i}', content='Body text', author=self.author, status='published')
+        urls = [f'/articles/{slug}/' for slug in Article.objects.values_list('slug', flat=True)]
+        urls += [f'/topics/{self.topic.slug}/', '/']
+        Site.objects.get_current()
+
+        # Articles, topics, meta tags, SEO settings (the current Site is cached per process)
+        with self.assertNumQueries(4):
+            resolved = SEOResolver().resolve_many(urls)
+        self.assertEqual(len(resolved), 8)
+
+    def test_meta_tag_change_invalidates(self):
+        url = f'/articles/{self.article.slug}/'
+        SEOResolver().resolve(url)
+
+        MetaTag.objects.filter(object_id=self.article.id).get().delete()
+
+        self.assertEqual(SEOResolver().resolve(url)['meta']['title'], '')
+
+    def test_content_change_invalidates(self):
+        url = f'/articles/{self.article.slug}/'
+        SEOResolver().resolve(url)
+
+        self.article.excerpt = 'Updated summary'
+        self.article.save()
+
+        self.assertEqual(SEOResolver().resolve(url)['schema']['description'], 'Updated summary')
+
+    def test_resolution_is_tenant_scoped(self):
+        """Another tenant's article with the same slug is not matched"""
+        account = Account.objects.create(name='Other', slug='other', owner=self.author)
+
+        resolved = SEOResolver(account).resolve(f'/articles/{self.article.slug}/')
+
+        self.assertIsNone(resolved['object_id'])
+        self.assertEqual(resolved['schema'], {})
+
+    def test_views(self):
+        request = self.factory.get('/api/seo/meta-tags/', {'url': f'/articles/{self.article.slug}/'})
+        request.tenant = None
+        self.assertEqual(json.loads(seo_meta_tags(request).content)['title'], 'Custom title')
+
+        request = self.factory.get('/api/seo/schema/', {'url': f'/articles/{self.article.slug}/'})
+        request.tenant = None
+        self.assertEqual(json.loads(seo_schema_ld(request).content)['@type'], 'Article')
+
+    def test_batch_endpoint(self):
+        urls = [f'/articles/{self.article.slug}/', '/topics/science/', '/missing/']
+        request = self.factory.post('/api/seo/meta-tags/batch/', {'urls': urls}, format='json')
+        request.tenant = None
+
+        response = seo_meta_tags_batch(request)
+
+        results = json.loads(response.content)['results']
+        self.assertEqual(list(results), urls)
+        self.assertEqual(results['/topics/science/']['content_type'], 'topic')
+        self.assertIsNone(results['/missing/']['object_id'])
+
+    def test_batch_endpoint_rejects_oversized_requests(self):
+        request = self.factory.post('/api/seo/meta-tags/batch/', {'urls': ['/'] * 101}, format='json')
+        request.tenant = None
+
+        self.assertEqual(seo_meta_tags_batch(request).status_code, 400)
@@ -0,0 +1,87 @@
+import gzip
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+
+from apps.articles.models import Article, Topic
+from apps.seo import sitemaps
+from apps.seo.models import SitemapEntry, SitemapShard
+from apps.seo.views import sitemap_index, sitemap_xml
+
+User = get_user_model()
+
+
+class SitemapShardTestCase(TestCase):
+    """Test sharded, pre-rendered sitemaps"""
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.author = User.objects.create_user(username='author', email='author@example.com', password='pass12345')
+        for i in range(5):
+            Article.objects.create(title=f'Post {i}', content='Body text', author=self.author, status='published')
+        Article.objects.create(title='Draft', content='Body text', author=self.author)
+        Topic.objects.create(name='News', slug='news')
+
+    def _get(self, view, path='/sitemap.xml', **extra):
+        request = self.factory.get(path, **extra)
+        request.tenant = None
+        return view(request)
+
+    @mock.patch.object(sitemaps, 'SITEMAP_SHARD_SIZE', 3)
+    def test_rebuild_splits_urls_into_shards(self):
+        """Published content is indexed into shards no larger than the limit"""
+        shards = sitemaps.rebuild_account(None)
+
+        self.assertEqual([shard.index for shard in shards], [0, 1])
+        self.assertEqual(SitemapEntry.objects.filter(shard=0).count(), 3)
+        self.assertEqual(SitemapEntry.objects.filter(shard=1).count(), 3)
+        self.assertFalse(SitemapEntry.objects.filter(url='/articles/draft/').exists())
+
+        xml = gzip.decompress(bytes(shards[1].content)).decode()
+        self.assertEqual(xml.count('<url>'), 3)
+
+    @mock.patch.object(sitemaps, 'SITEMAP_SHARD_SIZE', 3)
+    def test_index_lists_real_shards(self):
+        """The sitemap index references every stored shard"""
+        response = self._get(sitemap_index, '/sitemap-index.xml')
+
+        content = response.content.decode()
+        self.assertIn('/sitemap.xml</loc>', content)
+        self.assertIn('/sitemap-1.xml</loc>', content)
+        self.assertNotIn('/sitemap-2.xml', content)
+
+    def test_shard_served_gzipped_with_validators(self):
+        """Shards are served compressed when accepted and honour If-None-Match"""
+        response = self._get(sitemap_xml, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('/articles/post-0/', gzip.decompress(response.content).decode())
+
+        response = self._get(sitemap_xml, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_shard_and_index_honour_if_modified_since(self):
+        for view in (sitemap_xml, sitemap_index):
+            response = self._get(view)
+            self.assertEqual(response.status_code, 200)
+
+            response = self._get(view, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+            self.assertEqual(response.status_code, 304, view)
+
+    @mock.patch.object(sitemaps, 'SITEMAP_SHARD_SIZE', 3)
+    def test_article_save_rerenders_only_its_shard(self):
+        """Publishing an article appends it to the open shard and leaves others untouched"""
+        sitemaps.rebuild_account(None)
+        first = SitemapShard.objects.get(index=0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Article.objects.create(title='Fresh', content='Body text', author=self.author, status='published')
+
+        entry = SitemapEntry.objects.get(url='/articles/fresh/')
+        self.assertEqual(entry.shard, 2)
+        self.assertEqual(SitemapShard.objects.get(index=0).generated_at, first.generated_at)
+        fresh_shard = SitemapShard.objects.get(index=2)
+        self.assertFalse(fresh_shard.is_stale)
+        self.assertIn('/articles/fresh/', gzip.decompress(bytes(fresh_shard.content)).decode())
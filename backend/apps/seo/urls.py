@@ -6,6 +6,7 @@ app_name = 'seo'
 urlpatterns = [
     # Sitemap endpoints
     path('sitemap.xml', views.sitemap_xml, name='sitemap_xml'),
+    path('sitemap-<int:shard>.xml', views.sitemap_xml, name='sitemap_shard'),
     path('sitemap-index.xml', views.sitemap_index, name='sitemap_index'),
     
     # Robots.txt
@@ -14,9 +15,14 @@ urlpatterns = [
     # RSS feeds
     path('feed/articles/', views.rss_feed, kwargs={'feed_type': 'articles'}, name='rss_articles'),
     path('feed/topics/', views.rss_feed, kwargs={'feed_type': 'topics'}, name='rss_topics'),
+    path('feed/articles/atom/', views.rss_feed, kwargs={'feed_type': 'articles', 'feed_format': 'atom'}, name='atom_articles'),
+    path('feed/topics/atom/', views.rss_feed, kwargs={'feed_type': 'topics', 'feed_format': 'atom'}, name='atom_topics'),
+    path('feed/articles/json/', views.rss_feed, kwargs={'feed_type': 'articles', 'feed_format': 'json'}, name='json_feed_articles'),
+    path('feed/topics/json/', views.rss_feed, kwargs={'feed_type': 'topics', 'feed_format': 'json'}, name='json_feed_topics'),
     
     # SEO meta tags and structured data
     path('api/seo/meta-tags/', views.seo_meta_tags, name='seo_meta_tags'),
+    path('api/seo/meta-tags/batch/', views.seo_meta_tags_batch, name='seo_meta_tags_batch'),
     path('api/seo/schema/', views.seo_schema_ld, name='seo_schema_ld'),
     
     # Redirect tracking
@@ -7,8 +7,7 @@ from django.contrib.auth import authenticate
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
 from django.http import HttpResponseForbidden
-from functools import wraps
-import time
+from apps.core.ratelimit import RateThrottle
 from .serializers import (
     UserSerializer,
     UserCreateSerializer,
@@ -18,47 +17,18 @@ from .serializers import (
 User = get_user_model()
 
 
-def rate_limit(max_requests=5, window_seconds=300):  # 5 requests per 5 minutes by default
-    """
-    Rate limiting decorator for auth endpoints
-    """
-    def decorator(func):
-        @wraps(func)
-        def wrapper(request, *args, **kwargs):
-            # Get client IP
-            ip = request.META.get('HTTP_X_FORWARDED_FOR', request.META.get('REMOTE_ADDR', '')).split(',')[0].strip()
-
-            if not ip:
-                ip = 'unknown'
+class LoginRateThrottle(RateThrottle):
+    """Login attempts per IP (5 per 5 minutes by default)"""
+    scope = 'login'
+    rate = '5/300s'
+    key = 'ip'
 
-            # Create cache key
-            cache_key = f"ratelimit:{ip}:{func.__name__}"
 
-            # Get current requests
-            current_requests = cache.get(cache_key, [])
-
-            # Remove expired requests
-            current_time = time.time()
-            current_requests = [req_time for req_time in current_requests if current_time - req_time < window_seconds]
-
-            # Check if over limit
-            if len(current_requests) >= max_requests:
-                return Response(
-                    {
-                        'error': 'Too many requests. Please try again later.',
-                        'retry_after': window_seconds
-                    },
-                    status=status.HTTP_429_TOO_MANY_REQUESTS
-                )
-
-            # Add current request
-            current_requests.append(current_time)
-            cache.set(cache_key, current_requests, window_seconds)
-
-            # Call the function
-            return func(request, *args, **kwargs)
-        return wrapper
-    return decorator
+class RegistrationRateThrottle(RateThrottle):
+    """Registrations per IP (3 per hour by default)"""
+    scope = 'register'
+    rate = '3/h'
+    key = 'ip'
 
 
 from rest_framework_simplejwt.views import TokenObtainPairView
@@ -67,12 +37,7 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     """
     Custom token obtain view that includes user data in response with rate limiting
     """
-    def dispatch(self, request, *args, **kwargs):
-        # Apply rate limiting to login attempts
-        result = rate_limit(max_requests=5, window_seconds=300)(lambda r: None)(request)
-        if hasattr(result, 'status_code') and result.status_code == status.HTTP_429_TOO_MANY_REQUESTS:
-            return result
-        return super().dispatch(request, *args, **kwargs)
+    throttle_classes = [LoginRateThrottle]
 
     def post(self, request, *args, **kwargs):
         # Additional rate limiting for failed login attempts
@@ -113,8 +78,12 @@ class CustomTokenObtainPairView(TokenObtainPairView):
         else:
             # Increment failed attempts on failure
             if email:
-                attempts = cache.get(f"login_attempts:{email}", 0) + 1
-                cache.set(f"login_attempts:{email}", attempts, 3600)  # 1 hour
+                cache_key = f"login_attempts:{email}"
+                if not cache.add(cache_key, 1, 3600):  # 1 hour
+                    try:
+                        cache.incr(cache_key)
+                    except ValueError:
+                        cache.add(cache_key, 1, 3600)
 
         return response
 
@@ -162,13 +131,7 @@ class UserRegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserCreateSerializer
     permission_classes = [AllowAny]
-
-    def dispatch(self, request, *args, **kwargs):
-        # Apply rate limiting to registration attempts to prevent abuse
-        result = rate_limit(max_requests=3, window_seconds=3600)(lambda r: None)(request)  # 3 registrations per hour
-        if hasattr(result, 'status_code') and result.status_code == status.HTTP_429_TOO_MANY_REQUESTS:
-            return result
-        return super().dispatch(request, *args, **kwargs)
+    throttle_classes = [RegistrationRateThrottle]  # Prevent registration abuse
 
 
 class UserProfileView(generics.RetrieveUpdateAPIView):
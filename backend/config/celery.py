@@ -66,6 +66,36 @@ app.conf.beat_schedule = {
         'schedule': crontab(hour='*/4'),  # Every 4 hours
     },
 
+    # Correct drift in media storage counters
+    'reconcile-media-usage': {
+        'task': 'apps.media.tasks.reconcile_media_usage',
+        'schedule': crontab(hour=2, minute=30),  # Daily at 2:30 AM
+    },
+
+    # Correct drift in article comment and reaction counters
+    'reconcile-article-counters': {
+        'task': 'apps.articles.tasks.reconcile_article_counters',
+        'schedule': crontab(hour=2, minute=45),  # Daily at 2:45 AM
+    },
+
+    # Retry failed Stripe webhook events once their backoff has elapsed
+    'retry-failed-webhook-events': {
+        'task': 'apps.accounts.tasks.retry_failed_webhook_events',
+        'schedule': crontab(minute='*'),  # Every minute
+    },
+
+    # Requeue Stripe webhook events abandoned by crashed workers
+    'reclaim-stalled-webhook-events': {
+        'task': 'apps.accounts.tasks.reclaim_stalled_webhook_events',
+        'schedule': crontab(minute='*/15'),  # Every 15 minutes
+    },
+
+    # Correct drift in account article and member counters
+    'reconcile-account-quotas': {
+        'task': 'apps.accounts.tasks.reconcile_account_quotas',
+        'schedule': crontab(hour=2, minute=50),  # Daily at 2:50 AM
+    },
+
     # Update subscription statuses and billing
     'update-subscription-statuses': {
         'task': 'apps.accounts.tasks.update_subscription_statuses',
@@ -83,6 +113,8 @@ app.conf.update(
         'apps.accounts.tasks.*': {'queue': 'billing'},
         'apps.seo.tasks.*': {'queue': 'seo'},
         'apps.core.tasks.*': {'queue': 'maintenance'},
+        'apps.articles.tasks.*': {'queue': 'maintenance'},
+        'apps.content_analysis.tasks.*': {'queue': 'analytics'},
     },
 
     # Worker configuration
@@ -111,9 +143,6 @@ app.conf.update(
     worker_send_task_events = True,
     task_send_sent_event = True,
     task_track_started = True,
-
-    # Rate limiting (additional layer beyond Django middleware)
-    worker_disable_rate_limits = False,
 )
 
 # Celery Beat configuration
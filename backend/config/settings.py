@@ -51,6 +51,8 @@ MIDDLEWARE = [
     'csp.middleware.CSPMiddleware',  # Content Security Policy
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'apps.core.ratelimit.RateLimitMiddleware',  # Per-IP limits on tracking endpoints
+    'apps.seo.middleware.RedirectMiddleware',  # Configured redirects, before any view runs
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
@@ -88,7 +90,8 @@ ASGI_APPLICATION = 'config.asgi.application'
 
 # Database
 import sys
-if 'pytest' in sys.modules or any('pytest' in arg for arg in sys.argv):
+TESTING = 'pytest' in sys.modules or any('pytest' in arg for arg in sys.argv)
+if TESTING:
     # Use SQLite for tests
     DATABASES = {
         'default': {
@@ -96,6 +99,8 @@ if 'pytest' in sys.modules or any('pytest' in arg for arg in sys.argv):
             'NAME': ':memory:',
         }
     }
+    # Run Celery tasks inline so tests never need a broker
+    CELERY_TASK_ALWAYS_EAGER = True
 else:
     DATABASES = {
         'default': {
@@ -256,6 +261,18 @@ STRIPE_WEBHOOK_IP_WHITELIST = config('STRIPE_WEBHOOK_IP_WHITELIST', default=[
     '35.154.171.200/32', '3.130.192.231/32', '13.235.14.237/32',
     '13.235.122.149/32', '18.211.135.69/32', '99.79.142.11/32'
 ]
+# Failed Stripe webhook events are retried this many times in total, waiting
+# STRIPE_WEBHOOK_RETRY_BACKOFF seconds doubled per attempt, before they hold the customer's later events
+STRIPE_WEBHOOK_MAX_ATTEMPTS = config('STRIPE_WEBHOOK_MAX_ATTEMPTS', default=5, cast=int)
+STRIPE_WEBHOOK_RETRY_BACKOFF = config('STRIPE_WEBHOOK_RETRY_BACKOFF', default=60, cast=int)
+# Mirrored Stripe customers, subscriptions and prices are refetched once older than this (seconds)
+BILLING_STATE_TTL = config('BILLING_STATE_TTL', default=6 * 60 * 60, cast=int)
+# Stripe proration previews are reused per subscription, price and period for this long (seconds)
+BILLING_PRORATION_CACHE_TIMEOUT = config('BILLING_PRORATION_CACHE_TIMEOUT', default=15 * 60, cast=int)
+
+# Public account directory
+ACCOUNT_DIRECTORY_PAGE_SIZE = config('ACCOUNT_DIRECTORY_PAGE_SIZE', default=24, cast=int)
+ACCOUNT_CARD_CACHE_TIMEOUT = config('ACCOUNT_CARD_CACHE_TIMEOUT', default=5 * 60, cast=int)
 
 # Site URL (for email links) - Used for email verification links
 FRONTEND_URL = config('FRONTEND_URL', default='http://localhost:3000')
@@ -332,6 +349,29 @@ else:
         }
     }
 
+# Rate limit counters (apps.core.ratelimit); tests count in process memory
+RATELIMIT_ENABLED = config('RATELIMIT_ENABLED', default=True, cast=bool)
+RATELIMIT_CACHE_ALIAS = 'ratelimit'
+CACHES['ratelimit'] = (
+    {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'ratelimit'}
+    if TESTING else dict(CACHES['default'])
+)
+# Throttle rates by scope for views using RateThrottle subclasses
+RATELIMIT_RATES = {
+    'login': '5/300s',
+    'register': '3/h',
+    'subscribe': '5/h',
+    'text_analysis': '60/m',
+    'realtime_check': '120/m',
+}
+# Path prefixes limited per IP by RateLimitMiddleware before any view runs
+RATELIMIT_PATHS = {
+    '/api/analytics/track/': '120/m',
+    '/api/newsletter/tracking/': '300/m',
+    # apps.seo.urls mounts its API routes under api/seo/ again
+    '/api/seo/api/seo/redirect/': '120/m',
+}
+
 # Session configuration
 SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
 SESSION_CACHE_ALIAS = 'default'
@@ -449,6 +489,43 @@ CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes
 CELERY_TASK_SOFT_TIME_LIMIT = 25 * 60  # 25 minutes soft limit
 CELERY_WORKER_MAX_TASKS_PER_CHILD = 1000  # Restart worker after 1000 tasks
 
+# Data retention - expired rows are deleted in chunked batches (apps.core.retention)
+DATA_RETENTION_BATCH_SIZE = config('DATA_RETENTION_BATCH_SIZE', default=1000, cast=int)
+DATA_RETENTION_BATCH_SLEEP = config('DATA_RETENTION_BATCH_SLEEP', default=0.1, cast=float)
+DATA_RETENTION_DAYS = {
+    'newsletter_sends': 90,
+    'page_views': 365,
+    'operation_transforms': 30,
+    'text_analyses': 0,  # Delete as soon as cache_expires_at passes
+    'collaborative_sessions': 7,  # Grace period after expires_at
+}
+
+# Responsive image variants (apps.media.processing); AVIF needs Pillow AVIF support
+MEDIA_VARIANT_WIDTHS = [320, 640, 1024, 1600]
+MEDIA_VARIANT_FORMATS = ['avif', 'webp', 'jpeg']
+MEDIA_VARIANT_QUALITY = {'avif': 55, 'webp': 80, 'jpeg': 82}
+
+# Anonymous article/topic response cache (apps.articles.response_cache)
+RESPONSE_CACHE_ENABLED = config('RESPONSE_CACHE_ENABLED', default=True, cast=bool)
+RESPONSE_CACHE_FRESH = config('RESPONSE_CACHE_FRESH', default=60, cast=int)
+RESPONSE_CACHE_TIMEOUT = config('RESPONSE_CACHE_TIMEOUT', default=600, cast=int)
+
+# Cache-Control for conditional article/topic reads (apps.articles.conditional)
+HTTP_CACHE_MAX_AGE = config('HTTP_CACHE_MAX_AGE', default=60, cast=int)
+HTTP_CACHE_STALE_WHILE_REVALIDATE = config('HTTP_CACHE_STALE_WHILE_REVALIDATE', default=300, cast=int)
+
+# Text analysis result cache (apps.content_analysis.result_cache)
+TEXT_ANALYSIS_CACHE_TIMEOUT = config('TEXT_ANALYSIS_CACHE_TIMEOUT', default=86400, cast=int)
+TEXT_ANALYSIS_LOCAL_CACHE_SIZE = config('TEXT_ANALYSIS_LOCAL_CACHE_SIZE', default=512, cast=int)
+TEXT_ANALYSIS_METRICS_FLUSH_COUNT = config('TEXT_ANALYSIS_METRICS_FLUSH_COUNT', default=100, cast=int)
+TEXT_ANALYSIS_METRICS_FLUSH_INTERVAL = config('TEXT_ANALYSIS_METRICS_FLUSH_INTERVAL', default=30, cast=int)
+
+# Bulk text analysis (apps.content_analysis.bulk); 0 or 1 workers analyzes inline
+BULK_ANALYSIS_WORKERS = config('BULK_ANALYSIS_WORKERS', default=4, cast=int)
+BULK_ANALYSIS_CHUNK_SIZE = config('BULK_ANALYSIS_CHUNK_SIZE', default=25, cast=int)
+BULK_ANALYSIS_JOB_MAX_TEXTS = config('BULK_ANALYSIS_JOB_MAX_TEXTS', default=1000, cast=int)
+QUALITY_SCORE_BATCH_SIZE = config('QUALITY_SCORE_BATCH_SIZE', default=200, cast=int)
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
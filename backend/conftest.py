@@ -198,3 +198,10 @@ def django_db_setup(django_db_setup, django_db_blocker):
 
         # Run migrations
         execute_from_command_line(['manage.py', 'migrate', '--verbosity=0'])
+
+
+@pytest.fixture(autouse=True)
+def clear_rate_limits():
+    """Start every test with fresh rate limit counters"""
+    from django.core.cache import caches
+    caches['ratelimit'].clear()